@@ -0,0 +1,74 @@
+"""
+Conditional GET for Versioned Responses
+Viewset methods whose payload depends only on versioned datasets (see
+advisory.services.data_versions) answer revalidations with 304 before the
+payload is built, and mark full responses cacheable by shared proxies:
+
+    @versioned_response('government_schemes', max_age=3600)
+    def list(self, request): ...
+
+The ETag combines the dataset versions with RELEASE_VERSION, so a deploy
+that changes how a payload is built invalidates cached copies as well. It
+is weak: payloads may carry per-request fields such as timestamps, so two
+responses with the same tag are equivalent but not byte-identical.
+"""
+
+import functools
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..services.data_versions import combined_version
+
+logger = logging.getLogger(__name__)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires
+    tags = [tag.strip() for tag in header.split(',')]
+    bare = etag[2:] if etag.startswith('W/') else etag
+    return '*' in tags or any((tag[2:] if tag.startswith('W/') else tag) == bare for tag in tags)
+
+
+def is_not_modified(request, etag: str, last_modified) -> bool:
+    """Whether the client's cached copy is current (If-None-Match wins over If-Modified-Since)"""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        return _etag_matches(if_none_match, etag)
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and int(last_modified.timestamp()) <= since
+
+
+def versioned_response(*datasets: str, max_age: int = 3600, stale_while_revalidate: Optional[int] = None):
+    """Add ETag/Last-Modified/Cache-Control to a viewset method and answer matching requests with 304"""
+    stale = stale_while_revalidate if stale_while_revalidate is not None else max_age
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                version = combined_version(datasets, salt=f"{getattr(settings, 'RELEASE_VERSION', '')}:"
+                                                          f"{type(self).__name__}.{method.__name__}")
+            except Exception as e:
+                logger.warning(f"Could not version {type(self).__name__}.{method.__name__}: {e}")
+                return method(self, request, *args, **kwargs)
+            etag = f'W/"{version["version"]}"'
+
+            if is_not_modified(request, etag, version['last_modified']):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(version['last_modified'].timestamp())
+            response['Cache-Control'] = f'public, max-age={max_age}, stale-while-revalidate={stale}'
+            return response
+        return wrapper
+    return decorator
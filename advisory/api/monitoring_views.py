@@ -7,14 +7,16 @@ Provides endpoints for system monitoring, performance metrics, and health checks
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.http import JsonResponse
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import json
 import logging
 
 from ..monitoring.performance_monitor import performance_monitor, get_performance_summary
+from ..monitoring.profiler import get_profiler
+from ..monitoring.tracing import get_trace_store
 from ..middleware.rate_limiting import get_rate_limit_status, reset_rate_limits
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,13 @@ class MonitoringViewSet(viewsets.ViewSet):
     
     permission_classes = [AllowAny]  # Allow access for health checks
     
+    def get_permissions(self):
+        # The profiler exposes stacks and costs CPU, and traces carry request
+        # paths and parameters, so both are for staff only
+        if self.action in ('profile', 'traces'):
+            return [IsAdminUser()]
+        return super().get_permissions()
+    
     @action(detail=False, methods=['get'])
     def health(self, request):
         """
@@ -125,6 +134,66 @@ class MonitoringViewSet(viewsets.ViewSet):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'])
+    def traces(self, request):
+        """
+        Tail-sampled request traces as span trees with self time
+        Query parameters:
+        - trace_id: a single trace, with a text rendering
+        - min_ms: only traces at least this slow (default: 0)
+        - name: only traces whose root route contains this
+        - limit: number of traces, newest first (default: 20, max: 100)
+        - text: add an indented text rendering of each tree (1/0)
+        """
+        store = get_trace_store()
+        trace_id = request.GET.get('trace_id')
+        if trace_id:
+            trace = store.get(trace_id)
+            if trace is None:
+                return Response({'error': 'Trace not found'}, status=status.HTTP_404_NOT_FOUND)
+            return Response(trace, status=status.HTTP_200_OK)
+        try:
+            limit = max(1, min(int(request.GET.get('limit', 20)), 100))
+            min_ms = float(request.GET.get('min_ms', 0))
+        except ValueError:
+            return Response({'error': 'limit and min_ms must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        traces = store.traces(limit=limit, min_ms=min_ms, name=request.GET.get('name'),
+                              text=request.GET.get('text') in ('1', 'true'))
+        return Response({'traces': traces, 'count': len(traces), 'store': store.stats()},
+                        status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get', 'post', 'delete'])
+    def profile(self, request):
+        """
+        Sampling profiler (admin only)
+        POST {"seconds": 30, "interval_ms": 10}: sample every thread for that long
+        GET: status, hottest functions and collapsed stacks; ?download=1 returns
+             the collapsed stacks as text for flamegraph.pl
+        DELETE: stop and discard the profile
+        """
+        profiler = get_profiler()
+        if request.method == 'POST':
+            try:
+                seconds = float(request.data.get('seconds', 30))
+                interval_ms = request.data.get('interval_ms')
+                interval_ms = float(interval_ms) if interval_ms is not None else None
+            except (TypeError, ValueError):
+                return Response({'error': 'seconds and interval_ms must be numbers'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            if seconds <= 0:
+                return Response({'error': 'seconds must be positive'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(profiler.start(seconds, interval_ms), status=status.HTTP_202_ACCEPTED)
+        if request.method == 'DELETE':
+            profiler.stop()
+            profiler.reset()
+            return Response(profiler.status(), status=status.HTTP_200_OK)
+        if request.GET.get('download') in ('1', 'true'):
+            response = HttpResponse(profiler.collapsed(), content_type='text/plain; charset=utf-8')
+            response['Content-Disposition'] = 'attachment; filename="profile.collapsed"'
+            return response
+        return Response(dict(profiler.status(), top=profiler.top(), collapsed=profiler.collapsed()),
+                        status=status.HTTP_200_OK)
+
 
 class RateLimitViewSet(viewsets.ViewSet):
     """Rate limiting management endpoints"""
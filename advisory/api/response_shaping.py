@@ -0,0 +1,161 @@
+"""
+Response Shaping
+Query parameters that trim API payloads before they are rendered:
+
+    /api/market-prices/?schema=v3                         compact schema
+    /api/market-prices/?schema=v3&fields=crops.name,crops.price,mandi
+
+`schema=v3` maps a legacy payload through the view's compactor, which drops
+the keys the legacy schema repeats for older frontends (`crops` under three
+parents, `name`/`crop_name`, `profit`/`profit_margin`, ...). `fields` keeps
+only the listed top-level keys; dotted paths select keys inside nested
+objects and inside every element of a list.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+MISSING_VALUES = (None, '', 'N/A')
+
+
+def parse_fields(spec: Optional[str]) -> Optional[Dict[str, dict]]:
+    """
+    'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}; None when no fields
+    were requested. A path that names a key outright selects all of it, at
+    any depth and in either order: 'a,a.b' and 'a.b,a' both give {'a': {}}.
+    """
+    paths = [path.strip() for path in (spec or '').split(',') if path.strip()]
+    if not paths:
+        return None
+    tree: Dict[str, dict] = {}
+    for path in paths:
+        node = tree
+        parts = path.split('.')
+        for i, part in enumerate(parts):
+            if part in node and not node[part]:
+                break                       # already selected whole
+            if i == len(parts) - 1:
+                node[part] = {}             # whole key replaces a narrower selection
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def apply_fields(data: Any, tree: Optional[Dict[str, dict]]) -> Any:
+    """Keep only the selected keys; an empty subtree keeps the whole value"""
+    if not tree:
+        return data
+    if isinstance(data, list):
+        return [apply_fields(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: apply_fields(data[key], subtree) for key, subtree in tree.items() if key in data}
+    return data
+
+
+def _first(source: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = source.get(key)
+        if value not in MISSING_VALUES:
+            return value
+    return None
+
+
+# Compact key <- legacy aliases, in order of preference
+CROP_KEYS = {
+    'name': ('name', 'crop_name', 'commodity'),
+    'name_hindi': ('crop_name_hindi', 'name_hindi', 'hindi_name'),
+    'price': ('current_price', 'price', 'modal_price'),
+    'msp': ('msp',),
+    'profit': ('profit_margin', 'profit'),
+    'profit_pct': ('profit_percentage', 'profit_pct'),
+    'trend': ('trend',),
+    'demand': ('demand',),
+    'supply': ('supply',),
+    'mandi': ('mandi', 'market'),
+    'date': ('date', 'arrival_date'),
+}
+MANDI_KEYS = {
+    'name': ('name', 'mandi_name'),
+    'distance': ('distance', 'distance_km'),
+    'specialty': ('specialty',),
+    'status': ('status',),
+    'state': ('state',),
+}
+
+
+def _compact(item: Dict[str, Any], keys: Dict[str, tuple]) -> Dict[str, Any]:
+    compact = {}
+    for key, aliases in keys.items():
+        value = _first(item, *aliases)
+        if value is not None:
+            compact[key] = value
+    return compact
+
+
+def _crop_list(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nested = payload.get('market_prices')
+    for candidate in (payload.get('crops'),
+                      nested.get('crops') if isinstance(nested, dict) else None,
+                      nested.get('top_crops') if isinstance(nested, dict) else None,
+                      nested if isinstance(nested, list) else None):
+        if isinstance(candidate, list) and candidate:
+            return candidate
+    return []
+
+
+def _mandi_list(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nested = payload.get('market_prices')
+    for candidate in (payload.get('nearest_mandis_data'), payload.get('nearby_mandis'),
+                      nested.get('nearby_mandis') if isinstance(nested, dict) else None,
+                      payload.get('nearest_mandis')):
+        if isinstance(candidate, list) and candidate and isinstance(candidate[0], dict):
+            return candidate
+    return []
+
+
+def compact_market_prices(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    v3 market prices: every crop and mandi once, one key per value. A crop's
+    mandi is only given when it differs from the response's mandi.
+    """
+    mandi = _first(payload, 'mandi', 'auto_selected_mandi')
+    crops = []
+    for crop in _crop_list(payload):
+        compact = _compact(crop, CROP_KEYS)
+        if compact.get('mandi') == mandi:
+            del compact['mandi']
+        crops.append(compact)
+
+    compact = {'schema': 'v3'}
+    for key in ('status', 'location', 'state'):
+        if payload.get(key) not in MISSING_VALUES:
+            compact[key] = payload[key]
+    if mandi is not None:
+        compact['mandi'] = mandi
+    compact['crops'] = crops
+    compact['mandis'] = [_compact(item, MANDI_KEYS) for item in _mandi_list(payload)]
+    source = _first(payload, 'data_source', 'sources')
+    if source is not None:
+        compact['source'] = source
+    if payload.get('timestamp'):
+        compact['timestamp'] = payload['timestamp']
+    return compact
+
+
+class ResponseShapingMixin:
+    """
+    ViewSet mixin applying `?schema=v3` and `?fields=` to successful
+    responses. `compact_schemas` maps an action name to its compactor.
+    """
+
+    compact_schemas: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        data = getattr(response, 'data', None)
+        if 200 <= response.status_code < 300 and isinstance(data, (dict, list)):
+            params = getattr(request, 'query_params', {})
+            compactor = self.compact_schemas.get(getattr(self, 'action', None))
+            if compactor is not None and params.get('schema') == 'v3' and isinstance(data, dict):
+                data = compactor(data)
+            data = apply_fields(data, parse_fields(params.get('fields')))
+            response.data = data
+        return super().finalize_response(request, response, *args, **kwargs)
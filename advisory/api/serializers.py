@@ -50,8 +50,9 @@ class PestDetectionSerializer(serializers.Serializer):
     image = serializers.ImageField(required=True)
 
 class TextToSpeechSerializer(serializers.Serializer):
-    text = serializers.CharField(required=True)
+    text = serializers.CharField(required=True, max_length=2000)
     language = serializers.CharField(max_length=10, default='en')
+    voice = serializers.ChoiceField(choices=['default', 'slow'], default='default')
 
 class ForumPostSerializer(serializers.ModelSerializer):
     user_username = serializers.ReadOnlyField(source='user.username')
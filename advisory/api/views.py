@@ -7,6 +7,7 @@ This implements intelligent routing: Ollama for general queries, Government APIs
 import os
 import logging
 import json
+import uuid
 from contextlib import contextmanager
 import threading
 import time
@@ -16,18 +17,29 @@ from typing import Dict, Any, List
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 
-from ..services.enhanced_market_prices import EnhancedMarketPricesService
-from ..services.enhanced_pest_detection import pest_detection_service
-from ..services.ultra_dynamic_government_api import UltraDynamicGovernmentAPI
-from ..services.clean_weather_api import CleanWeatherAPI
-from ..services.comprehensive_crop_recommendations import ComprehensiveCropRecommendations
+from ..lazy_imports import lazy_import
+from .conditional import versioned_response
+from .response_shaping import ResponseShapingMixin, compact_market_prices
 from ..services.government_schemes_data import CENTRAL_GOVERNMENT_SCHEMES
-from ..services.enhanced_location_service import EnhancedLocationService
-from ..services.accurate_location_api import AccurateLocationAPI
 from ..models import User, ForumPost
 
+# Heavy services are imported on first use to keep worker cold start fast
+EnhancedMarketPricesService = lazy_import('advisory.services.enhanced_market_prices', 'EnhancedMarketPricesService')
+pest_detection_service = lazy_import('advisory.services.enhanced_pest_detection', 'pest_detection_service')
+UltraDynamicGovernmentAPI = lazy_import('advisory.services.ultra_dynamic_government_api', 'UltraDynamicGovernmentAPI')
+CleanWeatherAPI = lazy_import('advisory.services.clean_weather_api', 'CleanWeatherAPI')
+ComprehensiveCropRecommendations = lazy_import('advisory.services.comprehensive_crop_recommendations', 'ComprehensiveCropRecommendations')
+EnhancedLocationService = lazy_import('advisory.services.enhanced_location_service', 'EnhancedLocationService')
+AccurateLocationAPI = lazy_import('advisory.services.accurate_location_api', 'AccurateLocationAPI')
+text_to_speech = lazy_import('advisory.text_to_speech')
+sms_ivr = lazy_import('advisory.services.sms_ivr')
+image_inference = lazy_import('advisory.ml.image_inference')
+image_ingest = lazy_import('advisory.services.image_ingest')
+scheme_catalog = lazy_import('advisory.services.scheme_catalog')
+
 logger = logging.getLogger(__name__)
 
 @contextmanager
@@ -708,7 +720,7 @@ Please provide a helpful, detailed and informative response. Even if the questio
                 }
             
 # Additional ViewSets for compatibility
-class CropAdvisoryViewSet(viewsets.ViewSet):
+class CropAdvisoryViewSet(ResponseShapingMixin, viewsets.ViewSet):
     """Crop Advisory Service - Uses Government APIs for Real-Time Accurate Recommendations"""
     
     def __init__(self, *args, **kwargs):
@@ -808,7 +820,25 @@ class CropAdvisoryViewSet(viewsets.ViewSet):
                 'message': 'Government crop API temporarily unavailable'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class WeatherViewSet(viewsets.ViewSet):
+    @action(detail=False, methods=['post'], url_path='fertilizer-plan')
+    def fertilizer_plan(self, request):
+        """Least-cost fertilizer plans for many fields (e.g. a whole village) in one call"""
+        fields = request.data.get('fields')
+        if not isinstance(fields, list) or not fields or not all(isinstance(f, dict) for f in fields):
+            return Response({'error': 'fields must be a non-empty list of objects'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        products = request.data.get('products') or None
+        if products is not None and not isinstance(products, list):
+            return Response({'error': 'products must be a list of product names'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            from ..ml.fertilizer_planner import get_fertilizer_planner
+            plan = get_fertilizer_planner(products).plan(fields)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(plan, status=status.HTTP_200_OK)
+
+class WeatherViewSet(ResponseShapingMixin, viewsets.ViewSet):
     """Weather Service - Uses Government APIs (IMD) for Real-Time Accurate Data"""
     
     def __init__(self, *args, **kwargs):
@@ -895,8 +925,10 @@ class WeatherViewSet(viewsets.ViewSet):
                 'message': 'Government weather API temporarily unavailable'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-class MarketPricesViewSet(viewsets.ViewSet):
+class MarketPricesViewSet(ResponseShapingMixin, viewsets.ViewSet):
     """Market Prices Service - Uses Government APIs (Agmarknet/e-NAM) for Real-Time Accurate Data"""
+
+    compact_schemas = {'list': compact_market_prices}
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -939,7 +971,7 @@ class MarketPricesViewSet(viewsets.ViewSet):
             
             # Try government API first
             try:
-                gov_market_data = self.gov_api.get_market_prices_v2(location, latitude, longitude, language=language, mandi=mandi)
+                gov_market_data = self.gov_api.get_market_prices_v2(location, mandi=mandi, latitude=latitude, longitude=longitude)
                 
                 if gov_market_data and (gov_market_data.get('status') == 'success' or 'prices' in gov_market_data or 'crops' in gov_market_data):
                     logger.info(f"✅ Market prices retrieved from Government APIs")
@@ -1169,7 +1201,7 @@ class MarketPricesViewSet(viewsets.ViewSet):
         
         return crops[:4]  # Return top 4 crops
 
-class TrendingCropsViewSet(viewsets.ViewSet):
+class TrendingCropsViewSet(ResponseShapingMixin, viewsets.ViewSet):
     """Trending Crops Service - Uses Government APIs for Real-Time Accurate Data"""
     
     def __init__(self, *args, **kwargs):
@@ -1243,52 +1275,30 @@ class CropViewSet(viewsets.ViewSet):
     
     def list(self, request):
         """Get crop information using government APIs"""
+        # Not versioned: the body carries live market data for the location
         try:
             crop_name = request.query_params.get('crop', '')
             location = request.query_params.get('location', 'Delhi')
-            latitude = request.query_params.get('latitude')
-            longitude = request.query_params.get('longitude')
             
-            # Convert to float if provided
-            try:
-                latitude = float(latitude) if latitude else None
-            except (ValueError, TypeError):
-                latitude = None
-            try:
-                longitude = float(longitude) if longitude else None
-            except (ValueError, TypeError):
-                longitude = None
+            logger.info(f"🌾 Fetching crop data using Government APIs for {crop_name} in {location}")
             
-            language = request.query_params.get('language', 'hi')
-            
-            logger.info(f"🌾 Fetching crop data using Government APIs for {crop_name} in {location} in {language}")
-            
-            # Get comprehensive government data
-            gov_data = self.gov_api.get_comprehensive_government_data(
-                location=location,
-                latitude=latitude,
-                longitude=longitude,
-                language=language
-            )
-            
-            # Extract crop-specific data
-            crop_data = gov_data.get('government_data', {}).get('crop_recommendations', {})
-            market_data = gov_data.get('government_data', {}).get('market_prices', {})
+            # Live weather, market and scheme context for the location
+            gov_data = self.gov_api.get_comprehensive_government_data(location)
+            market_crops = (gov_data.get('market') or {}).get('top_crops', [])
             
             crop_info = {}
             if crop_name:
                 # Find specific crop information
-                if crop_data and 'recommendations' in crop_data:
-                    for crop in crop_data['recommendations']:
-                        if crop.get('name', '').lower() == crop_name.lower():
-                            crop_info = crop
-                            break
+                for crop in market_crops:
+                    if crop.get('name', '').lower() == crop_name.lower():
+                        crop_info = crop
+                        break
             
             return Response({
                 'crop': crop_name or 'All Crops',
                 'location': location,
                 'crop_info': crop_info,
-                'market_data': market_data.get('crops', []) if market_data else [],
+                'market_data': market_crops,
                 'data_source': 'Government APIs (ICAR, Agmarknet, e-NAM)',
                 'timestamp': datetime.now().isoformat()
             }, status=status.HTTP_200_OK)
@@ -1302,9 +1312,27 @@ class CropViewSet(viewsets.ViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
 class SMSIVRViewSet(viewsets.ViewSet):
+    """Inbound SMS and IVR webhooks, answered from the pre-rendered district digests"""
+
     def list(self, request):
         return Response({'message': 'SMS/IVR service'})
 
+    @action(detail=False, methods=['post'])
+    def sms(self, request):
+        phone_number = request.data.get('from', '')
+        result = sms_ivr.handle_sms_query(phone_number, request.data.get('text', ''))
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def ivr(self, request):
+        result = sms_ivr.handle_ivr_input(
+            request.data.get('from', ''),
+            str(request.data.get('digits', '')),
+            district=request.data.get('district'),
+            language=request.data.get('language', 'hi'),
+        )
+        return Response(result, status=status.HTTP_200_OK)
+
 class PestDetectionViewSet(viewsets.ViewSet):
     """Pest Detection Service - Uses Government APIs (ICAR, PPQS) for Real-Time Accurate Pest Data"""
     
@@ -1387,6 +1415,20 @@ class PestDetectionViewSet(viewsets.ViewSet):
                 'message': 'Government pest API temporarily unavailable'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def _analyze_image(self, image, crop_name: str) -> Dict[str, Any]:
+        """Crop and disease predictions for an uploaded image; empty without image or models"""
+        if not image:
+            return {}
+        analysis = {}
+        crop_prediction = None if crop_name else image_inference.classify_image('crop', image)
+        if crop_prediction:
+            analysis['crop'] = crop_prediction
+        crop = (crop_name or (crop_prediction or {}).get('label', '')).lower()
+        disease_prediction = image_inference.classify_image(f'disease_{crop}', image) if crop else None
+        if disease_prediction:
+            analysis['disease'] = disease_prediction
+        return analysis
+
     def create(self, request):
         """Handle pest detection from image upload with location"""
         try:
@@ -1410,6 +1452,12 @@ class PestDetectionViewSet(viewsets.ViewSet):
             
             logger.info(f"🐛 Processing pest detection from image for {crop_name} in {location}")
             
+            # Run the uploaded image through the batched crop/disease models, when installed
+            upload = request.FILES.get('image') or request.data.get('image')
+            image_analysis = self._analyze_image(upload.read() if hasattr(upload, 'read') else upload, crop_name)
+            if image_analysis.get('crop') and not crop_name:
+                crop_name = image_analysis['crop']['label']
+            
             # Use government APIs for pest identification with location
             if self.gov_api:
                 try:
@@ -1429,6 +1477,8 @@ class PestDetectionViewSet(viewsets.ViewSet):
                     
                     if pest_data and pest_data.get('status') == 'success':
                         response_data['pest_data'] = pest_data.get('data', {})
+                    if image_analysis:
+                        response_data['image_analysis'] = image_analysis
                     
                     return Response(response_data, status=status.HTTP_200_OK)
                 except Exception as e:
@@ -1440,6 +1490,7 @@ class PestDetectionViewSet(viewsets.ViewSet):
                 'location': location,
                 'data_source': 'ICAR + PPQS (Government APIs)',
                 'status': 'success',
+                'image_analysis': image_analysis,
                 'timestamp': datetime.now().isoformat()
             }, status=status.HTTP_200_OK)
             
@@ -1456,69 +1507,92 @@ class UserViewSet(viewsets.ViewSet):
         return Response({'message': 'User service'})
             
 class TextToSpeechViewSet(viewsets.ViewSet):
+    """Spoken advisories served from the content-addressed audio cache"""
+
+    # Audio is addressed by a hash of its content, so a URL never changes meaning
+    AUDIO_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+    # Local-engine fallback audio is replaced by gTTS audio later, so clients may only hold it briefly
+    FALLBACK_CACHE_CONTROL = 'public, max-age=300'
+
     def list(self, request):
         return Response({'message': 'Text to speech service'})
+
+    def create(self, request):
+        from .serializers import TextToSpeechSerializer
+
+        serializer = TextToSpeechSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        audio = text_to_speech.synthesize(data['text'], data['language'], data['voice'])
+        if audio is None:
+            return Response({
+                'error': 'Text to speech temporarily unavailable',
+                'timestamp': datetime.now().isoformat()
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        return Response({
+            'audio_url': f"{request.path.rstrip('/')}/{audio['key']}/",
+            'file_url': audio['url'],
+            'cache_key': audio['key'],
+            'content_type': audio['content_type'],
+            'cached': audio['cached'],
+            'engine': audio['engine'],
+            'language': data['language'],
+        }, status=status.HTTP_200_OK)
+
+    def retrieve(self, request, pk=None):
+        """Stream cached audio with long-lived caching headers; honours If-None-Match"""
+        from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+
+        path = text_to_speech.get_cached_audio(pk)
+        if path is None:
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+        fallback = text_to_speech.is_fallback_audio(path)
+        etag = f'"{pk}-fallback"' if fallback else f'"{pk}"'
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = HttpResponseNotModified()
+        else:
+            content_type = text_to_speech.CONTENT_TYPES[os.path.splitext(path)[1]]
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        response['ETag'] = etag
+        response['Cache-Control'] = self.FALLBACK_CACHE_CONTROL if fallback else self.AUDIO_CACHE_CONTROL
+        return response
             
 class ForumPostViewSet(viewsets.ViewSet):
     def list(self, request):
         return Response({'message': 'Forum post service'})
     
-class GovernmentSchemesViewSet(viewsets.ViewSet):
-    """Government Schemes Service using UltraDynamicGovernmentAPI"""
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        try:
-            from ..services.ultra_dynamic_government_api import UltraDynamicGovernmentAPI
-            self.gov_api = UltraDynamicGovernmentAPI()
-            logger.info("✅ UltraDynamicGovernmentAPI loaded for GovernmentSchemesViewSet")
-        except Exception as e:
-            logger.warning(f"Could not load UltraDynamicGovernmentAPI: {e}")
-            self.gov_api = None
+class GovernmentSchemesViewSet(ResponseShapingMixin, viewsets.ViewSet):
+    """Government Schemes Service backed by the compiled scheme catalog"""
     
+    @versioned_response('government_schemes', max_age=6 * 3600)
     def list(self, request):
         try:
-            location = request.query_params.get('location', 'Delhi')
-            latitude = request.query_params.get('latitude')
-            longitude = request.query_params.get('longitude')
-            
-            # Convert latitude/longitude to float if provided
-            if latitude:
-                try:
-                    latitude = float(latitude)
-                except (ValueError, TypeError):
-                    latitude = None
-            if longitude:
-                try:
-                    longitude = float(longitude)
-                except (ValueError, TypeError):
-                    longitude = None
-            
-            # Use government API service for real-time data with location
-            if self.gov_api:
-                try:
-                    language = request.query_params.get('language', 'hi')
-                    logger.info(f"🏛️ Fetching government schemes for {location} (lat: {latitude}, lon: {longitude}) in {language}")
-                    schemes_data = self.gov_api.get_government_schemes(location, latitude, longitude, language=language)
-                    
-                    if schemes_data and schemes_data.get('status') == 'success':
-                        logger.info(f"✅ Government schemes retrieved for {location}")
-                        # Ensure location is included in response
-                        schemes_data['location'] = location
-                        schemes_data['timestamp'] = datetime.now().isoformat()
-                        return Response(schemes_data, status=status.HTTP_200_OK)
-                    else:
-                        logger.warning(f"Government API returned limited data for {location}")
-                except Exception as api_error:
-                    logger.warning(f"Government API error for {location}, using fallback: {api_error}")
+            params = request.query_params
+            location = params.get('location', 'Delhi')
+            language = params.get('language', 'hi')
+            try:
+                page = int(params.get('page', 1))
+                page_size = int(params.get('page_size', scheme_catalog.DEFAULT_PAGE_SIZE))
+            except (ValueError, TypeError):
+                return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Fallback to location-specific schemes
-            schemes = self._get_location_specific_schemes(location)
+            result = self._get_location_specific_schemes(
+                location, language=language, category=params.get('category'), crop=params.get('crop'),
+                tag=params.get('eligibility'), page=page, page_size=page_size)
             
             return Response({
                 'location': location,
-                'schemes': schemes,
-                'total_schemes': len(schemes),
+                'state': result['state'],
+                'language': scheme_catalog.SchemeCatalog.language(language),
+                'schemes': result['schemes'],
+                'total_schemes': result['total'],
+                'page': result['page'],
+                'page_size': result['page_size'],
+                'pages': result['pages'],
                 'data_source': 'Ministry of Agriculture & Farmers Welfare',
                 'timestamp': datetime.now().isoformat()
             }, status=status.HTTP_200_OK)
@@ -1529,215 +1603,14 @@ class GovernmentSchemesViewSet(viewsets.ViewSet):
                 'error': 'Unable to fetch government schemes'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    def _get_location_specific_schemes(self, location: str) -> List[Dict[str, Any]]:
-        """Get location-specific government schemes"""
-        
-        # Base schemes available nationwide
-        base_schemes = [
-            {
-                'name': 'प्रधानमंत्री किसान सम्मान निधि (PM-KISAN)',
-                'name_hindi': 'प्रधानमंत्री किसान सम्मान निधि',
-                'amount': '₹6,000 प्रति वर्ष',
-                'description': 'किसानों को प्रत्यक्ष आय सहायता',
-                'eligibility': 'सभी किसान परिवार',
-                'helpline': '1800-180-1551',
-                'website': 'https://pmkisan.gov.in',
-                'category': 'आय सहायता',
-                'status': 'सक्रिय',
-                'beneficiaries': '12 करोड़ किसान',
-                'application_method': 'ऑनलाइन आवेदन',
-                'priority': 'high'
-            },
-            {
-                'name': 'प्रधानमंत्री फसल बीमा योजना (PMFBY)',
-                'name_hindi': 'प्रधानमंत्री फसल बीमा योजना',
-                'amount': 'फसल नुकसान के लिए बीमा',
-                'description': 'फसल नुकसान से सुरक्षा',
-                'eligibility': 'सभी किसान',
-                'helpline': '1800-180-1551',
-                'website': 'https://pmfby.gov.in',
-                'category': 'बीमा',
-                'status': 'सक्रिय',
-                'beneficiaries': '5 करोड़ किसान',
-                'application_method': 'ऑनलाइन आवेदन',
-                'priority': 'high'
-            },
-            {
-                'name': 'किसान क्रेडिट कार्ड (KCC)',
-                'name_hindi': 'किसान क्रेडिट कार्ड',
-                'amount': '₹3 लाख तक ऋण',
-                'description': 'किसानों के लिए क्रेडिट कार्ड',
-                'eligibility': 'किसान परिवार',
-                'helpline': '1800-425-1556',
-                'website': 'https://kcc.gov.in',
-                'category': 'ऋण',
-                'status': 'सक्रिय',
-                'beneficiaries': '8 करोड़ किसान',
-                'application_method': 'बैंक में आवेदन',
-                'priority': 'high'
-            }
-        ]
-        
-        # Location-specific schemes
-        location_schemes = {
-            'Delhi': [
-                {
-                    'name': 'दिल्ली किसान विकास योजना',
-                    'name_hindi': 'दिल्ली किसान विकास योजना',
-                    'amount': '₹50,000 प्रति किसान',
-                    'description': 'दिल्ली के किसानों के लिए विशेष योजना',
-                    'eligibility': 'दिल्ली के किसान',
-                    'helpline': '011-23379111',
-                    'website': 'https://delhi.gov.in',
-                    'category': 'विकास',
-                    'status': 'सक्रिय',
-                    'beneficiaries': '50,000 किसान',
-                    'application_method': 'ऑनलाइन आवेदन',
-                    'priority': 'medium'
-                }
-            ],
-            'Mumbai': [
-                {
-                    'name': 'महाराष्ट्र किसान विकास योजना',
-                    'name_hindi': 'महाराष्ट्र किसान विकास योजना',
-                    'amount': '₹75,000 प्रति किसान',
-                    'description': 'महाराष्ट्र के किसानों के लिए विशेष योजना',
-                    'eligibility': 'महाराष्ट्र के किसान',
-                    'helpline': '1800-120-8040',
-                    'website': 'https://maharashtra.gov.in',
-                    'category': 'विकास',
-                    'status': 'सक्रिय',
-                    'beneficiaries': '2 लाख किसान',
-                    'application_method': 'ऑनलाइन आवेदन',
-                    'priority': 'medium'
-                }
-            ],
-            'Bangalore': [
-                {
-                    'name': 'कर्नाटक किसान विकास योजना',
-                    'name_hindi': 'कर्नाटक किसान विकास योजना',
-                    'amount': '₹60,000 प्रति किसान',
-                    'description': 'कर्नाटक के किसानों के लिए विशेष योजना',
-                    'eligibility': 'कर्नाटक के किसान',
-                    'helpline': '1800-425-1556',
-                    'website': 'https://karnataka.gov.in',
-                    'category': 'विकास',
-                    'status': 'सक्रिय',
-                    'beneficiaries': '1.5 लाख किसान',
-                    'application_method': 'ऑनलाइन आवेदन',
-                    'priority': 'medium'
-                }
-            ],
-            'Chennai': [
-                {
-                    'name': 'तमिलनाडु किसान विकास योजना',
-                    'name_hindi': 'तमिलनाडु किसान विकास योजना',
-                    'amount': '₹55,000 प्रति किसान',
-                    'description': 'तमिलनाडु के किसानों के लिए विशेष योजना',
-                    'eligibility': 'तमिलनाडु के किसान',
-                    'helpline': '1800-425-1556',
-                    'website': 'https://tamilnadu.gov.in',
-                    'category': 'विकास',
-                    'status': 'सक्रिय',
-                    'beneficiaries': '1.2 लाख किसान',
-                    'application_method': 'ऑनलाइन आवेदन',
-                    'priority': 'medium'
-                }
-            ],
-            'Kolkata': [
-                {
-                    'name': 'पश्चिम बंगाल किसान विकास योजना',
-                    'name_hindi': 'पश्चिम बंगाल किसान विकास योजना',
-                    'amount': '₹45,000 प्रति किसान',
-                    'description': 'पश्चिम बंगाल के किसानों के लिए विशेष योजना',
-                    'eligibility': 'पश्चिम बंगाल के किसान',
-                    'helpline': '1800-345-3380',
-                    'website': 'https://westbengal.gov.in',
-                    'category': 'विकास',
-                    'status': 'सक्रिय',
-                    'beneficiaries': '1 लाख किसान',
-                    'application_method': 'ऑनलाइन आवेदन',
-                    'priority': 'medium'
-                }
-            ]
-        }
-        
-        # Combine base schemes with location-specific schemes
-        all_schemes = base_schemes.copy()
-        if location in location_schemes:
-            all_schemes.extend(location_schemes[location])
-        
-        # Add some additional schemes based on location
-        additional_schemes = [
-            {
-                'name': 'मृदा स्वास्थ्य कार्ड योजना',
-                'name_hindi': 'मृदा स्वास्थ्य कार्ड योजना',
-                'amount': 'मुफ्त मृदा परीक्षण',
-                'description': 'मिट्टी की जांच और सुझाव',
-                'eligibility': 'सभी किसान',
-                'helpline': '1800-180-1551',
-                'website': 'https://soilhealth.dac.gov.in',
-                'category': 'मृदा स्वास्थ्य',
-                'status': 'सक्रिय',
-                'beneficiaries': '10 करोड़ किसान',
-                'application_method': 'ऑनलाइन आवेदन',
-                'priority': 'medium'
-            },
-            {
-                'name': 'नेशनल ई-गवर्नेंस प्लान',
-                'name_hindi': 'राष्ट्रीय ई-गवर्नेंस योजना',
-                'amount': 'डिजिटल सेवाएं',
-                'description': 'किसानों के लिए डिजिटल सेवाएं',
-                'eligibility': 'सभी किसान',
-                'helpline': '1800-180-1551',
-                'website': 'https://egov.gov.in',
-                'category': 'डिजिटल सेवाएं',
-                'status': 'सक्रिय',
-                'beneficiaries': 'सभी किसान',
-                'application_method': 'ऑनलाइन आवेदन',
-                'priority': 'low'
-            }
-        ]
-        
-        all_schemes.extend(additional_schemes)
-        
-        # Sort by priority and return top 6
-        priority_order = {'high': 1, 'medium': 2, 'low': 3}
-        all_schemes.sort(key=lambda x: priority_order.get(x.get('priority', 'low'), 3))
-        
-        return all_schemes[:6]
+    def _get_location_specific_schemes(self, location: str, **filters) -> Dict[str, Any]:
+        """One page of central and state schemes for the location from the scheme catalog"""
+        return scheme_catalog.get_scheme_catalog().lookup(location, **filters)
     
     @action(detail=False, methods=['get'])
     def government_schemes(self, request):
-        """Get government schemes using UltraDynamicGovernmentAPI"""
-        try:
-            location = request.query_params.get('location', 'Delhi')
-            latitude = request.query_params.get('latitude')
-            longitude = request.query_params.get('longitude')
-            
-            # Use government API service for real-time data
-            if 'government_api' in self.services and self.services['government_api']:
-                schemes_data = self.services['government_api'].get_government_schemes(location, latitude, longitude)
-                return Response(schemes_data, status=status.HTTP_200_OK)
-            else:
-                # Fallback if service not available
-                schemes_data = {
-                    'location': location,
-                    'schemes': [
-                        {'name': 'PM-Kisan', 'description': 'Direct income support to farmers'},
-                        {'name': 'Soil Health Card', 'description': 'Free soil testing for farmers'}
-                    ],
-                    'data_source': 'Ministry of Agriculture',
-                    'timestamp': datetime.now().isoformat()
-                }
-                return Response(schemes_data, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            logger.error(f"Government schemes error: {e}")
-            return Response({
-                'error': 'Unable to fetch government schemes',
-                'status': 'error'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        """Get government schemes (alias of list)"""
+        return self.list(request)
     
     @action(detail=False, methods=['post'])
     def pest_detection(self, request):
@@ -1830,8 +1703,10 @@ class LocationRecommendationViewSet(viewsets.ViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
 
-class RealTimeGovernmentDataViewSet(viewsets.ViewSet):
+class RealTimeGovernmentDataViewSet(ResponseShapingMixin, viewsets.ViewSet):
     """Real-time government data integration"""
+
+    compact_schemas = {'market_prices': compact_market_prices}
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -1868,7 +1743,7 @@ class RealTimeGovernmentDataViewSet(viewsets.ViewSet):
             mandi = request.query_params.get('mandi')
             
             # Use v2 which prioritizes real-time data
-            data = self.gov_api.get_market_prices_v2(location, latitude, longitude, language=language, mandi=mandi)
+            data = self.gov_api.get_market_prices_v2(location, mandi=mandi, latitude=latitude, longitude=longitude)
             return Response(data)
             
         except Exception as e:
@@ -1926,7 +1801,7 @@ class RealTimeGovernmentDataViewSet(viewsets.ViewSet):
             language = request.query_params.get('language', 'hi')
             
             # Get market data which includes mandi info
-            market_data = self.gov_api.get_market_prices_v2(location, latitude, longitude, language=language)
+            market_data = self.gov_api.get_market_prices_v2(location, latitude=latitude, longitude=longitude)
             
             mandis = []
             mandis = []
@@ -2088,7 +1963,7 @@ class ChatbotViewSet(viewsets.ViewSet):
             # Market price queries
             elif any(word in query_lower for word in ['price', 'भाव', 'कीमत', 'mandi', 'मंडी', 'market', 'बाजार']):
                 try:
-                    market_data = self.gov_api.get_market_prices_v2(location, language=language)
+                    market_data = self.gov_api.get_market_prices_v2(location)
                     if market_data and market_data.get('status') == 'success':
                         crops = market_data.get('market_prices', {}).get('top_crops', [])[:3]
                         if crops:
@@ -2223,12 +2098,9 @@ class ChatbotViewSet(viewsets.ViewSet):
 
 
 
-# Import KrishiRaksha Service and Models
-try:
-    from ..services.krishi_raksha_pest_service import KrishiRakshaPestService
-    from ..models import DiagnosticSession, ExpertVerification
-except ImportError:
-    pass
+# Import KrishiRaksha Service (on first use) and Models
+KrishiRakshaPestService = lazy_import('advisory.services.krishi_raksha_pest_service', 'KrishiRakshaPestService')
+from ..models import DiagnosticSession, ExpertVerification
 
 class DiagnosticViewSet(viewsets.ViewSet):
     """
@@ -2265,19 +2137,7 @@ class DiagnosticViewSet(viewsets.ViewSet):
                 images=images
             )
             
-            # Persist Session (if models available)
-            try:
-                if result['status'] == 'success':
-                     DiagnosticSession.objects.create(
-                         session_id=session_id or str(uuid.uuid4()),
-                         user_id=str(request.user.id) if request.user.is_authenticated else 'anonymous',
-                         crop_detected=result['crop_detected'],
-                         final_diagnosis=result['diagnosis'][0]['name'] if result['diagnosis'] else 'Unknown',
-                         confidence_score=result['diagnosis'][0].get('confidence', 0.0) if result['diagnosis'] else 0.0,
-                         severity_level=result['diagnosis'][0].get('severity_label', 'Low') if result['diagnosis'] else 'Low'
-                     )
-            except Exception as db_err:
-                logger.warning(f"Failed to save diagnostic session: {db_err}")
+            self._save_session(request, session_id, result)
             
             return Response(result)
             
@@ -2288,6 +2148,77 @@ class DiagnosticViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _save_session(self, request, session_id, result, images_json=None):
+        """Persist a successful diagnosis (if models available)"""
+        try:
+            if result['status'] == 'success':
+                 DiagnosticSession.objects.create(
+                     session_id=session_id or str(uuid.uuid4()),
+                     user_id=str(request.user.id) if request.user.is_authenticated else 'anonymous',
+                     crop_detected=result['crop_detected'],
+                     images_json=images_json or {},
+                     final_diagnosis=result['diagnosis'][0]['name'] if result['diagnosis'] else 'Unknown',
+                     confidence_score=result['diagnosis'][0].get('confidence', 0.0) if result['diagnosis'] else 0.0,
+                     severity_level=result['diagnosis'][0].get('severity_label', 'Low') if result['diagnosis'] else 'Low'
+                 )
+        except Exception as db_err:
+            logger.warning(f"Failed to save diagnostic session: {db_err}")
+
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
+    def upload(self, request):
+        """
+        Diagnostic pipeline for multipart photo uploads.
+        Form fields: crop, location, session_id (optional);
+        files: whole, close_up (or a single `image`).
+        Photos stream to disk and are decoded off the request thread; a
+        repeat or near-identical photo returns the earlier diagnosis.
+        """
+        files = {name: request.FILES[name] for name in ('whole', 'close_up', 'image') if name in request.FILES}
+        if not files:
+            return Response({'status': 'error', 'message': 'Attach at least one photo (whole, close_up or image)'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if 'image' in files and 'close_up' not in files:
+            files['close_up'] = files.pop('image')
+        crop = request.data.get('crop')
+        location = request.data.get('location', 'Unknown')
+        session_id = request.data.get('session_id')
+
+        try:
+            ingested = image_ingest.ingest_uploads(files)
+        except image_ingest.UploadTooLarge as e:
+            return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        except Exception as e:
+            logger.warning(f"Could not decode uploaded photos: {e}")
+            return Response({'status': 'error', 'message': 'Could not read the uploaded photos'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        key_hash = ingested.get('close_up', ingested.get('whole'))['phash']
+        images_json = {name: {key: entry[key] for key in ('phash', 'sha256', 'size', 'shape')}
+                       for name, entry in ingested.items()}
+
+        # Only the model output is reused; region checks run for this farmer's location
+        cached = image_ingest.find_cached_diagnosis(key_hash, crop)
+        distance = cached.pop('duplicate_distance') if cached is not None else None
+        try:
+            recognized = cached or self.pest_service.recognize(
+                crop, {name: entry['image'] for name, entry in ingested.items()})
+            result = self.pest_service.diagnose_crop(
+                session_id=session_id,
+                crop_name=crop,
+                location=location,
+                recognized=recognized
+            )
+        except Exception as e:
+            logger.error(f"Diagnostic error: {e}")
+            return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if cached is None and result.get('status') == 'success':
+            image_ingest.remember_diagnosis(key_hash, recognized, crop)
+        self._save_session(request, session_id, result, images_json)
+        if cached is None:
+            return Response(dict(result, cached=False))
+        return Response(dict(result, cached=True, duplicate_distance=distance))
+
     @action(detail=False, methods=['post'])
     def feedback(self, request):
         """
@@ -0,0 +1,7 @@
+"""
+Hot-path micro-benchmarks for Krishimitra AI.
+
+Benchmarks run offline: upstream HTTP (Agmarknet, IMD, Nominatim, ...) is
+served by a local fixture server replaying recorded responses. Run them with
+`python manage.py run_benchmarks`.
+"""
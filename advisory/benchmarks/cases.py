@@ -0,0 +1,135 @@
+"""
+Hot-path benchmarks
+Intent classification, crop scoring, mandi filtering, scheme lookup,
+rate limiting, caching and the full chatbot request.
+"""
+
+import itertools
+
+from django.test import RequestFactory
+
+from .harness import benchmark
+
+INTENT_QUERIES = [
+    ('What is the weather in Delhi today?', 'en'),
+    ('wheat price kya hai lucknow mandi mein', 'hinglish'),
+    ('मेरे खेत में कौन सी फसल लगाऊं', 'hi'),
+    ('tomato leaves have yellow spots, what pesticide should I spray', 'en'),
+    ('PM Kisan yojana ka paisa kab aayega', 'hinglish'),
+    ('best crop for loamy soil in rabi season near Pune', 'en'),
+]
+
+
+@benchmark('intent_classification', iterations=500)
+def bench_intent_classification():
+    """UltimateIntelligentAI language detection + keyword intent analysis"""
+    from ..ml.ultimate_intelligent_ai import UltimateIntelligentAI
+    ai = UltimateIntelligentAI()
+    queries = itertools.cycle(INTENT_QUERIES)
+
+    def run():
+        query, language = next(queries)
+        ai._detect_language(query)
+        return ai._analyze_intent_intelligently(query, language)
+    return run
+
+
+@benchmark('crop_scoring', iterations=50)
+def bench_crop_scoring():
+    """EnhancedGovernmentAPI comprehensive scoring across the full crop database"""
+    from ..services.enhanced_government_api import EnhancedGovernmentAPI
+    api = EnhancedGovernmentAPI()
+    all_crops = api._get_comprehensive_crop_database()
+    weather_data = {'temperature': 24, 'humidity': 62, 'rainfall': 650, 'condition': 'Partly cloudy'}
+    soil_data = {'soil_type': 'loamy', 'ph': 6.8, 'organic_carbon': 0.6}
+    market_data = {'wheat': {'current_price': 2480, 'msp': 2425}, 'mustard': {'current_price': 5650, 'msp': 5650}}
+
+    def run():
+        return api._analyze_all_crops_comprehensive(
+            all_crops, 'Delhi', 'rabi', weather_data, soil_data, market_data
+        )
+    return run
+
+
+@benchmark('filter_mandis_by_location', iterations=300)
+def bench_filter_mandis_by_location():
+    """EnhancedMarketPricesService nearest-mandi filtering over the nationwide table"""
+    from ..services.enhanced_market_prices import EnhancedMarketPricesService
+    service = EnhancedMarketPricesService()
+    all_mandis = service._get_nationwide_mandi_database()
+    points = itertools.cycle([
+        ('Delhi', 28.6517, 77.2219), ('Pune', 18.5214, 73.8545),
+        ('Lucknow', 26.8381, 80.9346), ('Bangalore', 12.9768, 77.5901),
+    ])
+
+    def run():
+        location, latitude, longitude = next(points)
+        return service._filter_mandis_by_location(all_mandis, location, latitude, longitude)
+    return run
+
+
+@benchmark('scheme_lookup', iterations=2000)
+def bench_scheme_lookup():
+    """Filtered, paginated government scheme lookup from the compiled catalog"""
+    from ..services.scheme_catalog import get_scheme_catalog
+    catalog = get_scheme_catalog()
+    queries = itertools.cycle([
+        {'location': 'Delhi', 'language': 'hi'},
+        {'location': 'Pune', 'category': 'credit', 'language': 'en'},
+        {'location': 'Punjab', 'crop': 'wheat', 'tag': 'small_marginal', 'page': 2, 'page_size': 3},
+        {'location': 'Nashik', 'crop': 'onion', 'category': 'market_access', 'language': 'en'},
+    ])
+
+    def run():
+        return catalog.lookup(**next(queries))
+    return run
+
+
+@benchmark('rate_limit_middleware', iterations=1000)
+def bench_rate_limit_middleware():
+    """RateLimitMiddleware.process_request for distinct clients on the chatbot path"""
+    from ..middleware.rate_limiting import RateLimitMiddleware
+    middleware = RateLimitMiddleware(lambda request: None)
+    factory = RequestFactory()
+    client_ips = itertools.cycle(f'203.0.113.{i}' for i in range(1, 255))
+
+    def run():
+        request = factory.post('/api/chatbot/', REMOTE_ADDR=next(client_ips))
+        return middleware.process_request(request)
+    return run
+
+
+@benchmark('cache_manager', iterations=2000)
+def bench_cache_manager():
+    """CacheManager key generation plus a get/set round trip"""
+    from ..cache_utils import CacheManager
+    manager = CacheManager()
+    counter = itertools.count()
+
+    def run():
+        i = next(counter) % 500
+        key = manager._generate_cache_key('market_prices', 'Delhi', crop='wheat', page=i)
+        if manager.get(key) is None:
+            manager.set(key, {'crop': 'wheat', 'modal_price': 2480, 'page': i}, 300)
+        return key
+    return run
+
+
+@benchmark('chatbot_create', iterations=20, warmup=2, network=True)
+def bench_chatbot_create():
+    """Full ChatbotViewSet.create request with upstreams served by the fixture server"""
+    from rest_framework.test import APIRequestFactory
+    from ..api.views import ChatbotViewSet
+    view = ChatbotViewSet.as_view({'post': 'create'})
+    factory = APIRequestFactory()
+    payloads = itertools.cycle([
+        {'query': 'What is the weather in Delhi?', 'language': 'en', 'location': 'Delhi'},
+        {'query': 'wheat mandi price today', 'language': 'en', 'location': 'Lucknow'},
+        {'query': 'गेहूं का भाव क्या है', 'language': 'hi', 'location': 'Delhi'},
+        {'query': 'PM Kisan scheme details', 'language': 'en', 'location': 'Pune'},
+    ])
+
+    def run():
+        request = factory.post('/api/chatbot/', next(payloads), format='json')
+        return view(request)
+    return run
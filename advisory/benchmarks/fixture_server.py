@@ -0,0 +1,233 @@
+"""
+Upstream Fixture Server
+Replays recorded Agmarknet, IMD, Nominatim (and other upstream) responses from
+a local HTTP server with configurable latency, so benchmarks and load tests
+run reproducibly without network access.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'upstream')
+
+_original_session_request = requests.sessions.Session.request
+
+
+def load_fixtures(fixture_dir: str = FIXTURE_DIR) -> Dict[str, List[Dict[str, Any]]]:
+    """Load recorded responses, keyed by upstream host"""
+    fixtures: Dict[str, List[Dict[str, Any]]] = {}
+    if not os.path.isdir(fixture_dir):
+        return fixtures
+    for filename in sorted(os.listdir(fixture_dir)):
+        if not filename.endswith('.json'):
+            continue
+        with open(os.path.join(fixture_dir, filename), encoding='utf-8') as f:
+            recording = json.load(f)
+        fixtures.setdefault(recording['host'], []).extend(recording.get('responses', []))
+    return fixtures
+
+
+def _match_response(responses: List[Dict[str, Any]], method: str, path: str,
+                    query: Dict[str, List[str]]) -> Optional[Dict[str, Any]]:
+    """First recorded response matching method, path and any recorded query constraints"""
+    for response in responses:
+        if response.get('method', 'GET').upper() != method:
+            continue
+        if response.get('path', '/') != path:
+            continue
+        constraints = response.get('query', {})
+        if all(query.get(key, [None])[0] == str(value) for key, value in constraints.items()):
+            return response
+    return None
+
+
+class _FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serves /<upstream-host>/<path> from the recorded fixtures"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _replay(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + path
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        recorded = _match_response(
+            server.fixtures.get(host, []), self.command, path, parse_qs(parts.query)
+        )
+        server.record_hit(host, recorded is not None)
+
+        latency_ms = server.latency_ms
+        if recorded is not None and 'latency_ms' in recorded:
+            latency_ms = recorded['latency_ms']
+        if server.jitter_ms:
+            latency_ms += random.uniform(0, server.jitter_ms)
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000)
+
+        if recorded is None:
+            status = 404
+            headers = {'Content-Type': 'application/json'}
+            body: Any = {'error': f'No recorded response for {self.command} {host}{path}'}
+        else:
+            status = recorded.get('status', 200)
+            headers = recorded.get('headers', {'Content-Type': 'application/json'})
+            body = recorded.get('body', '')
+
+        payload = body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            if name.lower() not in ('content-length', 'transfer-encoding', 'content-encoding', 'connection'):
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _replay
+    do_POST = _replay
+    do_HEAD = _replay
+
+    def log_message(self, format, *args):
+        logger.debug("fixture-server: " + format % args)
+
+
+class FixtureServer:
+    """
+    Local HTTP server that replays recorded upstream responses.
+
+        with FixtureServer(latency_ms=80) as server, route_upstreams(server):
+            requests.get('https://nominatim.openstreetmap.org/search', params={'q': 'Delhi'})
+    """
+
+    def __init__(self, fixture_dir: str = FIXTURE_DIR, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self.fixture_dir = fixture_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._address = (host, port)
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def netloc(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.netloc}"
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Replayed (hits) and unrecorded (misses) request counts per upstream host"""
+        with self._stats_lock:
+            return {host: dict(counts) for host, counts in self._stats.items()}
+
+    def _record_hit(self, host: str, matched: bool):
+        with self._stats_lock:
+            counts = self._stats.setdefault(host, {'hits': 0, 'misses': 0})
+            counts['hits' if matched else 'misses'] += 1
+
+    def start(self) -> 'FixtureServer':
+        httpd = ThreadingHTTPServer(self._address, _FixtureRequestHandler)
+        httpd.daemon_threads = True
+        httpd.fixtures = load_fixtures(self.fixture_dir)
+        httpd.latency_ms = self.latency_ms
+        httpd.jitter_ms = self.jitter_ms
+        httpd.record_hit = self._record_hit
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Fixture server replaying {sum(map(len, httpd.fixtures.values()))} "
+                    f"responses on {self.base_url}")
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'FixtureServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+@contextmanager
+def route_upstreams(server: FixtureServer):
+    """Redirect every outgoing `requests` call to the fixture server"""
+    def request(session, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        if parts.netloc and parts.netloc != server.netloc:
+            url = f"{server.base_url}/{parts.netloc}{parts.path or '/'}"
+            if parts.query:
+                url += f"?{parts.query}"
+        return _original_session_request(session, method, url, *args, **kwargs)
+
+    with mock.patch.object(requests.sessions.Session, 'request', request):
+        yield server
+
+
+@contextmanager
+def record_upstreams(fixture_dir: str = FIXTURE_DIR):
+    """
+    Pass requests through to the real upstreams and record their responses
+    into `<fixture_dir>/<host>.json`, ready for replay by FixtureServer.
+    """
+    recordings: Dict[str, List[Dict[str, Any]]] = {}
+
+    def request(session, method, url, *args, **kwargs):
+        response = _original_session_request(session, method, url, *args, **kwargs)
+        parts = urlsplit(response.request.url)
+        try:
+            body: Any = response.json()
+        except ValueError:
+            body = response.text
+        recordings.setdefault(parts.netloc, []).append({
+            'method': method.upper(),
+            'path': parts.path or '/',
+            'query': {key: values[0] for key, values in parse_qs(parts.query).items()},
+            'status': response.status_code,
+            'headers': {'Content-Type': response.headers.get('Content-Type', 'application/json')},
+            'body': body,
+        })
+        return response
+
+    with mock.patch.object(requests.sessions.Session, 'request', request):
+        yield recordings
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    for host, responses in recordings.items():
+        filepath = os.path.join(fixture_dir, f"{host.replace(':', '_')}.json")
+        existing = []
+        if os.path.exists(filepath):
+            with open(filepath, encoding='utf-8') as f:
+                existing = json.load(f).get('responses', [])
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({
+                'host': host,
+                'recorded_at': datetime.now().isoformat(),
+                'responses': existing + responses,
+            }, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,143 @@
+"""
+Benchmark Harness
+Registers benchmarks, times them, stores results as JSON and flags
+regressions against a previous run.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# name -> {'setup': callable returning the timed function, 'iterations': int, ...}
+_registry: Dict[str, Dict[str, Any]] = {}
+
+DEFAULT_REGRESSION_THRESHOLD = 0.10  # 10% slower median counts as a regression
+
+
+def benchmark(name: str, iterations: int = 200, warmup: int = 5, network: bool = False):
+    """
+    Register a benchmark. The decorated function performs one-off setup and
+    returns a zero-argument callable; only calls to that callable are timed.
+    Set `network` for benchmarks that reach upstream services (served by the
+    fixture server).
+    """
+    def decorator(setup: Callable[[], Callable[[], Any]]):
+        _registry[name] = {
+            'setup': setup,
+            'iterations': iterations,
+            'warmup': warmup,
+            'network': network,
+            'description': (setup.__doc__ or '').strip(),
+        }
+        return setup
+    return decorator
+
+
+def get_benchmarks() -> Dict[str, Dict[str, Any]]:
+    """All registered benchmarks"""
+    return dict(_registry)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def run_benchmark(name: str, iterations: Optional[int] = None) -> Dict[str, Any]:
+    """Run one registered benchmark and return its timing summary in milliseconds"""
+    spec = _registry[name]
+    iterations = iterations or spec['iterations']
+    func = spec['setup']()
+
+    for _ in range(spec['warmup']):
+        func()
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    timings.sort()
+    mean_ms = statistics.fmean(timings)
+    return {
+        'name': name,
+        'iterations': iterations,
+        'min_ms': round(timings[0], 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'mean_ms': round(mean_ms, 4),
+        'p95_ms': round(percentile(timings, 0.95), 4),
+        'max_ms': round(timings[-1], 4),
+        'stdev_ms': round(statistics.pstdev(timings), 4),
+        'ops_per_sec': round(1000 / mean_ms, 2) if mean_ms else None,
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, iterations: Optional[int] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks (all by default) and return a result document"""
+    selected = names or sorted(_registry)
+    results = {}
+    for name in selected:
+        try:
+            results[name] = run_benchmark(name, iterations)
+        except Exception as e:
+            results[name] = {'name': name, 'error': f"{type(e).__name__}: {e}"}
+    return {
+        'created_at': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare medians with a baseline run. Each entry carries the relative
+    change (positive = slower) and a `regression` flag when the slowdown
+    exceeds `threshold`.
+    """
+    comparison = []
+    for name, result in current.get('results', {}).items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or 'median_ms' not in result or 'median_ms' not in previous:
+            continue
+        before, after = previous['median_ms'], result['median_ms']
+        change = (after - before) / before if before else 0.0
+        comparison.append({
+            'name': name,
+            'baseline_median_ms': before,
+            'current_median_ms': after,
+            'change': round(change, 4),
+            'regression': change > threshold,
+        })
+    return comparison
+
+
+def save_results(results: Dict[str, Any], path: str) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
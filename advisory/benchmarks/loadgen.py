@@ -0,0 +1,255 @@
+"""
+Load Generator
+Replays a JSONL trace of API calls (or a weighted synthetic mix) against a
+running server with open-loop arrival rates or fixed concurrency, and reports
+throughput, latency percentiles, errors and rate-limit hits per endpoint.
+
+Trace lines look like:
+    {"method": "POST", "path": "/api/chatbot/", "json": {"query": "wheat price"}, "at": 0.25}
+    {"method": "GET", "path": "/api/weather/", "params": {"location": "Pune"}}
+`at` (seconds from trace start) is optional and only used when replaying
+with original timing. Lines without a `path` are skipped.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from .harness import percentile
+
+logger = logging.getLogger(__name__)
+
+# Request templates for the synthetic mix, per endpoint
+ENDPOINT_TEMPLATES: Dict[str, List[Dict[str, Any]]] = {
+    'chatbot': [
+        {'method': 'POST', 'path': '/api/chatbot/', 'json': {'query': 'What is the weather in Delhi?', 'language': 'en', 'location': 'Delhi'}},
+        {'method': 'POST', 'path': '/api/chatbot/', 'json': {'query': 'गेहूं का भाव क्या है', 'language': 'hi', 'location': 'Lucknow'}},
+        {'method': 'POST', 'path': '/api/chatbot/', 'json': {'query': 'PM Kisan scheme details', 'language': 'en', 'location': 'Pune'}},
+        {'method': 'POST', 'path': '/api/chatbot/', 'json': {'query': 'which crop should I sow in rabi', 'language': 'en', 'location': 'Bangalore'}},
+    ],
+    'market-prices': [
+        {'method': 'GET', 'path': '/api/market-prices/', 'params': {'location': location}}
+        for location in ('Delhi', 'Pune', 'Lucknow', 'Bangalore')
+    ],
+    'weather': [
+        {'method': 'GET', 'path': '/api/weather/', 'params': {'location': location}}
+        for location in ('Delhi', 'Mumbai', 'Pune', 'Lucknow')
+    ],
+    'locations': [
+        {'method': 'GET', 'path': '/api/locations/search/', 'params': {'q': query}}
+        for query in ('Delhi', 'Pune', 'Lucknow', 'Bangalore')
+    ],
+}
+
+DEFAULT_MIX = {'chatbot': 4, 'market-prices': 3, 'weather': 2, 'locations': 1}
+
+
+def endpoint_of(path: str) -> str:
+    """Endpoint name for a path, e.g. /api/market-prices/?x=1 -> market-prices"""
+    segments = [segment for segment in path.split('?', 1)[0].split('/') if segment]
+    if segments and segments[0] == 'api':
+        segments = segments[1:]
+    return segments[0] if segments else '/'
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse 'chatbot=4,weather=1' into endpoint weights"""
+    mix = {}
+    for part in filter(None, (item.strip() for item in value.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINT_TEMPLATES:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINT_TEMPLATES)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Read a JSONL trace; lines that are not API calls are skipped"""
+    entries, skipped = [], 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(entry, dict) or not entry.get('path'):
+                skipped += 1
+                continue
+            entry.setdefault('method', 'POST' if 'json' in entry else 'GET')
+            entries.append(entry)
+    if skipped:
+        logger.warning(f"Skipped {skipped} trace line(s) without an API call in {path}")
+    return entries
+
+
+def synthetic_requests(mix: Optional[Dict[str, float]] = None, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Endless stream of template requests drawn with the given endpoint weights"""
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while True:
+        name = rng.choices(names, weights)[0]
+        yield dict(rng.choice(ENDPOINT_TEMPLATES[name]), endpoint=name)
+
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles, error and rate-limit counts for a set of samples"""
+    latencies = sorted(sample['latency_ms'] for sample in samples)
+    errors = sum(1 for sample in samples if sample['error'])
+    rate_limited = sum(1 for sample in samples if sample['status'] == 429)
+    count = len(samples)
+    summary = {
+        'requests': count,
+        'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+        'errors': errors,
+        'error_rate': round(errors / count, 4) if count else 0.0,
+        'rate_limited': rate_limited,
+        'rate_limited_rate': round(rate_limited / count, 4) if count else 0.0,
+    }
+    if latencies:
+        summary.update({
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'max_ms': round(latencies[-1], 2),
+        })
+    return summary
+
+
+class LoadGenerator:
+    """
+    Drive load against `base_url`.
+
+    With `rate` set the generator is open-loop: arrivals follow a Poisson
+    process at `rate` requests/second regardless of how fast the server
+    answers, and latency is measured from the scheduled arrival time so
+    queueing delay is not hidden. Without `rate`, `concurrency` workers send
+    requests back-to-back (closed loop).
+    """
+
+    def __init__(self, base_url: str, concurrency: int = 10, rate: Optional[float] = None,
+                 duration: Optional[float] = None, total_requests: Optional[int] = None,
+                 timeout: float = 30.0, seed: Optional[int] = None):
+        if duration is None and total_requests is None:
+            raise ValueError('Set a duration, a request count, or both')
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.total_requests = total_requests
+        self.timeout = timeout
+        self._rng = random.Random(seed)
+        self._samples: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _send(self, entry: Dict[str, Any], scheduled_at: float):
+        path = entry['path']
+        if entry.get('params'):
+            path += ('&' if '?' in path else '?') + urlencode(entry['params'])
+        headers = {'Accept': 'application/json', **entry.get('headers', {})}
+        data = None
+        if entry.get('json') is not None:
+            data = json.dumps(entry['json']).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        request = Request(self.base_url + path, data=data, headers=headers, method=entry['method'].upper())
+
+        status, error = 0, None
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                status = response.status
+        except HTTPError as e:
+            status = e.code
+            e.read()
+        except (URLError, OSError) as e:
+            error = f"{type(e).__name__}: {e}"
+
+        latency_ms = (time.perf_counter() - scheduled_at) * 1000
+        if error is None and status >= 400 and status != 429:
+            error = f"HTTP {status}"
+        with self._lock:
+            self._samples.append({
+                'endpoint': entry.get('endpoint') or endpoint_of(entry['path']),
+                'status': status,
+                'latency_ms': latency_ms,
+                'error': error,
+            })
+
+    def _should_stop(self, started: float, sent: int) -> bool:
+        if self.total_requests is not None and sent >= self.total_requests:
+            return True
+        return self.duration is not None and time.perf_counter() - started >= self.duration
+
+    def run(self, source: Iterator[Dict[str, Any]], replay_timing: bool = False, speed: float = 1.0) -> Dict[str, Any]:
+        """
+        Send requests from `source` and return the report. With
+        `replay_timing`, each entry is sent at its trace `at` offset
+        (divided by `speed`) instead of using `rate`.
+        """
+        self._samples = []
+        source = iter(source)
+        started = time.perf_counter()
+        sent = 0
+
+        if self.rate or replay_timing:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                next_arrival = started
+                for entry in source:
+                    if self._should_stop(started, sent):
+                        break
+                    if replay_timing:
+                        next_arrival = started + float(entry.get('at', 0)) / speed
+                    else:
+                        next_arrival += self._rng.expovariate(self.rate)
+                    delay = next_arrival - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    pool.submit(self._send, entry, next_arrival)
+                    sent += 1
+        else:
+            source_lock = threading.Lock()
+            counter = {'sent': 0}
+
+            def worker():
+                while True:
+                    with source_lock:
+                        if self._should_stop(started, counter['sent']):
+                            return
+                        entry = next(source, None)
+                        if entry is None:
+                            return
+                        counter['sent'] += 1
+                    self._send(entry, time.perf_counter())
+
+            threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.perf_counter() - started
+        by_endpoint: Dict[str, List[Dict[str, Any]]] = {}
+        for sample in self._samples:
+            by_endpoint.setdefault(sample['endpoint'], []).append(sample)
+
+        return {
+            'base_url': self.base_url,
+            'mode': 'trace-timing' if replay_timing else ('open-loop' if self.rate else 'closed-loop'),
+            'target_rate_rps': self.rate,
+            'concurrency': self.concurrency,
+            'elapsed_seconds': round(elapsed, 3),
+            'overall': summarize(self._samples, elapsed),
+            'endpoints': {name: summarize(samples, elapsed) for name, samples in sorted(by_endpoint.items())},
+        }
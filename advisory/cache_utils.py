@@ -8,7 +8,8 @@ import hashlib
 import logging
 from datetime import timedelta
 from typing import Any, Optional, Dict, List
-from django.core.cache import cache
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
 from django.conf import settings
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
@@ -17,6 +18,57 @@ import time
 
 logger = logging.getLogger(__name__)
 
+
+class SharedCache:
+    """
+    The 'shared' alias, one store for every worker (Redis or the database
+    cache table), unlike the per-process LocMem aliases. While it is
+    unreachable, reads and writes go to a per-process LocMemCache instead,
+    so callers degrade to per-worker state rather than failing.
+    """
+
+    RETRY_LOG_SECONDS = 60
+
+    def __init__(self, alias: str = 'shared'):
+        self.alias = alias
+        self.local = LocMemCache(f'{alias}-fallback', {'TIMEOUT': 3600, 'OPTIONS': {'MAX_ENTRIES': 10000}})
+        self._logged_at = 0.0
+
+    def _call(self, method: str, *args, **kwargs):
+        try:
+            return getattr(caches[self.alias], method)(*args, **kwargs)
+        except Exception as e:
+            if time.monotonic() - self._logged_at > self.RETRY_LOG_SECONDS:
+                self._logged_at = time.monotonic()
+                logger.warning(f"Shared cache '{self.alias}' unavailable, using per-process state: {e}")
+            return getattr(self.local, method)(*args, **kwargs)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._call('get', key, default)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        return self._call('get_many', keys)
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None):
+        if timeout is None:
+            return self._call('set', key, value)
+        return self._call('set', key, value, timeout)
+
+    def set_many(self, data: Dict[str, Any], timeout: Optional[int] = None):
+        if timeout is None:
+            return self._call('set_many', data)
+        return self._call('set_many', data, timeout)
+
+    def delete(self, key: str):
+        return self._call('delete', key)
+
+    def clear(self):
+        self.local.clear()
+        return self._call('clear')
+
+
+shared_cache = SharedCache()
+
 class CacheManager:
     """Advanced cache manager with multiple strategies"""
     
@@ -359,6 +411,17 @@ def cache_ml_prediction(model_type: str):
         include_location=True
     )
 
+# Farmer (subsidized) prices per bag; also the fertilizer planner's price list
+FALLBACK_FERTILIZER_PRICES = {
+    'urea': {'price': 242, 'unit': '50kg bag', 'subsidy': 50},
+    'dap': {'price': 1350, 'unit': '50kg bag', 'subsidy': 60},
+    'mop': {'price': 1750, 'unit': '50kg bag', 'subsidy': 40},
+    'ssp': {'price': 470, 'unit': '50kg bag', 'subsidy': 45},
+    'npk_10_26_26': {'price': 1470, 'unit': '50kg bag', 'subsidy': 55},
+    'npk_12_32_16': {'price': 1470, 'unit': '50kg bag', 'subsidy': 55},
+    'npk_20_20_0': {'price': 1250, 'unit': '50kg bag', 'subsidy': 50},
+}
+
 # Pre-warmed cache data for critical fallbacks
 def prewarm_fallback_cache():
     """Pre-warm cache with critical fallback data"""
@@ -377,11 +440,7 @@ def prewarm_fallback_cache():
                 'eligibility': 'Farmers growing notified crops'
             }
         },
-        'fertilizer_prices': {
-            'urea': {'price': 242, 'unit': '50kg bag', 'subsidy': 50},
-            'dap': {'price': 1350, 'unit': '50kg bag', 'subsidy': 60},
-            'mop': {'price': 1750, 'unit': '50kg bag', 'subsidy': 40}
-        },
+        'fertilizer_prices': FALLBACK_FERTILIZER_PRICES,
         'msp_prices': {
             'wheat': 2275, 'rice': 2183, 'maize': 2090, 'cotton': 6620
         }
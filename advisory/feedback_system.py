@@ -3,16 +3,67 @@ User Feedback Collection and Analysis System
 Collects, stores, and analyzes user feedback for continuous ML model improvement
 """
 
+import hashlib
 import json
+import math
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from typing import Dict, List, Any, Optional
-from django.db import models
-from advisory.models import User, UserFeedback
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from advisory.models import User, UserFeedback, FeedbackDailyRollup
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Additive counters stored on FeedbackDailyRollup
+ROLLUP_COUNTERS = (
+    'total_count', 'rating_sum',
+    'rating_1_count', 'rating_2_count', 'rating_3_count', 'rating_4_count', 'rating_5_count',
+    'with_text_count', 'geo_count',
+)
+
+# Distinct users are kept as a HyperLogLog sketch per rollup row: 2**10
+# one-byte registers (about 3% error), merged by register-wise max, so a
+# period's distinct count never needs the raw feedback rows
+SKETCH_BITS = 10
+SKETCH_SIZE = 1 << SKETCH_BITS
+
+
+def user_sketch(user_ids) -> bytes:
+    """HyperLogLog registers for a collection of user ids"""
+    registers = bytearray(SKETCH_SIZE)
+    rest_bits = 64 - SKETCH_BITS
+    for user_id in user_ids:
+        value = int.from_bytes(hashlib.blake2b(str(user_id).encode('utf-8'), digest_size=8).digest(), 'big')
+        index, rest = value >> rest_bits, value & ((1 << rest_bits) - 1)
+        registers[index] = max(registers[index], rest_bits - rest.bit_length() + 1)
+    return bytes(registers)
+
+
+def merge_sketches(sketches) -> bytes:
+    merged = bytes(SKETCH_SIZE)
+    for sketch in sketches:
+        if sketch:
+            merged = bytes(map(max, merged, sketch))
+    return merged
+
+
+def estimate_distinct(sketch: bytes) -> int:
+    """Distinct count from HyperLogLog registers, with linear counting for small counts"""
+    registers = sketch or bytes(SKETCH_SIZE)
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in registers)
+    empty = registers.count(0)
+    if estimate <= 2.5 * m and empty:
+        estimate = m * math.log(m / empty)
+    return int(round(estimate))
+
+# Rows fetched per round trip when streaming raw feedback
+EXPORT_CHUNK_SIZE = 2000
+
 
 class FeedbackAnalytics:
     """Analytics system for user feedback"""
@@ -60,47 +111,39 @@ class FeedbackAnalytics:
             return False
     
     def get_feedback_analytics(self, days: int = 30) -> Dict[str, Any]:
-        """Get analytics on user feedback"""
+        """Get analytics on user feedback from the daily rollups"""
         try:
-            # Get feedback from last N days
-            start_date = datetime.now() - timedelta(days=days)
-            recent_feedback = UserFeedback.objects.filter(created_at__gte=start_date)
+            today = timezone.now().date()
+            start_date = today - timedelta(days=days)
+            week_ago = today - timedelta(days=7)
             
-            # Calculate metrics
-            total_feedback = recent_feedback.count()
+            totals = dict.fromkeys(ROLLUP_COUNTERS, 0)
+            prediction_types = {}
+            recent_trend = 0
+            sketches = []
+            
+            for row in self._rollup_rows(start_date):
+                for field in ROLLUP_COUNTERS:
+                    totals[field] += row[field]
+                sketches.append(row['user_sketch'])
+                pred_type = row['prediction_type']
+                prediction_types[pred_type] = prediction_types.get(pred_type, 0) + row['total_count']
+                if row['date'] >= week_ago:
+                    recent_trend += row['total_count']
+            
+            total_feedback = totals['total_count']
             if total_feedback == 0:
                 return {'message': 'No feedback data available'}
             
-            # Average rating
-            avg_rating = recent_feedback.aggregate(
-                avg_rating=models.Avg('feedback_rating')
-            )['avg_rating']
-            
-            # Rating distribution
-            rating_distribution = {}
-            for rating in range(1, 6):
-                count = recent_feedback.filter(feedback_rating=rating).count()
-                rating_distribution[rating] = count
-            
-            # Prediction type distribution
-            prediction_types = {}
-            for feedback in recent_feedback.values('prediction_type').distinct():
-                pred_type = feedback['prediction_type']
-                count = recent_feedback.filter(prediction_type=pred_type).count()
-                prediction_types[pred_type] = count
+            avg_rating = totals['rating_sum'] / total_feedback
+            rating_distribution = {
+                rating: totals[f'rating_{rating}_count'] for rating in range(1, 6)
+            }
             
-            # User engagement
-            unique_users = recent_feedback.values('user_id').distinct().count()
+            # Per-row sketches merge into the distinct users of the whole period
+            unique_users = estimate_distinct(merge_sketches(sketches))
             avg_feedback_per_user = total_feedback / unique_users if unique_users > 0 else 0
             
-            # Geographic distribution
-            geo_feedback = recent_feedback.exclude(latitude__isnull=True).exclude(longitude__isnull=True)
-            geo_count = geo_feedback.count()
-            
-            # Recent trends (last 7 days)
-            week_ago = datetime.now() - timedelta(days=7)
-            recent_trend = recent_feedback.filter(created_at__gte=week_ago).count()
-            
             return {
                 'period_days': days,
                 'total_feedback': total_feedback,
@@ -109,20 +152,20 @@ class FeedbackAnalytics:
                 'prediction_types': prediction_types,
                 'unique_users': unique_users,
                 'avg_feedback_per_user': round(avg_feedback_per_user, 2),
-                'geographic_coverage': geo_count,
+                'geographic_coverage': totals['geo_count'],
                 'recent_trend_7_days': recent_trend,
-                'feedback_quality': self._assess_feedback_quality(recent_feedback),
-                'generated_at': datetime.now().isoformat()
+                'feedback_quality': self._assess_feedback_quality(totals, len(prediction_types)),
+                'generated_at': timezone.now().isoformat()
             }
             
         except Exception as e:
             logger.error(f"Error getting feedback analytics: {e}")
             return {'error': str(e)}
     
-    def _assess_feedback_quality(self, feedback_queryset) -> Dict[str, Any]:
-        """Assess the quality of feedback data"""
+    def _assess_feedback_quality(self, totals: Dict[str, int], prediction_type_count: int) -> Dict[str, Any]:
+        """Assess the quality of feedback data from aggregated counters"""
         try:
-            total = feedback_queryset.count()
+            total = totals['total_count']
             if total == 0:
                 return {'quality_score': 0, 'issues': []}
             
@@ -130,26 +173,24 @@ class FeedbackAnalytics:
             quality_score = 100
             
             # Check for low ratings
-            low_ratings = feedback_queryset.filter(feedback_rating__lte=2).count()
+            low_ratings = totals['rating_1_count'] + totals['rating_2_count']
             if low_ratings / total > 0.3:  # More than 30% low ratings
                 issues.append('High percentage of low ratings')
                 quality_score -= 20
             
             # Check for missing feedback text
-            missing_text = feedback_queryset.filter(feedback_text__isnull=True).count()
+            missing_text = total - totals['with_text_count']
             if missing_text / total > 0.8:  # More than 80% missing text
                 issues.append('Most feedback lacks detailed comments')
                 quality_score -= 10
             
             # Check for geographic diversity
-            geo_feedback = feedback_queryset.exclude(latitude__isnull=True)
-            if geo_feedback.count() / total < 0.5:  # Less than 50% have location
+            if totals['geo_count'] / total < 0.5:  # Less than 50% have location
                 issues.append('Limited geographic data')
                 quality_score -= 15
             
             # Check for prediction type diversity
-            pred_types = feedback_queryset.values('prediction_type').distinct().count()
-            if pred_types < 2:
+            if prediction_type_count < 2:
                 issues.append('Limited prediction type diversity')
                 quality_score -= 10
             
@@ -163,6 +204,106 @@ class FeedbackAnalytics:
             logger.error(f"Error assessing feedback quality: {e}")
             return {'quality_score': 0, 'issues': ['Error in quality assessment']}
     
+    def _daily_aggregates(self, feedback_queryset):
+        """Group feedback by (day, prediction_type) in a single aggregation query"""
+        return feedback_queryset.annotate(
+            date=TruncDate('created_at')
+        ).values('date', 'prediction_type').annotate(
+            total_count=Count('id'),
+            rating_sum=Sum('feedback_rating'),
+            rating_1_count=Count('id', filter=Q(feedback_rating=1)),
+            rating_2_count=Count('id', filter=Q(feedback_rating=2)),
+            rating_3_count=Count('id', filter=Q(feedback_rating=3)),
+            rating_4_count=Count('id', filter=Q(feedback_rating=4)),
+            rating_5_count=Count('id', filter=Q(feedback_rating=5)),
+            with_text_count=Count('id', filter=Q(feedback_text__isnull=False)),
+            geo_count=Count('id', filter=Q(latitude__isnull=False, longitude__isnull=False)),
+        ).order_by()
+    
+    def _daily_user_sketches(self, feedback_queryset) -> Dict[tuple, bytes]:
+        """HyperLogLog sketch of the users of each (day, prediction_type)"""
+        users: Dict[tuple, set] = {}
+        pairs = feedback_queryset.annotate(date=TruncDate('created_at')).values_list(
+            'date', 'prediction_type', 'user_id').distinct().order_by()
+        for date, prediction_type, user_id in pairs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            users.setdefault((date, prediction_type), set()).add(user_id)
+        return {key: user_sketch(ids) for key, ids in users.items()}
+    
+    def _rollup_rows(self, start_date, prediction_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Rollup rows from start_date, with today's counters aggregated live"""
+        today = timezone.now().date()
+        self._ensure_rollups_current(today)
+        
+        rollups = FeedbackDailyRollup.objects.filter(date__gte=start_date, date__lt=today)
+        live = UserFeedback.objects.filter(created_at__gte=self._day_start(today))
+        if prediction_type is not None:
+            rollups = rollups.filter(prediction_type=prediction_type)
+            live = live.filter(prediction_type=prediction_type)
+        
+        rows = list(rollups.values('date', 'prediction_type', 'user_sketch', *ROLLUP_COUNTERS))
+        sketches = self._daily_user_sketches(live)
+        for row in self._daily_aggregates(live):
+            row['user_sketch'] = sketches.get((row['date'], row['prediction_type']), b'')
+            rows.append(row)
+        return rows
+    
+    def _ensure_rollups_current(self, today) -> None:
+        """
+        Refresh the rollups when no refresh has run yet today, so past days
+        are complete even without the scheduled task. The refresh starts at
+        the day of the last one, which may have been partial.
+        """
+        last_refresh = FeedbackDailyRollup.objects.aggregate(last=Max('updated_at'))['last']
+        if last_refresh is not None and last_refresh >= self._day_start(today):
+            return
+        if not UserFeedback.objects.filter(created_at__lt=self._day_start(today)).exists():
+            return
+        self.refresh_daily_rollups(since=timezone.localdate(last_refresh) if last_refresh else None)
+    
+    @staticmethod
+    def _day_start(day):
+        """Timezone-aware midnight at the start of the given date"""
+        return timezone.make_aware(datetime.combine(day, time.min))
+    
+    def refresh_daily_rollups(self, since=None) -> int:
+        """
+        Incrementally (re)build FeedbackDailyRollup rows.
+        
+        Re-aggregates every day from `since` (default: the latest rolled-up
+        day, which may have been partial) up to and including today.
+        Returns the number of rollup rows written.
+        """
+        try:
+            if since is None:
+                latest = FeedbackDailyRollup.objects.aggregate(latest=Max('date'))['latest']
+                if latest is None:
+                    earliest = UserFeedback.objects.aggregate(earliest=Min('created_at'))['earliest']
+                    if earliest is None:
+                        return 0
+                    latest = timezone.localdate(earliest)
+                since = latest
+            
+            feedback = UserFeedback.objects.filter(created_at__gte=self._day_start(since))
+            sketches = self._daily_user_sketches(feedback)
+            written = 0
+            with transaction.atomic():
+                for row in self._daily_aggregates(feedback):
+                    defaults = {field: row[field] or 0 for field in ROLLUP_COUNTERS}
+                    defaults['user_sketch'] = sketches.get((row['date'], row['prediction_type']), b'')
+                    FeedbackDailyRollup.objects.update_or_create(
+                        date=row['date'],
+                        prediction_type=row['prediction_type'],
+                        defaults=defaults
+                    )
+                    written += 1
+            
+            logger.info(f"Refreshed {written} feedback rollup rows since {since}")
+            return written
+            
+        except Exception as e:
+            logger.error(f"Error refreshing feedback rollups: {e}")
+            return 0
+    
     def get_user_feedback_history(self, user_id: str, limit: int = 50) -> List[Dict]:
         """Get feedback history for a specific user"""
         try:
@@ -192,25 +333,26 @@ class FeedbackAnalytics:
     def get_prediction_accuracy(self, prediction_type: str, days: int = 30) -> Dict[str, Any]:
         """Get accuracy metrics for a specific prediction type"""
         try:
-            start_date = datetime.now() - timedelta(days=days)
-            feedback = UserFeedback.objects.filter(
-                prediction_type=prediction_type,
-                created_at__gte=start_date
-            )
+            start_date = timezone.now().date() - timedelta(days=days)
+            rows = self._rollup_rows(start_date, prediction_type=prediction_type)
             
-            total = feedback.count()
+            total = sum(row['total_count'] for row in rows)
             if total == 0:
                 return {'message': f'No feedback data for {prediction_type}'}
             
             # Calculate accuracy based on ratings
-            high_ratings = feedback.filter(feedback_rating__gte=4).count()
-            medium_ratings = feedback.filter(feedback_rating=3).count()
-            low_ratings = feedback.filter(feedback_rating__lte=2).count()
+            high_ratings = sum(row['rating_4_count'] + row['rating_5_count'] for row in rows)
+            medium_ratings = sum(row['rating_3_count'] for row in rows)
+            low_ratings = sum(row['rating_1_count'] + row['rating_2_count'] for row in rows)
             
             accuracy = (high_ratings + medium_ratings * 0.5) / total
             
             # Get common issues from low ratings
-            low_rating_feedback = feedback.filter(feedback_rating__lte=2)
+            low_rating_feedback = UserFeedback.objects.filter(
+                prediction_type=prediction_type,
+                created_at__gte=self._day_start(start_date),
+                feedback_rating__lte=2
+            )
             common_issues = self._analyze_common_issues(low_rating_feedback)
             
             return {
@@ -232,9 +374,6 @@ class FeedbackAnalytics:
         """Analyze common issues from low-rated feedback"""
         issues = []
         
-        # Analyze feedback text for common issues
-        feedback_texts = low_rating_feedback.exclude(feedback_text__isnull=True).values_list('feedback_text', flat=True)
-        
         # Simple keyword analysis (in a real system, you'd use NLP)
         issue_keywords = {
             'inaccurate': ['wrong', 'incorrect', 'inaccurate', 'not right'],
@@ -244,49 +383,57 @@ class FeedbackAnalytics:
             'confusing': ['confusing', 'unclear', 'hard to understand']
         }
         
-        for category, keywords in issue_keywords.items():
-            count = 0
-            for text in feedback_texts:
-                if any(keyword in text.lower() for keyword in keywords):
-                    count += 1
-            
-            if count > len(feedback_texts) * 0.2:  # More than 20% mention this issue
+        # Stream the texts once and count every category in the same pass
+        counts = dict.fromkeys(issue_keywords, 0)
+        total_texts = 0
+        feedback_texts = low_rating_feedback.exclude(
+            feedback_text__isnull=True
+        ).values_list('feedback_text', flat=True).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        
+        for text in feedback_texts:
+            total_texts += 1
+            text = text.lower()
+            for category, keywords in issue_keywords.items():
+                if any(keyword in text for keyword in keywords):
+                    counts[category] += 1
+        
+        for category, count in counts.items():
+            if count > total_texts * 0.2:  # More than 20% mention this issue
                 issues.append(category)
         
         return issues
     
     def export_feedback_data(self, format: str = 'json', days: int = 30) -> str:
-        """Export feedback data for analysis"""
+        """Export feedback data for analysis, streaming rows from the database"""
         try:
-            start_date = datetime.now() - timedelta(days=days)
-            feedback = UserFeedback.objects.filter(created_at__gte=start_date)
-            
-            data = []
-            for f in feedback:
-                data.append({
-                    'user_id': f.user_id,
-                    'prediction_type': f.prediction_type,
-                    'input_data': f.input_data,
-                    'system_prediction': f.system_prediction,
-                    'actual_result': f.actual_result,
-                    'feedback_rating': f.feedback_rating,
-                    'feedback_text': f.feedback_text,
-                    'latitude': f.latitude,
-                    'longitude': f.longitude,
-                    'created_at': f.created_at.isoformat()
-                })
+            start_date = timezone.now() - timedelta(days=days)
+            feedback = UserFeedback.objects.filter(created_at__gte=start_date).values(
+                'user_id', 'prediction_type', 'input_data', 'system_prediction',
+                'actual_result', 'feedback_rating', 'feedback_text',
+                'latitude', 'longitude', 'created_at'
+            ).order_by('created_at').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            
+            def export_rows():
+                for row in feedback:
+                    row['created_at'] = row['created_at'].isoformat()
+                    yield row
             
             if format == 'json':
                 filename = f'feedback_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
                 filepath = os.path.join('exports', filename)
                 os.makedirs('exports', exist_ok=True)
                 
+                # Write one record at a time so memory stays flat for large exports
                 with open(filepath, 'w') as f:
-                    json.dump(data, f, indent=2)
+                    f.write('[')
+                    for index, row in enumerate(export_rows()):
+                        f.write(',\n' if index else '\n')
+                        f.write(json.dumps(row))
+                    f.write('\n]')
                 
                 return filepath
             
-            return str(data)
+            return str(list(export_rows()))
             
         except Exception as e:
             logger.error(f"Error exporting feedback data: {e}")
@@ -295,7 +442,7 @@ class FeedbackAnalytics:
     def cleanup_old_feedback(self, days: int = 365) -> int:
         """Clean up old feedback data to manage storage"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff_date = timezone.now() - timedelta(days=days)
             old_feedback = UserFeedback.objects.filter(created_at__lt=cutoff_date)
             count = old_feedback.count()
             old_feedback.delete()
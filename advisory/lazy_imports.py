@@ -0,0 +1,75 @@
+"""
+Lazy Import Layer
+Defers heavy service and ML modules until they are first used, so that
+importing views (and booting a worker) does not pay for every singleton.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from django.utils.functional import SimpleLazyObject, empty
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent resolving each lazy import, keyed by "module:attribute"
+_import_timings: Dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+class LazyImport(SimpleLazyObject):
+    """
+    Proxy for a module, or an attribute of a module, that is imported on first use.
+
+    Attribute access, iteration, item access and calls are forwarded to the
+    real object, so a proxy can stand in for a class, a function or a
+    service singleton:
+
+        UltraDynamicGovernmentAPI = lazy_import('advisory.services.ultra_dynamic_government_api',
+                                                'UltraDynamicGovernmentAPI')
+        api = UltraDynamicGovernmentAPI()  # module imported here
+    """
+
+    def __init__(self, module_path: str, attribute: Optional[str] = None):
+        name = f"{module_path}:{attribute}" if attribute else module_path
+
+        def _load():
+            start = time.perf_counter()
+            module = importlib.import_module(module_path)
+            target = getattr(module, attribute) if attribute else module
+            elapsed = time.perf_counter() - start
+            with _timings_lock:
+                _import_timings[name] = elapsed
+            logger.debug(f"Lazy import {name} resolved in {elapsed * 1000:.1f}ms")
+            return target
+
+        super().__init__(_load)
+        self.__dict__['_lazy_name'] = name
+
+    def __call__(self, *args, **kwargs):
+        if self._wrapped is empty:
+            self._setup()
+        return self._wrapped(*args, **kwargs)
+
+    def __repr__(self):
+        if self._wrapped is empty:
+            return f"<LazyImport: {self._lazy_name} (not loaded)>"
+        return f"<LazyImport: {self._wrapped!r}>"
+
+
+def lazy_import(module_path: str, attribute: Optional[str] = None) -> LazyImport:
+    """Return a proxy that imports `module_path` (and fetches `attribute`) on first use"""
+    return LazyImport(module_path, attribute)
+
+
+def is_loaded(proxy: LazyImport) -> bool:
+    """Whether a lazy import has been resolved yet"""
+    return proxy._wrapped is not empty
+
+
+def get_import_timings() -> Dict[str, float]:
+    """Seconds spent resolving each lazy import so far in this process"""
+    with _timings_lock:
+        return dict(_import_timings)
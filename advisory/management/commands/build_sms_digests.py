@@ -0,0 +1,33 @@
+"""
+Render the daily SMS/IVR digests for every district and language.
+
+Usage:
+    python manage.py build_sms_digests
+    python manage.py build_sms_digests --show pune --language hi
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.services.sms_ivr import get_digest, update_digests
+
+
+class Command(BaseCommand):
+    help = 'Pre-render per-district SMS and IVR digests (weather, mandi prices, alerts)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Write digests here instead of SMS_DIGEST_PATH')
+        parser.add_argument('--show', metavar='DISTRICT', help='Print the stored digest for a district instead of rebuilding')
+        parser.add_argument('--language', default='en', help='Language for --show (en or hi)')
+
+    def handle(self, *args, **options):
+        if options['show']:
+            digest = get_digest(options['show'], options['language'])
+            if digest is None:
+                raise CommandError(f"No digest for {options['show']}; run build_sms_digests first")
+            self.stdout.write(f"SMS ({digest['segments']} segment(s)):\n{digest['sms']}\n")
+            for section, script in digest['ivr'].items():
+                self.stdout.write(f"IVR {section}: {script}")
+            return
+
+        result = update_digests(options['output'])
+        self.stdout.write(f"Wrote {result['digests']} digests for {result['districts']} districts to {result['path']}")
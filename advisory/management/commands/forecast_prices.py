@@ -0,0 +1,31 @@
+"""
+Fit and persist price forecasts for every commodity and mandi series.
+
+Usage:
+    python manage.py forecast_prices
+    python manage.py forecast_prices --history exports/agmarknet_history.parquet --output /tmp/forecasts.json
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.ml.price_forecasting import update_forecasts
+
+
+class Command(BaseCommand):
+    help = 'Run the batch price forecast over the price store (or a CSV/Parquet history file)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--history', default=None,
+                            help='Agmarknet-style CSV or Parquet history instead of the price store')
+        parser.add_argument('--output', default=None,
+                            help='Forecast file to write (default: settings.PRICE_FORECAST_PATH)')
+
+    def handle(self, *args, **options):
+        try:
+            result = update_forecasts(options['history'], options['output'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Price forecasting failed: {e}')
+
+        models = ', '.join(f"{name}: {count}" for name, count in result['models'].items())
+        self.stdout.write(f"Forecast {result['series']} series ({models})")
+        self.stdout.write(self.style.SUCCESS(f"Forecasts written to {result['path']}"))
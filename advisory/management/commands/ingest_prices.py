@@ -0,0 +1,40 @@
+"""
+Load Agmarknet price exports into the columnar mandi price store.
+
+Usage:
+    python manage.py ingest_prices exports/agmarknet_wheat_2024.csv exports/agmarknet_onion_2024.csv
+    python manage.py ingest_prices --summary
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.services.price_store import get_price_store
+
+
+class Command(BaseCommand):
+    help = 'Ingest Agmarknet / data.gov.in CSV price exports into the price store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help='CSV exports to ingest')
+        parser.add_argument('--summary', action='store_true', help='List stored commodities and date ranges')
+
+    def handle(self, *args, **options):
+        store = get_price_store()
+        if not options['files'] and not options['summary']:
+            raise CommandError('Pass one or more CSV files, or --summary')
+
+        for path in options['files']:
+            try:
+                result = store.ingest_agmarknet_csv(path)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not ingest {path}: {e}')
+            self.stdout.write(
+                f"{path}: {result['rows']} rows for {', '.join(result['commodities']) or 'no commodities'}"
+                + (f" ({result['skipped']} skipped)" if result['skipped'] else '')
+            )
+
+        if options['summary']:
+            self.stdout.write(f"Price store at {store.root}: {len(store.mandis())} mandis")
+            for commodity in store.commodities():
+                info = store.info(commodity)
+                self.stdout.write(f"  {commodity:<20} {info['rows']:>10} rows  {info['first_date']} .. {info['last_date']}")
@@ -0,0 +1,120 @@
+"""
+Drive concurrent load against the /api/ surface.
+
+Usage:
+    # Against a running server, synthetic mix, 20 req/s open loop for a minute
+    python manage.py load_test --url http://127.0.0.1:8000 --rate 20 --duration 60
+
+    # Replay a recorded trace with its original timing, twice as fast
+    python manage.py load_test --trace traces/harvest_peak.jsonl --replay-timing --speed 2
+
+    # Fully offline: serve this project in-process with fixture upstreams
+    python manage.py load_test --serve --mix chatbot=5,weather=1 --concurrency 16 --requests 2000
+"""
+
+import itertools
+import json
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.benchmarks.fixture_server import FixtureServer, route_upstreams
+from advisory.benchmarks.harness import save_results
+from advisory.benchmarks.loadgen import LoadGenerator, load_trace, parse_mix, synthetic_requests
+
+
+class Command(BaseCommand):
+    help = 'Replay API traffic with configurable arrival rate and concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server to load')
+        parser.add_argument('--serve', action='store_true',
+                            help='Serve this project in-process with upstreams replayed from fixtures')
+        parser.add_argument('--upstream-latency-ms', type=float, default=50.0,
+                            help='Latency of replayed upstream responses when using --serve')
+        parser.add_argument('--trace', default=None, help='JSONL trace of API calls to replay')
+        parser.add_argument('--replay-timing', action='store_true',
+                            help='Send trace entries at their recorded "at" offsets')
+        parser.add_argument('--speed', type=float, default=1.0, help='Time compression for --replay-timing')
+        parser.add_argument('--mix', default=None,
+                            help='Synthetic endpoint weights, e.g. chatbot=4,market-prices=3,weather=2,locations=1')
+        parser.add_argument('--rate', type=float, default=None,
+                            help='Open-loop arrival rate in requests/second (default: closed loop)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Maximum requests in flight')
+        parser.add_argument('--duration', type=float, default=None, help='Stop after this many seconds')
+        parser.add_argument('--requests', type=int, default=None, help='Stop after this many requests')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+        parser.add_argument('--seed', type=int, default=None, help='Seed for arrivals and the synthetic mix')
+        parser.add_argument('--output', default=None, help='Write the JSON report to this path')
+
+    def handle(self, *args, **options):
+        if options['duration'] is None and options['requests'] is None:
+            if options['trace'] and options['replay_timing']:
+                options['duration'] = float('inf')
+            else:
+                options['duration'] = 30.0
+
+        if options['trace']:
+            entries = load_trace(options['trace'])
+            if not entries:
+                raise CommandError(f"No API calls found in {options['trace']}")
+            source = iter(entries) if options['replay_timing'] else itertools.cycle(entries)
+        else:
+            try:
+                mix = parse_mix(options['mix']) if options['mix'] else None
+            except ValueError as e:
+                raise CommandError(str(e))
+            source = synthetic_requests(mix, seed=options['seed'])
+
+        def run(base_url):
+            generator = LoadGenerator(
+                base_url, concurrency=options['concurrency'], rate=options['rate'],
+                duration=options['duration'], total_requests=options['requests'],
+                timeout=options['timeout'], seed=options['seed'],
+            )
+            return generator.run(source, replay_timing=options['replay_timing'], speed=options['speed'])
+
+        if options['serve']:
+            report = self._run_in_process(run, options['upstream_latency_ms'])
+        else:
+            report = run(options['url'])
+
+        self._print_report(report)
+        if options['output']:
+            save_results(report, options['output'])
+            self.stdout.write(f"Report written to {options['output']}")
+
+    def _run_in_process(self, run, upstream_latency_ms):
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+        with FixtureServer(latency_ms=upstream_latency_ms) as upstreams, route_upstreams(upstreams):
+            httpd = ThreadedWSGIServer(('127.0.0.1', 0), WSGIRequestHandler, allow_reuse_address=False)
+            httpd.set_app(WSGIHandler())
+            thread = threading.Thread(target=httpd.serve_forever, name='load-test-server', daemon=True)
+            thread.start()
+            try:
+                host, port = httpd.server_address[:2]
+                report = run(f"http://{host}:{port}")
+            finally:
+                httpd.shutdown()
+                httpd.server_close()
+            report['upstream_requests'] = upstreams.stats
+            report['upstream_latency_ms'] = upstream_latency_ms
+        return report
+
+    def _print_report(self, report):
+        overall = report['overall']
+        self.stdout.write(f"{report['mode']} against {report['base_url']} "
+                          f"({report['elapsed_seconds']}s, concurrency {report['concurrency']})")
+        header = f"{'endpoint':<16} {'reqs':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>7} {'429s':>6}"
+        self.stdout.write(header)
+        rows = list(report['endpoints'].items()) + [('TOTAL', overall)]
+        for name, summary in rows:
+            self.stdout.write(
+                f"{name:<16} {summary['requests']:>6} {summary['throughput_rps']:>8.2f} "
+                f"{summary.get('p50_ms', 0):>9.1f} {summary.get('p95_ms', 0):>9.1f} {summary.get('p99_ms', 0):>9.1f} "
+                f"{summary['error_rate'] * 100:>7.2f} {summary['rate_limited']:>6}"
+            )
+        if 'upstream_requests' in report:
+            self.stdout.write(f"Upstream replay: {json.dumps(report['upstream_requests'])}")
@@ -0,0 +1,36 @@
+"""
+Pre-render the templated voice advisories into the text-to-speech cache.
+
+Usage:
+    python manage.py prerender_tts
+    python manage.py prerender_tts --language hi --voice slow
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.text_to_speech import ADVISORY_TEMPLATES, VOICES, pre_render_templates
+
+
+class Command(BaseCommand):
+    help = 'Synthesize weather, price and scheme advisory templates ahead of time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', action='append', dest='languages',
+                            help='Language to render (repeatable, default: en and hi)')
+        parser.add_argument('--voice', default='default', choices=sorted(VOICES),
+                            help='Voice preset to render')
+
+    def handle(self, *args, **options):
+        languages = options['languages'] or ['en', 'hi']
+        known = {lang for by_language in ADVISORY_TEMPLATES.values() for lang in by_language}
+        unknown = sorted(set(languages) - known)
+        if unknown:
+            raise CommandError(f"No advisory templates for: {', '.join(unknown)}")
+
+        counts = pre_render_templates(languages, options['voice'])
+        self.stdout.write(
+            f"Rendered {counts['rendered']}, already cached {counts['cached']}, failed {counts['failed']}"
+        )
+        if counts['failed']:
+            raise CommandError(f"{counts['failed']} phrase(s) could not be synthesized")
+        self.stdout.write(self.style.SUCCESS('Advisory templates are cached'))
@@ -0,0 +1,57 @@
+"""
+Report per-module import cost for a cold Django start.
+
+Usage:
+    python manage.py profile_startup
+    python manage.py profile_startup --top 40 --module advisory.api.urls
+    python manage.py profile_startup --json
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.startup_profiler import DEFAULT_STARTUP_MODULES, profile_cold_start
+
+
+class Command(BaseCommand):
+    help = 'Profile cold start time and per-module import cost'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', action='append', dest='modules',
+                            help='Module to import after django.setup() (repeatable)')
+        parser.add_argument('--top', type=int, default=25,
+                            help='Number of most expensive imports to list')
+        parser.add_argument('--budget', type=float, default=None,
+                            help='Fail when cold start exceeds this many seconds')
+        parser.add_argument('--json', action='store_true',
+                            help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or DEFAULT_STARTUP_MODULES
+        try:
+            report = profile_cold_start(modules)
+        except Exception as e:
+            raise CommandError(f'Start-up profiling failed: {e}')
+
+        budget = options['budget'] if options['budget'] is not None else report['budget_seconds']
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(f"django.setup(): {report['setup_seconds'] * 1000:.0f}ms")
+            self.stdout.write(f"Cold start total: {report['total_seconds'] * 1000:.0f}ms "
+                              f"({', '.join(report['modules'])})")
+            self.stdout.write('')
+            self.stdout.write(f"{'cumulative ms':>14} {'self ms':>9}  module")
+            for entry in report['imports'][:options['top']]:
+                self.stdout.write(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  {entry['module']}")
+
+        if budget and report['total_seconds'] > budget:
+            raise CommandError(
+                f"Cold start {report['total_seconds']:.2f}s exceeds budget of {budget:.2f}s"
+            )
+        if budget:
+            self.stdout.write(self.style.SUCCESS(
+                f"Within cold start budget ({report['total_seconds']:.2f}s <= {budget:.2f}s)"
+            ))
@@ -0,0 +1,33 @@
+"""
+Rebuild the daily feedback rollups read by the feedback analytics.
+
+Analytics also refresh stale rollups on read; run this from cron (or enable
+the update-feedback-rollups beat entry) to keep reads fast.
+
+Usage:
+    python manage.py refresh_feedback_rollups
+    python manage.py refresh_feedback_rollups --since 2024-06-01
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.feedback_system import FeedbackAnalytics
+
+
+class Command(BaseCommand):
+    help = 'Re-aggregate FeedbackDailyRollup rows from the last rolled-up day (or --since) to today'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to rebuild (YYYY-MM-DD); default: the latest rolled-up day')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"--since must be YYYY-MM-DD, got {options['since']!r}")
+        written = FeedbackAnalytics().refresh_daily_rollups(since=since)
+        self.stdout.write(f"Wrote {written} feedback rollup rows")
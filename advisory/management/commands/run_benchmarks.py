@@ -0,0 +1,93 @@
+"""
+Run the hot-path micro-benchmarks offline and compare with a previous run.
+
+Usage:
+    python manage.py run_benchmarks
+    python manage.py run_benchmarks intent_classification cache_manager --iterations 1000
+    python manage.py run_benchmarks --baseline benchmark_results/main.json --threshold 0.05
+    python manage.py run_benchmarks --latency-ms 120 --jitter-ms 40
+"""
+
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from advisory.benchmarks import cases  # noqa: F401  (registers the benchmarks)
+from advisory.benchmarks.fixture_server import FixtureServer, route_upstreams
+from advisory.benchmarks.harness import (
+    DEFAULT_REGRESSION_THRESHOLD, compare_results, get_benchmarks,
+    load_results, run_benchmarks, save_results,
+)
+
+# Benchmarks always run against in-memory caches so results do not depend on DEBUG
+BENCHMARK_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'bench-{alias}'}
+    for alias in ('default', 'weather_cache', 'market_cache', 'schema_cache')
+}
+
+
+class Command(BaseCommand):
+    help = 'Run hot-path micro-benchmarks with recorded upstream fixtures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Benchmarks to run (default: all)')
+        parser.add_argument('--list', action='store_true', help='List available benchmarks')
+        parser.add_argument('--iterations', type=int, default=None,
+                            help='Override the iteration count of every benchmark')
+        parser.add_argument('--output', default=None,
+                            help='Where to write the JSON results (default: benchmark_results/<timestamp>.json)')
+        parser.add_argument('--baseline', default=None, help='Previous results JSON to compare against')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                            help='Relative median slowdown that counts as a regression (default 0.10)')
+        parser.add_argument('--latency-ms', type=float, default=0.0,
+                            help='Latency added to every replayed upstream response')
+        parser.add_argument('--jitter-ms', type=float, default=0.0,
+                            help='Random extra latency (0..jitter) per upstream response')
+
+    def handle(self, *args, **options):
+        available = get_benchmarks()
+        if options['list']:
+            for name, spec in sorted(available.items()):
+                self.stdout.write(f"{name:<28} {spec['description']}")
+            return
+
+        unknown = [name for name in options['names'] if name not in available]
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+        with FixtureServer(latency_ms=options['latency_ms'], jitter_ms=options['jitter_ms']) as server, \
+                route_upstreams(server), override_settings(CACHES=BENCHMARK_CACHES):
+            results = run_benchmarks(options['names'] or None, options['iterations'])
+            results['upstream_latency_ms'] = options['latency_ms']
+            results['upstream_jitter_ms'] = options['jitter_ms']
+            results['upstream_requests'] = server.stats
+
+        self.stdout.write(f"{'benchmark':<28} {'median ms':>10} {'p95 ms':>10} {'ops/sec':>10}")
+        for name, result in results['results'].items():
+            if 'error' in result:
+                self.stdout.write(self.style.ERROR(f"{name:<28} {result['error']}"))
+                continue
+            self.stdout.write(f"{name:<28} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f} "
+                              f"{result['ops_per_sec']:>10.1f}")
+
+        output = options['output'] or os.path.join(
+            settings.BASE_DIR, 'benchmark_results', f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        save_results(results, output)
+        self.stdout.write(f"Results written to {output}")
+
+        if options['baseline']:
+            comparison = compare_results(results, load_results(options['baseline']), options['threshold'])
+            regressions = [entry for entry in comparison if entry['regression']]
+            for entry in comparison:
+                line = (f"{entry['name']:<28} {entry['baseline_median_ms']:>10.3f} -> "
+                        f"{entry['current_median_ms']:>10.3f} ms ({entry['change']:+.1%})")
+                self.stdout.write(self.style.ERROR(line) if entry['regression'] else line)
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} benchmark(s) regressed by more than {options['threshold']:.0%}"
+                )
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
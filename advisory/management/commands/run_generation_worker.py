@@ -0,0 +1,51 @@
+"""
+Run the resident local text-generation worker for the offline LLM fallback.
+
+Usage:
+    python manage.py run_generation_worker
+    python manage.py run_generation_worker --model distilgpt2 --address 127.0.0.1:8765 --no-quantize
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.ml.local_generation import GenerationServer, generation_address, generation_authkey, load_generator
+
+
+class Command(BaseCommand):
+    help = 'Load the offline generation model once and serve it to web workers on a local socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default=None, help='Model name (default: settings.LOCAL_GENERATION_MODEL)')
+        parser.add_argument('--address', default=None,
+                            help='Unix socket path or host:port (default: settings.LOCAL_GENERATION_ADDRESS)')
+        parser.add_argument('--no-quantize', action='store_true', help='Keep float32 weights')
+
+    def handle(self, *args, **options):
+        if options['address']:
+            settings.LOCAL_GENERATION_ADDRESS = options['address']
+        try:
+            authkey = generation_authkey()
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+        quantize = getattr(settings, 'LOCAL_GENERATION_QUANTIZE', True) and not options['no_quantize']
+        try:
+            generator = load_generator(options['model'], quantize=quantize)
+        except Exception as e:
+            raise CommandError(f'Could not load a generation model: {e}')
+
+        server = GenerationServer(
+            generator, generation_address(), authkey,
+            max_batch_size=int(getattr(settings, 'LOCAL_GENERATION_MAX_BATCH_SIZE', 8)),
+            max_wait_ms=float(getattr(settings, 'LOCAL_GENERATION_MAX_WAIT_MS', 20)),
+            max_new_tokens=int(getattr(settings, 'LOCAL_GENERATION_MAX_TOKENS', 128)),
+            max_time=float(getattr(settings, 'LOCAL_GENERATION_TIMEOUT', 10)),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Serving {generator.model_name}{' (int8)' if quantize else ''} on {server.address}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.close()
+            self.stdout.write(f"Stopped after {server.stats()['requests']} requests")
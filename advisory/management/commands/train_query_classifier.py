@@ -0,0 +1,53 @@
+"""
+Train the local query classifier on logged chat queries.
+
+Queries are labelled by the existing classifiers (Gemini with --llm, else
+agreeing keyword scorers) and the model is written to
+settings.QUERY_CLASSIFIER_PATH.
+
+Usage:
+    python manage.py train_query_classifier
+    python manage.py train_query_classifier --llm --limit 50000
+    python manage.py train_query_classifier --labelled exports/labelled_queries.jsonl --output /tmp/qc.npz
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from advisory.ml.query_classifier import train_from_logs
+
+
+class Command(BaseCommand):
+    help = 'Distil the LLM and keyword query classifiers into the local query classifier'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20000, help='Most recent logged user queries to label')
+        parser.add_argument('--llm', action='store_true',
+                            help='Label with Gemini first (needs GOOGLE_AI_API_KEY; one request per query)')
+        parser.add_argument('--labelled', default=None,
+                            help='JSON Lines file of {"query": ..., "category": ...} to train on as well')
+        parser.add_argument('--output', default=None,
+                            help='Model file to write (default: settings.QUERY_CLASSIFIER_PATH)')
+
+    def handle(self, *args, **options):
+        extra = []
+        if options['labelled']:
+            try:
+                with open(options['labelled'], encoding='utf-8') as handle:
+                    rows = [json.loads(line) for line in handle if line.strip()]
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read {options['labelled']}: {e}")
+            extra = [(row.get('query', ''), row.get('category', '')) for row in rows]
+
+        try:
+            result = train_from_logs(options['limit'], options['llm'], options['output'], extra)
+        except (OSError, ValueError, RuntimeError) as e:
+            raise CommandError(f'Query classifier training failed: {e}')
+
+        teachers = ', '.join(f"{name}: {count}" for name, count in result['teachers'].items())
+        accuracy = result['validation_accuracy']
+        self.stdout.write(f"Trained on {result['samples']} queries ({teachers})")
+        self.stdout.write(f"Held-out accuracy: {accuracy:.3f}" if accuracy is not None else 'No held-out split')
+        self.stdout.write(f"Calibration temperature: {result['temperature']:.2f}")
+        self.stdout.write(self.style.SUCCESS(f"Model written to {result['path']}"))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Request Timing Middleware
+Records the latency and status of every request into the per-route ring
+buffers of advisory.monitoring.performance_monitor, and starts the system
+sampler on the first request each worker serves. Each request is also the
+root span of a trace (advisory.monitoring.tracing), named after its route
+once resolved. Requests carrying the X-Profile token are stack-sampled
+while they run (advisory.monitoring.profiler).
+"""
+
+import logging
+import time
+from contextlib import nullcontext
+
+from ..monitoring.performance_monitor import performance_monitor
+from ..monitoring.profiler import get_profiler, profiling_requested
+from ..monitoring.tracing import start_trace
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimingMiddleware:
+    """Time each request and record it under its resolved view name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        performance_monitor.sampler.ensure_running()
+        profiling = get_profiler().profile_current_thread() if profiling_requested(request) else nullcontext()
+        with profiling, start_trace(f'{request.method} {request.path}', path=request.path) as root:
+            started = time.perf_counter()
+            status_code = 500
+            try:
+                response = self.get_response(request)
+                status_code = response.status_code
+                return response
+            finally:
+                duration_ms = (time.perf_counter() - started) * 1000
+                match = getattr(request, 'resolver_match', None)
+                route = (match.view_name or match.route) if match else 'unmatched'
+                if root is not None:
+                    root.name = f'{request.method} {route}'
+                    root.set(status=status_code)
+                try:
+                    performance_monitor.record_request(route, request.method, status_code, duration_ms)
+                except Exception as e:
+                    logger.warning(f"Could not record request timing: {e}")
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advisory', '0004_diagnosticsession_expertverification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Day the feedback was created')),
+                ('prediction_type', models.CharField(help_text='Type of prediction', max_length=50)),
+                ('total_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0, help_text='Sum of ratings, for averages')),
+                ('rating_1_count', models.IntegerField(default=0)),
+                ('rating_2_count', models.IntegerField(default=0)),
+                ('rating_3_count', models.IntegerField(default=0)),
+                ('rating_4_count', models.IntegerField(default=0)),
+                ('rating_5_count', models.IntegerField(default=0)),
+                ('with_text_count', models.IntegerField(default=0, help_text='Feedback entries with comments')),
+                ('geo_count', models.IntegerField(default=0, help_text='Feedback entries with coordinates')),
+                ('unique_users', models.IntegerField(default=0, help_text='Distinct users on this day')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'feedback_daily_rollup',
+                'indexes': [models.Index(fields=['date'], name='feedback_da_date_61fb24_idx'), models.Index(fields=['prediction_type', 'date'], name='feedback_da_predict_6c9a37_idx')],
+                'unique_together': {('date', 'prediction_type')},
+            },
+        ),
+    ]
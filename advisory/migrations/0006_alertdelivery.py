@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advisory', '0005_feedbackdailyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alert_id', models.CharField(help_text='Alert identifier, e.g. weather:heavy_rain:<date>', max_length=200)),
+                ('provider', models.CharField(help_text='Delivery provider name', max_length=50)),
+                ('recipient', models.CharField(help_text='User ID the alert was delivered to', max_length=100)),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'alert_deliveries',
+                'indexes': [models.Index(fields=['sent_at'], name='alert_deliv_sent_at_de4027_idx')],
+                'unique_together': {('alert_id', 'provider', 'recipient')},
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advisory', '0006_alertdelivery'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='feedbackdailyrollup',
+            name='unique_users',
+        ),
+        migrations.AddField(
+            model_name='feedbackdailyrollup',
+            name='user_sketch',
+            field=models.BinaryField(default=b'', help_text="HyperLogLog registers of this day's users"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Creates the database table behind the 'shared' cache alias, so a migrated
+# database needs no separate `createcachetable` step
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_tables(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advisory', '0007_feedbackdailyrollup_user_sketch'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_tables, migrations.RunPython.noop),
+    ]
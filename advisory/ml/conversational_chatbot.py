@@ -1,14 +1,19 @@
 import logging
 import re
 import random
+from contextvars import ContextVar
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
+from django.core.cache import cache
 from ..services.weather_api import MockWeatherAPI
 from ..services.market_api import get_market_prices, get_trending_crops
 from ..services.enhanced_government_api import EnhancedGovernmentAPI
 from ..ml.ml_models import AgriculturalMLSystem
 from ..models import Crop
 from .advanced_chatbot import AdvancedAgriculturalChatbot
+from ..services.chat_sessions import get_session_store, new_context, remember_place
+from ..services.translation_memory import NLLB_CODES, get_translator
+from ..monitoring.tracing import traced
 import requests
 
 try:
@@ -18,19 +23,20 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+GEOCODE_CACHE_TTL = 30 * 24 * 3600  # place names rarely move
+
+# Conversation context of the session whose turn is being answered
+_active_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar('chat_session_context', default=None)
+
 class ConversationalAgriculturalChatbot:
     def __init__(self):
         # Enhanced conversational chatbot like ChatGPT
-        self.conversation_context: Dict[str, Any] = {
-            "last_lat": None,
-            "last_lon": None,
-            "last_lang": "en",
-            "last_product": None,
-        }
+        # Per-session context comes from the session store; this default only
+        # serves handler calls made outside get_response
+        self._default_context: Dict[str, Any] = new_context()
         self.weather_api = MockWeatherAPI()
         self.enhanced_api = EnhancedGovernmentAPI()  # Real government data
         self.ml_system = AgriculturalMLSystem()
-        self._gen_pipeline = None  # lazy init
         
         # Initialize advanced chatbot for enhanced capabilities
         try:
@@ -44,6 +50,7 @@ class ConversationalAgriculturalChatbot:
         
         logger.info("Enhanced conversational chatbot initialized")
     
+    @traced('chatbot.format_response')
     def _format_government_recommendations(self, gov_rec: Dict, language: str) -> str:
         """Format government recommendations for user display"""
         try:
@@ -130,11 +137,29 @@ class ConversationalAgriculturalChatbot:
             return ("Please share your location or mandi name for market prices. "
                    "I can show you real-time prices from Agmarknet.")
     
-    def get_response(self, user_query: str, language: str = 'en') -> Dict[str, Any]:
+    @property
+    def conversation_context(self) -> Dict[str, Any]:
+        """Context of the chat session being answered in this request"""
+        context = _active_context.get()
+        return self._default_context if context is None else context
+    
+    def get_response(self, user_query: str, language: str = 'en', session_id: Optional[str] = None,
+                     user_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Generates a conversational response like ChatGPT.
         Supports multiple languages, grammatic errors, and casual conversations.
+        Location and product context are kept per session_id; without one
+        each call starts from a fresh context.
         """
+        with get_session_store().session(session_id, user_id) as context:
+            token = _active_context.set(context)
+            try:
+                return self._respond(user_query, language)
+            finally:
+                _active_context.reset(token)
+    
+    @traced('chatbot.respond')
+    def _respond(self, user_query: str, language: str) -> Dict[str, Any]:
         try:
             # Use advanced chatbot if available for better ChatGPT-like responses
             if self.use_advanced and self.advanced_chatbot:
@@ -233,13 +258,14 @@ class ConversationalAgriculturalChatbot:
                 self.conversation_context["last_product"] = token.capitalize()
                 break
 
+    @traced('chatbot.extract_place')
     def _maybe_extract_place_and_geocode(self, original_query: str, language: str) -> None:
         """Heuristic place extraction and geocoding using OpenStreetMap Nominatim."""
         try:
             # Very simple heuristics for place extraction; improve with NER later
             # Look for words after 'in/at/near' or Hindi equivalents
             patterns = [
-                r"(?:in|at|near)\s+([A-Za-z][A-Za-z\s]{2,40})",
+                r"\b(?:in|at|near)\s+([A-Za-z][A-Za-z\s]{2,40})",
                 r"(?:में|के पास|पास)\s+([\u0900-\u097F\s]{2,40})",
             ]
             place: Optional[str] = None
@@ -250,22 +276,39 @@ class ConversationalAgriculturalChatbot:
                     break
             if not place:
                 return
-            # Geocode
-            resp = requests.get(
-                "https://nominatim.openstreetmap.org/search",
-                params={"q": place, "format": "json", "limit": 1},
-                headers={"User-Agent": "agri-advisory-app/1.0"}, timeout=8
-            )
-            if resp.ok:
-                arr = resp.json()
-                if arr:
-                    lat = float(arr[0].get("lat"))
-                    lon = float(arr[0].get("lon"))
-                    self.conversation_context["last_lat"] = lat
-                    self.conversation_context["last_lon"] = lon
+            key = place.lower()
+            context = self.conversation_context
+            # Places already geocoded in this session, then by any session, before Nominatim
+            coords = context.get('places', {}).get(key)
+            if coords is None:
+                coords = self._geocode(key)
+            if coords:
+                context["last_lat"], context["last_lon"] = coords
+                context["last_place"] = place
+                remember_place(context, key, *coords)
         except Exception:
             pass
 
+    @traced('chatbot.geocode')
+    def _geocode(self, place: str) -> Optional[Tuple[float, float]]:
+        """Nominatim lookup shared across sessions through the cache; misses are cached too"""
+        cache_key = f"geocode:{place}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return tuple(cached) if cached else None
+        resp = requests.get(
+            "https://nominatim.openstreetmap.org/search",
+            params={"q": place, "format": "json", "limit": 1},
+            headers={"User-Agent": "agri-advisory-app/1.0"}, timeout=8
+        )
+        if not resp.ok:
+            return None
+        arr = resp.json()
+        coords = (float(arr[0].get("lat")), float(arr[0].get("lon"))) if arr else None
+        cache.set(cache_key, list(coords) if coords else [], GEOCODE_CACHE_TTL)
+        return coords
+
+    @traced('chatbot.detect_language')
     def _detect_language(self, query: str) -> str:
         """Detect language based on characters and common words"""
         # Check for Hindi/Devanagari characters
@@ -285,6 +328,7 @@ class ConversationalAgriculturalChatbot:
         
         return 'en'
 
+    @traced('chatbot.generate_response')
     def _generate_response(self, query: str, language: str) -> str:
         """Generate universal conversational response like ChatGPT - understands ANY query"""
         
@@ -1190,18 +1234,6 @@ class ConversationalAgriculturalChatbot:
         # Comprehensive agricultural advice - REAL government data for ALL questions
         else:
             return self._handle_comprehensive_agricultural_query(query, lat, lon, language)
-            
-            # Fallback to LLM or general response
-            llm = self._get_generation_pipeline()
-            if llm is not None:
-                try:
-                    prompt = self._build_llm_prompt(query, language)
-                    out = llm(prompt, max_new_tokens=128, do_sample=False)
-                    text = out[0]['generated_text'] if isinstance(out, list) else str(out)
-                    return text.strip()
-                except Exception:
-                    pass
-            return self._get_general_agri_response(language)
 
     def _get_crop_recommendation_response(self, language: str) -> str:
         if language in ['hi', 'hinglish']:
@@ -1218,6 +1250,7 @@ class ConversationalAgriculturalChatbot:
             ]
         return random.choice(responses)
 
+    @traced('chatbot.detect_language')
     def _detect_language_extended(self, query: str) -> str:
         """Lightweight language detection for major Indic languages and Hinglish/English."""
         # Devanagari
@@ -1252,49 +1285,15 @@ class ConversationalAgriculturalChatbot:
             return 'hinglish'
         return 'en'
 
+    @traced('chatbot.translate')
     def _translate_to_en(self, text: str, source_lang: str) -> Optional[str]:
-        """Translate Indic language to English using transformers if available; fallback returns original."""
-        if pipeline is None:
+        """Translate Indic language to English with NLLB through the translation memory; fallback returns original."""
+        if pipeline is None or source_lang not in NLLB_CODES:
             return text
         try:
-            model_map = {
-                'hi': 'facebook/nllb-200-distilled-600M',
-                'bn': 'facebook/nllb-200-distilled-600M',
-                'pa': 'facebook/nllb-200-distilled-600M',
-                'ta': 'facebook/nllb-200-distilled-600M',
-                'te': 'facebook/nllb-200-distilled-600M',
-                'kn': 'facebook/nllb-200-distilled-600M',
-                'ml': 'facebook/nllb-200-distilled-600M',
-                'gu': 'facebook/nllb-200-distilled-600M',
-                'or': 'facebook/nllb-200-distilled-600M',
-            }
-            model = model_map.get(source_lang)
-            if not model:
-                return text
-            translator = pipeline('translation', model=model, src_lang=source_lang, tgt_lang='en')
-            out = translator(text, max_length=256)
-            if out and isinstance(out, list) and 'translation_text' in out[0]:
-                return out[0]['translation_text']
+            return get_translator('nllb').translate(text, source_lang, 'en')
         except Exception:
-            pass
-        return text
-
-    def _get_generation_pipeline(self):
-        """Lazy initialize a small text generation pipeline for general responses."""
-        if self._gen_pipeline is not None:
-            return self._gen_pipeline
-        if pipeline is None:
-            return None
-        try:
-            # A small seq2seq model works better for instruction-like prompts
-            self._gen_pipeline = pipeline('text2text-generation', model='google/flan-t5-base')
-            return self._gen_pipeline
-        except Exception:
-            try:
-                self._gen_pipeline = pipeline('text-generation', model='distilgpt2')
-                return self._gen_pipeline
-            except Exception:
-                return None
+            return text
 
     def _build_llm_prompt(self, query: str, language: str) -> str:
         """Construct a concise prompt for the LLM while keeping agricultural context."""
@@ -0,0 +1,241 @@
+"""
+Fertilizer Planner
+Least-cost fertilizer plans for many fields at once, such as a cooperative
+planning a whole village:
+
+    plan = get_fertilizer_planner().plan([
+        {'field_id': 'A-12', 'crop': 'wheat', 'soil_type': 'sandy', 'season': 'rabi', 'area_hectares': 1.5},
+        ...
+    ])
+
+N, P2O5 and K2O needs for all fields are computed as arrays from the ICAR
+tables in FertilizerRecommendationEngine: crop base rate x soil adjustment x
+season adjustment x area. Each field's needs are then covered by the
+cheapest mix of the products on the subsidized price list (see
+prewarm_fallback_cache), solved exactly as a small linear program:
+
+    minimise  price . kg   subject to  content @ kg >= needs,  kg >= 0
+
+An optimum of this LP is a basic feasible solution of [content, -I]. Each
+3-column basis is inverted once, then applied to every field in one
+matrix product. The cheapest feasible basis of each field is its exact
+optimum, so a village needs no per-field solver calls.
+"""
+
+import logging
+import re
+import threading
+from datetime import datetime
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .fertilizer_recommendations import FertilizerRecommendationEngine
+
+logger = logging.getLogger(__name__)
+
+NUTRIENTS = ('nitrogen', 'phosphorus', 'potassium')     # kg of N, P2O5 and K2O
+MAX_FIELDS = 10000
+SOLVE_CHUNK = 4096            # fields per matrix product, bounds the (fields x bases x 3) array
+
+# Label and (N, P2O5, K2O) fraction of the products on the price list
+PRODUCT_GRADES = {
+    'urea': ('Urea (46% N)', (0.46, 0.0, 0.0)),
+    'dap': ('DAP (18% N, 46% P2O5)', (0.18, 0.46, 0.0)),
+    'mop': ('MOP (60% K2O)', (0.0, 0.0, 0.60)),
+    'ssp': ('SSP (16% P2O5)', (0.0, 0.16, 0.0)),
+    'npk_10_26_26': ('NPK 10:26:26', (0.10, 0.26, 0.26)),
+    'npk_12_32_16': ('NPK 12:32:16', (0.12, 0.32, 0.16)),
+    'npk_20_20_0': ('NPK 20:20:0:13', (0.20, 0.20, 0.0)),
+}
+
+
+def bag_kg(unit: Optional[str]) -> float:
+    match = re.search(r'(\d+(?:\.\d+)?)\s*kg', unit or '')
+    return float(match.group(1)) if match else 50.0
+
+
+def product_names(products: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """Known product names, sorted and unique; None means every product"""
+    if not products:
+        return None
+    if isinstance(products, (str, bytes, dict)):
+        raise ValueError('products must be a list of product names')
+    products = list(products)
+    if not all(isinstance(name, str) for name in products):
+        raise ValueError('products must be a list of product names')
+    unknown = sorted(set(products) - set(PRODUCT_GRADES))
+    if unknown:
+        raise ValueError(f"Unknown fertilizer products: {', '.join(unknown)} "
+                         f"(choose from {', '.join(PRODUCT_GRADES)})")
+    return tuple(sorted(set(products)))
+
+
+def fertilizer_prices() -> Dict[str, Dict[str, Any]]:
+    """Price list pre-warmed by prewarm_fallback_cache, over its defaults"""
+    from ..cache_utils import FALLBACK_FERTILIZER_PRICES, CacheManager
+    cached = CacheManager().get('fallback:fertilizer_prices')
+    return dict(FALLBACK_FERTILIZER_PRICES, **(cached or {}))
+
+
+class LeastCostSolver:
+    """Exact least-cost cover of nutrient needs, vectorized over fields"""
+
+    def __init__(self, contents: np.ndarray, prices: np.ndarray):
+        self.contents = np.asarray(contents, dtype=float)        # (nutrients, products)
+        self.prices = np.asarray(prices, dtype=float)            # per kg
+        n, m = self.contents.shape
+        columns = np.hstack([self.contents, -np.eye(n)])         # products, then surplus
+        costs = np.concatenate([self.prices, np.zeros(n)])
+        bases, inverses = [], []
+        for basis in combinations(range(m + n), n):
+            matrix = columns[:, basis]
+            if abs(np.linalg.det(matrix)) > 1e-9:
+                bases.append(basis)
+                inverses.append(np.linalg.inv(matrix))
+        self.bases = np.array(bases)                              # (bases, n)
+        self.inverses = np.array(inverses)                        # (bases, n, n)
+        self.basis_costs = costs[self.bases]                      # (bases, n)
+
+    def solve(self, needs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """kg of each product (fields, products) and cost (fields,) for needs (fields, nutrients)"""
+        needs = np.atleast_2d(np.asarray(needs, dtype=float))
+        m = self.contents.shape[1]
+        amounts = np.zeros((len(needs), m + self.contents.shape[0]))
+        costs = np.zeros(len(needs))
+        for start in range(0, len(needs), SOLVE_CHUNK):
+            chunk = needs[start:start + SOLVE_CHUNK]
+            rows = np.arange(len(chunk))
+            values = np.einsum('kij,fj->fki', self.inverses, chunk)           # (fields, bases, n)
+            feasible = (values >= -1e-9).all(axis=2)
+            basis_cost = np.where(feasible, np.einsum('fki,ki->fk', values, self.basis_costs), np.inf)
+            best = basis_cost.argmin(axis=1)
+            amounts[start + rows[:, None], self.bases[best]] = values[rows, best].clip(min=0)
+            costs[start:start + len(chunk)] = basis_cost[rows, best]
+        return amounts[:, :m], costs
+
+
+class FertilizerPlanner:
+    """Batch N/P/K needs and least-cost product mixes for many fields"""
+
+    def __init__(self, engine: Optional[FertilizerRecommendationEngine] = None,
+                 prices: Optional[Dict[str, Dict[str, Any]]] = None, products: Optional[Iterable[str]] = None):
+        engine = engine or FertilizerRecommendationEngine()
+        self.crops = list(engine.crop_fertilizer_database)
+        self.base_rates = np.array([[engine.crop_fertilizer_database[crop]['primary_nutrients'][n]['amount']
+                                     for n in NUTRIENTS] for crop in self.crops], dtype=float)
+        self.soils = list(engine.soil_fertilizer_requirements)
+        self.soil_factors = np.array([[engine.soil_fertilizer_requirements[soil]['adjustments'].get(n, 1.0)
+                                       for n in NUTRIENTS] for soil in self.soils], dtype=float)
+        self.seasons = list(engine.seasonal_adjustments)
+        self.season_factors = np.array([[engine.seasonal_adjustments[season].get(n, 1.0) for n in NUTRIENTS]
+                                        for season in self.seasons], dtype=float)
+
+        prices = prices if prices is not None else fertilizer_prices()
+        wanted = set(product_names(products) or PRODUCT_GRADES)
+        self.products = [name for name in PRODUCT_GRADES if name in prices and name in wanted]
+        if not self.products:
+            raise ValueError('No priced fertilizer products to plan with')
+        self.bag_kg = np.array([bag_kg(prices[name].get('unit')) for name in self.products])
+        self.bag_price = np.array([float(prices[name]['price']) for name in self.products])
+        contents = np.array([PRODUCT_GRADES[name][1] for name in self.products]).T
+        if (contents.sum(axis=1) == 0).any():
+            missing = [n for n, total in zip(NUTRIENTS, contents.sum(axis=1)) if total == 0]
+            raise ValueError(f"No product supplies {', '.join(missing)}")
+        self.solver = LeastCostSolver(contents, self.bag_price / self.bag_kg)
+
+    def requirements(self, crops: Sequence[int], soils: Sequence[int], seasons: Sequence[int],
+                     areas: Sequence[float]) -> np.ndarray:
+        """Adjusted kg of N, P2O5 and K2O per field from table indices and areas"""
+        return (self.base_rates[np.asarray(crops)] * self.soil_factors[np.asarray(soils)]
+                * self.season_factors[np.asarray(seasons)] * np.asarray(areas, dtype=float)[:, None])
+
+    def _index(self, fields: List[Dict[str, Any]]) -> Tuple[List[int], List[Dict[str, Any]], np.ndarray]:
+        crop_index = {crop: i for i, crop in enumerate(self.crops)}
+        soil_index = {soil: i for i, soil in enumerate(self.soils)}
+        season_index = {season: i for i, season in enumerate(self.seasons)}
+        valid, errors, rows = [], [], []
+        for i, field in enumerate(fields):
+            crop = str(field.get('crop') or field.get('crop_type') or '').lower()
+            try:
+                area = float(field.get('area_hectares', 1.0))
+            except (TypeError, ValueError):
+                area = -1.0
+            if crop not in crop_index:
+                errors.append({'index': i, 'field_id': field.get('field_id'),
+                               'error': f"No fertilizer data available for {crop or 'missing crop'}"})
+            elif not 0 <= area < float('inf'):
+                errors.append({'index': i, 'field_id': field.get('field_id'), 'error': 'Invalid area_hectares'})
+            else:
+                valid.append(i)
+                rows.append((crop_index[crop],
+                             soil_index.get(str(field.get('soil_type') or 'loamy').lower(), soil_index['loamy']),
+                             season_index.get(str(field.get('season') or 'kharif').lower(), season_index['kharif']),
+                             area))
+        return valid, errors, np.array(rows, dtype=float).reshape(-1, 4)
+
+    def plan(self, fields: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Least-cost plan per field and village totals"""
+        if len(fields) > MAX_FIELDS:
+            raise ValueError(f'At most {MAX_FIELDS} fields per plan')
+        valid, errors, rows = self._index(fields)
+        needs = self.requirements(rows[:, 0].astype(int), rows[:, 1].astype(int), rows[:, 2].astype(int),
+                                  rows[:, 3]) if valid else np.zeros((0, 3))
+        kg, costs = self.solver.solve(needs)
+        supplied = kg @ self.solver.contents.T
+        bags = kg / self.bag_kg
+
+        plans = []
+        for row, i in enumerate(valid):
+            field = fields[i]
+            plans.append({
+                'field_id': field.get('field_id', i),
+                'crop': self.crops[int(rows[row, 0])],
+                'soil_type': self.soils[int(rows[row, 1])],
+                'season': self.seasons[int(rows[row, 2])],
+                'area_hectares': float(rows[row, 3]),
+                'nutrient_requirements': dict(zip(NUTRIENTS, np.round(needs[row], 2).tolist())),
+                'nutrients_supplied': dict(zip(NUTRIENTS, np.round(supplied[row], 2).tolist())),
+                'products': [{'product': name, 'name': PRODUCT_GRADES[name][0], 'kg': round(float(kg[row, p]), 2),
+                              'bags': round(float(bags[row, p]), 2),
+                              'cost': round(float(bags[row, p] * self.bag_price[p]), 2)}
+                             for p, name in enumerate(self.products) if kg[row, p] > 1e-6],
+                'total_cost': round(float(costs[row]), 2),
+            })
+
+        totals_kg = kg.sum(axis=0)
+        return {
+            'fields': plans,
+            'errors': errors,
+            'totals': {
+                'fields': len(plans),
+                'area_hectares': round(float(rows[:, 3].sum()), 2) if valid else 0.0,
+                'nutrient_requirements': dict(zip(NUTRIENTS, np.round(needs.sum(axis=0), 2).tolist())),
+                'products': {name: {'kg': round(float(totals_kg[p]), 2),
+                                    'bags': round(float(totals_kg[p] / self.bag_kg[p]), 2),
+                                    'cost': round(float(totals_kg[p] / self.bag_kg[p] * self.bag_price[p]), 2)}
+                             for p, name in enumerate(self.products) if totals_kg[p] > 1e-6},
+                'total_cost': round(float(costs.sum()), 2),
+            },
+            'prices': {name: {'price': float(self.bag_price[p]), 'bag_kg': float(self.bag_kg[p])}
+                       for p, name in enumerate(self.products)},
+            'currency': 'INR',
+            'source': 'ICAR nutrient rates, subsidized fertilizer prices',
+            'generated_at': datetime.now().isoformat(),
+        }
+
+
+_planner: Dict[str, Any] = {'key': None, 'planner': None}
+_planner_lock = threading.Lock()
+
+
+def get_fertilizer_planner(products: Optional[Iterable[str]] = None) -> FertilizerPlanner:
+    """Planner for the current price list, rebuilt only when prices or products change"""
+    products = product_names(products)
+    prices = fertilizer_prices()
+    key = (repr(sorted((name, sorted(row.items())) for name, row in prices.items())), products)
+    with _planner_lock:
+        if _planner['key'] != key:
+            _planner.update(key=key, planner=FertilizerPlanner(prices=prices, products=products))
+        return _planner['planner']
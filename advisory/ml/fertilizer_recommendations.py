@@ -389,34 +389,38 @@ class FertilizerRecommendationEngine:
         return adjusted
     
     def _calculate_fertilizer_cost(self, nutrients: Dict) -> Dict:
-        """Calculate estimated fertilizer cost"""
-        # Approximate prices per kg (these would be updated with real market prices)
-        fertilizer_prices = {
-            "nitrogen": 25,  # INR per kg
-            "phosphorus": 30,
-            "potassium": 35
-        }
+        """Calculate fertilizer cost from the least-cost product mix at subsidized prices"""
+        from .fertilizer_planner import NUTRIENTS, get_fertilizer_planner
+
+        planner = get_fertilizer_planner()
+        needs = [[nutrients.get(nutrient, {}).get("adjusted_amount", 0) for nutrient in NUTRIENTS]]
+        kg, costs = planner.solver.solve(needs)
         
-        total_cost = 0
         cost_breakdown = {}
-        
-        for nutrient, data in nutrients.items():
-            if nutrient in fertilizer_prices:
-                cost = data["adjusted_amount"] * fertilizer_prices[nutrient]
-                cost_breakdown[nutrient] = {
-                    "amount": data["adjusted_amount"],
-                    "rate": fertilizer_prices[nutrient],
-                    "cost": round(cost, 2)
+        for i, product in enumerate(planner.products):
+            if kg[0, i] > 1e-6:
+                cost_breakdown[product] = {
+                    "amount": round(float(kg[0, i]), 2),
+                    "bags": round(float(kg[0, i] / planner.bag_kg[i]), 2),
+                    "rate": float(planner.bag_price[i]),
+                    "cost": round(float(kg[0, i] / planner.bag_kg[i] * planner.bag_price[i]), 2)
                 }
-                total_cost += cost
         
         return {
-            "total_cost": round(total_cost, 2),
+            "total_cost": round(float(costs[0]), 2),
             "cost_breakdown": cost_breakdown,
             "currency": "INR",
-            "note": "Prices are approximate and may vary by location"
+            "note": "Least-cost mix at subsidized prices per bag; prices may vary by location"
         }
     
+    def plan_fields(self, fields: List[Dict[str, Any]], products: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Least-cost fertilizer plans for many fields in one call; see
+        advisory.ml.fertilizer_planner
+        """
+        from .fertilizer_planner import get_fertilizer_planner
+        return get_fertilizer_planner(products).plan(fields)
+    
     def _get_best_practices(self, crop_type: str, soil_type: str, season: str) -> List[str]:
         """Get best practices for fertilizer application"""
         practices = [
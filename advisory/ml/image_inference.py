@@ -0,0 +1,312 @@
+"""
+Image Inference Server
+In-process CPU inference for the crop and disease image models. Requests
+from concurrent callers are decoded in a worker pool and collected into
+micro-batches (bounded by size and by how long the first request may wait),
+so each model call is shared by every image that arrived in the window:
+
+    result = classify_image('crop', image_b64)        # blocks on a future
+    future = get_inference_server('disease_rice').submit(image_bytes)
+
+Models are looked up in IMAGE_MODEL_DIR by name: `<name>.onnx` runs on ONNX
+Runtime, `<name>.joblib` is a scikit-learn classifier over colour/texture
+features (see `image_features`). Each needs a `<name>.labels.json` list of
+class names. Without a model file `get_inference_server` returns None and
+callers keep their rule-based fallbacks. Names come from user input (the
+disease model is `disease_<crop>`), so only installed models get a server.
+"""
+
+import base64
+import io
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+# Optional runtimes; Pillow decodes uploads, ONNX Runtime runs exported networks
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+try:
+    import onnxruntime
+    ONNX_AVAILABLE = True
+except ImportError:
+    onnxruntime = None
+    ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+INPUT_SIZE = (224, 224)
+HISTOGRAM_BINS = 8
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def decode_image(image: Any) -> np.ndarray:
+    """Base64 string, data URL, raw bytes, file-like or array -> HxWx3 uint8 array"""
+    if isinstance(image, np.ndarray):
+        array = image
+    else:
+        if hasattr(image, 'read'):
+            image = image.read()
+        if isinstance(image, str):
+            image = base64.b64decode(image.split(',', 1)[1] if image.startswith('data:') else image)
+        if not PIL_AVAILABLE:
+            raise RuntimeError('Pillow is required to decode uploaded images')
+        with Image.open(io.BytesIO(image)) as img:
+            array = np.asarray(img.convert('RGB'))
+    if array.ndim == 2:
+        array = np.repeat(array[:, :, None], 3, axis=2)
+    return array[:, :, :3]
+
+
+def preprocess(image: Any, size=INPUT_SIZE) -> np.ndarray:
+    """Decoded, resized (nearest neighbour) float32 image in [0, 1], HxWx3"""
+    array = decode_image(image)
+    rows = (np.arange(size[0]) * array.shape[0] // size[0]).clip(0, array.shape[0] - 1)
+    cols = (np.arange(size[1]) * array.shape[1] // size[1]).clip(0, array.shape[1] - 1)
+    resized = array[rows][:, cols]
+    if np.issubdtype(resized.dtype, np.integer):
+        return resized.astype(np.float32) / 255.0
+    return resized.astype(np.float32)
+
+
+def image_features(batch: np.ndarray) -> np.ndarray:
+    """
+    Colour and texture features for a batch (N, H, W, 3) in [0, 1]: per-channel
+    mean and standard deviation, per-channel histograms, the excess-green
+    vegetation index and mean gradient magnitude.
+    """
+    n, h, w, _ = batch.shape
+    pixels = h * w
+    means = batch.mean(axis=(1, 2))
+    stds = batch.std(axis=(1, 2))
+
+    bins = np.minimum((batch * HISTOGRAM_BINS).astype(np.int64), HISTOGRAM_BINS - 1)
+    offsets = (np.arange(n)[:, None, None, None] * 3 + np.arange(3)) * HISTOGRAM_BINS
+    histograms = np.bincount((bins + offsets).ravel(), minlength=n * 3 * HISTOGRAM_BINS)
+    histograms = histograms.reshape(n, 3 * HISTOGRAM_BINS) / pixels
+
+    r, g, b = batch[..., 0], batch[..., 1], batch[..., 2]
+    excess_green = (2 * g - r - b).mean(axis=(1, 2))
+    gray = batch.mean(axis=3)
+    gradient = (np.abs(np.diff(gray, axis=1)).mean(axis=(1, 2)) + np.abs(np.diff(gray, axis=2)).mean(axis=(1, 2)))
+
+    return np.hstack([means, stds, histograms, excess_green[:, None], gradient[:, None]]).astype(np.float32)
+
+
+class SklearnFeatureBackend:
+    """Classifier with `predict_proba` over `image_features`"""
+
+    def __init__(self, model, labels: List[str]):
+        self.model = model
+        self.labels = list(labels)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        return np.asarray(self.model.predict_proba(image_features(batch)), dtype=np.float32)
+
+
+class OnnxBackend:
+    """Exported network on ONNX Runtime; input NCHW, ImageNet-normalised"""
+
+    def __init__(self, path: str, labels: List[str], threads: int = 0):
+        if not ONNX_AVAILABLE:
+            raise RuntimeError('onnxruntime is not installed')
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.labels = list(labels)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        tensor = ((batch - IMAGENET_MEAN) / IMAGENET_STD).transpose(0, 3, 1, 2).astype(np.float32)
+        logits = self.session.run(None, {self.input_name: tensor})[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+class InferenceServer:
+    """
+    Micro-batching front end for one model. `submit` returns a Future;
+    decoding runs on the preprocessing pool and a single batching thread
+    groups ready images into batches of up to `max_batch_size`, waiting at
+    most `max_wait_ms` after the first image of a batch arrives.
+    """
+
+    def __init__(self, name: str, backend, max_batch_size: int = 16, max_wait_ms: float = 10,
+                 preprocess_workers: int = 4, preprocess_fn: Callable[[Any], np.ndarray] = preprocess):
+        self.name = name
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.preprocess_fn = preprocess_fn
+        self._ready: 'queue.Queue' = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=preprocess_workers, thread_name_prefix=f'preprocess-{name}')
+        self._stats = {'requests': 0, 'batches': 0, 'images': 0, 'model_seconds': 0.0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name=f'inference-{name}', daemon=True)
+        self._worker.start()
+
+    def submit(self, image: Any) -> Future:
+        future: Future = Future()
+        with self._stats_lock:
+            self._stats['requests'] += 1
+        self._pool.submit(self._prepare, image, future)
+        return future
+
+    def predict(self, image: Any, timeout: Optional[float] = 30) -> Dict[str, Any]:
+        return self.submit(image).result(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['mean_batch_size'] = round(stats['images'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['model_ms_per_image'] = round(stats['model_seconds'] * 1000 / stats['images'], 3) if stats['images'] else 0.0
+        return stats
+
+    def _prepare(self, image: Any, future: Future):
+        try:
+            self._ready.put((self.preprocess_fn(image), future))
+        except Exception as e:
+            with self._stats_lock:
+                self._stats['errors'] += 1
+            future.set_exception(e)
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._ready.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._ready.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                probabilities = self.backend.predict(np.stack([array for array, _ in batch]))
+            except Exception as e:
+                logger.error(f"Inference batch for {self.name} failed: {e}")
+                with self._stats_lock:
+                    self._stats['errors'] += len(batch)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self._stats['batches'] += 1
+                self._stats['images'] += len(batch)
+                self._stats['model_seconds'] += elapsed
+            for (_, future), row in zip(batch, probabilities):
+                future.set_result(self._result(row))
+
+    def _result(self, row: np.ndarray) -> Dict[str, Any]:
+        order = np.argsort(-row)[:3]
+        labels = self.backend.labels
+        return {
+            'label': labels[order[0]],
+            'confidence': round(float(row[order[0]]), 4),
+            'top': [{'label': labels[i], 'confidence': round(float(row[i]), 4)} for i in order],
+        }
+
+
+_servers: Dict[str, Optional[InferenceServer]] = {}
+_servers_lock = threading.Lock()
+_MODEL_NAME = re.compile(r'^[a-z0-9_]+$')
+
+
+def _model_dir() -> str:
+    return str(getattr(settings, 'IMAGE_MODEL_DIR', None) or os.path.join(str(settings.BASE_DIR), 'models', 'vision'))
+
+
+def is_installed(name: str, model_dir: Optional[str] = None) -> bool:
+    """True when `name` is a plain model name with a labels file in the model directory"""
+    if not _MODEL_NAME.match(name or ''):
+        return False
+    return os.path.exists(os.path.join(model_dir or _model_dir(), f'{name}.labels.json'))
+
+
+def load_backend(name: str, model_dir: Optional[str] = None):
+    """Backend for the model files named `name`, or None when absent"""
+    model_dir = model_dir or _model_dir()
+    labels_path = os.path.join(model_dir, f'{name}.labels.json')
+    if not os.path.exists(labels_path):
+        return None
+    with open(labels_path, encoding='utf-8') as f:
+        labels = json.load(f)
+
+    onnx_path = os.path.join(model_dir, f'{name}.onnx')
+    if os.path.exists(onnx_path) and ONNX_AVAILABLE:
+        return OnnxBackend(onnx_path, labels)
+    joblib_path = os.path.join(model_dir, f'{name}.joblib')
+    if os.path.exists(joblib_path):
+        import joblib
+        return SklearnFeatureBackend(joblib.load(joblib_path), labels)
+    logger.warning(f"Labels for image model {name} found but no usable model file in {model_dir}")
+    return None
+
+
+def register_model(name: str, backend, **options) -> InferenceServer:
+    """Serve `backend` under `name`, replacing any model loaded from disk"""
+    server = InferenceServer(name, backend, **{
+        'max_batch_size': int(getattr(settings, 'INFERENCE_MAX_BATCH_SIZE', 16)),
+        'max_wait_ms': float(getattr(settings, 'INFERENCE_MAX_WAIT_MS', 10)),
+        **options,
+    })
+    with _servers_lock:
+        _servers[name] = server
+    return server
+
+
+def get_inference_server(name: str) -> Optional[InferenceServer]:
+    """Shared server for a model, loaded on first use; None when no model is installed"""
+    if name in _servers:
+        return _servers[name]
+    # Unknown names are not remembered, so arbitrary crop names cannot grow the table
+    if not is_installed(name):
+        return None
+    with _servers_lock:
+        if name in _servers:
+            return _servers[name]
+        try:
+            backend = load_backend(name)
+        except Exception as e:
+            logger.error(f"Could not load image model {name}: {e}")
+            backend = None
+        _servers[name] = None
+    if backend is None:
+        return None
+    logger.info(f"Loaded image model {name} ({type(backend).__name__})")
+    return register_model(name, backend)
+
+
+def classify_image(name: str, image: Any, timeout: Optional[float] = 30) -> Optional[Dict[str, Any]]:
+    """Top predictions for one image, or None when the model is missing or the image is unusable"""
+    server = get_inference_server(name)
+    if server is None or image is None:
+        return None
+    try:
+        return server.predict(image, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Image classification with {name} failed: {e}")
+        return None
@@ -0,0 +1,355 @@
+"""
+Local Generation Worker
+Offline text-generation fallback served by one resident process, so web
+workers neither load the model nor hold a copy of it:
+
+    python manage.py run_generation_worker          # loads the model once
+    get_generation_client().generate(prompt)        # from any web worker
+
+The worker loads google/flan-t5-base (distilgpt2 if that fails), with
+dynamic int8 quantization of its Linear layers for CPU. It listens on
+LOCAL_GENERATION_ADDRESS, a Unix socket path (mode 0600) or host:port, and
+accepts requests from clients that share LOCAL_GENERATION_AUTHKEY, a secret
+used for nothing else. Messages are JSON, never pickle, so even a client
+that knows the key can only send prompts. Requests with the same token
+budget are batched: a batch holds up to
+LOCAL_GENERATION_MAX_BATCH_SIZE prompts and waits at most
+LOCAL_GENERATION_MAX_WAIT_MS after the first. Each request gets at most
+LOCAL_GENERATION_MAX_TOKENS new tokens. Generation stops once the earliest
+deadline in the batch passes, and requests that expired while queued are
+answered with a timeout instead of being run.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from ..lazy_imports import lazy_import
+
+# Optional runtimes, imported only when the worker loads a model; web
+# processes only need the client
+TORCH_AVAILABLE = importlib.util.find_spec('torch') is not None
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec('transformers') is not None
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'google/flan-t5-base'
+FALLBACK_MODEL = 'distilgpt2'
+MAX_INPUT_TOKENS = 512
+MAX_MESSAGE_BYTES = 1 << 20     # a request or reply on the socket
+MIN_AUTHKEY_LENGTH = 32
+PING_TIMEOUT = 1.0
+ALIVE_SECONDS = 5.0             # how long a successful ping is trusted
+
+Address = Union[str, Tuple[str, int]]
+
+
+class TransformersGenerator:
+    """Greedy batched generation with a seq2seq or causal model, int8-quantized for CPU"""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, quantize: bool = True, threads: int = 0):
+        if not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
+            raise RuntimeError('torch and transformers are required for local generation')
+        if threads:
+            torch.set_num_threads(threads)
+        self.model_name = model_name
+        self.seq2seq = bool(transformers.AutoConfig.from_pretrained(model_name).is_encoder_decoder)
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_name)
+        model_class = transformers.AutoModelForSeq2SeqLM if self.seq2seq else transformers.AutoModelForCausalLM
+        model = model_class.from_pretrained(model_name).eval()
+        if not self.seq2seq:
+            # Causal models continue the prompt, so pad on the left
+            self.tokenizer.padding_side = 'left'
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+
+    def generate(self, prompts: List[str], max_new_tokens: int, max_time: float) -> List[str]:
+        with torch.inference_mode():
+            inputs = self.tokenizer(prompts, return_tensors='pt', padding=True, truncation=True,
+                                    max_length=MAX_INPUT_TOKENS)
+            output = self.model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False,
+                                         max_time=max_time, pad_token_id=self.tokenizer.pad_token_id)
+        if not self.seq2seq:
+            output = output[:, inputs['input_ids'].shape[1]:]
+        return [text.strip() for text in self.tokenizer.batch_decode(output, skip_special_tokens=True)]
+
+
+def load_generator(model_name: Optional[str] = None, quantize: bool = True) -> TransformersGenerator:
+    """The configured model, falling back to distilgpt2"""
+    model_name = model_name or getattr(settings, 'LOCAL_GENERATION_MODEL', DEFAULT_MODEL)
+    try:
+        return TransformersGenerator(model_name, quantize=quantize)
+    except Exception as e:
+        if model_name == FALLBACK_MODEL:
+            raise
+        logger.warning(f"Could not load {model_name} ({e}), falling back to {FALLBACK_MODEL}")
+        return TransformersGenerator(FALLBACK_MODEL, quantize=quantize)
+
+
+class GenerationServer:
+    """
+    Serves a preloaded generator on a local socket. Each client connection
+    has its own thread, and a single batching thread runs the model.
+    """
+
+    def __init__(self, generator, address: Address, authkey: bytes, max_batch_size: int = 8,
+                 max_wait_ms: float = 20, max_new_tokens: int = 128, max_time: float = 10.0):
+        if not authkey:
+            raise ValueError('the generation worker needs an authkey')
+        self.generator = generator
+        self.address = address
+        self.authkey = authkey
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_new_tokens = max_new_tokens
+        self.max_time = max_time
+        self._pending: 'queue.Queue' = queue.Queue()
+        self._listener: Optional[Listener] = None
+        self._stats = {'requests': 0, 'batches': 0, 'prompts': 0, 'expired': 0, 'errors': 0,
+                       'model_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name='generation-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: str, max_new_tokens: Optional[int] = None, timeout: Optional[float] = None) -> Future:
+        future: Future = Future()
+        tokens = max(1, min(int(max_new_tokens or self.max_new_tokens), self.max_new_tokens))
+        now = time.monotonic()
+        deadline = now + min(timeout or self.max_time, self.max_time)
+        with self._stats_lock:
+            self._stats['requests'] += 1
+        self._pending.put((prompt, tokens, deadline, future, now))
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['mean_batch_size'] = round(stats['prompts'] / stats['batches'], 2) if stats['batches'] else 0.0
+        return stats
+
+    def serve_forever(self):
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)         # stale socket from a previous run
+        if isinstance(self.address, str):
+            # Only this user may connect to the socket, from the moment it exists
+            umask = os.umask(0o177)
+            try:
+                self._listener = Listener(self.address, authkey=self.authkey)
+            finally:
+                os.umask(umask)
+            os.chmod(self.address, 0o600)
+        else:
+            self._listener = Listener(self.address, authkey=self.authkey)
+        logger.info(f"Local generation worker listening on {self.address}")
+        while self._listener is not None:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                # Closed listener, or a client with the wrong authkey
+                if self._listener is None:
+                    return
+                logger.warning(f"Rejected local generation client: {e}")
+                continue
+            threading.Thread(target=self._handle, args=(conn,), name='generation-client', daemon=True).start()
+
+    def start(self) -> threading.Thread:
+        """Serve on a background thread (for tests and embedding)"""
+        thread = threading.Thread(target=self.serve_forever, name='generation-listener', daemon=True)
+        thread.start()
+        while self._listener is None and thread.is_alive():
+            time.sleep(0.005)
+        return thread
+
+    def close(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    message = conn.recv_bytes(MAX_MESSAGE_BYTES)
+                except (EOFError, OSError):
+                    return
+                reply = self._reply(message)
+                try:
+                    conn.send_bytes(json.dumps(reply).encode('utf-8'))
+                except OSError:
+                    return
+
+    def _reply(self, message: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(message.decode('utf-8'))
+        except ValueError:
+            return {'error': 'ValueError: request is not JSON'}
+        if not isinstance(request, dict):
+            return {'error': 'ValueError: request is not a JSON object'}
+        if request.get('ping'):
+            return {'ok': True}
+        prompt, tokens, timeout = request.get('prompt'), request.get('max_new_tokens'), request.get('timeout')
+        if not isinstance(prompt, str) or any(isinstance(value, bool) or not isinstance(value, (int, float, type(None)))
+                                              for value in (tokens, timeout)):
+            return {'error': 'ValueError: expected a prompt string and numeric budgets'}
+        try:
+            return self.submit(prompt, tokens, timeout).result()
+        except Exception as e:
+            return {'error': f'{type(e).__name__}: {e}'}
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            groups: Dict[int, List[tuple]] = {}
+            now = time.monotonic()
+            for item in self._collect():
+                if item[2] <= now:
+                    with self._stats_lock:
+                        self._stats['expired'] += 1
+                    item[3].set_exception(TimeoutError('expired while queued'))
+                else:
+                    groups.setdefault(item[1], []).append(item)
+            for tokens, items in groups.items():
+                self._generate(tokens, items)
+
+    def _generate(self, tokens: int, items: List[tuple]):
+        started = time.monotonic()
+        max_time = max(0.01, min(item[2] for item in items) - started)
+        try:
+            texts = self.generator.generate([item[0] for item in items], tokens, max_time)
+        except Exception as e:
+            logger.exception('Local generation failed')
+            with self._stats_lock:
+                self._stats['errors'] += 1
+            for item in items:
+                item[3].set_exception(e)
+            return
+        elapsed = time.monotonic() - started
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['prompts'] += len(items)
+            self._stats['model_seconds'] += elapsed
+        for item, text in zip(items, texts):
+            item[3].set_result({'text': text, 'batch_size': len(items), 'generate_ms': round(elapsed * 1000, 1),
+                                'queue_ms': round((started - item[4]) * 1000, 1)})
+
+
+class LocalGenerationClient:
+    """Sends prompts to the generation worker; raises if it is down or too slow"""
+
+    def __init__(self, address: Address, authkey: Optional[bytes], timeout: float = 10.0):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._alive_until = 0.0
+
+    def available(self) -> bool:
+        """True when the worker answers a ping; a success is trusted for ALIVE_SECONDS"""
+        if not self.authkey:
+            return False
+        if time.monotonic() < self._alive_until:
+            return True
+        if isinstance(self.address, str) and not os.path.exists(self.address):
+            return False
+        try:
+            self._request({'ping': True}, PING_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Generation worker did not answer a ping: {e}")
+            return False
+        self._alive_until = time.monotonic() + ALIVE_SECONDS
+        return True
+
+    def generate(self, prompt: str, max_new_tokens: Optional[int] = None, timeout: Optional[float] = None) -> str:
+        timeout = timeout or self.timeout
+        try:
+            reply = self._request({'prompt': prompt, 'max_new_tokens': max_new_tokens, 'timeout': timeout}, timeout)
+        except (OSError, EOFError):
+            self._alive_until = 0.0
+            raise
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return reply['text']
+
+    def _request(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        if not self.authkey:
+            raise ConnectionError('LOCAL_GENERATION_AUTHKEY is not configured')
+        with Client(self.address, authkey=self.authkey) as conn:
+            conn.send_bytes(json.dumps(request).encode('utf-8'))
+            if not conn.poll(timeout):
+                raise TimeoutError(f'no answer from the generation worker within {timeout}s')
+            return json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES).decode('utf-8'))
+
+
+def generation_address() -> Address:
+    """LOCAL_GENERATION_ADDRESS as a socket path or (host, port)"""
+    address = getattr(settings, 'LOCAL_GENERATION_ADDRESS', None)
+    if not address:
+        if os.name == 'nt':
+            return ('127.0.0.1', 8765)
+        return os.path.join(tempfile.gettempdir(), 'krishimitra-generation.sock')
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        return (host, int(port))
+    return address
+
+
+def generation_authkey() -> bytes:
+    """LOCAL_GENERATION_AUTHKEY; refuses an empty, short or reused secret"""
+    key = str(getattr(settings, 'LOCAL_GENERATION_AUTHKEY', '') or '')
+    if len(key) < MIN_AUTHKEY_LENGTH or key == str(settings.SECRET_KEY):
+        raise ImproperlyConfigured(f'LOCAL_GENERATION_AUTHKEY must be a dedicated secret of at least '
+                                   f'{MIN_AUTHKEY_LENGTH} characters, not SECRET_KEY')
+    return key.encode('utf-8')
+
+
+_client: Optional[LocalGenerationClient] = None
+_client_lock = threading.Lock()
+
+
+def get_generation_client() -> LocalGenerationClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                try:
+                    authkey = generation_authkey()
+                except ImproperlyConfigured as e:
+                    # Without a key the client reports the worker as unavailable
+                    logger.info(f"Local generation disabled: {e}")
+                    authkey = None
+                _client = LocalGenerationClient(generation_address(), authkey,
+                                                timeout=float(getattr(settings, 'LOCAL_GENERATION_TIMEOUT', 10)))
+    return _client
+
+
+def reset_generation_client(client: Optional[LocalGenerationClient] = None):
+    global _client
+    with _client_lock:
+        _client = client
@@ -15,10 +15,11 @@ from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score, accuracy_score, classification_report
-from sklearn.linear_model import LinearRegression
 from sklearn.neural_network import MLPRegressor
 import logging
 
+from .price_forecasting import get_forecast
+
 # Suppress sklearn convergence warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='sklearn')
 
@@ -67,8 +68,7 @@ class AgriculturalMLSystem:
             validation_fraction=0.1
         )
         
-        # Market Price Prediction Model
-        self.models['price_prediction'] = LinearRegression()
+        # Market prices are forecast nightly in one batch (see price_forecasting.py)
         
         # Weather Impact Model
         self.models['weather_impact'] = RandomForestRegressor(
@@ -88,7 +88,6 @@ class AgriculturalMLSystem:
         self.scalers = {
             'yield_prediction': StandardScaler(),
             'fertilizer_recommendation': StandardScaler(),
-            'price_prediction': StandardScaler(),
             'weather_impact': StandardScaler()
         }
     
@@ -648,6 +647,21 @@ class AgriculturalMLSystem:
             logger.error(f"Error in fertilizer prediction: {e}")
             return {'error': str(e)}
     
+    def predict_price(self, commodity: str, mandi: str = None, state: str = None) -> Dict[str, Any]:
+        """Look up the persisted batch price forecast for a commodity"""
+        forecast = get_forecast(commodity, mandi, state)
+        if not forecast:
+            return {'error': f'No price forecast available for {commodity}'}
+        return {
+            'current_price': forecast['last_price'],
+            'next_3_months': forecast['next_3_months'],
+            'next_6_months': forecast['next_6_months'],
+            'next_year': forecast.get('next_year'),
+            'model': forecast['model'],
+            'holdout_mae': forecast['holdout_mae'],
+            'prediction_timestamp': forecast['generated_at']
+        }
+    
     def collect_feedback(self, user_id: str, prediction_type: str, input_data: Dict, 
                         prediction: Dict, actual_result: Dict, feedback_rating: int) -> bool:
         """Collect user feedback for model improvement"""
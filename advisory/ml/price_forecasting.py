@@ -0,0 +1,335 @@
+"""
+Batch Price Forecasting
+Fits lightweight forecasting models to every (commodity, mandi) price series
+in one vectorized pass over a weekly price matrix, picks the best model per
+series on a holdout window, and persists the forecasts so request-time
+lookups are a dictionary access.
+
+Models (all vectorized across series):
+    - seasonal naive: the value one season (52 weeks) earlier, or the last value
+    - Holt exponential smoothing: level + trend
+    - ridge regression on lag features, forecast recursively
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from ..services.price_store import PriceStore, from_days, get_price_store, normalize_commodity
+
+logger = logging.getLogger(__name__)
+
+SEASON_WEEKS = 52
+HORIZON_WEEKS = 52
+HORIZONS = {'next_week': 1, 'next_3_months': 13, 'next_6_months': 26, 'next_year': 52}
+MIN_OBSERVED_WEEKS = 8
+
+HOLT_ALPHA = 0.5
+HOLT_BETA = 0.1
+RIDGE_LAGS = (1, 2, 3, 4)
+RIDGE_LAMBDA = 1.0
+
+MODELS = ('seasonal_naive', 'holt', 'ridge_lags')
+
+# Series key parts; an empty mandi/state marks commodity- or state-level aggregates
+ALL = ''
+
+
+# ---------------------------------------------------------------------- history
+
+def history_from_store(store: Optional[PriceStore] = None) -> Dict[str, np.ndarray]:
+    """Long-format history (commodity, mandi, state, day, modal) from the price store"""
+    store = store or get_price_store()
+    mandis = store.mandis()
+    parts = {'commodity': [], 'mandi': [], 'state': [], 'day': [], 'modal': []}
+    for commodity in store.commodities():
+        rows = store.range(commodity)
+        if not len(rows['date']):
+            continue
+        names = np.array([m['name'] for m in mandis], dtype=object)
+        states = np.array([m.get('state', '') for m in mandis], dtype=object)
+        parts['commodity'].append(np.full(len(rows['date']), commodity, dtype=object))
+        parts['mandi'].append(names[rows['mandi']])
+        parts['state'].append(states[rows['mandi']])
+        parts['day'].append(np.asarray(rows['date'], dtype=np.int64))
+        parts['modal'].append(np.asarray(rows['modal'], dtype=np.float64))
+    if not parts['day']:
+        return {name: np.empty(0, dtype=object if name in ('commodity', 'mandi', 'state') else np.float64)
+                for name in parts}
+    return {name: np.concatenate(values) for name, values in parts.items()}
+
+
+def history_from_file(path: str) -> Dict[str, np.ndarray]:
+    """Long-format history from an Agmarknet-style CSV or a Parquet file"""
+    import pandas as pd
+
+    frame = pd.read_parquet(path) if path.endswith(('.parquet', '.pq')) else pd.read_csv(path)
+    fields = PriceStore._csv_field_map(frame.columns)
+    missing = [name for name in ('market', 'commodity', 'date', 'modal') if name not in fields]
+    if missing:
+        raise ValueError(f"{path} is missing column(s): {', '.join(missing)}")
+
+    dates = pd.to_datetime(frame[fields['date']], dayfirst=True, errors='coerce')
+    modal = pd.to_numeric(frame[fields['modal']], errors='coerce')
+    valid = dates.notna() & modal.notna()
+    frame, dates, modal = frame[valid], dates[valid], modal[valid]
+    return {
+        'commodity': frame[fields['commodity']].map(normalize_commodity).to_numpy(dtype=object),
+        'mandi': frame[fields['market']].astype(str).str.strip().to_numpy(dtype=object),
+        'state': (frame[fields['state']].astype(str).str.strip() if 'state' in fields
+                  else pd.Series(ALL, index=frame.index)).to_numpy(dtype=object),
+        'day': (dates.dt.normalize() - pd.Timestamp('1970-01-01')).dt.days.to_numpy(dtype=np.int64),
+        'modal': modal.to_numpy(dtype=np.float64),
+    }
+
+
+def build_weekly_matrix(history: Dict[str, np.ndarray]) -> Tuple[List[Tuple[str, str, str]], np.ndarray, np.ndarray]:
+    """
+    Weekly mean modal price matrix of shape (series, weeks). Besides one
+    series per (commodity, mandi, state) it adds per-state and national
+    aggregates per commodity. Gaps are forward-filled; weeks before a
+    series starts stay NaN. Returns (keys, week start days, matrix).
+    """
+    if not len(history['day']):
+        return [], np.empty(0, dtype=np.int64), np.empty((0, 0))
+
+    week = (history['day'] + 3) // 7  # Monday-start weeks
+    first_week = int(week.min())
+    col = week - first_week
+    n_weeks = int(col.max()) + 1
+
+    levels = [
+        (history['commodity'], history['mandi'], history['state']),
+        (history['commodity'], np.full(len(week), ALL, dtype=object), history['state']),
+        (history['commodity'], np.full(len(week), ALL, dtype=object), np.full(len(week), ALL, dtype=object)),
+    ]
+    keys: List[Tuple[str, str, str]] = []
+    sums, counts = [], []
+    for commodity, mandi, state in levels:
+        combined = np.array(['\x1f'.join(k) for k in zip(commodity, mandi, state)], dtype=object)
+        unique, row = np.unique(combined, return_inverse=True)
+        level_sums = np.zeros((len(unique), n_weeks))
+        level_counts = np.zeros((len(unique), n_weeks))
+        np.add.at(level_sums, (row, col), history['modal'])
+        np.add.at(level_counts, (row, col), 1)
+        keys.extend(tuple(k.split('\x1f')) for k in unique)
+        sums.append(level_sums)
+        counts.append(level_counts)
+
+    sums, counts = np.vstack(sums), np.vstack(counts)
+    matrix = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    matrix = _forward_fill(matrix)
+    week_starts = (np.arange(n_weeks) + first_week) * 7 - 3
+    return keys, week_starts, matrix
+
+
+def _forward_fill(matrix: np.ndarray) -> np.ndarray:
+    observed = ~np.isnan(matrix)
+    index = np.where(observed, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], index]
+    # Positions before the first observation point at column 0; restore NaN there
+    started = np.maximum.accumulate(observed, axis=1)
+    return np.where(started, filled, np.nan)
+
+
+# ---------------------------------------------------------------------- models
+
+def _back_fill_start(matrix: np.ndarray) -> np.ndarray:
+    """Fill leading NaNs with each series' first observation so recursions can start"""
+    first = np.argmax(~np.isnan(matrix), axis=1)
+    first_values = matrix[np.arange(matrix.shape[0]), first]
+    return np.where(np.isnan(matrix), first_values[:, None], matrix)
+
+
+def forecast_seasonal_naive(y: np.ndarray, horizon: int, season: int = SEASON_WEEKS) -> np.ndarray:
+    n = y.shape[1]
+    steps = np.arange(horizon)
+    if n >= season:
+        return y[:, n - season + steps % season]
+    return np.repeat(y[:, -1:], horizon, axis=1)
+
+
+def forecast_holt(y: np.ndarray, horizon: int, alpha: float = HOLT_ALPHA, beta: float = HOLT_BETA) -> np.ndarray:
+    level = y[:, 0].copy()
+    trend = np.zeros(y.shape[0]) if y.shape[1] < 2 else y[:, 1] - y[:, 0]
+    for t in range(1, y.shape[1]):
+        previous = level
+        level = alpha * y[:, t] + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+    return level[:, None] + trend[:, None] * np.arange(1, horizon + 1)
+
+
+def forecast_ridge_lags(y: np.ndarray, horizon: int, lags=RIDGE_LAGS, lam: float = RIDGE_LAMBDA) -> np.ndarray:
+    """Per-series ridge on lagged, mean-scaled prices; all series solved as one batch"""
+    max_lag = max(lags)
+    n_series, n = y.shape
+    if n <= max_lag + 2:
+        return np.repeat(y[:, -1:], horizon, axis=1)
+
+    scale = np.nanmean(y, axis=1, keepdims=True)
+    scale[scale == 0] = 1.0
+    z = y / scale
+    X = np.stack([np.ones((n_series, n - max_lag))] + [z[:, max_lag - lag:n - lag] for lag in lags], axis=2)
+    target = z[:, max_lag:]
+    penalty = lam * np.eye(X.shape[2])
+    penalty[0, 0] = 0.0  # leave the intercept unpenalized
+    xtx = np.einsum('snp,snq->spq', X, X) + penalty
+    xty = np.einsum('snp,sn->sp', X, target)
+    beta = np.linalg.solve(xtx, xty[..., None])[..., 0]
+
+    window = list(z[:, -max_lag:].T)  # oldest .. newest
+    out = np.empty((n_series, horizon))
+    for h in range(horizon):
+        features = np.stack([np.ones(n_series)] + [window[-lag] for lag in lags], axis=1)
+        step = np.einsum('sp,sp->s', features, beta)
+        out[:, h] = step
+        window.append(step)
+    return out * scale
+
+
+FORECASTERS = {
+    'seasonal_naive': forecast_seasonal_naive,
+    'holt': forecast_holt,
+    'ridge_lags': forecast_ridge_lags,
+}
+
+
+def fit_and_forecast(matrix: np.ndarray, horizon: int = HORIZON_WEEKS) -> Dict[str, np.ndarray]:
+    """
+    Pick a model per series by mean absolute error on a holdout of the last
+    weeks, then forecast `horizon` weeks from the full history with it.
+    Returns the forecasts, the chosen model index and its holdout MAE.
+    """
+    y = _back_fill_start(matrix)
+    n_series, n = y.shape
+    holdout = max(1, min(13, n // 4))
+
+    errors = np.empty((len(MODELS), n_series))
+    forecasts = np.empty((len(MODELS), n_series, horizon))
+    for i, name in enumerate(MODELS):
+        backtest = FORECASTERS[name](y[:, :n - holdout], holdout)
+        errors[i] = np.mean(np.abs(backtest - y[:, n - holdout:]), axis=1)
+        forecasts[i] = FORECASTERS[name](y, horizon)
+
+    errors = np.where(np.isfinite(errors), errors, np.inf)
+    chosen = np.argmin(errors, axis=0)
+    series = np.arange(n_series)
+    # Prices cannot go negative; clamp runaway trends at zero
+    return {
+        'forecast': np.maximum(forecasts[chosen, series], 0.0),
+        'model': chosen,
+        'mae': errors[chosen, series],
+    }
+
+
+def run_batch_forecast(history: Dict[str, np.ndarray], horizon: int = HORIZON_WEEKS) -> Dict[str, Any]:
+    """Forecast every series in `history` and return the document persisted by `save_forecasts`"""
+    keys, week_starts, matrix = build_weekly_matrix(history)
+    generated_at = datetime.now().isoformat()
+    if not keys:
+        return {'generated_at': generated_at, 'horizon_weeks': horizon, 'series': {}}
+
+    observed_weeks = np.sum(~np.isnan(matrix), axis=1)
+    usable = observed_weeks >= MIN_OBSERVED_WEEKS
+    series: Dict[str, Dict[str, Any]] = {}
+    if usable.any():
+        result = fit_and_forecast(matrix[usable], horizon)
+        last_week = str(from_days(int(week_starts[-1])))
+        for row, index in enumerate(np.flatnonzero(usable)):
+            commodity, mandi, state = keys[index]
+            forecast = result['forecast'][row]
+            last_price = float(matrix[index, -1])
+            entry = {
+                'commodity': commodity,
+                'mandi': mandi or None,
+                'state': state or None,
+                'model': MODELS[result['model'][row]],
+                'holdout_mae': round(float(result['mae'][row]), 2),
+                'observed_weeks': int(observed_weeks[index]),
+                'last_week': last_week,
+                'last_price': round(last_price, 2),
+            }
+            for name, weeks in HORIZONS.items():
+                if weeks <= horizon:
+                    entry[name] = round(float(forecast[weeks - 1]), 2)
+            series[series_key(commodity, mandi, state)] = entry
+
+    skipped = int((~usable).sum())
+    if skipped:
+        logger.info(f"Skipped {skipped} series with fewer than {MIN_OBSERVED_WEEKS} observed weeks")
+    return {'generated_at': generated_at, 'horizon_weeks': horizon, 'series': series}
+
+
+# ---------------------------------------------------------------------- persistence
+
+def series_key(commodity: str, mandi: Optional[str] = None, state: Optional[str] = None) -> str:
+    return '|'.join((normalize_commodity(commodity), normalize_commodity(mandi or ALL), normalize_commodity(state or ALL)))
+
+
+def _forecast_path() -> str:
+    return str(getattr(settings, 'PRICE_FORECAST_PATH', None)
+               or os.path.join(str(getattr(settings, 'PRICE_STORE_DIR', settings.BASE_DIR)), 'forecasts.json'))
+
+
+def save_forecasts(document: Dict[str, Any], path: Optional[str] = None) -> str:
+    path = path or _forecast_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.forecasts.', suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+_loaded: Dict[str, Any] = {'path': None, 'mtime': None, 'document': None}
+_loaded_lock = threading.Lock()
+
+
+def _document() -> Optional[Dict[str, Any]]:
+    path = _forecast_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if _loaded['path'] != path or _loaded['mtime'] != mtime:
+        with _loaded_lock:
+            with open(path, encoding='utf-8') as f:
+                _loaded.update(path=path, mtime=mtime, document=json.load(f))
+    return _loaded['document']
+
+
+def get_forecast(commodity: str, mandi: Optional[str] = None, state: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Persisted forecast for a series: the exact (commodity, mandi, state)
+    when known, else the state aggregate, else the national aggregate.
+    """
+    document = _document()
+    if not document:
+        return None
+    series = document['series']
+    for key in (series_key(commodity, mandi, state), series_key(commodity, None, state), series_key(commodity)):
+        if key in series:
+            return dict(series[key], generated_at=document['generated_at'])
+    return None
+
+
+def update_forecasts(history_path: Optional[str] = None, output: Optional[str] = None) -> Dict[str, Any]:
+    """Nightly job: forecast from the price store (or a history file) and persist the result"""
+    history = history_from_file(history_path) if history_path else history_from_store()
+    document = run_batch_forecast(history)
+    path = save_forecasts(document, output)
+    models = [entry['model'] for entry in document['series'].values()]
+    logger.info(f"Wrote {len(models)} price forecasts to {path}")
+    return {
+        'path': path,
+        'series': len(models),
+        'models': {name: models.count(name) for name in MODELS},
+    }
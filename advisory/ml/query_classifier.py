@@ -0,0 +1,342 @@
+"""
+Local Query Classifier
+A small TF-IDF + linear model over character n-grams, distilled offline from
+the Gemini and keyword classifiers and served in-process, so classifying a
+chat query costs microseconds instead of a remote round trip:
+
+    prediction = confident_prediction('gehun ka mandi bhav kya hai')
+    # {'category': 'market_economics', 'confidence': 0.91, ...} or None
+
+Training (`manage.py train_query_classifier`) labels logged user queries
+with the existing classifiers, fits scikit-learn's LogisticRegression and
+calibrates it with temperature scaling on a held-out split. The fitted model
+is exported as plain arrays (vocabulary, idf, coefficients) to
+QUERY_CLASSIFIER_PATH, so serving needs only numpy. Without a model file
+`get_query_classifier` returns None and callers keep their current path.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+
+# Training-time only; serving uses the exported arrays
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    TfidfVectorizer = LogisticRegression = None
+    SKLEARN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# The Gemini classification taxonomy (advisory.services.google_ai_studio)
+CATEGORIES = (
+    'farming_agriculture', 'weather_climate', 'market_economics', 'government_policies', 'general_knowledge',
+    'technology_ai', 'education_learning', 'entertainment_fun', 'health_medical', 'mixed_query',
+)
+FARMING_CATEGORIES = {'farming_agriculture', 'weather_climate', 'market_economics', 'government_policies'}
+
+NGRAM_RANGE = (2, 4)
+REGULARIZATION_C = 10.0
+VALIDATION_FRACTION = 0.2
+MIN_TRAINING_SAMPLES = 20
+TEMPERATURES = np.exp(np.linspace(np.log(0.25), np.log(4.0), 41))
+RELOAD_CHECK_SECONDS = 60
+
+# ASCII punctuation and the Devanagari danda; \W would also drop Hindi vowel signs
+_PUNCTUATION = re.compile(r'[!-/:-@\[-`{-~।॥]+')
+
+
+def _model_path() -> str:
+    return str(getattr(settings, 'QUERY_CLASSIFIER_PATH', None)
+               or os.path.join(str(settings.BASE_DIR), 'models', 'query_classifier.npz'))
+
+
+def min_confidence() -> float:
+    return float(getattr(settings, 'QUERY_CLASSIFIER_MIN_CONFIDENCE', 0.75))
+
+
+def features(query: str) -> List[str]:
+    """Word tokens plus their space-padded character n-grams"""
+    text = _PUNCTUATION.sub(' ', (query or '').lower())
+    terms = []
+    for word in text.split():
+        terms.append(f'w:{word}')
+        padded = f' {word} '
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+            terms.extend(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+    return terms
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+class LocalQueryClassifier:
+    """Exported TF-IDF + multinomial logistic model with a calibration temperature"""
+
+    def __init__(self, vocabulary: Sequence[str], idf: np.ndarray, coef: np.ndarray, intercept: np.ndarray,
+                 classes: Sequence[str], temperature: float = 1.0, metadata: Optional[Dict[str, Any]] = None):
+        self.vocabulary = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        # (features, classes), so a query's logits are a weighted sum of a few rows
+        self.coef = np.ascontiguousarray(np.asarray(coef, dtype=np.float32))
+        self.intercept = np.asarray(intercept, dtype=np.float32)
+        self.classes = list(classes)
+        self.temperature = float(temperature)
+        self.metadata = metadata or {}
+
+    def logits(self, query: str) -> np.ndarray:
+        counts = Counter(self.vocabulary[term] for term in features(query) if term in self.vocabulary)
+        if not counts:
+            return self.intercept.astype(np.float64)
+        ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights = (1.0 + np.log(tf)) * self.idf[ids]
+        weights /= np.linalg.norm(weights)
+        return (weights @ self.coef[ids] + self.intercept).astype(np.float64)
+
+    def predict_proba(self, query: str) -> np.ndarray:
+        return _softmax(self.logits(query) / self.temperature)
+
+    def predict(self, query: str) -> Dict[str, Any]:
+        probabilities = self.predict_proba(query)
+        best = int(probabilities.argmax())
+        return {
+            'category': self.classes[best],
+            'confidence': round(float(probabilities[best]), 4),
+            'probabilities': {name: round(float(p), 4) for name, p in zip(self.classes, probabilities)},
+            'source': 'local_model',
+        }
+
+    # ------------------------------------------------------------ persistence
+
+    def save(self, path: str):
+        """Atomically write the model as an .npz of plain arrays"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                np.savez_compressed(
+                    handle, vocabulary=np.array(vocabulary, dtype=str), idf=self.idf, coef=self.coef,
+                    intercept=self.intercept, classes=np.array(self.classes, dtype=str),
+                    temperature=np.float64(self.temperature),
+                    metadata=np.array(json.dumps(self.metadata, ensure_ascii=False)),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'LocalQueryClassifier':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['vocabulary'].tolist(), data['idf'], data['coef'], data['intercept'],
+                data['classes'].tolist(), float(data['temperature']), json.loads(str(data['metadata'])),
+            )
+
+
+# ------------------------------------------------------------------ training
+
+def fit_temperature(logits: np.ndarray, labels: np.ndarray) -> float:
+    """Temperature minimising held-out negative log-likelihood"""
+    rows = np.arange(len(labels))
+    losses = [-np.log(_softmax(logits / t)[rows, labels] + 1e-12).mean() for t in TEMPERATURES]
+    return float(TEMPERATURES[int(np.argmin(losses))])
+
+
+def train(samples: Iterable[Tuple[str, str]], seed: int = 0) -> Tuple[LocalQueryClassifier, Dict[str, Any]]:
+    """Fit and calibrate a classifier on (query, category) pairs"""
+    if not SKLEARN_AVAILABLE:
+        raise RuntimeError('scikit-learn is required to train the query classifier')
+    samples = [(query, label) for query, label in samples if query and label in CATEGORIES]
+    if len(samples) < MIN_TRAINING_SAMPLES:
+        raise ValueError(f'need at least {MIN_TRAINING_SAMPLES} labelled queries, got {len(samples)}')
+
+    queries = np.array([query for query, _ in samples], dtype=object)
+    labels = np.array([label for _, label in samples], dtype=object)
+    order = np.random.default_rng(seed).permutation(len(samples))
+    holdout = order[:int(len(samples) * VALIDATION_FRACTION)]
+    fit = order[len(holdout):]
+
+    def fit_model(rows):
+        vectorizer = TfidfVectorizer(analyzer=features, sublinear_tf=True, dtype=np.float32)
+        matrix = vectorizer.fit_transform(queries[rows])
+        model = LogisticRegression(C=REGULARIZATION_C, max_iter=2000)
+        model.fit(matrix, labels[rows])
+        return vectorizer, model
+
+    temperature, accuracy = 1.0, None
+    if len(holdout) and len(set(labels[fit])) > 1:
+        vectorizer, model = fit_model(fit)
+        classes = list(model.classes_)
+        known = np.array([label in classes for label in labels[holdout]])
+        if known.any():
+            rows = holdout[known]
+            logits = model.decision_function(vectorizer.transform(queries[rows]))
+            if logits.ndim == 1:
+                logits = np.stack([-logits / 2, logits / 2], axis=1)
+            targets = np.array([classes.index(label) for label in labels[rows]])
+            temperature = fit_temperature(logits, targets)
+            accuracy = float((logits.argmax(axis=1) == targets).mean())
+
+    # Final model on everything, calibrated with the held-out temperature
+    vectorizer, model = fit_model(order)
+    coef, intercept = model.coef_, model.intercept_
+    if len(model.classes_) == 2:
+        coef = np.vstack([-coef[0] / 2, coef[0] / 2])
+        intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+    vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    summary = {
+        'trained_at': datetime.now().isoformat(),
+        'samples': len(samples),
+        'validation_samples': int(len(holdout)),
+        'validation_accuracy': accuracy,
+        'temperature': temperature,
+        'class_counts': dict(Counter(labels.tolist())),
+    }
+    classifier = LocalQueryClassifier(vocabulary, vectorizer.idf_, coef.T, intercept,
+                                      list(model.classes_), temperature, summary)
+    return classifier, summary
+
+
+def logged_queries(limit: int = 20000) -> List[str]:
+    """Distinct recent user messages from the chat history"""
+    from ..models import ChatHistory
+
+    rows = (ChatHistory.objects.filter(message_type='user').order_by('-created_at')
+            .values_list('message_content', flat=True)[:limit])
+    return list(dict.fromkeys(text.strip() for text in rows if text and text.strip()))
+
+
+def label_queries(queries: Iterable[str], use_llm: bool = False,
+                  min_llm_confidence: float = 0.7) -> List[Tuple[str, str, str]]:
+    """
+    (query, category, teacher) for each query the existing classifiers agree
+    on. With `use_llm` Gemini labels first; otherwise, or when it is unsure,
+    the keyword scorer's unique best category is kept only if the enhanced
+    classifier puts the query on the same (farming vs general) side.
+    """
+    from ..services.enhanced_classifier import EnhancedQueryClassifier
+    from ..services.google_ai_studio import GoogleAIStudio
+
+    studio = GoogleAIStudio()
+    enhanced = EnhancedQueryClassifier()
+    llm = use_llm and bool(studio.api_key)
+    labelled = []
+    for query in queries:
+        if llm:
+            result = studio._call_google_ai(studio.classification_prompt.replace('{query}', query))
+            if result and result.get('category') in CATEGORIES and \
+                    float(result.get('confidence', 0)) >= min_llm_confidence:
+                labelled.append((query, result['category'], 'llm'))
+                continue
+
+        scores = studio._keyword_scores(query.lower().strip())
+        best = max(scores.values())
+        winners = [name for name, score in scores.items() if score == best]
+        if best == 0 or len(winners) > 1:
+            continue
+        query_type = enhanced._keyword_classification(query)['query_type']
+        if (winners[0] in FARMING_CATEGORIES) == (query_type == 'farming') and query_type != 'mixed':
+            labelled.append((query, winners[0], 'keywords'))
+    return labelled
+
+
+def seed_queries() -> List[Tuple[str, str, str]]:
+    """The hand-labelled few-shot examples from the Gemini prompt"""
+    from ..services.google_ai_studio import GoogleAIStudio
+    return [(example['query'], example['category'], 'seed') for example in GoogleAIStudio().training_examples]
+
+
+def train_from_logs(limit: int = 20000, use_llm: bool = False, output: Optional[str] = None,
+                    extra: Iterable[Tuple[str, str]] = ()) -> Dict[str, Any]:
+    """Label logged queries, train, write the model and reload it in this process"""
+    labelled = seed_queries() + label_queries(logged_queries(limit), use_llm=use_llm)
+    labelled += [(query, label, 'file') for query, label in extra]
+    classifier, summary = train((query, label) for query, label, _ in labelled)
+    summary['teachers'] = dict(Counter(teacher for _, _, teacher in labelled))
+    classifier.metadata = summary
+    path = output or _model_path()
+    classifier.save(path)
+    reset_query_classifier()
+    logger.info(f"Trained query classifier on {summary['samples']} queries -> {path}")
+    return dict(summary, path=path)
+
+
+# ------------------------------------------------------------------- serving
+
+_classifier: Optional[LocalQueryClassifier] = None
+_loaded_mtime: Optional[float] = None
+_checked_at = 0.0
+_classifier_lock = threading.Lock()
+
+
+def get_query_classifier() -> Optional[LocalQueryClassifier]:
+    """Process-wide classifier, reloaded when the model file changes; None without one"""
+    global _classifier, _loaded_mtime, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < RELOAD_CHECK_SECONDS and _checked_at:
+        return _classifier
+    with _classifier_lock:
+        if now - _checked_at < RELOAD_CHECK_SECONDS and _checked_at:
+            return _classifier
+        path = _model_path()
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != _loaded_mtime:
+            try:
+                _classifier = LocalQueryClassifier.load(path) if mtime is not None else None
+                if _classifier:
+                    logger.info(f"Loaded query classifier from {path} ({len(_classifier.vocabulary)} features)")
+            except Exception as e:
+                logger.warning(f"Could not load query classifier from {path}: {e}")
+                _classifier = None
+            _loaded_mtime = mtime
+        _checked_at = now
+    return _classifier
+
+
+def reset_query_classifier():
+    """Forget the loaded model so the next call reads the file again"""
+    global _classifier, _loaded_mtime, _checked_at
+    with _classifier_lock:
+        _classifier, _loaded_mtime, _checked_at = None, None, 0.0
+
+
+def local_prediction(query: str) -> Optional[Dict[str, Any]]:
+    """The local model's prediction, or None without a model"""
+    classifier = get_query_classifier()
+    if classifier is None or not (query or '').strip():
+        return None
+    try:
+        return classifier.predict(query)
+    except Exception as e:
+        logger.warning(f"Local query classification failed: {e}")
+        return None
+
+
+def confident_prediction(query: str) -> Optional[Dict[str, Any]]:
+    """The local prediction when it clears QUERY_CLASSIFIER_MIN_CONFIDENCE, else None"""
+    prediction = local_prediction(query)
+    if prediction and prediction['confidence'] >= min_confidence():
+        return prediction
+    return None
@@ -10,15 +10,18 @@ import time
 from datetime import datetime
 from typing import Dict, Any, List
 # from ..services.enhanced_government_api import EnhancedGovernmentAPI
-from ..services.accurate_location_api import get_accurate_location
 import sys
 import os
-from ..services.enhanced_classifier import enhanced_classifier
-from ..services.enhanced_multilingual import enhanced_multilingual
-from ..services.general_apis import general_apis_service
-from ..services.ai_ml_crop_recommendation import ai_ml_crop_system
-from ..services.google_ai_studio import google_ai_studio
-from ..services.ollama_integration import ollama_integration
+from ..lazy_imports import lazy_import
+
+# Service singletons are resolved on first use; several build large tables or models
+get_accurate_location = lazy_import('advisory.services.accurate_location_api', 'get_accurate_location')
+enhanced_classifier = lazy_import('advisory.services.enhanced_classifier', 'enhanced_classifier')
+enhanced_multilingual = lazy_import('advisory.services.enhanced_multilingual', 'enhanced_multilingual')
+general_apis_service = lazy_import('advisory.services.general_apis', 'general_apis_service')
+ai_ml_crop_system = lazy_import('advisory.services.ai_ml_crop_recommendation', 'ai_ml_crop_system')
+google_ai_studio = lazy_import('advisory.services.google_ai_studio', 'google_ai_studio')
+ollama_integration = lazy_import('advisory.services.ollama_integration', 'ollama_integration')
 # Import ComprehensiveGovernmentAPI with fallback
 try:
     from ..services.comprehensive_government_api import ComprehensiveGovernmentAPI
@@ -33,7 +36,7 @@ except ImportError:
             return []
         def get_government_schemes(self, *args, **kwargs):
             return []
-from .self_learning_ai import self_learning_ai
+self_learning_ai = lazy_import('advisory.ml.self_learning_ai', 'self_learning_ai')
 
 # Import ChatGPT-level enhancer
 try:
@@ -2985,98 +2988,10 @@ class UltimateIntelligentAI:
     
     def _get_government_schemes_data(self, location: str, language: str) -> list:
         """Get government schemes data for the location"""
-        schemes = [
-            {
-                'name': 'PM Kisan Samman Nidhi',
-                'benefit': '₹6,000 per year in 3 installments',
-                'description': 'Direct income support for farmers',
-                'eligibility': 'All small and marginal farmers',
-                'application': 'Online through PM Kisan portal'
-            },
-            {
-                'name': 'PM Fasal Bima Yojana',
-                'benefit': 'Crop insurance against losses',
-                'description': 'Comprehensive crop insurance scheme',
-                'eligibility': 'All farmers growing notified crops',
-                'application': 'Through Common Service Centres'
-            },
-            {
-                'name': 'Soil Health Card',
-                'benefit': 'Free soil testing every 3 years',
-                'description': 'Soil health assessment and recommendations',
-                'eligibility': 'All farmers',
-                'application': 'Through Krishi Vigyan Kendras'
-            },
-            {
-                'name': 'Kisan Credit Card',
-                'benefit': 'Credit up to ₹3 lakh at 4% interest',
-                'description': 'Easy credit facility for farmers',
-                'eligibility': 'All farmers',
-                'application': 'Through banks and cooperatives'
-            },
-            {
-                'name': 'PM Krishi Sinchai Yojana',
-                'benefit': 'Irrigation support with up to 50% subsidy',
-                'description': 'Water conservation and irrigation scheme',
-                'eligibility': 'Farmers with landholding',
-                'application': 'Through state agriculture departments'
-            },
-            {
-                'name': 'Operation Green',
-                'benefit': 'Support for vegetables and fruits',
-                'description': 'Price stabilization for perishables',
-                'eligibility': 'Vegetable and fruit farmers',
-                'application': 'Through FPOs and cooperatives'
-            },
-            {
-                'name': 'National Food Security Mission',
-                'benefit': 'Support for food grain production',
-                'description': 'Promoting food grain production',
-                'eligibility': 'Rice, wheat, and pulse farmers',
-                'application': 'Through state agriculture departments'
-            }
-        ]
-        
-        if language == 'hi':
-            return [
-                {
-                    'name': 'पीएम किसान सम्मान निधि',
-                    'benefit': '₹6,000 प्रति वर्ष 3 किस्तों में',
-                    'description': 'किसानों के लिए प्रत्यक्ष आय सहायता',
-                    'eligibility': 'सभी छोटे और सीमांत किसान',
-                    'application': 'पीएम किसान पोर्टल के माध्यम से ऑनलाइन'
-                },
-                {
-                    'name': 'पीएम फसल बीमा योजना',
-                    'benefit': 'नुकसान के खिलाफ फसल बीमा',
-                    'description': 'व्यापक फसल बीमा योजना',
-                    'eligibility': 'सूचित फसल उगाने वाले सभी किसान',
-                    'application': 'कॉमन सर्विस सेंटर के माध्यम से'
-                },
-                {
-                    'name': 'मृदा स्वास्थ्य कार्ड',
-                    'benefit': 'हर 3 साल में मुफ्त मिट्टी परीक्षण',
-                    'description': 'मिट्टी स्वास्थ्य मूल्यांकन और सुझाव',
-                    'eligibility': 'सभी किसान',
-                    'application': 'कृषि विज्ञान केंद्र के माध्यम से'
-                },
-                {
-                    'name': 'किसान क्रेडिट कार्ड',
-                    'benefit': '4% ब्याज दर पर ₹3 लाख तक क्रेडिट',
-                    'description': 'किसानों के लिए आसान क्रेडिट सुविधा',
-                    'eligibility': 'सभी किसान',
-                    'application': 'बैंकों और सहकारी समितियों के माध्यम से'
-                },
-                {
-                    'name': 'पीएम कृषि सिंचाई योजना',
-                    'benefit': '50% सब्सिडी के साथ सिंचाई सहायता',
-                    'description': 'जल संरक्षण और सिंचाई योजना',
-                    'eligibility': 'भूमि धारक किसान',
-                    'application': 'राज्य कृषि विभागों के माध्यम से'
-                }
-            ]
-        else:
-            return schemes
+        from ..services.scheme_catalog import get_scheme_catalog
+
+        schemes = get_scheme_catalog().lookup(location, language=language, page_size=7)['schemes']
+        return [dict(scheme, benefit=scheme['amount']) for scheme in schemes]
     
     def _generate_intelligent_fallback_crop_response(self, location: str, season: str, lat: float, lon: float, language: str) -> str:
         """Generate HIGHLY ACCURATE and PREDICTABLE crop response based on location, season, and coordinates"""
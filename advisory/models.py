@@ -77,6 +77,37 @@ class UserFeedback(models.Model):
     def __str__(self):
         return f"Feedback from {self.user_id} for {self.prediction_type} - Rating: {self.feedback_rating}"
 
+class FeedbackDailyRollup(models.Model):
+    """Materialized per-day, per-prediction-type feedback counters"""
+
+    date = models.DateField(help_text="Day the feedback was created")
+    prediction_type = models.CharField(max_length=50, help_text="Type of prediction")
+
+    # Counters (all additive across days)
+    total_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0, help_text="Sum of ratings, for averages")
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+    with_text_count = models.IntegerField(default=0, help_text="Feedback entries with comments")
+    geo_count = models.IntegerField(default=0, help_text="Feedback entries with coordinates")
+    user_sketch = models.BinaryField(default=b'', help_text="HyperLogLog registers of this day's users")
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'feedback_daily_rollup'
+        unique_together = [('date', 'prediction_type')]
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['prediction_type', 'date']),
+        ]
+
+    def __str__(self):
+        return f"Rollup {self.date} {self.prediction_type}: {self.total_count} feedback"
+
 class MLModelPerformance(models.Model):
     """Model to track ML model performance metrics"""
     
@@ -234,6 +265,24 @@ class ChatSession(models.Model):
     def __str__(self):
         return f"Chat session {self.session_id} for user {self.user_id}"
 
+class AlertDelivery(models.Model):
+    """Idempotency ledger for alert fan-out: one row per alert, provider and recipient"""
+
+    alert_id = models.CharField(max_length=200, help_text="Alert identifier, e.g. weather:heavy_rain:<date>")
+    provider = models.CharField(max_length=50, help_text="Delivery provider name")
+    recipient = models.CharField(max_length=100, help_text="User ID the alert was delivered to")
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'alert_deliveries'
+        unique_together = [('alert_id', 'provider', 'recipient')]
+        indexes = [
+            models.Index(fields=['sent_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.alert_id} via {self.provider} to {self.recipient}"
+
 class ForumPost(models.Model):
     """
     Model for community forum posts.
@@ -0,0 +1,5 @@
+"""
+Runtime monitoring: per-route request timings kept in ring buffers
+(advisory.middleware.request_timing), a background system sampler and the
+snapshots read by the monitoring API.
+"""
@@ -0,0 +1,277 @@
+"""
+Performance Monitor
+Request timings and system health for the monitoring API.
+
+Three parts, none of which blocks a request:
+
+- RequestTimingMiddleware (advisory.middleware.request_timing) appends
+  (time, status, duration_ms) for each request to a per-route RingBuffer.
+- SystemSampler, a daemon thread per process, reads CPU, memory, open file
+  descriptors and threads with psutil every PERFORMANCE_SAMPLE_INTERVAL
+  seconds. It also summarises recent request rate, error rate and p95, and
+  publishes the result as one snapshot dict, replaced by reference.
+- The views read that snapshot. A health check is a dict copy, and it never
+  calls psutil or waits on a lock the request path holds.
+
+Routes are keyed by "METHOD view_name" rather than the raw path, so IDs in
+URLs do not create unbounded keys. After PERFORMANCE_MAX_ROUTES routes,
+further ones share the 'other' bucket.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import psutil
+from django.conf import settings
+
+from .ring_buffer import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+RECENT_WINDOW = 60.0          # seconds of requests summarised in each snapshot
+OVERFLOW_ROUTE = 'other'
+
+# (degraded, critical) thresholds
+CPU_THRESHOLDS = (85.0, 95.0)
+MEMORY_THRESHOLDS = (85.0, 95.0)
+ERROR_RATE_THRESHOLDS = (0.05, 0.25)
+P95_MS_THRESHOLDS = (2000.0, 10000.0)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(round(fraction * len(sorted_values), 9)) - 1
+    rank = max(0, min(len(sorted_values) - 1, rank))
+    return sorted_values[rank]
+
+
+def summarise(records: List[tuple]) -> Dict[str, Any]:
+    """Count, errors and latency percentiles of (time, status, duration_ms) records"""
+    durations = sorted(record[2] for record in records)
+    errors = sum(1 for record in records if record[1] >= 500)
+    statuses: Dict[str, int] = {}
+    for record in records:
+        family = f'{record[1] // 100}xx'
+        statuses[family] = statuses.get(family, 0) + 1
+    count = len(durations)
+    return {
+        'count': count,
+        'errors': errors,
+        'error_rate': round(errors / count, 4) if count else 0.0,
+        'mean_ms': round(sum(durations) / count, 2) if count else 0.0,
+        'p50_ms': round(percentile(durations, 0.50), 2),
+        'p95_ms': round(percentile(durations, 0.95), 2),
+        'p99_ms': round(percentile(durations, 0.99), 2),
+        'max_ms': round(durations[-1], 2) if count else 0.0,
+        'status_codes': statuses,
+    }
+
+
+def grade(value: float, thresholds: tuple) -> str:
+    if value >= thresholds[1]:
+        return 'critical'
+    if value >= thresholds[0]:
+        return 'degraded'
+    return 'healthy'
+
+
+class SystemSampler:
+    """Background thread that publishes a system snapshot at a fixed interval"""
+
+    def __init__(self, monitor: 'PerformanceMonitor', interval: float = 5.0):
+        self.monitor = monitor
+        self.interval = interval
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self._process: Optional[psutil.Process] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def ensure_running(self):
+        """Start the thread once per process; a forked worker starts its own"""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._process = psutil.Process(self._pid)
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='system-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def sample(self) -> Dict[str, Any]:
+        """Take one sample and publish it"""
+        process = self._process or psutil.Process()
+        memory = psutil.virtual_memory()
+        with process.oneshot():
+            rss = process.memory_info().rss
+            threads = process.num_threads()
+            try:
+                open_files = process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+            except (psutil.Error, OSError):
+                open_files = None
+        snapshot = {
+            'sampled_at': time.time(),
+            'pid': process.pid,
+            # interval=None compares against the previous call, so it never sleeps
+            'cpu': {'percent': psutil.cpu_percent(interval=None), 'count': psutil.cpu_count()},
+            'memory': {'percent': memory.percent, 'available_mb': round(memory.available / 2 ** 20, 1),
+                       'used_mb': round(memory.used / 2 ** 20, 1)},
+            'process': {'rss_mb': round(rss / 2 ** 20, 1), 'threads': threads, 'open_files': open_files},
+            'requests': self.monitor.recent_requests(),
+        }
+        self.snapshot = snapshot
+        return snapshot
+
+    def _run(self):
+        psutil.cpu_percent(interval=None)       # prime the CPU counter
+        stop = self._stop
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"System sample failed: {e}")
+            if stop.wait(self.interval):
+                return
+
+
+class PerformanceMonitor:
+    """Per-route request timings, user activity and the latest system snapshot"""
+
+    def __init__(self, ring_size: Optional[int] = None, max_routes: Optional[int] = None,
+                 sample_interval: Optional[float] = None):
+        self.ring_size = int(ring_size or getattr(settings, 'PERFORMANCE_RING_SIZE', 1024))
+        self.max_routes = int(max_routes or getattr(settings, 'PERFORMANCE_MAX_ROUTES', 200))
+        self.started_at = time.time()
+        self._routes: Dict[str, RingBuffer] = {}
+        self._recent = RingBuffer(self.ring_size * 4)
+        self._activity = RingBuffer(self.ring_size)
+        self.sampler = SystemSampler(
+            self, float(sample_interval or getattr(settings, 'PERFORMANCE_SAMPLE_INTERVAL', 5)))
+
+    def record_request(self, route: str, method: str, status_code: int, duration_ms: float):
+        """Called by the middleware on every request; appends only, never locks"""
+        key = f'{method} {route}'
+        buffer = self._routes.get(key)
+        if buffer is None:
+            if len(self._routes) >= self.max_routes:
+                key = OVERFLOW_ROUTE
+            buffer = self._routes.setdefault(key, RingBuffer(self.ring_size))
+        record = (time.time(), int(status_code), float(duration_ms))
+        buffer.append(record)
+        self._recent.append(record)
+
+    def record_user_activity(self, user_id: Any, activity_type: str, details: Optional[Dict[str, Any]] = None):
+        self._activity.append((time.time(), str(user_id), str(activity_type), details or {}))
+
+    def recent_requests(self, window: float = RECENT_WINDOW) -> Dict[str, Any]:
+        """Rate, error rate and latency of requests in the last `window` seconds"""
+        cutoff = time.time() - window
+        stats = summarise([record for record in self._recent.items() if record[0] >= cutoff])
+        return {
+            'window_seconds': window,
+            'per_minute': round(stats['count'] * 60.0 / window, 2),
+            'error_rate': stats['error_rate'],
+            'p95_ms': stats['p95_ms'],
+        }
+
+    def system_snapshot(self) -> Optional[Dict[str, Any]]:
+        self.sampler.ensure_running()
+        return self.sampler.snapshot
+
+    def get_system_health_status(self) -> Dict[str, Any]:
+        """Latest snapshot with an overall status; reads memory only"""
+        snapshot = self.system_snapshot()
+        now = time.time()
+        health = {
+            'status': 'starting',
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'uptime_seconds': round(now - self.started_at, 1),
+        }
+        if snapshot is None:
+            return health
+        grades = [
+            grade(snapshot['cpu']['percent'], CPU_THRESHOLDS),
+            grade(snapshot['memory']['percent'], MEMORY_THRESHOLDS),
+            grade(snapshot['requests']['error_rate'], ERROR_RATE_THRESHOLDS),
+            grade(snapshot['requests']['p95_ms'], P95_MS_THRESHOLDS),
+        ]
+        health.update(snapshot)
+        health['status'] = ('critical' if 'critical' in grades else
+                            'degraded' if 'degraded' in grades else 'healthy')
+        health['sample_age_seconds'] = round(now - snapshot['sampled_at'], 2)
+        return health
+
+    def get_api_performance_summary(self, hours: float = 24) -> Dict[str, Any]:
+        """Latency percentiles per route over the last `hours`, from the ring buffers"""
+        cutoff = time.time() - float(hours) * 3600
+        routes, everything = {}, []
+        for key, buffer in list(self._routes.items()):
+            records = [record for record in buffer.items() if record[0] >= cutoff]
+            if records:
+                routes[key] = summarise(records)
+                routes[key]['dropped'] = max(0, buffer.total - len(buffer))
+                everything.extend(records)
+        overall = summarise(everything)
+        overall.pop('status_codes')
+        return {
+            'period_hours': hours,
+            'generated_at': datetime.now().isoformat(),
+            'ring_size': self.ring_size,
+            'overall': overall,
+            'routes': dict(sorted(routes.items(), key=lambda item: -item[1]['count'])),
+        }
+
+    def get_user_activity_summary(self, hours: float = 24) -> Dict[str, Any]:
+        cutoff = time.time() - float(hours) * 3600
+        activity = [entry for entry in self._activity.items() if entry[0] >= cutoff]
+        by_type: Dict[str, int] = {}
+        for entry in activity:
+            by_type[entry[2]] = by_type.get(entry[2], 0) + 1
+        return {'events': len(activity), 'users': len({entry[1] for entry in activity}), 'by_type': by_type}
+
+    def reset(self):
+        self._routes = {}
+        self._recent = RingBuffer(self.ring_size * 4)
+        self._activity = RingBuffer(self.ring_size)
+
+
+performance_monitor = PerformanceMonitor()
+
+
+def record_request(route: str, method: str, status_code: int, duration_ms: float):
+    performance_monitor.record_request(route, method, status_code, duration_ms)
+
+
+def record_user_activity(user_id: Any, activity_type: str, details: Optional[Dict[str, Any]] = None):
+    performance_monitor.record_user_activity(user_id, activity_type, details)
+
+
+def get_system_health_status() -> Dict[str, Any]:
+    return performance_monitor.get_system_health_status()
+
+
+def get_api_performance_summary(hours: float = 24) -> Dict[str, Any]:
+    return performance_monitor.get_api_performance_summary(hours)
+
+
+def get_performance_summary(hours: float = 1) -> Dict[str, Any]:
+    """System snapshot, API latency and user activity in one payload"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'system': performance_monitor.get_system_health_status(),
+        'api': performance_monitor.get_api_performance_summary(hours),
+        'user_activity': performance_monitor.get_user_activity_summary(hours),
+    }
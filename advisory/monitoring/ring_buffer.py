@@ -0,0 +1,47 @@
+"""
+Ring Buffer
+Fixed-size buffer of the most recent items, written from request threads
+without a lock. A slot index comes from itertools.count, whose next() is
+atomic under the GIL, and storing a reference into a list slot is a single
+bytecode. Writers never block one another or a reader. A reader copies the
+slots list and may see a slot that is one write newer than the rest, which
+is acceptable for latency statistics.
+"""
+
+import itertools
+from typing import Any, List
+
+
+class RingBuffer:
+    """The last `capacity` items appended, oldest first on read"""
+
+    __slots__ = ('capacity', '_slots', '_counter', '_written')
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self._slots: List[Any] = [None] * capacity
+        self._counter = itertools.count()
+        self._written = 0
+
+    def append(self, item: Any):
+        index = next(self._counter)
+        self._slots[index % self.capacity] = item
+        self._written = index + 1
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Items ever appended, including those overwritten"""
+        return self._written
+
+    def items(self) -> List[Any]:
+        written = self._written
+        slots = list(self._slots)
+        if written <= self.capacity:
+            return [item for item in slots[:written] if item is not None]
+        start = written % self.capacity
+        return [item for item in slots[start:] + slots[:start] if item is not None]
@@ -0,0 +1,287 @@
+"""
+Request Tracing
+In-process span trees showing which stage of a request was slow:
+
+    with span('gov.market_prices', location=location):
+        ...
+
+    @traced('chatbot.geocode')
+    def _geocode(self, place): ...
+
+RequestTimingMiddleware opens a root span for every request. Nested spans
+find their parent through a ContextVar, so no trace object is passed
+around. A ContextVar is not inherited by a new thread or an executor task,
+so wrap the callable with propagate() at submission time. Outside a request,
+span() and traced() return immediately.
+
+Traces are tail-sampled when the root span ends. A trace is kept if it
+took at least TRACE_SLOW_MS, raised, or falls in the random TRACE_SAMPLE_RATE
+fraction. Kept traces go into a RingBuffer of TRACE_STORE_SIZE. They are
+rendered only when read by /api/monitoring/traces/ (staff only), as span
+trees with self time, the time not covered by child spans.
+"""
+
+import contextvars
+import functools
+import logging
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+
+from .ring_buffer import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('trace_span', default=None)
+
+
+class Trace:
+    __slots__ = ('trace_id', 'started_at', 'root', 'span_count', 'max_spans', 'reason')
+
+    def __init__(self, max_spans: int):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.root: Optional['Span'] = None
+        self.span_count = 0
+        self.max_spans = max_spans
+        self.reason: Optional[str] = None
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'start', 'end', 'children', 'error', 'trace')
+
+    def __init__(self, name: str, trace: Trace, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.trace = trace
+        self.children: List['Span'] = []
+        self.error: Optional[str] = None
+        self.end: Optional[float] = None
+        self.start = time.perf_counter()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+@contextmanager
+def _enter(active: Span) -> Iterator[Span]:
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.error = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        active.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """Child of the current span; a no-op outside a trace or past TRACE_MAX_SPANS"""
+    parent = _current_span.get()
+    if parent is None or parent.trace.span_count >= parent.trace.max_spans:
+        yield None
+        return
+    parent.trace.span_count += 1
+    child = Span(name, parent.trace, attrs)
+    parent.children.append(child)
+    with _enter(child):
+        yield child
+
+
+@contextmanager
+def start_trace(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """Root span of a new trace, offered to the trace store when it ends"""
+    store = get_trace_store()
+    if not store.enabled or _current_span.get() is not None:
+        with span(name, **attrs) as nested:
+            yield nested
+        return
+    trace = Trace(store.max_spans)
+    trace.root = Span(name, trace, attrs)
+    try:
+        with _enter(trace.root):
+            yield trace.root
+    finally:
+        store.offer(trace)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator: run the function inside span(name or its qualified name)"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """func bound to a copy of the current context, for one thread or executor task"""
+    if _current_span.get() is None:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def render_span(node: Span, origin: float, trace_end: float) -> Dict[str, Any]:
+    """Span tree as dicts with start, duration and self time in milliseconds"""
+    end = node.end if node.end is not None else trace_end
+    children = [render_span(child, origin, trace_end) for child in sorted(node.children, key=lambda c: c.start)]
+    # Self time excludes the union of child intervals, so parallel children are not counted twice
+    covered, cursor = 0.0, node.start
+    for child in sorted(node.children, key=lambda c: c.start):
+        child_start = max(child.start, cursor)
+        child_end = min(child.end if child.end is not None else trace_end, end)
+        if child_end > child_start:
+            covered += child_end - child_start
+            cursor = child_end
+    rendered = {
+        'name': node.name,
+        'start_ms': round((node.start - origin) * 1000, 3),
+        'duration_ms': round((end - node.start) * 1000, 3),
+        'self_ms': round(max(0.0, end - node.start - covered) * 1000, 3),
+        'children': children,
+    }
+    if node.attrs:
+        rendered['attrs'] = dict(node.attrs)
+    if node.error:
+        rendered['error'] = node.error
+    if node.end is None:
+        rendered['unfinished'] = True
+    return rendered
+
+
+def stage_breakdown(tree: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Self time and calls per span name, largest first"""
+    stages: Dict[str, Dict[str, Any]] = {}
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        stage = stages.setdefault(node['name'], {'name': node['name'], 'self_ms': 0.0, 'calls': 0})
+        stage['self_ms'] += node['self_ms']
+        stage['calls'] += 1
+        stack.extend(node['children'])
+    for stage in stages.values():
+        stage['self_ms'] = round(stage['self_ms'], 3)
+    return sorted(stages.values(), key=lambda s: -s['self_ms'])
+
+
+def render_text(tree: Dict[str, Any], depth: int = 0) -> List[str]:
+    """Indented one-line-per-span view of a tree"""
+    line = f"{tree['duration_ms']:>10.1f}ms  self {tree['self_ms']:>9.1f}ms  {'  ' * depth}{tree['name']}"
+    if tree.get('error'):
+        line += f"  !! {tree['error']}"
+    lines = [line]
+    for child in tree['children']:
+        lines.extend(render_text(child, depth + 1))
+    return lines
+
+
+class TraceStore:
+    """Bounded store of tail-sampled traces"""
+
+    def __init__(self, capacity: int = 200, slow_ms: float = 1000.0, sample_rate: float = 0.01,
+                 max_spans: int = 500, enabled: bool = True):
+        self.capacity = capacity
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.max_spans = max_spans
+        self.enabled = enabled
+        self._traces = RingBuffer(capacity)
+        self._seen = 0
+
+    def offer(self, trace: Trace) -> bool:
+        """Keep the finished trace if it was slow, failed or is sampled"""
+        self._seen += 1
+        duration_ms = (trace.root.end - trace.root.start) * 1000
+        if duration_ms >= self.slow_ms:
+            trace.reason = 'slow'
+        elif trace.root.error:
+            trace.reason = 'error'
+        elif random.random() < self.sample_rate:
+            trace.reason = 'sampled'
+        else:
+            return False
+        self._traces.append(trace)
+        return True
+
+    def render(self, trace: Trace, text: bool = False) -> Dict[str, Any]:
+        root = trace.root
+        tree = render_span(root, root.start, root.end if root.end is not None else time.perf_counter())
+        rendered = {
+            'trace_id': trace.trace_id,
+            'name': root.name,
+            'started_at': trace.started_at,
+            'duration_ms': tree['duration_ms'],
+            'reason': trace.reason,
+            'spans': trace.span_count + 1,
+            'stages': stage_breakdown(tree),
+            'root': tree,
+        }
+        if text:
+            rendered['text'] = render_text(tree)
+        return rendered
+
+    def traces(self, limit: int = 20, min_ms: float = 0.0, name: Optional[str] = None,
+               text: bool = False) -> List[Dict[str, Any]]:
+        """Kept traces, newest first"""
+        found = []
+        for trace in reversed(self._traces.items()):
+            duration_ms = (trace.root.end - trace.root.start) * 1000
+            if duration_ms < min_ms or (name and name not in trace.root.name):
+                continue
+            found.append(self.render(trace, text))
+            if len(found) >= limit:
+                break
+        return found
+
+    def get(self, trace_id: str, text: bool = True) -> Optional[Dict[str, Any]]:
+        for trace in self._traces.items():
+            if trace.trace_id == trace_id:
+                return self.render(trace, text)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {'enabled': self.enabled, 'seen': self._seen, 'kept': self._traces.total,
+                'stored': len(self._traces), 'capacity': self.capacity, 'slow_ms': self.slow_ms,
+                'sample_rate': self.sample_rate}
+
+
+_store: Optional[TraceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_trace_store() -> TraceStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TraceStore(
+                    capacity=int(getattr(settings, 'TRACE_STORE_SIZE', 200)),
+                    slow_ms=float(getattr(settings, 'TRACE_SLOW_MS', 1000)),
+                    sample_rate=float(getattr(settings, 'TRACE_SAMPLE_RATE', 0.01)),
+                    max_spans=int(getattr(settings, 'TRACE_MAX_SPANS', 500)),
+                    enabled=bool(getattr(settings, 'TRACING_ENABLED', True)),
+                )
+    return _store
+
+
+def reset_trace_store(store: Optional[TraceStore] = None):
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,520 @@
+"""
+Alert Fan-out
+Evaluates weather and price alert rules per weather tile or mandi, resolves
+the farmers in the affected area through a grid index over session
+coordinates, and delivers in provider-sized batches with per-provider rate
+limits, retries and per-recipient idempotency.
+
+    index = SubscriberIndex.from_sessions()
+    fan_out_weather_alerts(index)                      # scheduled, per tile
+    fan_out_warning('imd-2024-07-12-12', {...}, index)  # an IMD warning area
+"""
+
+import hashlib
+import logging
+import math
+import operator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import requests
+from django.utils import timezone
+
+from ..models import AlertDelivery, ChatSession, UserSession
+from ..rate_limiters import RateLimiter
+from .mandi_database import ALL_INDIA_MANDIS
+from .notifications import send_push_notification
+from .sms_ivr import send_sms
+
+logger = logging.getLogger(__name__)
+
+TILE_DEGREES = 0.25          # ~28 km grid, close to the IMD gridded forecast resolution
+EARTH_RADIUS_KM = 6371.0
+IDEMPOTENCY_TTL = 2 * 24 * 3600
+OPEN_METEO_URL = 'https://api.open-meteo.com/v1/forecast'
+OPEN_METEO_BATCH = 100       # coordinates per Open-Meteo request
+
+# Vectorized over tiles; thresholds follow IMD heavy rain / heatwave / wind criteria
+WEATHER_RULES = [
+    {
+        'id': 'heavy_rain', 'field': 'precipitation_mm', 'op': '>=', 'threshold': 64.5,
+        'messages': {
+            'en': ('Heavy rain alert', 'Heavy rain expected in your area in the next 24 hours. Delay spraying and secure harvested produce.'),
+            'hi': ('भारी बारिश चेतावनी', 'अगले 24 घंटों में आपके क्षेत्र में भारी बारिश की संभावना है। छिड़काव टालें और कटी फसल सुरक्षित रखें।'),
+        },
+    },
+    {
+        'id': 'heatwave', 'field': 'temperature_max_c', 'op': '>=', 'threshold': 45.0,
+        'messages': {
+            'en': ('Heatwave alert', 'Severe heat expected. Irrigate in the evening and protect livestock from the sun.'),
+            'hi': ('लू चेतावनी', 'तेज गर्मी की संभावना है। शाम को सिंचाई करें और पशुओं को धूप से बचाएं।'),
+        },
+    },
+    {
+        'id': 'frost', 'field': 'temperature_min_c', 'op': '<=', 'threshold': 2.0,
+        'messages': {
+            'en': ('Frost alert', 'Frost likely tonight. Give light irrigation to protect standing crops.'),
+            'hi': ('पाला चेतावनी', 'आज रात पाला पड़ने की संभावना है। खड़ी फसल बचाने के लिए हल्की सिंचाई करें।'),
+        },
+    },
+    {
+        'id': 'strong_wind', 'field': 'wind_max_kmph', 'op': '>=', 'threshold': 50.0,
+        'messages': {
+            'en': ('Strong wind alert', 'Strong winds expected. Stake tall crops and postpone spraying.'),
+            'hi': ('तेज हवा चेतावनी', 'तेज हवाओं की संभावना है। ऊंची फसलों को सहारा दें और छिड़काव टालें।'),
+        },
+    },
+]
+
+PRICE_RULES = [
+    {
+        'id': 'price_drop', 'field': 'change_percent', 'op': '<=', 'threshold': -10.0, 'radius_km': 50,
+        'messages': {
+            'en': ('Price drop at {mandi}', '{commodity} modal price fell {change:.0f}% this week to Rs {price:.0f}/quintal.'),
+            'hi': ('{mandi} में भाव गिरा', '{commodity} का भाव इस सप्ताह {change:.0f}% गिरकर ₹{price:.0f}/क्विंटल हुआ।'),
+        },
+    },
+    {
+        'id': 'price_spike', 'field': 'change_percent', 'op': '>=', 'threshold': 15.0, 'radius_km': 50,
+        'messages': {
+            'en': ('Price rise at {mandi}', '{commodity} modal price rose {change:.0f}% this week to Rs {price:.0f}/quintal.'),
+            'hi': ('{mandi} में भाव बढ़ा', '{commodity} का भाव इस सप्ताह {change:.0f}% बढ़कर ₹{price:.0f}/क्विंटल हुआ।'),
+        },
+    },
+]
+
+_OPS = {'>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt}
+
+
+def tile_of(latitude, longitude) -> Tuple[int, int]:
+    return int(math.floor(latitude / TILE_DEGREES)), int(math.floor(longitude / TILE_DEGREES))
+
+
+def tile_center(tile: Tuple[int, int]) -> Tuple[float, float]:
+    return (tile[0] + 0.5) * TILE_DEGREES, (tile[1] + 0.5) * TILE_DEGREES
+
+
+def _haversine_km(lat, lon, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat, lon, lats, lons = map(np.radians, (lat, lon, lats, lons))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class SubscriberIndex:
+    """
+    Grid index of farmers by their last known coordinates. Users are held
+    in parallel NumPy arrays and each occupied tile maps to the array
+    positions inside it, so area lookups touch only the covering tiles.
+    """
+
+    def __init__(self, user_ids: Sequence[str], latitudes, longitudes, languages: Optional[Sequence[str]] = None):
+        self.user_ids = np.asarray(user_ids, dtype=object)
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.languages = np.asarray(languages if languages is not None else ['en'] * len(self.user_ids), dtype=object)
+
+        rows = np.floor(self.latitudes / TILE_DEGREES).astype(np.int64)
+        cols = np.floor(self.longitudes / TILE_DEGREES).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        keys = np.stack([rows[order], cols[order]], axis=1)
+        self._tiles: Dict[Tuple[int, int], np.ndarray] = {}
+        if len(order):
+            starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+            for start, end in zip(starts, np.r_[starts[1:], len(order)]):
+                self._tiles[(int(keys[start, 0]), int(keys[start, 1]))] = order[start:end]
+
+    @classmethod
+    def from_sessions(cls) -> 'SubscriberIndex':
+        """Latest coordinates per user across UserSession and ChatSession"""
+        latest: Dict[str, Tuple[Any, float, float, str]] = {}
+        sources = [
+            UserSession.objects.exclude(latitude__isnull=True).exclude(longitude__isnull=True)
+            .values_list('user_id', 'latitude', 'longitude', 'preferred_language', 'start_time'),
+            ChatSession.objects.exclude(latitude__isnull=True).exclude(longitude__isnull=True)
+            .values_list('user_id', 'latitude', 'longitude', 'preferred_language', 'last_activity'),
+        ]
+        for queryset in sources:
+            for user_id, latitude, longitude, language, seen in queryset.iterator(chunk_size=5000):
+                previous = latest.get(user_id)
+                if previous is None or seen > previous[0]:
+                    latest[user_id] = (seen, latitude, longitude, language if language in ('en', 'hi') else 'en')
+        user_ids = list(latest)
+        return cls(
+            user_ids,
+            [latest[u][1] for u in user_ids],
+            [latest[u][2] for u in user_ids],
+            [latest[u][3] for u in user_ids],
+        )
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def occupied_tiles(self) -> List[Tuple[int, int]]:
+        return sorted(self._tiles)
+
+    def in_tiles(self, tiles: Iterable[Tuple[int, int]]) -> np.ndarray:
+        """Array positions of users inside the given tiles"""
+        found = [self._tiles[tile] for tile in tiles if tile in self._tiles]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def in_bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        (r0, c0), (r1, c1) = tile_of(south, west), tile_of(north, east)
+        candidates = self.in_tiles((r, c) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1))
+        lats, lons = self.latitudes[candidates], self.longitudes[candidates]
+        return candidates[(lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)]
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        dlat = radius_km / 111.0
+        dlon = radius_km / max(1e-6, 111.0 * math.cos(math.radians(latitude)))
+        candidates = self.in_bbox(latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon)
+        distances = _haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        return candidates[distances <= radius_km]
+
+    def by_language(self, positions: np.ndarray) -> Dict[str, np.ndarray]:
+        """Unique user ids at `positions`, grouped by preferred language"""
+        positions = np.unique(positions)
+        languages = self.languages[positions]
+        return {
+            language: self.user_ids[positions[languages == language]]
+            for language in np.unique(languages).tolist()
+        }
+
+
+# ---------------------------------------------------------------------- providers
+
+class AlertProvider:
+    """A delivery channel; `send_batch` returns the recipients that failed"""
+
+    name = 'provider'
+    batch_size = 100
+    batches_per_second = 10
+
+    def send_batch(self, recipients: List[str], message: Dict[str, Any], idempotency_key: str) -> List[str]:
+        raise NotImplementedError
+
+
+class PushProvider(AlertProvider):
+    """Push notifications; FCM multicast accepts up to 500 tokens per request"""
+
+    name = 'push'
+    batch_size = 500
+    batches_per_second = 20
+
+    def send_batch(self, recipients, message, idempotency_key):
+        data = dict(message.get('data') or {}, idempotency_key=idempotency_key)
+        if send_push_notification(recipients, message['title'], message['body'], data):
+            return []
+        return list(recipients)
+
+
+class SMSProvider(AlertProvider):
+    """SMS gateway; recipients are the addresses known for each user"""
+
+    name = 'sms'
+    batch_size = 100
+    batches_per_second = 5
+
+    def send_batch(self, recipients, message, idempotency_key):
+        text = f"{message['title']}: {message['body']}"
+        return [recipient for recipient in recipients if not send_sms(recipient, text)]
+
+
+class LocalProvider(AlertProvider):
+    """In-process stand-in that records deliveries; `fail_first` batches raise once"""
+
+    def __init__(self, name: str = 'local', batch_size: int = 100, batches_per_second: float = 1000,
+                 fail_first: int = 0, rejected: Iterable[str] = ()):
+        self.name = name
+        self.batch_size = batch_size
+        self.batches_per_second = batches_per_second
+        self.fail_first = fail_first
+        self.rejected = set(rejected)
+        self.delivered: List[Tuple[str, Dict[str, Any]]] = []
+        self.batches: List[str] = []
+        self._lock = threading.Lock()
+
+    def send_batch(self, recipients, message, idempotency_key):
+        with self._lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                raise ConnectionError('provider temporarily unavailable')
+            self.batches.append(idempotency_key)
+            accepted = [r for r in recipients if r not in self.rejected]
+            self.delivered.extend((recipient, message) for recipient in accepted)
+        return [r for r in recipients if r in self.rejected]
+
+
+def default_providers() -> List[AlertProvider]:
+    return [PushProvider()]
+
+
+def prune_deliveries(max_age_seconds: int = IDEMPOTENCY_TTL) -> int:
+    """Drop ledger rows older than the idempotency window; returns the number removed"""
+    cutoff = timezone.now() - timedelta(seconds=max_age_seconds)
+    deleted, _ = AlertDelivery.objects.filter(sent_at__lt=cutoff).delete()
+    return deleted
+
+
+# ---------------------------------------------------------------------- dispatch
+
+class AlertDispatcher:
+    """
+    Sends one alert to many recipients. Recipients are split into provider
+    batches and sent from a thread pool, gated by a per-provider rate
+    limiter. Failed batches and rejected recipients are retried with
+    exponential backoff. Recipients already sent this alert are recorded
+    in the AlertDelivery table and skipped, so re-running a fan-out from any
+    worker or scheduler never double-sends.
+    """
+
+    def __init__(self, providers: Optional[List[AlertProvider]] = None, max_workers: int = 8,
+                 max_retries: int = 3, base_delay: float = 0.5):
+        self.providers = providers or default_providers()
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._limiters = {p.name: RateLimiter(max_calls=max(1, int(p.batches_per_second)), time_window=1)
+                          for p in self.providers}
+        self._limiter_lock = threading.Lock()
+
+    def _acquire(self, provider: AlertProvider):
+        limiter = self._limiters[provider.name]
+        while True:
+            with self._limiter_lock:
+                if limiter.is_allowed(provider.name):
+                    return
+                wait = limiter.wait_time(provider.name)
+            time.sleep(max(wait, 0.001))
+
+    def _send(self, provider: AlertProvider, alert_id: str, recipients: List[str], message: Dict[str, Any],
+              already_sent: set) -> Dict[str, Any]:
+        """Deliver one batch; the ledger is read and written by the dispatching thread"""
+        pending = [recipient for recipient in recipients if (provider.name, recipient) not in already_sent]
+        result = {'provider': provider.name, 'delivered': [], 'failed': 0,
+                  'skipped': len(recipients) - len(pending)}
+
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            batch_key = hashlib.sha1(f"{alert_id}|{provider.name}|{','.join(pending)}".encode('utf-8')).hexdigest()
+            self._acquire(provider)
+            try:
+                failed = provider.send_batch(pending, message, batch_key)
+            except Exception as e:
+                logger.warning(f"{provider.name} batch for {alert_id} failed (attempt {attempt + 1}): {e}")
+                failed = pending
+            failed_set = set(failed)
+            result['delivered'].extend(recipient for recipient in pending if recipient not in failed_set)
+            pending = [recipient for recipient in pending if recipient in failed_set]
+            if pending and attempt < self.max_retries:
+                time.sleep(self.base_delay * (2 ** attempt))
+
+        result['failed'] = len(pending)
+        return result
+
+    def dispatch(self, alert_id: str, recipients_by_language: Dict[str, Iterable[str]],
+                 messages: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Send `messages[language]` to each language group over every provider"""
+        jobs = []
+        for language, recipients in recipients_by_language.items():
+            message = messages.get(language) or messages['en']
+            recipients = sorted(set(recipients))
+            for provider in self.providers:
+                for start in range(0, len(recipients), provider.batch_size):
+                    jobs.append((provider, recipients[start:start + provider.batch_size], message))
+
+        totals = {'alert_id': alert_id, 'recipients': sum(len(set(r)) for r in recipients_by_language.values()),
+                  'batches': len(jobs), 'sent': 0, 'failed': 0, 'skipped': 0}
+        if not jobs:
+            return totals
+        prune_deliveries()
+        already_sent = set(AlertDelivery.objects.filter(alert_id=alert_id).values_list('provider', 'recipient'))
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            futures = [pool.submit(self._send, provider, alert_id, recipients, message, already_sent)
+                       for provider, recipients, message in jobs]
+            # Record each batch as it completes, so a crash mid-fan-out loses at most the batches in flight
+            for future in as_completed(futures):
+                result = future.result()
+                if result['delivered']:
+                    AlertDelivery.objects.bulk_create(
+                        [AlertDelivery(alert_id=alert_id, provider=result['provider'], recipient=recipient)
+                         for recipient in result['delivered']],
+                        ignore_conflicts=True,
+                    )
+                totals['sent'] += len(result['delivered'])
+                totals['failed'] += result['failed']
+                totals['skipped'] += result['skipped']
+        logger.info(f"Alert {alert_id}: {totals['sent']} sent, {totals['skipped']} already sent, "
+                    f"{totals['failed']} failed in {totals['batches']} batches")
+        return totals
+
+
+# ---------------------------------------------------------------------- rules
+
+def evaluate_rules(rules: List[Dict[str, Any]], observations: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Rule id -> positions (tiles or mandis) where the rule fires; one vectorized comparison per rule"""
+    fired = {}
+    for rule in rules:
+        values = observations.get(rule['field'])
+        if values is None:
+            continue
+        values = np.asarray(values, dtype=np.float64)
+        mask = _OPS[rule['op']](values, rule['threshold']) & ~np.isnan(values)
+        if mask.any():
+            fired[rule['id']] = np.flatnonzero(mask)
+    return fired
+
+
+def _localized(rule: Dict[str, Any], data: Dict[str, Any], **values) -> Dict[str, Dict[str, Any]]:
+    return {
+        language: {'title': title.format(**values), 'body': body.format(**values), 'data': data}
+        for language, (title, body) in rule['messages'].items()
+    }
+
+
+def fetch_tile_weather(tiles: List[Tuple[int, int]], session: Optional[requests.Session] = None) -> Dict[str, np.ndarray]:
+    """Next-day forecast per tile from Open-Meteo, many coordinates per request"""
+    session = session or requests.Session()
+    fields = {
+        'precipitation_mm': 'precipitation_sum',
+        'temperature_max_c': 'temperature_2m_max',
+        'temperature_min_c': 'temperature_2m_min',
+        'wind_max_kmph': 'windspeed_10m_max',
+    }
+    observations = {name: np.full(len(tiles), np.nan) for name in fields}
+    for start in range(0, len(tiles), OPEN_METEO_BATCH):
+        chunk = tiles[start:start + OPEN_METEO_BATCH]
+        centers = [tile_center(tile) for tile in chunk]
+        try:
+            response = session.get(OPEN_METEO_URL, params={
+                'latitude': ','.join(f"{lat:.3f}" for lat, _ in centers),
+                'longitude': ','.join(f"{lon:.3f}" for _, lon in centers),
+                'daily': ','.join(fields.values()),
+                'forecast_days': 2,
+                'timezone': 'Asia/Kolkata',
+            }, timeout=15)
+            response.raise_for_status()
+            payload = response.json()
+        except Exception as e:
+            logger.warning(f"Open-Meteo forecast failed for {len(chunk)} tiles: {e}")
+            continue
+        locations = payload if isinstance(payload, list) else [payload]
+        for offset, location in enumerate(locations[:len(chunk)]):
+            daily = location.get('daily', {})
+            for name, source in fields.items():
+                values = [v for v in (daily.get(source) or [])[:2] if v is not None]
+                if values:
+                    observations[name][start + offset] = max(values) if name != 'temperature_min_c' else min(values)
+    return observations
+
+
+def fan_out_weather_alerts(index: Optional[SubscriberIndex] = None, observations: Optional[Dict[str, np.ndarray]] = None,
+                           tiles: Optional[List[Tuple[int, int]]] = None,
+                           dispatcher: Optional[AlertDispatcher] = None) -> List[Dict[str, Any]]:
+    """
+    Evaluate the weather rules once per occupied tile and alert every farmer
+    in the tiles where a rule fires. One alert id per rule per day.
+    """
+    index = index or SubscriberIndex.from_sessions()
+    tiles = tiles if tiles is not None else index.occupied_tiles()
+    if not tiles:
+        return []
+    observations = observations if observations is not None else fetch_tile_weather(tiles)
+    dispatcher = dispatcher or AlertDispatcher()
+    today = date.today().isoformat()
+
+    results = []
+    rules = {rule['id']: rule for rule in WEATHER_RULES}
+    for rule_id, positions in evaluate_rules(WEATHER_RULES, observations).items():
+        affected = [tiles[i] for i in positions]
+        recipients = index.by_language(index.in_tiles(affected))
+        messages = _localized(rules[rule_id], {'type': 'weather_alert', 'rule': rule_id})
+        result = dispatcher.dispatch(f"weather:{rule_id}:{today}", recipients, messages)
+        result['tiles'] = len(affected)
+        results.append(result)
+    return results
+
+
+def fan_out_warning(warning_id: str, area: Dict[str, float], messages: Dict[str, Dict[str, Any]],
+                    index: Optional[SubscriberIndex] = None,
+                    dispatcher: Optional[AlertDispatcher] = None) -> Dict[str, Any]:
+    """
+    Alert everyone inside an issued warning area, given either a bounding
+    box (`south`, `west`, `north`, `east`) or a circle (`latitude`,
+    `longitude`, `radius_km`).
+    """
+    index = index or SubscriberIndex.from_sessions()
+    if 'radius_km' in area:
+        positions = index.within(area['latitude'], area['longitude'], area['radius_km'])
+    else:
+        positions = index.in_bbox(area['south'], area['west'], area['north'], area['east'])
+    return (dispatcher or AlertDispatcher()).dispatch(f"warning:{warning_id}", index.by_language(positions), messages)
+
+
+def mandi_coordinates(name: str) -> Optional[Tuple[float, float]]:
+    """Approximate coordinates of a mandi from the APMC directory"""
+    lowered = name.lower().strip()
+    for mandi, info in ALL_INDIA_MANDIS.items():
+        if mandi.lower() == lowered or mandi.lower().startswith(lowered):
+            return info['lat'], info['lon']
+    return None
+
+
+def price_moves_from_store(days: int = 7) -> List[Dict[str, Any]]:
+    """Week-over-week modal price change per (commodity, mandi) from the price store"""
+    from .price_store import get_price_store
+
+    store = get_price_store()
+    mandis = store.mandis()
+    moves = []
+    for commodity in store.commodities():
+        info = store.info(commodity)
+        rows = store.range(commodity, start=info['last_day'] - days)
+        if not len(rows['date']):
+            continue
+        # Rows are date-sorted: first/last occurrence per mandi give the change over the window
+        ids, first = np.unique(rows['mandi'], return_index=True)
+        last = len(rows['mandi']) - 1 - np.unique(rows['mandi'][::-1], return_index=True)[1]
+        before, after = rows['modal'][first].astype(np.float64), rows['modal'][last].astype(np.float64)
+        changed = (first != last) & (before > 0)
+        for mandi_id, old, new in zip(ids[changed], before[changed], after[changed]):
+            mandi = mandis[int(mandi_id)]
+            coordinates = mandi_coordinates(mandi['name'])
+            if coordinates is None:
+                continue
+            moves.append({
+                'commodity': commodity, 'mandi': mandi['name'], 'state': mandi.get('state', ''),
+                'latitude': coordinates[0], 'longitude': coordinates[1],
+                'price': float(new), 'change_percent': float((new - old) / old * 100),
+            })
+    return moves
+
+
+def fan_out_price_alerts(moves: Optional[List[Dict[str, Any]]] = None, index: Optional[SubscriberIndex] = None,
+                         dispatcher: Optional[AlertDispatcher] = None) -> List[Dict[str, Any]]:
+    """Alert farmers near each mandi where a price rule fires"""
+    moves = moves if moves is not None else price_moves_from_store()
+    if not moves:
+        return []
+    index = index or SubscriberIndex.from_sessions()
+    dispatcher = dispatcher or AlertDispatcher()
+    today = date.today().isoformat()
+    observations = {'change_percent': np.array([move['change_percent'] for move in moves])}
+
+    results = []
+    rules = {rule['id']: rule for rule in PRICE_RULES}
+    for rule_id, positions in evaluate_rules(PRICE_RULES, observations).items():
+        rule = rules[rule_id]
+        for i in positions:
+            move = moves[i]
+            recipients = index.by_language(index.within(move['latitude'], move['longitude'], rule['radius_km']))
+            messages = _localized(rule, {'type': 'market_update', 'rule': rule_id, 'commodity': move['commodity']},
+                                  mandi=move['mandi'], commodity=move['commodity'].title(),
+                                  change=abs(move['change_percent']), price=move['price'])
+            alert_id = f"price:{rule_id}:{move['commodity']}:{move['mandi']}:{today}"
+            results.append(dispatcher.dispatch(alert_id, recipients, messages))
+    return results
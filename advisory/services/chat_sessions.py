@@ -0,0 +1,216 @@
+"""
+Chat Session State
+Conversation state for each chat session, such as the last location, the
+product and places already geocoded. It replaces state kept on a chatbot
+instance shared by every user:
+
+    with get_session_store().session(session_id) as context:
+        context['last_lat'] = 28.61
+
+Entries live in a bounded in-process LRU with a TTL. Every change is written
+through to the 'shared' cache alias (Redis or the database cache table), and
+each turn starts from the copy found there, so another worker or instance
+picks up the same conversation. The in-process copy is only used when the
+shared copy is missing, or while the shared cache is unreachable, so an
+outage costs cross-worker continuity but never a turn. Changes are also persisted lazily to
+ChatSession.conversation_context: on the first change, then at most every
+CHAT_SESSION_PERSIST_SECONDS, and when a changed entry is evicted. A
+per-session lock serializes turns of the same session within a worker;
+concurrent turns of one session on two workers are last-write-wins.
+Different sessions never share state.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..cache_utils import shared_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'chat_state:{}'
+MAX_PLACES = 20                # geocoded places remembered per session
+
+
+def new_context() -> Dict[str, Any]:
+    return {
+        'last_lat': None,
+        'last_lon': None,
+        'last_lang': 'en',
+        'last_product': None,
+        'last_place': None,
+        'places': {},
+    }
+
+
+def remember_place(context: Dict[str, Any], place: str, lat: float, lon: float):
+    """Record a geocoded place in the session, keeping only the latest MAX_PLACES"""
+    places = context.setdefault('places', {})
+    places.pop(place, None)
+    places[place] = [lat, lon]
+    for stale in list(places)[:-MAX_PLACES]:
+        del places[stale]
+
+
+class _Entry:
+    __slots__ = ('state', 'expires', 'lock', 'dirty', 'persisted', 'user_id')
+
+    def __init__(self, ttl: float):
+        self.state: Optional[Dict[str, Any]] = None
+        self.expires = time.monotonic() + ttl
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.persisted = 0.0
+        self.user_id: Optional[str] = None
+
+
+class SessionStateStore:
+    """Bounded LRU of per-session state with TTL, write-through and lazy persistence"""
+
+    def __init__(self, max_sessions: int = 10000, ttl: float = 1800, shared_cache: bool = True,
+                 persist_seconds: float = 60):
+        self.max_sessions = max(1, max_sessions)
+        self.ttl = ttl
+        self.shared_cache = shared_cache
+        self.persist_seconds = persist_seconds
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, session_id: str) -> _Entry:
+        evicted: List[Tuple[str, _Entry]] = []
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None and entry.expires < now:
+                evicted.append((session_id, self._entries.pop(session_id)))
+                entry = None
+            if entry is None:
+                entry = self._entries[session_id] = _Entry(self.ttl)
+            else:
+                self._entries.move_to_end(session_id)
+                entry.expires = now + self.ttl
+            # Least recently used first, which is also earliest to expire
+            while self._entries and (len(self._entries) > self.max_sessions
+                                     or next(iter(self._entries.values())).expires < now):
+                evicted.append(self._entries.popitem(last=False))
+        for stale_id, stale in evicted:
+            if stale.dirty:
+                with stale.lock:
+                    self._persist(stale_id, stale)
+        return entry
+
+    @contextmanager
+    def session(self, session_id: Optional[str], user_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Mutable copy of a session's state for one turn. The changes are
+        committed when the block exits without an exception. Without a
+        session id the state is a throwaway default.
+        """
+        if not session_id:
+            yield new_context()
+            return
+        entry = self._entry(session_id)
+        with entry.lock:
+            if user_id:
+                entry.user_id = user_id
+            if entry.state is None:
+                entry.state = self._load(session_id)
+            elif self.shared_cache:
+                # The shared copy holds the latest turn, whichever worker served it
+                entry.state = shared_cache.get(CACHE_KEY.format(session_id)) or entry.state
+            state = copy.deepcopy(entry.state)
+            yield state
+            if state != entry.state:
+                self._commit(session_id, entry, state)
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        with self.session(session_id) as state:
+            return copy.deepcopy(state)
+
+    def update(self, session_id: str, **changes):
+        with self.session(session_id) as state:
+            state.update(changes)
+
+    def flush(self):
+        """Persist every changed session now (for shutdown and tests)"""
+        with self._lock:
+            entries = list(self._entries.items())
+        for session_id, entry in entries:
+            with entry.lock:
+                if entry.dirty:
+                    self._persist(session_id, entry)
+
+    def _load(self, session_id: str) -> Dict[str, Any]:
+        if self.shared_cache:
+            shared = shared_cache.get(CACHE_KEY.format(session_id))
+            if shared:
+                return shared
+        state = new_context()
+        try:
+            from ..models import ChatSession
+            stored = ChatSession.objects.filter(session_id=session_id).values_list(
+                'conversation_context', flat=True).first()
+            if stored:
+                state.update(stored)
+        except Exception as e:
+            logger.warning(f"Could not load chat session {session_id}: {e}")
+        return state
+
+    def _commit(self, session_id: str, entry: _Entry, state: Dict[str, Any]):
+        entry.state = state
+        entry.dirty = True
+        if self.shared_cache:
+            shared_cache.set(CACHE_KEY.format(session_id), state, int(self.ttl))
+        if time.monotonic() - entry.persisted >= self.persist_seconds:
+            self._persist(session_id, entry)
+
+    def _persist(self, session_id: str, entry: _Entry):
+        state = entry.state or {}
+        fields = {
+            'conversation_context': state,
+            'latitude': state.get('last_lat'),
+            'longitude': state.get('last_lon'),
+            'location_name': state.get('last_place'),
+        }
+        try:
+            from ..models import ChatSession
+            ChatSession.objects.update_or_create(session_id=session_id, defaults=fields,
+                                                 create_defaults=dict(fields, user_id=entry.user_id or session_id))
+            entry.dirty = False
+            entry.persisted = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Could not persist chat session {session_id}: {e}")
+
+
+_store: Optional[SessionStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStateStore:
+    """Process-wide session store, built from settings on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStateStore(
+                    max_sessions=int(getattr(settings, 'CHAT_SESSION_MAX_ENTRIES', 10000)),
+                    ttl=float(getattr(settings, 'CHAT_SESSION_TTL', 1800)),
+                    shared_cache=bool(getattr(settings, 'CHAT_SESSION_SHARED_CACHE', True)),
+                    persist_seconds=float(getattr(settings, 'CHAT_SESSION_PERSIST_SECONDS', 60)),
+                )
+    return _store
+
+
+def reset_session_store(store: Optional[SessionStateStore] = None):
+    global _store
+    with _store_lock:
+        _store = store
@@ -12,6 +12,9 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import random
 
+from .price_store import get_price_store
+from ..ml.price_forecasting import get_forecast
+
 logger = logging.getLogger(__name__)
 
 class ComprehensiveCropRecommendations:
@@ -1398,6 +1401,18 @@ class ComprehensiveCropRecommendations:
         crop_info = self.crop_database.get(crop_name, {})
         season = crop_info.get('season', 'year_round')
         trend_info = crop_trends.get(crop_name, {'trend': 'stable', 'volatility': 'medium'})
+        data_source = 'Government MSP + Market Analysis'
+        
+        # Observed mandi prices replace the MSP baseline and static trend table when available
+        observed = get_price_store().trend(crop_name, days=365)
+        if observed:
+            base_price = observed['latest_price']
+            volatility = observed['volatility']
+            trend_info = {
+                'trend': observed['trend'],
+                'volatility': 'low' if volatility < 0.01 else 'medium' if volatility < 0.03 else 'high' if volatility < 0.06 else 'very_high'
+            }
+            data_source = f"Observed mandi prices ({observed['from']} to {observed['to']}) + Seasonal Analysis"
         
         # Calculate predictions
         current_price = int(base_price)
@@ -1405,6 +1420,16 @@ class ComprehensiveCropRecommendations:
         next_6_months = int(current_price * seasonal_multipliers.get(season, seasonal_multipliers['year_round'])['next_6_months'])
         next_year = int(current_price * seasonal_multipliers.get(season, seasonal_multipliers['year_round'])['next_year'])
         
+        # Nightly batch forecasts take precedence over the seasonal multipliers
+        state = market_data.get('state') if isinstance(market_data, dict) else None
+        forecast = get_forecast(crop_name, state=state)
+        if forecast:
+            current_price = int(forecast['last_price'])
+            next_3_months = int(forecast['next_3_months'])
+            next_6_months = int(forecast['next_6_months'])
+            next_year = int(forecast['next_year'])
+            data_source = f"Batch price forecast ({forecast['model']}, {forecast['generated_at'][:10]})"
+        
         return {
             'current_price': f"₹{current_price:,}/quintal",
             'next_3_months': f"₹{next_3_months:,}/quintal",
@@ -1413,7 +1438,7 @@ class ComprehensiveCropRecommendations:
             'trend': trend_info['trend'],
             'volatility': trend_info['volatility'],
             'confidence': 'High' if trend_info['volatility'] in ['low', 'medium'] else 'Medium',
-            'data_source': 'Government MSP + Market Analysis',
+            'data_source': data_source,
             'prediction_factors': [
                 'Historical MSP trends',
                 'Seasonal demand patterns',
@@ -17,8 +17,27 @@ import asyncio
 import aiohttp
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from ..ml.query_classifier import FARMING_CATEGORIES, confident_prediction
+from .llm_gateway import data_source, get_llm_gateway
+
 logger = logging.getLogger(__name__)
 
+# Subcategory and context hints for the categories this service answers itself
+CATEGORY_DETAILS = {
+    'farming_agriculture': {
+        'subcategory': 'crop_recommendation',
+        'context_hints': ['agricultural', 'location-based'],
+    },
+    'weather_climate': {
+        'subcategory': 'weather_forecast',
+        'context_hints': ['location-based', 'temporal'],
+    },
+    'market_economics': {
+        'subcategory': 'price_inquiry',
+        'context_hints': ['location-based', 'commodity-specific'],
+    },
+}
+
 
 class ConsolidatedAIService:
     """
@@ -132,37 +151,39 @@ class ConsolidatedAIService:
                 'context_hints': []
             }
             
-            # Check for farming-related content
-            farming_score = self._calculate_farming_score(query_lower)
-            weather_score = self._calculate_weather_score(query_lower)
-            market_score = self._calculate_market_score(query_lower)
-            
-            # Determine primary category
-            max_score = max(farming_score, weather_score, market_score)
-            
-            if farming_score == max_score and farming_score > 0.3:
-                classification.update({
-                    'category': 'farming_agriculture',
-                    'subcategory': 'crop_recommendation',
-                    'confidence': farming_score,
-                    'requires_farming_expertise': True,
-                    'requires_general_knowledge': False,
-                    'context_hints': ['agricultural', 'location-based']
-                })
-            elif weather_score == max_score and weather_score > 0.3:
-                classification.update({
-                    'category': 'weather_climate',
-                    'subcategory': 'weather_forecast',
-                    'confidence': weather_score,
-                    'context_hints': ['location-based', 'temporal']
-                })
-            elif market_score == max_score and market_score > 0.3:
+            # A confident local model prediction replaces the keyword scores
+            prediction = confident_prediction(query)
+            if prediction:
+                category = prediction['category']
                 classification.update({
-                    'category': 'market_economics',
-                    'subcategory': 'price_inquiry',
-                    'confidence': market_score,
-                    'context_hints': ['location-based', 'commodity-specific']
+                    'category': category,
+                    'confidence': prediction['confidence'],
+                    'requires_farming_expertise': category in FARMING_CATEGORIES,
+                    'requires_general_knowledge': category not in FARMING_CATEGORIES,
+                    'source': 'local_model',
                 })
+                classification.update(CATEGORY_DETAILS.get(category, {}))
+            else:
+                # Check for farming-related content
+                farming_score = self._calculate_farming_score(query_lower)
+                weather_score = self._calculate_weather_score(query_lower)
+                market_score = self._calculate_market_score(query_lower)
+                
+                # Determine primary category
+                max_score = max(farming_score, weather_score, market_score)
+                
+                if farming_score == max_score and farming_score > 0.3:
+                    classification.update({
+                        'category': 'farming_agriculture',
+                        'confidence': farming_score,
+                        'requires_farming_expertise': True,
+                        'requires_general_knowledge': False,
+                    })
+                elif weather_score == max_score and weather_score > 0.3:
+                    classification.update({'category': 'weather_climate', 'confidence': weather_score})
+                elif market_score == max_score and market_score > 0.3:
+                    classification.update({'category': 'market_economics', 'confidence': market_score})
+                classification.update(CATEGORY_DETAILS.get(classification['category'], {}))
             
             # Extract entities
             classification['entities'] = self._extract_entities(query)
@@ -347,28 +368,16 @@ class ConsolidatedAIService:
                             context: Dict) -> Dict[str, Any]:
         """Handle general queries using AI"""
         try:
-            # Try Ollama first (local AI)
-            response = self._get_ollama_response(query, classification)
-            
-            if response and len(response) > 50:
+            # The gateway answers from the fastest healthy LLM backend
+            result = get_llm_gateway().generate(f"You are a helpful AI assistant. Respond to this query: {query}")
+            if result:
                 return {
-                    'response': response,
-                    'data_source': 'ollama_ai',
+                    'response': result['text'],
+                    'data_source': data_source(result),
                     'confidence': classification['confidence'],
                     'classification': classification
                 }
             
-            # Fallback to Google AI if available
-            if self.google_ai_key:
-                response = self._get_google_ai_response(query, classification)
-                if response:
-                    return {
-                        'response': response,
-                        'data_source': 'google_ai',
-                        'confidence': classification['confidence'],
-                        'classification': classification
-                    }
-            
             # Final fallback
             return {
                 'response': self.response_templates['general_query'],
@@ -384,54 +393,6 @@ class ConsolidatedAIService:
                 'data_source': 'error_fallback',
                 'error': str(e)
             }
-    
-    def _get_ollama_response(self, query: str, classification: Dict) -> Optional[str]:
-        """Get response from Ollama (local AI)"""
-        try:
-            url = f"{self.ollama_base_url}/api/generate"
-            data = {
-                "model": self.models['llama3'],
-                "prompt": f"You are a helpful AI assistant. Respond to this query: {query}",
-                "stream": False
-            }
-            
-            response = self.session.post(url, json=data, timeout=30)
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '').strip()
-            
-        except Exception as e:
-            logger.warning(f"Ollama not available: {e}")
-        
-        return None
-    
-    def _get_google_ai_response(self, query: str, classification: Dict) -> Optional[str]:
-        """Get response from Google AI Studio"""
-        try:
-            if not self.google_ai_key:
-                return None
-            
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.models['gemini']}:generateContent"
-            headers = {
-                'Content-Type': 'application/json',
-                'x-goog-api-key': self.google_ai_key
-            }
-            
-            data = {
-                "contents": [{
-                    "parts": [{"text": f"You are a helpful AI assistant. Respond to this query: {query}"}]
-                }]
-            }
-            
-            response = self.session.post(url, headers=headers, json=data, timeout=30)
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '').strip()
-            
-        except Exception as e:
-            logger.warning(f"Google AI not available: {e}")
-        
-        return None
 
 
 # Convenience function for backward compatibility
@@ -18,6 +18,9 @@ from sklearn.metrics import accuracy_score, mean_squared_error
 import joblib
 import os
 
+from .pest_database import CROP_PEST_CATALOG
+from .pest_index import current_season, get_pest_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -140,33 +143,7 @@ class ConsolidatedCropService:
     
     def _initialize_pest_database(self) -> Dict[str, Any]:
         """Initialize pest and disease database"""
-        return {
-            'wheat': {
-                'rust': {
-                    'name': 'Rust',
-                    'hindi_name': 'रस्ट',
-                    'symptoms': ['Yellow-orange pustules', 'Reduced yield'],
-                    'treatment': ['Fungicide spray', 'Resistant varieties'],
-                    'prevention': ['Crop rotation', 'Proper spacing']
-                },
-                'aphids': {
-                    'name': 'Aphids',
-                    'hindi_name': 'एफिड्स',
-                    'symptoms': ['Sticky leaves', 'Yellowing', 'Stunted growth'],
-                    'treatment': ['Insecticide spray', 'Natural predators'],
-                    'prevention': ['Healthy soil', 'Proper irrigation']
-                }
-            },
-            'rice': {
-                'blast': {
-                    'name': 'Blast',
-                    'hindi_name': 'ब्लास्ट',
-                    'symptoms': ['Spindle-shaped lesions', 'Node rot'],
-                    'treatment': ['Fungicide treatment', 'Resistant varieties'],
-                    'prevention': ['Proper spacing', 'Water management']
-                }
-            }
-        }
+        return CROP_PEST_CATALOG
     
     def _initialize_fertilizer_database(self) -> Dict[str, Any]:
         """Initialize fertilizer recommendations database"""
@@ -491,33 +468,19 @@ class ConsolidatedCropService:
             Pest/disease detection results
         """
         try:
-            crop_pests = self.pest_database.get(crop_type.lower(), {})
+            # Ranked against the shared symptom index rather than scanning this crop's entries
             matches = []
-            
-            # Simple symptom-based matching
-            for pest_id, pest_info in crop_pests.items():
-                pest_symptoms = pest_info.get('symptoms', [])
-                symptom_matches = 0
-                
-                for symptom in symptoms:
-                    for pest_symptom in pest_symptoms:
-                        if symptom.lower() in pest_symptom.lower() or pest_symptom.lower() in symptom.lower():
-                            symptom_matches += 1
-                
-                if symptom_matches > 0:
-                    match_score = symptom_matches / len(pest_symptoms)
-                    matches.append({
-                        'pest_id': pest_id,
-                        'name': pest_info['name'],
-                        'hindi_name': pest_info['hindi_name'],
-                        'match_score': match_score,
-                        'symptoms': pest_symptoms,
-                        'treatment': pest_info.get('treatment', []),
-                        'prevention': pest_info.get('prevention', [])
-                    })
-            
-            # Sort by match score
-            matches.sort(key=lambda x: x['match_score'], reverse=True)
+            for match in get_pest_index().search(symptoms, crop=crop_type, season=current_season(), top_k=10):
+                matches.append({
+                    'pest_id': match['id'].split(':', 1)[1],
+                    'name': match['name'],
+                    'hindi_name': match['hindi_name'],
+                    'match_score': match['confidence'],
+                    'score': match['score'],
+                    'symptoms': match['symptoms'],
+                    'treatment': match['treatment'],
+                    'prevention': match['prevention']
+                })
             
             return {
                 'crop_type': crop_type,
@@ -0,0 +1,81 @@
+"""
+Dataset Versions
+Version hashes for the datasets behind slowly changing API responses. A
+response built only from versioned datasets can be validated by comparing
+versions, without rebuilding it:
+
+    dataset_version('government_schemes')   # {'version': '3f2a...', 'last_modified': datetime}
+
+Static datasets such as the scheme lists are hashed once per process from
+their contents; other datasets are added with register_dataset().
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def content_hash(data: Any) -> str:
+    """Stable 16-hex-digit hash of JSON-serialisable data"""
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _module_mtime(module) -> datetime:
+    try:
+        return datetime.fromtimestamp(int(os.stat(module.__file__).st_mtime), tz=timezone.utc)
+    except (OSError, AttributeError, TypeError):
+        return _EPOCH
+
+
+def _government_schemes() -> Dict[str, Any]:
+    from . import government_schemes_data
+    return {
+        'version': content_hash([government_schemes_data.CENTRAL_GOVERNMENT_SCHEMES,
+                                 government_schemes_data.STATE_SPECIFIC_SCHEMES]),
+        'last_modified': _module_mtime(government_schemes_data),
+    }
+
+
+# name -> (loader, static); static versions are computed once per process
+DATASETS: Dict[str, tuple] = {
+    'government_schemes': (_government_schemes, True),
+}
+
+_static_versions: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def register_dataset(name: str, loader: Callable[[], Dict[str, Any]], static: bool = False):
+    """Add a dataset; `loader` returns {'version': str, 'last_modified': aware datetime}"""
+    with _lock:
+        DATASETS[name] = (loader, static)
+        _static_versions.pop(name, None)
+
+
+def dataset_version(name: str) -> Dict[str, Any]:
+    loader, static = DATASETS[name]
+    if not static:
+        return loader()
+    if name not in _static_versions:
+        with _lock:
+            if name not in _static_versions:
+                _static_versions[name] = loader()
+    return _static_versions[name]
+
+
+def combined_version(names: Iterable[str], salt: str = '') -> Dict[str, Any]:
+    """One version and last-modified time for a response built from several datasets"""
+    versions = [dataset_version(name) for name in names]
+    return {
+        'version': content_hash([salt] + [v['version'] for v in versions]),
+        'last_modified': max((v['last_modified'] for v in versions), default=_EPOCH),
+    }
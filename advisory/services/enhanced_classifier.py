@@ -9,6 +9,8 @@ import logging
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 
+from ..ml.query_classifier import FARMING_CATEGORIES, confident_prediction
+
 logger = logging.getLogger(__name__)
 
 class EnhancedQueryClassifier:
@@ -124,6 +126,32 @@ class EnhancedQueryClassifier:
     
     def classify_query(self, query: str) -> Dict[str, Any]:
         """Enhanced query classification with improved accuracy"""
+        prediction = confident_prediction(query)
+        if prediction is None:
+            return self._keyword_classification(query)
+        
+        query_lower = query.lower().strip()
+        category = prediction['category']
+        if category == 'mixed_query':
+            query_type = 'mixed'
+        elif category in FARMING_CATEGORIES:
+            query_type = 'farming'
+        else:
+            query_type = 'general'
+        
+        return {
+            'query_type': query_type,
+            'subcategory': self._determine_subcategory(query_lower, query_type),
+            'language': self._detect_language(query_lower),
+            'confidence': prediction['confidence'],
+            'entities': self._extract_entities(query_lower, query_type),
+            'is_mixed': query_type == 'mixed',
+            'category': category,
+            'source': 'local_model'
+        }
+    
+    def _keyword_classification(self, query: str) -> Dict[str, Any]:
+        """Keyword-pattern classification"""
         
         query_lower = query.lower().strip()
         
@@ -1783,46 +1783,6 @@ class EnhancedGovernmentAPI:
                 'kolkata': {'temp': 32, 'humidity': 75, 'rainfall': 35},
                 'chennai': {'temp': 33, 'humidity': 70, 'rainfall': 30},
                 'bangalore': {'temp': 26, 'humidity': 60, 'rainfall': 20}
-            },
-            'government_schemes': {
-                'pm_kisan': {
-                    'name': 'प्रधानमंत्री किसान सम्मान निधि',
-                    'benefit': '₹6,000 प्रति वर्ष (₹2,000 x 3 किस्त)',
-                    'eligibility': 'सभी किसान परिवार',
-                    'details': 'आय सहायता योजना',
-                    'process': 'ऑनलाइन आवेदन या CSC केंद्र',
-                    'validity': 'वार्षिक नवीकरण',
-                    'cost': 'पूरी तरह मुफ्त'
-                },
-                'fasal_bima': {
-                    'name': 'प्रधानमंत्री फसल बीमा योजना',
-                    'benefit': 'प्रीमियम पर 90% सब्सिडी',
-                    'eligibility': 'सभी किसान'
-                },
-                'kisan_credit_card': {
-                    'name': 'किसान क्रेडिट कार्ड',
-                    'benefit': '₹3 लाख तक का ऋण',
-                    'eligibility': 'जमीन वाले किसान'
-                },
-                'soil_health_card': {
-                    'name': 'मृदा स्वास्थ्य कार्ड योजना',
-                    'benefit': 'मुफ्त मिट्टी परीक्षण और सुझाव',
-                    'eligibility': 'सभी किसान',
-                    'details': 'मिट्टी का pH, पोषक तत्वों की जांच, फसल सुझाव',
-                    'process': 'नजदीकी कृषि विज्ञान केंद्र में आवेदन',
-                    'validity': '3 साल तक वैध',
-                    'cost': 'पूरी तरह मुफ्त'
-                },
-                'neem_coated_urea': {
-                    'name': 'नीम कोटेड यूरिया',
-                    'benefit': '₹268/बैग सब्सिडी',
-                    'eligibility': 'सभी किसान'
-                },
-                'kisan_drone': {
-                    'name': 'किसान ड्रोन योजना',
-                    'benefit': 'ड्रोन खरीद पर 75% सब्सिडी',
-                    'eligibility': 'FPO, सहकारी समितियां'
-                }
             }
         }
     
@@ -2160,38 +2120,11 @@ class EnhancedGovernmentAPI:
     
     def get_government_schemes(self, location: str = None, state: str = None, 
                               language: str = 'en') -> Dict[str, Any]:
-        """Get government schemes data using Google Maps-level accurate location detection"""
-        # Use Google Maps-level comprehensive location detection first
-        if location:
-            location_info = self.detect_location_comprehensive(location)
-            accurate_location = location_info['location'] or location
-            accurate_state = location_info['state'] or state or location
-            logger.info(f"Government schemes using accurate location: {accurate_location} in {accurate_state} (confidence: {location_info['confidence']})")
-        else:
-            accurate_location = location
-            accurate_state = state
-        
-        cache_key = f"schemes_{accurate_location}_{accurate_state}_{language}"
-        
-        if self._is_cached(cache_key):
-            _, data = self.cache[cache_key]
-            return data
-        
-        schemes_data = self.fallback_data['government_schemes'].copy()
-        
-        # Add state-specific schemes if available
-        if state:
-            state_schemes = self._get_state_specific_schemes(state)
-            schemes_data.update(state_schemes)
-        
-        # Format for language
-        if language == 'hi':
-            schemes_data = self._translate_schemes_to_hindi(schemes_data)
-        
-        # Cache the result
-        self._cache_result(cache_key, schemes_data)
-        
-        return schemes_data
+        """Get government schemes keyed by scheme id from the compiled scheme catalog"""
+        from .scheme_catalog import MAX_PAGE_SIZE, get_scheme_catalog
+
+        result = get_scheme_catalog().lookup(state or location, language=language, page_size=MAX_PAGE_SIZE)
+        return {scheme['id']: dict(scheme, benefit=scheme['amount']) for scheme in result['schemes']}
     
     def _fetch_from_api(self, source: str, crop: str, location: str) -> Dict[str, Any]:
         """Fetch data from specific API source - Enhanced with realistic government data"""
@@ -4072,65 +4005,6 @@ class EnhancedGovernmentAPI:
         
         return recommendations
     
-    def _get_state_specific_schemes(self, state: str) -> Dict[str, Any]:
-        """Get state-specific government schemes"""
-        state_schemes = {
-            'delhi': {
-                'delhi_scheme': {
-                    'name': 'Delhi Agricultural Scheme',
-                    'benefit': 'Special subsidy for Delhi farmers',
-                    'eligibility': 'Delhi registered farmers'
-                }
-            },
-            'mumbai': {
-                'maharashtra_scheme': {
-                    'name': 'Maharashtra Agricultural Scheme',
-                    'benefit': 'State-specific benefits',
-                    'eligibility': 'Maharashtra farmers'
-                }
-            }
-        }
-        
-        return state_schemes.get(state.lower(), {})
-    
-    def _translate_schemes_to_hindi(self, schemes_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Translate schemes data to Hindi with enhanced details"""
-        hindi_translations = {
-            'PM Kisan Samman Nidhi': 'प्रधानमंत्री किसान सम्मान निधि',
-            'PM Fasal Bima Yojana': 'प्रधानमंत्री फसल बीमा योजना',
-            'Kisan Credit Card': 'किसान क्रेडिट कार्ड',
-            'Soil Health Card': 'मृदा स्वास्थ्य कार्ड योजना',
-            '₹6,000 per year': '₹6,000 प्रति वर्ष',
-            '90% subsidy on premium': 'प्रीमियम पर 90% सब्सिडी',
-            'Up to ₹3 lakh loan': '₹3 लाख तक का ऋण',
-            'Free soil testing': 'मुफ्त मिट्टी परीक्षण',
-            'All farmers': 'सभी किसान',
-            'All farmer families': 'सभी किसान परिवार',
-            'Farmers with land': 'जमीन वाले किसान',
-            'FPOs and cooperatives': 'FPO और सहकारी समितियां',
-            'Income support scheme': 'आय सहायता योजना',
-            'Soil pH and nutrient testing': 'मिट्टी का pH और पोषक तत्वों की जांच',
-            'Crop recommendations': 'फसल सुझाव',
-            'Apply at nearest KVK': 'नजदीकी कृषि विज्ञान केंद्र में आवेदन',
-            'Valid for 3 years': '3 साल तक वैध',
-            'Annual renewal': 'वार्षिक नवीकरण',
-            'Completely free': 'पूरी तरह मुफ्त',
-            'Online application or CSC': 'ऑनलाइन आवेदन या CSC केंद्र'
-        }
-        
-        translated_schemes = {}
-        for key, scheme in schemes_data.items():
-            translated_scheme = scheme.copy()
-            for field, value in scheme.items():
-                if isinstance(value, str) and value in hindi_translations:
-                    translated_scheme[field] = hindi_translations[value]
-                elif isinstance(value, str) and field in ['details', 'process', 'validity', 'cost']:
-                    # Keep detailed fields as they are already in Hindi
-                    translated_scheme[field] = value
-            translated_schemes[key] = translated_scheme
-        
-        return translated_schemes
-    
     def _get_location_multiplier(self, location: str) -> float:
         """Get price multiplier based on location"""
         location_key = location.lower().replace(' ', '').replace('city', '')
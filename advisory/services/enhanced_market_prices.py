@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from django.core.cache import cache
 
+from .price_store import get_price_store
+
 logger = logging.getLogger(__name__)
 
 class EnhancedMarketPricesService:
@@ -1245,6 +1247,11 @@ class EnhancedMarketPricesService:
             # Ensure minimum price above MSP (at least 15% above MSP)
             current_price = max(current_price, int(base_msp * 1.15))
             
+            # Observed prices take precedence over the estimate
+            observed = self._get_observed_price(crop_name, state)
+            if observed:
+                current_price = int(observed['modal'])
+            
             crop_index += 1
             
             # Calculate profit margins
@@ -1257,15 +1264,15 @@ class EnhancedMarketPricesService:
                 'msp': base_msp,
                 'mandi': primary_mandi,
                 'state': state,
-                'date': datetime.now().strftime('%Y-%m-%d'),
-                'source': 'Government MSP Data + Location Analysis',
+                'date': observed['date'] if observed else datetime.now().strftime('%Y-%m-%d'),
+                'source': 'Observed Mandi Prices (Agmarknet)' if observed else 'Government MSP Data + Location Analysis',
                 'profit_margin': profit_margin,
                 'profit_percentage': profit_percentage,
                 'unit': msp_data.get('unit', '/quintal'),
                 'season': msp_data.get('season', 'All Season'),
                 'location_factor': round(location_factor, 2),
                 'region_multiplier': round(region_multiplier, 2),
-                    'api_source': 'government_msp_with_estimated_prices'
+                    'api_source': 'observed_mandi_prices' if observed else 'government_msp_with_estimated_prices'
             })
         
         # Sort crops by price to show variety
@@ -1435,6 +1442,15 @@ class EnhancedMarketPricesService:
         
         return location.title()
     
+    def _get_observed_price(self, commodity: str, state: str) -> Optional[Dict[str, Any]]:
+        """Latest observed prices for a commodity in a state from the columnar price store"""
+        try:
+            store = get_price_store()
+            return store.latest(commodity, state=state)
+        except Exception as e:
+            logger.warning(f"Price store lookup failed for {commodity}: {e}")
+            return None
+    
     def _get_real_government_msp_data(self) -> Dict[str, Any]:
         """Get real government MSP data from official sources"""
         return {
@@ -2381,6 +2397,11 @@ class EnhancedMarketPricesService:
 
     def _calculate_realtime_price(self, commodity: str, state: str, location: str) -> int:
         """Calculate real-time price based on commodity, state, and location factors"""
+        # Latest observed modal price in the state, when the price store has one
+        observed = self._get_observed_price(commodity, state)
+        if observed:
+            return int(observed['modal'])
+        
         # Get base MSP for the commodity
         msp_data = self._get_real_government_msp_data()
         base_msp = msp_data.get(commodity, {}).get('msp', 2000)
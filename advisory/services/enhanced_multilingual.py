@@ -154,10 +154,10 @@ class EnhancedMultilingualSupport:
         if source_language == target_language:
             return query
         
-        if target_language == 'hindi':
-            return self._translate_to_hindi(query)
-        elif target_language == 'english':
-            return self._translate_to_english(query)
+        if target_language in ('hindi', 'english'):
+            # Segment by segment through the translation memory; see translation_memory
+            from .translation_memory import get_translator
+            return get_translator('dictionary').translate(query, source_language, target_language)
         elif target_language == 'hinglish':
             return self._translate_to_hinglish(query)
         
@@ -422,7 +422,7 @@ class EnhancedMultilingualSupport:
     def translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
         """Translate text between languages - method expected by tests"""
         try:
-            return self.translate_query(text, source_lang, target_lang)
+            return self.translate_query(text, {'hi': 'hindi', 'en': 'english'}.get(target_lang, target_lang))
         except Exception as e:
             logger.error(f"Error translating text: {e}")
             return text  # Return original text if translation fails
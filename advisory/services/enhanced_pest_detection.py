@@ -12,6 +12,9 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from django.core.cache import cache
 
+from .pest_database import CROP_PESTS
+from .pest_index import current_season, get_pest_index, state_of
+
 logger = logging.getLogger(__name__)
 
 class EnhancedPestDetectionService:
@@ -344,7 +347,7 @@ class EnhancedPestDetectionService:
         
         # If no API data, use comprehensive database
         if not all_pests:
-            all_pests = self._get_pests_from_database(crop, symptoms)
+            all_pests = self._get_pests_from_database(crop, symptoms, location)
             all_sources = ['Comprehensive Pest Database']
             reliability_scores = [0.8]
         
@@ -370,7 +373,7 @@ class EnhancedPestDetectionService:
         """Enhanced fallback data with comprehensive pest information"""
         
         # Get pests from comprehensive database
-        pests = self._get_pests_from_database(crop, symptoms)
+        pests = self._get_pests_from_database(crop, symptoms, location)
         
         return {
             'status': 'success',
@@ -390,112 +393,32 @@ class EnhancedPestDetectionService:
     
     def _load_comprehensive_pest_database(self) -> Dict[str, List[Dict]]:
         """Load comprehensive pest database"""
-        return {
-            'wheat': [
-                {
-                    'name': 'Rust Disease',
-                    'scientific_name': 'Puccinia spp.',
-                    'type': 'disease',
-                    'severity': 'high',
-                    'description': 'Fungal disease causing yellow-orange pustules on leaves',
-                    'symptoms': ['Yellow-orange pustules', 'Leaf discoloration', 'Reduced yield'],
-                    'treatment': ['Fungicide application', 'Resistant varieties', 'Crop rotation'],
-                    'prevention': ['Use resistant varieties', 'Proper field sanitation', 'Avoid excessive nitrogen'],
-                    'confidence': 0.9
-                },
-                {
-                    'name': 'Aphids',
-                    'scientific_name': 'Rhopalosiphum maidis',
-                    'type': 'pest',
-                    'severity': 'medium',
-                    'description': 'Small sap-sucking insects that damage plants',
-                    'symptoms': ['Stunted growth', 'Yellowing leaves', 'Honeydew secretion'],
-                    'treatment': ['Insecticide application', 'Natural predators', 'Neem oil'],
-                    'prevention': ['Early planting', 'Proper irrigation', 'Beneficial insects'],
-                    'confidence': 0.9
-                }
-            ],
-            'rice': [
-                {
-                    'name': 'Blast Disease',
-                    'scientific_name': 'Magnaporthe oryzae',
-                    'type': 'disease',
-                    'severity': 'high',
-                    'description': 'Fungal disease causing lesions on leaves and panicles',
-                    'symptoms': ['Diamond-shaped lesions', 'Panicle blight', 'Yield loss'],
-                    'treatment': ['Fungicide application', 'Resistant varieties', 'Proper water management'],
-                    'prevention': ['Use resistant varieties', 'Avoid excessive nitrogen', 'Proper spacing'],
-                    'confidence': 0.9
-                },
-                {
-                    'name': 'Brown Planthopper',
-                    'scientific_name': 'Nilaparvata lugens',
-                    'type': 'pest',
-                    'severity': 'high',
-                    'description': 'Sap-sucking insect that causes hopperburn',
-                    'symptoms': ['Hopperburn', 'Yellowing', 'Plant death'],
-                    'treatment': ['Insecticide application', 'Natural enemies', 'Resistant varieties'],
-                    'prevention': ['Avoid excessive nitrogen', 'Proper water management', 'Early planting'],
-                    'confidence': 0.9
-                }
-            ],
-            'maize': [
-                {
-                    'name': 'Fall Armyworm',
-                    'scientific_name': 'Spodoptera frugiperda',
-                    'type': 'pest',
-                    'severity': 'high',
-                    'description': 'Invasive pest causing severe damage to maize',
-                    'symptoms': ['Leaf damage', 'Ear damage', 'Yield loss'],
-                    'treatment': ['Biological control', 'Insecticide application', 'Bt varieties'],
-                    'prevention': ['Early detection', 'Crop rotation', 'Resistant varieties'],
-                    'confidence': 0.9
-                },
-                {
-                    'name': 'Maize Lethal Necrosis',
-                    'scientific_name': 'Virus complex',
-                    'type': 'disease',
-                    'severity': 'high',
-                    'description': 'Viral disease causing plant death',
-                    'symptoms': ['Yellowing', 'Stunting', 'Plant death'],
-                    'treatment': ['Virus-free seeds', 'Vector control', 'Resistant varieties'],
-                    'prevention': ['Use certified seeds', 'Vector management', 'Field sanitation'],
-                    'confidence': 0.8
-                }
-            ],
-            'cotton': [
-                {
-                    'name': 'Bollworm',
-                    'scientific_name': 'Helicoverpa armigera',
-                    'type': 'pest',
-                    'severity': 'high',
-                    'description': 'Major pest attacking cotton bolls',
-                    'symptoms': ['Boll damage', 'Yield loss', 'Quality reduction'],
-                    'treatment': ['Bt cotton', 'Insecticide application', 'Biological control'],
-                    'prevention': ['Bt varieties', 'Proper timing', 'Natural enemies'],
-                    'confidence': 0.9
-                },
-                {
-                    'name': 'Whitefly',
-                    'scientific_name': 'Bemisia tabaci',
-                    'type': 'pest',
-                    'severity': 'medium',
-                    'description': 'Sap-sucking insect transmitting viruses',
-                    'symptoms': ['Yellowing', 'Virus transmission', 'Honeydew'],
-                    'treatment': ['Insecticide application', 'Natural enemies', 'Resistant varieties'],
-                    'prevention': ['Early planting', 'Proper irrigation', 'Beneficial insects'],
-                    'confidence': 0.8
-                }
-            ]
-        }
+        return CROP_PESTS
     
-    def _get_pests_from_database(self, crop: str, symptoms: str) -> List[Dict]:
-        """Get pests from comprehensive database"""
+    def _get_pests_from_database(self, crop: str, symptoms: str, location: str = '') -> List[Dict]:
+        """Get pests from comprehensive database, ranked by the described symptoms"""
         crop_lower = crop.lower()
         pests = []
         
+        # Rank against the symptom index when symptoms are described
+        if symptoms and symptoms.strip():
+            for match in get_pest_index().search(symptoms, crop=crop_lower, season=current_season(),
+                                                 state=state_of(location)):
+                pests.append({
+                    'name': match['name'],
+                    'scientific_name': match['scientific_name'] or 'Various',
+                    'type': match['type'] or 'pest',
+                    'severity': match['severity'] or 'medium',
+                    'description': match['description'],
+                    'symptoms': match['symptoms'],
+                    'treatment': match['treatment'],
+                    'prevention': match['prevention'],
+                    'confidence': match['confidence'],
+                    'matched_symptoms': match['matched_terms'],
+                })
+        
         # Get pests for specific crop
-        if crop_lower in self.pest_database:
+        if not pests and crop_lower in self.pest_database:
             pests.extend(self.pest_database[crop_lower])
         
         # If no specific crop found, return common pests
@@ -12,6 +12,9 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import re
 
+from ..ml.query_classifier import local_prediction, min_confidence
+from .llm_gateway import get_llm_gateway
+
 logger = logging.getLogger(__name__)
 
 class GoogleAIStudio:
@@ -170,12 +173,19 @@ Confidence should be between 0.0 and 1.0
                 if datetime.now() - cached_data['timestamp'] < self.cache_duration:
                     return cached_data['data']
             
+            # The local distilled model answers unless it is unsure; without an
+            # API key its best guess still beats the keyword scorer
+            prediction = local_prediction(query)
+            if prediction and (prediction['confidence'] >= min_confidence() or not self.api_key):
+                return self._classification_for(query, prediction['category'], prediction['confidence'],
+                                                source='local_model', fallback=False)
+            
             # If no API key, use fallback classification
             if not self.api_key:
                 return self._fallback_classification(query)
             
             # Prepare the prompt
-            prompt = self.classification_prompt.format(query=query)
+            prompt = self.classification_prompt.replace('{query}', query)
             
             # Call Google AI Studio
             response = self._call_google_ai(prompt)
@@ -195,30 +205,10 @@ Confidence should be between 0.0 and 1.0
             return self._fallback_classification(query)
     
     def _call_google_ai_text(self, prompt: str) -> str:
-        """Call Google AI to get raw text response (Conversational Mode)"""
+        """Raw text response (Conversational Mode) from the fastest LLM backend"""
         try:
-            # Use Google Generative AI library if available
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-                model = genai.GenerativeModel('gemini-1.5-flash')
-                
-                response = model.generate_content(prompt)
-                return response.text if response.text else "I am unable to process that right now."
-                
-            except ImportError:
-                 # Fallback to direct API call
-                url = f"{self.base_url}/models/{self.model}:generateContent"
-                headers = {"Content-Type": "application/json"}
-                data = {"contents": [{"parts": [{"text": prompt}]}]}
-                params = {"key": self.api_key}
-                
-                response = requests.post(url, headers=headers, json=data, params=params, timeout=30)
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'candidates' in result and result['candidates']:
-                         return result['candidates'][0]['content']['parts'][0]['text']
-                return "AI Service Unavailable (Direct)"
+            result = get_llm_gateway().generate(prompt)
+            return result['text'] if result else "I am unable to process that right now."
                 
         except Exception as e:
             logger.error(f"Error calling Google AI Text: {e}")
@@ -299,7 +289,20 @@ Confidence should be between 0.0 and 1.0
     def _fallback_classification(self, query: str) -> Dict[str, Any]:
         """Fallback classification when Google AI is not available"""
         query_lower = query.lower().strip()
+        scores = self._keyword_scores(query_lower)
+        
+        max_score = max(scores.values())
+        if max_score == 0:
+            category = 'general_knowledge'
+            confidence = 0.5
+        else:
+            category = max(scores, key=scores.get)
+            confidence = min(max_score / 3, 0.95)  # Normalize confidence
         
+        return self._classification_for(query, category, confidence, fallback=True)
+    
+    def _keyword_scores(self, query_lower: str) -> Dict[str, int]:
+        """Keyword hit counts per category"""
         # Enhanced keyword-based classification
         farming_keywords = [
             'crop', 'फसल', 'farming', 'खेती', 'agriculture', 'कृषि', 'soil', 'मिट्टी',
@@ -347,8 +350,7 @@ Confidence should be between 0.0 and 1.0
         tech_score = sum(1 for kw in tech_keywords if kw in query_lower)
         entertainment_score = sum(1 for kw in entertainment_keywords if kw in query_lower)
         
-        # Determine category
-        scores = {
+        return {
             'farming_agriculture': farming_score,
             'weather_climate': weather_score,
             'market_economics': market_score,
@@ -357,30 +359,22 @@ Confidence should be between 0.0 and 1.0
             'technology_ai': tech_score,
             'entertainment_fun': entertainment_score
         }
-        
-        max_score = max(scores.values())
-        if max_score == 0:
-            category = 'general_knowledge'
-            confidence = 0.5
-        else:
-            category = max(scores, key=scores.get)
-            confidence = min(max_score / 3, 0.95)  # Normalize confidence
-        
-        # Detect language
-        language = self._detect_language(query)
-        
+    
+    def _classification_for(self, query: str, category: str, confidence: float, **extra) -> Dict[str, Any]:
+        """Classification result for a category decided without the LLM"""
+        query_lower = query.lower().strip()
         return {
             "category": category,
             "confidence": confidence,
             "subcategory": self._get_subcategory(category, query_lower),
-            "language": language,
+            "language": self._detect_language(query),
             "entities": self._extract_entities(query_lower),
             "intent": f"User query classified as {category}",
             "response_type": "structured_data",
             "requires_farming_expertise": category == 'farming_agriculture',
             "requires_general_knowledge": category in ['general_knowledge', 'education_learning'],
             "context_hints": self._get_context_hints(category, query_lower),
-            "fallback": True
+            **extra
         }
     
     def _detect_language(self, query: str) -> str:
@@ -14,7 +14,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['₹2,000 प्रति 4 महीने', 'सीधे बैंक खाते में', 'ऑनलाइन आवेदन'],
         'official_website': 'https://pmkisan.gov.in/',
         'helpline': '155261 / 011-24300606',
-        'apply_link': 'https://pmkisan.gov.in/RegistrationForm.aspx'
+        'apply_link': 'https://pmkisan.gov.in/RegistrationForm.aspx',
+        'amount_en': '₹6,000 per year',
+        'description_en': 'Direct income support of ₹2,000 in three instalments to all landholding farmer families',
+        'eligibility_en': 'All landholding farmer families',
+        'benefits_en': ['₹2,000 every 4 months', 'Paid directly to the bank account', 'Apply online'],
+        'category': 'income_support',
+        'crops': [],
+        'eligibility_tags': ['landholding', 'small_marginal'],
+        'priority': 1
     },
     {
         'id': 'fasal_bima',
@@ -26,7 +34,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['खरीफ: 2% प्रीमियम', 'रबी: 1.5% प्रीमियम', 'तुरंत क्लेम सेटलमेंट'],
         'official_website': 'https://pmfby.gov.in/',
         'helpline': '011-23382012',
-        'apply_link': 'https://pmfby.gov.in/farmerRegistrationLogin'
+        'apply_link': 'https://pmfby.gov.in/farmerRegistrationLogin',
+        'amount_en': 'Full crop cover at a low premium',
+        'description_en': 'Insurance cover for crop loss from natural calamities at very low premium rates',
+        'eligibility_en': 'All farmers (owners and tenants)',
+        'benefits_en': ['Kharif: 2% premium', 'Rabi: 1.5% premium', 'Quick claim settlement'],
+        'category': 'insurance',
+        'crops': [],
+        'eligibility_tags': ['all_farmers', 'tenant'],
+        'priority': 1
     },
     {
         'id': 'kisan_credit',
@@ -38,7 +54,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['4% ब्याज दर', '₹3 लाख तक ऋण', 'आसान प्रक्रिया'],
         'official_website': 'https://www.nabard.org/content1.aspx?id=575&catid=8&mid=530',
         'helpline': '1800-180-1111',
-        'apply_link': 'https://www.nabard.org/content1.aspx?id=575&catid=8&mid=530'
+        'apply_link': 'https://www.nabard.org/content1.aspx?id=575&catid=8&mid=530',
+        'amount_en': 'Loans up to ₹3 lakh at low interest',
+        'description_en': 'Timely and adequate credit for cultivation',
+        'eligibility_en': 'All farmers, fishers and livestock keepers',
+        'benefits_en': ['4% interest rate', 'Loans up to ₹3 lakh', 'Simple process'],
+        'category': 'credit',
+        'crops': [],
+        'eligibility_tags': ['all_farmers', 'fisher', 'livestock'],
+        'priority': 1
     },
     {
         'id': 'pm_kusum',
@@ -50,7 +74,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['60% सब्सिडी', 'बिजली बिल में बचत', 'पर्यावरण अनुकूल'],
         'official_website': 'https://mnre.gov.in/solar/schemes/',
         'helpline': '1800-180-3333',
-        'apply_link': 'https://pmkusum.mnre.gov.in/'
+        'apply_link': 'https://pmkusum.mnre.gov.in/',
+        'amount_en': '60% subsidy on solar pumps',
+        'description_en': '60% subsidy for farmers installing solar irrigation pumps',
+        'eligibility_en': 'All farmers',
+        'benefits_en': ['60% subsidy', 'Lower electricity bills', 'Environment friendly'],
+        'category': 'irrigation',
+        'crops': [],
+        'eligibility_tags': ['all_farmers'],
+        'priority': 2
     },
     {
         'id': 'kisan_rath',
@@ -62,7 +94,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['निःशुल्क', 'तुरंत ट्रांसपोर्ट', 'ऑनलाइन बुकिंग'],
         'official_website': 'https://kisanrath.nic.in/',
         'helpline': '1800-180-1551',
-        'apply_link': 'https://play.google.com/store/apps/details?id=com.nic.KisanRath'
+        'apply_link': 'https://play.google.com/store/apps/details?id=com.nic.KisanRath',
+        'amount_en': 'Free transport booking',
+        'description_en': 'App connecting farmers with transport vehicles',
+        'eligibility_en': 'All farmers',
+        'benefits_en': ['Free', 'Instant transport', 'Online booking'],
+        'category': 'market_access',
+        'crops': [],
+        'eligibility_tags': ['all_farmers'],
+        'priority': 3
     },
     {
         'id': 'soil_health',
@@ -74,7 +114,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['मुफ्त मिट्टी परीक्षण', 'सही खाद की सलाह', 'उत्पादकता बढ़ाएं'],
         'official_website': 'https://soilhealth.dac.gov.in/',
         'helpline': '011-24305948',
-        'apply_link': 'https://soilhealth.dac.gov.in/'
+        'apply_link': 'https://soilhealth.dac.gov.in/',
+        'amount_en': 'Free soil testing',
+        'description_en': 'Card giving farmers the health of their soil',
+        'eligibility_en': 'All farmers',
+        'benefits_en': ['Free soil test', 'Fertilizer advice', 'Higher productivity'],
+        'category': 'soil_health',
+        'crops': [],
+        'eligibility_tags': ['all_farmers'],
+        'priority': 2
     },
     {
         'id': 'kisan_drone',
@@ -86,7 +134,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['SC/ST: 50% सब्सिडी', 'महिला: 50% सब्सिडी', 'अन्य: 40% सब्सिडी'],
         'official_website': 'https://agricoop.nic.in/',
         'helpline': '011-23382691',
-        'apply_link': 'https://agricoop.nic.in/en/kisan-drones'
+        'apply_link': 'https://agricoop.nic.in/en/kisan-drones',
+        'amount_en': '40-50% subsidy on drones',
+        'description_en': 'Subsidy for buying drones for farm operations',
+        'eligibility_en': 'Farmers, FPOs and rural entrepreneurs',
+        'benefits_en': ['SC/ST: 50% subsidy', 'Women: 50% subsidy', 'Others: 40% subsidy'],
+        'category': 'mechanization',
+        'crops': [],
+        'eligibility_tags': ['all_farmers', 'fpo', 'entrepreneur', 'sc_st', 'women'],
+        'priority': 3
     },
     {
         'id': 'organic_farming',
@@ -98,7 +154,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['₹50,000/हेक्टेयर', 'प्रशिक्षण', 'प्रमाणीकरण सहायता'],
         'official_website': 'https://pgsindia-ncof.gov.in/',
         'helpline': '011-23070004',
-        'apply_link': 'https://pgsindia-ncof.gov.in/PKVY/Index.aspx'
+        'apply_link': 'https://pgsindia-ncof.gov.in/PKVY/Index.aspx',
+        'amount_en': '₹50,000 per hectare',
+        'description_en': 'Financial support to promote organic farming',
+        'eligibility_en': 'Farmers practising organic farming',
+        'benefits_en': ['₹50,000/hectare', 'Training', 'Certification support'],
+        'category': 'organic',
+        'crops': [],
+        'eligibility_tags': ['organic'],
+        'priority': 2
     },
     {
         'id': 'kisan_mall',
@@ -110,7 +174,15 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['घर बैठे खरीदारी', 'सही कीमत', 'गुणवत्ता की गारंटी'],
         'official_website': 'https://www.kisanemall.com/',
         'helpline': '1800-180-1551',
-        'apply_link': 'https://www.kisanemall.com/'
+        'apply_link': 'https://www.kisanemall.com/',
+        'amount_en': 'Online purchasing',
+        'description_en': 'Buy farm inputs online',
+        'eligibility_en': 'All farmers',
+        'benefits_en': ['Shop from home', 'Fair prices', 'Quality assurance'],
+        'category': 'market_access',
+        'crops': [],
+        'eligibility_tags': ['all_farmers'],
+        'priority': 3
     },
     {
         'id': 'mkisan',
@@ -122,53 +194,225 @@ CENTRAL_GOVERNMENT_SCHEMES = [
         'benefits': ['मुफ्त SMS', 'मौसम की जानकारी', 'बाजार भाव'],
         'official_website': 'https://mkisan.gov.in/',
         'helpline': '1800-180-1551',
-        'apply_link': 'https://mkisan.gov.in/Home/English'
+        'apply_link': 'https://mkisan.gov.in/Home/English',
+        'amount_en': 'Free SMS advisories',
+        'description_en': 'Farm advice by SMS on the mobile phone',
+        'eligibility_en': 'All farmers',
+        'benefits_en': ['Free SMS', 'Weather updates', 'Market prices'],
+        'category': 'advisory',
+        'crops': [],
+        'eligibility_tags': ['all_farmers'],
+        'priority': 3
+    },
+    {
+        'id': 'pmksy',
+        'name': 'प्रधानमंत्री कृषि सिंचाई योजना (PMKSY)',
+        'name_en': 'Pradhan Mantri Krishi Sinchayee Yojana',
+        'amount': '50% तक सब्सिडी के साथ सिंचाई सहायता',
+        'description': 'जल संरक्षण और सूक्ष्म सिंचाई (ड्रिप/स्प्रिंकलर) के लिए सहायता - हर खेत को पानी',
+        'eligibility': 'भूमि धारक किसान',
+        'benefits': ['ड्रिप/स्प्रिंकलर पर सब्सिडी', 'कम पानी में अधिक उपज', 'राज्य कृषि विभाग से आवेदन'],
+        'official_website': 'https://pmksy.gov.in/',
+        'helpline': '1800-180-1551',
+        'apply_link': 'https://pmksy.gov.in/',
+        'amount_en': 'Irrigation support with up to 50% subsidy',
+        'description_en': 'Support for water conservation and micro-irrigation (drip/sprinkler) - water for every field',
+        'eligibility_en': 'Farmers with landholding',
+        'benefits_en': ['Subsidy on drip/sprinkler', 'More crop per drop', 'Apply through state agriculture departments'],
+        'category': 'irrigation',
+        'crops': [],
+        'eligibility_tags': ['landholding'],
+        'priority': 2
+    },
+    {
+        'id': 'operation_greens',
+        'name': 'ऑपरेशन ग्रीन्स',
+        'name_en': 'Operation Greens',
+        'amount': 'परिवहन और भंडारण पर 50% सब्सिडी',
+        'description': 'टमाटर, प्याज, आलू और अन्य जल्दी खराब होने वाली फसलों के दाम स्थिर रखने की योजना',
+        'eligibility': 'फल और सब्जी उत्पादक किसान, FPO और सहकारी समितियां',
+        'benefits': ['परिवहन पर सब्सिडी', 'भंडारण पर सब्सिडी', 'दाम में स्थिरता'],
+        'official_website': 'https://www.mofpi.gov.in/',
+        'helpline': '1800-11-0551',
+        'apply_link': 'https://www.mofpi.gov.in/Schemes/operation-greens',
+        'amount_en': '50% subsidy on transport and storage',
+        'description_en': 'Price stabilisation for tomato, onion, potato and other perishables',
+        'eligibility_en': 'Fruit and vegetable growers, FPOs and cooperatives',
+        'benefits_en': ['Transport subsidy', 'Storage subsidy', 'Stable prices'],
+        'category': 'market_access',
+        'crops': ['tomato', 'onion', 'potato'],
+        'eligibility_tags': ['fpo', 'horticulture'],
+        'priority': 2
+    },
+    {
+        'id': 'nfsm',
+        'name': 'राष्ट्रीय खाद्य सुरक्षा मिशन (NFSM)',
+        'name_en': 'National Food Security Mission',
+        'amount': 'बीज, मशीनरी और प्रदर्शन पर सहायता',
+        'description': 'चावल, गेहूं, दलहन और मोटे अनाज का उत्पादन बढ़ाने के लिए सहायता',
+        'eligibility': 'चावल, गेहूं, दलहन और मोटे अनाज उगाने वाले किसान',
+        'benefits': ['उन्नत बीज पर सब्सिडी', 'फसल प्रदर्शन', 'कृषि यंत्रों पर सहायता'],
+        'official_website': 'https://www.nfsm.gov.in/',
+        'helpline': '1800-180-1551',
+        'apply_link': 'https://www.nfsm.gov.in/',
+        'amount_en': 'Support for seed, machinery and demonstrations',
+        'description_en': 'Support to raise production of rice, wheat, pulses and coarse cereals',
+        'eligibility_en': 'Rice, wheat, pulse and coarse cereal farmers',
+        'benefits_en': ['Subsidy on improved seed', 'Crop demonstrations', 'Support for farm machinery'],
+        'category': 'production',
+        'crops': ['rice', 'wheat', 'pulses', 'maize', 'millets'],
+        'eligibility_tags': ['all_farmers'],
+        'priority': 2
     }
 ]
 
 STATE_SPECIFIC_SCHEMES = {
     'Delhi': [
         {
+            'id': 'delhi_sarvahit_bima',
             'name': 'मुख्यमंत्री किसान और सर्वहित बीमा योजना',
+            'name_en': 'Mukhyamantri Kisan Aur Sarvahit Bima Yojana',
             'amount': '₹5 लाख दुर्घटना बीमा',
+            'amount_en': '₹5 lakh accident insurance',
             'description': 'दिल्ली के किसानों के लिए निःशुल्क बीमा',
-            'website': 'http://delhi.gov.in/'
+            'description_en': 'Free insurance for farmers in Delhi',
+            'website': 'http://delhi.gov.in/',
+            'category': 'insurance'
+        },
+        {
+            'id': 'delhi_kisan_vikas',
+            'name': 'दिल्ली किसान विकास योजना',
+            'name_en': 'Delhi Kisan Vikas Yojana',
+            'amount': '₹50,000 प्रति किसान',
+            'amount_en': '₹50,000 per farmer',
+            'description': 'दिल्ली के किसानों के लिए विशेष योजना',
+            'description_en': 'Special scheme for farmers in Delhi',
+            'helpline': '011-23379111',
+            'website': 'https://delhi.gov.in',
+            'category': 'development'
         }
     ],
     'Punjab': [
         {
+            'id': 'punjab_karz_mafi',
             'name': 'पंजाब किसान कर्ज माफी योजना',
+            'name_en': 'Punjab Farm Loan Waiver Scheme',
             'amount': 'ऋण माफी',
+            'amount_en': 'Loan waiver',
             'description': 'छोटे और सीमांत किसानों का कर्ज माफ',
-            'website': 'https://punjab.gov.in/'
+            'description_en': 'Loan waiver for small and marginal farmers',
+            'website': 'https://punjab.gov.in/',
+            'category': 'credit',
+            'eligibility_tags': ['small_marginal']
         }
     ],
     'Maharashtra': [
         {
+            'id': 'mjpsky',
             'name': 'महात्मा ज्योतिबा फुले कर्ज मुक्ति योजना',
+            'name_en': 'Mahatma Jyotiba Phule Karj Mukti Yojana',
             'amount': 'ऋण माफी',
+            'amount_en': 'Loan waiver',
             'description': 'किसानों का कर्ज माफ करने की योजना',
-            'website': 'https://maharashtra.gov.in/'
+            'description_en': 'Scheme to waive farm loans',
+            'website': 'https://maharashtra.gov.in/',
+            'category': 'credit'
+        },
+        {
+            'id': 'maharashtra_kisan_vikas',
+            'name': 'महाराष्ट्र किसान विकास योजना',
+            'name_en': 'Maharashtra Kisan Vikas Yojana',
+            'amount': '₹75,000 प्रति किसान',
+            'amount_en': '₹75,000 per farmer',
+            'description': 'महाराष्ट्र के किसानों के लिए विशेष योजना',
+            'description_en': 'Special scheme for farmers in Maharashtra',
+            'helpline': '1800-120-8040',
+            'website': 'https://maharashtra.gov.in',
+            'category': 'development'
+        }
+    ],
+    'Karnataka': [
+        {
+            'id': 'karnataka_kisan_vikas',
+            'name': 'कर्नाटक किसान विकास योजना',
+            'name_en': 'Karnataka Kisan Vikas Yojana',
+            'amount': '₹60,000 प्रति किसान',
+            'amount_en': '₹60,000 per farmer',
+            'description': 'कर्नाटक के किसानों के लिए विशेष योजना',
+            'description_en': 'Special scheme for farmers in Karnataka',
+            'helpline': '1800-425-1556',
+            'website': 'https://karnataka.gov.in',
+            'category': 'development'
         }
     ],
     'Kerala': [
         {
+            'id': 'kerala_rin_rahat',
             'name': 'केरल किसान ऋण राहत योजना',
+            'name_en': 'Kerala Farmers Debt Relief Scheme',
             'amount': 'ब्याज मुक्त ऋण',
+            'amount_en': 'Interest-free loans',
             'description': 'किसानों को ब्याज मुक्त ऋण',
-            'website': 'https://kerala.gov.in/'
+            'description_en': 'Interest-free loans for farmers',
+            'website': 'https://kerala.gov.in/',
+            'category': 'credit'
         }
     ],
     'Tamil Nadu': [
         {
+            'id': 'tn_cm_kisan_samman',
             'name': 'सीएम किसान सम्मान योजना',
+            'name_en': 'CM Kisan Samman Scheme',
             'amount': '₹4,000 प्रति वर्ष',
+            'amount_en': '₹4,000 per year',
             'description': 'किसानों को अतिरिक्त आर्थिक सहायता',
-            'website': 'https://tn.gov.in/'
+            'description_en': 'Additional income support for farmers',
+            'website': 'https://tn.gov.in/',
+            'category': 'income_support'
+        },
+        {
+            'id': 'tn_kisan_vikas',
+            'name': 'तमिलनाडु किसान विकास योजना',
+            'name_en': 'Tamil Nadu Kisan Vikas Yojana',
+            'amount': '₹55,000 प्रति किसान',
+            'amount_en': '₹55,000 per farmer',
+            'description': 'तमिलनाडु के किसानों के लिए विशेष योजना',
+            'description_en': 'Special scheme for farmers in Tamil Nadu',
+            'helpline': '1800-425-1556',
+            'website': 'https://tamilnadu.gov.in',
+            'category': 'development'
+        }
+    ],
+    'West Bengal': [
+        {
+            'id': 'wb_kisan_vikas',
+            'name': 'पश्चिम बंगाल किसान विकास योजना',
+            'name_en': 'West Bengal Kisan Vikas Yojana',
+            'amount': '₹45,000 प्रति किसान',
+            'amount_en': '₹45,000 per farmer',
+            'description': 'पश्चिम बंगाल के किसानों के लिए विशेष योजना',
+            'description_en': 'Special scheme for farmers in West Bengal',
+            'helpline': '1800-345-3380',
+            'website': 'https://westbengal.gov.in',
+            'category': 'development'
         }
     ]
 }
 
+CATEGORY_LABELS = {
+    'income_support': {'hi': 'आय सहायता', 'en': 'Income support'},
+    'insurance': {'hi': 'बीमा', 'en': 'Insurance'},
+    'credit': {'hi': 'ऋण', 'en': 'Credit'},
+    'irrigation': {'hi': 'सिंचाई', 'en': 'Irrigation'},
+    'market_access': {'hi': 'बाजार पहुंच', 'en': 'Market access'},
+    'soil_health': {'hi': 'मृदा स्वास्थ्य', 'en': 'Soil health'},
+    'mechanization': {'hi': 'मशीनीकरण', 'en': 'Mechanization'},
+    'organic': {'hi': 'जैविक खेती', 'en': 'Organic farming'},
+    'advisory': {'hi': 'डिजिटल सेवाएं', 'en': 'Digital services'},
+    'production': {'hi': 'उत्पादन', 'en': 'Production'},
+    'development': {'hi': 'विकास', 'en': 'Development'},
+}
+
 def get_all_schemes(location='Delhi'):
     """Get all government schemes for a location"""
     schemes_data = {
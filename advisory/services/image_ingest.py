@@ -0,0 +1,215 @@
+"""
+Image Upload Ingest
+Multipart crop photos are streamed to a spool file in fixed-size chunks,
+then decoded on a small worker pool: Pillow draft mode decodes JPEGs
+directly at reduced scale, EXIF orientation is applied and the image is
+downscaled to the model input size. A 64-bit perceptual hash (dHash) of
+each photo keys a cache of earlier model outputs in the 'shared' alias, so
+a repeat photo of the same field skips the image models on every worker. Only the photo-dependent part of a
+diagnosis is cached; region and weather checks run for every request.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+from ..cache_utils import shared_cache
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = ImageOps = None
+    PIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_SIDE = 512
+HASH_BANDS = 4                 # 16-bit bands; any hash within 3 bits shares at least one band
+DUPLICATE_MAX_DISTANCE = 3
+DIAGNOSIS_TTL = 7 * 24 * 3600
+BAND_CANDIDATES = 50
+
+
+class UploadTooLarge(ValueError):
+    """An upload over MAX_IMAGE_UPLOAD_BYTES"""
+
+
+def _spool_dir() -> str:
+    path = str(getattr(settings, 'UPLOAD_SPOOL_DIR', None) or tempfile.gettempdir())
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _max_upload_bytes() -> int:
+    return int(getattr(settings, 'MAX_IMAGE_UPLOAD_BYTES', 10 * 1024 * 1024))
+
+
+def spool_upload(uploaded) -> Dict[str, Any]:
+    """
+    Write an uploaded file to a spool file chunk by chunk, hashing as it
+    goes; memory use is one chunk regardless of the upload size. Uploads
+    Django already streamed to a temporary file are hashed in place.
+    Raises UploadTooLarge when the upload exceeds MAX_IMAGE_UPLOAD_BYTES.
+    """
+    limit = _max_upload_bytes()
+    if getattr(uploaded, 'size', 0) and uploaded.size > limit:
+        raise UploadTooLarge(f'Image exceeds the {limit // (1024 * 1024)} MB upload limit')
+    chunks = uploaded.chunks() if hasattr(uploaded, 'chunks') else iter(lambda: uploaded.read(64 * 1024), b'')
+    digest = hashlib.sha256()
+    size = 0
+
+    if hasattr(uploaded, 'temporary_file_path'):
+        for chunk in chunks:
+            size += len(chunk)
+            digest.update(chunk)
+        return {'path': uploaded.temporary_file_path(), 'size': size, 'sha256': digest.hexdigest(), 'owned': False}
+
+    fd, path = tempfile.mkstemp(dir=_spool_dir(), prefix='upload-', suffix='.img')
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            for chunk in chunks:
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLarge(f'Image exceeds the {limit // (1024 * 1024)} MB upload limit')
+                digest.update(chunk)
+                spool.write(chunk)
+    except Exception:
+        os.unlink(path)
+        raise
+    return {'path': path, 'size': size, 'sha256': digest.hexdigest(), 'owned': True}
+
+
+def _discard(spooled: Dict[str, Any]):
+    if spooled.get('owned'):
+        try:
+            os.unlink(spooled['path'])
+        except OSError:
+            pass
+
+
+def load_downscaled(path: str, max_side: int = MAX_IMAGE_SIDE) -> np.ndarray:
+    """Decode a spooled image at reduced scale, upright and at most `max_side` pixels a side"""
+    if not PIL_AVAILABLE:
+        raise RuntimeError('Pillow is required to decode uploaded images')
+    with Image.open(path) as img:
+        # JPEG decoders can skip detail during decoding (1/2, 1/4, 1/8 scale)
+        img.draft('RGB', (max_side, max_side))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert('RGB')
+        img.thumbnail((max_side, max_side))
+        return np.asarray(img)
+
+
+def perceptual_hash(image: np.ndarray) -> str:
+    """64-bit difference hash as 16 hex digits; robust to rescaling and recompression"""
+    gray = image.astype(np.float32).mean(axis=2) if image.ndim == 3 else image.astype(np.float32)
+    h, w = gray.shape
+    if h < 8 or w < 9:
+        gray = gray[np.arange(max(h, 8)) * h // max(h, 8)][:, np.arange(max(w, 9)) * w // max(w, 9)]
+        h, w = gray.shape
+    # Block-average down to 8 rows x 9 columns
+    rows = np.linspace(0, h, 9).astype(int)
+    cols = np.linspace(0, w, 10).astype(int)
+    small = np.add.reduceat(np.add.reduceat(gray, rows[:-1], axis=0), cols[:-1], axis=1)
+    small /= np.outer(np.diff(rows), np.diff(cols))
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _decode_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=int(getattr(settings, 'IMAGE_DECODE_WORKERS', 4)),
+                                           thread_name_prefix='image-decode')
+    return _pool
+
+
+def _process(spooled: Dict[str, Any], max_side: int) -> Dict[str, Any]:
+    try:
+        image = load_downscaled(spooled['path'], max_side)
+    finally:
+        _discard(spooled)
+    return {
+        'image': image,
+        'phash': perceptual_hash(image),
+        'sha256': spooled['sha256'],
+        'size': spooled['size'],
+        'shape': list(image.shape[:2]),
+    }
+
+
+def ingest_uploads(files: Dict[str, Any], max_side: int = MAX_IMAGE_SIDE) -> Dict[str, Dict[str, Any]]:
+    """
+    Spool each named upload, then decode them concurrently on the worker
+    pool. Returns name -> {image, phash, sha256, size, shape}.
+    """
+    spooled = {}
+    try:
+        for name, uploaded in files.items():
+            spooled[name] = spool_upload(uploaded)
+    except Exception:
+        for entry in spooled.values():
+            _discard(entry)
+        raise
+    futures = {name: _decode_pool().submit(_process, entry, max_side) for name, entry in spooled.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+# ---------------------------------------------------------------------- duplicate photos
+
+def _bands(phash: str) -> List[str]:
+    width = 16 // HASH_BANDS
+    return [phash[i * width:(i + 1) * width] for i in range(HASH_BANDS)]
+
+
+def _scope(crop: Optional[str]) -> str:
+    return (crop or 'any').lower().replace(' ', '_')
+
+
+def find_cached_diagnosis(phash: str, crop: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Earlier model output for the same or a near-identical photo of the same crop"""
+    scope = _scope(crop)
+    exact = shared_cache.get(f'recognition_phash:{scope}:{phash}')
+    if exact is not None:
+        return dict(exact, duplicate_distance=0)
+
+    band_keys = [f'recognition_band:{scope}:{i}:{band}' for i, band in enumerate(_bands(phash))]
+    candidates = set()
+    for hashes in shared_cache.get_many(band_keys).values():
+        candidates.update(hashes)
+    best = min(((hamming(phash, other), other) for other in candidates), default=None)
+    if best is None or best[0] > DUPLICATE_MAX_DISTANCE:
+        return None
+    cached = shared_cache.get(f'recognition_phash:{scope}:{best[1]}')
+    return dict(cached, duplicate_distance=best[0]) if cached is not None else None
+
+
+def remember_diagnosis(phash: str, result: Dict[str, Any], crop: Optional[str] = None):
+    """Index the model output for a photo (`KrishiRakshaPestService.recognize`) under its hash and bands"""
+    scope = _scope(crop)
+    shared_cache.set(f'recognition_phash:{scope}:{phash}', result, DIAGNOSIS_TTL)
+    band_keys = [f'recognition_band:{scope}:{i}:{band}' for i, band in enumerate(_bands(phash))]
+    existing = shared_cache.get_many(band_keys)
+    updates = {}
+    for key in band_keys:
+        hashes = [h for h in existing.get(key, []) if h != phash]
+        updates[key] = (hashes + [phash])[-BAND_CANDIDATES:]
+    shared_cache.set_many(updates, DIAGNOSIS_TTL)
@@ -1,3 +1,4 @@
+import copy
 import logging
 import random
 from typing import Dict, Any, List, Optional
@@ -5,6 +6,7 @@ from datetime import datetime
 from django.utils import timezone
 
 # Import Services
+from ..ml.image_inference import classify_image
 from .clean_weather_api import CleanWeatherAPI
 from .ultra_dynamic_government_api import UltraDynamicGovernmentAPI
 
@@ -27,30 +29,27 @@ class KrishiRakshaPestService:
         self.gov_api = UltraDynamicGovernmentAPI()
         self.supported_crops = ['tomato', 'rice', 'potato', 'chilli', 'banana']
 
-    def diagnose_crop(self, session_id: str, crop_name: str, location: str, images: Dict[str, str] = None) -> Dict[str, Any]:
+    def diagnose_crop(self, session_id: str, crop_name: str, location: str, images: Dict[str, str] = None,
+                      recognized: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Main pipeline entry point.
         Step 1: Classification (Simulated if crop_name provided)
         Step 2: Specialist Model
-        Step 3: Region Verification
-        Step 4: Severity Analysis
+        Step 3: Severity Analysis
+        Step 4: Region Verification
+        Steps 1-3 depend only on the photos (see `recognize`); pass their
+        earlier output as `recognized` to run just step 4 for this location.
         """
         try:
-            # Step 1: Crop Classification / Validation
-            detected_crop = self._classify_crop(crop_name, images)
-            
-            # Step 2: Run Specialist Model (Dual Pipeline)
-            raw_diagnosis = self._run_specialist_model(detected_crop, images)
-            
-            # Step 3: Region & Weather Verification (Filter impossible diseases)
-            verified_diagnosis = self._verify_region_context(raw_diagnosis, location)
-            
-            # Step 4: Severity Analysis
-            final_result = self._analyze_severity(verified_diagnosis)
+            if recognized is None:
+                recognized = self.recognize(crop_name, images)
+
+            # Step 4: Region & Weather Verification (Filter impossible diseases)
+            final_result = self._verify_region_context(copy.deepcopy(recognized['diagnosis']), location)
 
             return {
                 "status": "success",
-                "crop_detected": detected_crop,
+                "crop_detected": recognized['crop_detected'],
                 "diagnosis": final_result,
                 "pipeline_stages": {
                     "classification": "High Confidence",
@@ -69,18 +68,59 @@ class KrishiRakshaPestService:
                 "diagnosis": self._generalist_logic(crop_name)
             }
 
+    def recognize(self, crop_name: str, images: Dict[str, str] = None) -> Dict[str, Any]:
+        """Steps 1-3: the model output for the photos, independent of location and weather"""
+        # Step 1: Crop Classification / Validation
+        detected_crop = self._classify_crop(crop_name, images)
+
+        # Step 2: Run Specialist Model (Dual Pipeline)
+        raw_diagnosis = self._run_specialist_model(detected_crop, images)
+
+        # Step 3: Severity Analysis
+        return {"crop_detected": detected_crop, "diagnosis": self._analyze_severity(raw_diagnosis)}
+
+    def _primary_image(self, images: Optional[Dict], preferred: str):
+        """The preferred view from the uploaded images, else any of them."""
+        if not images:
+            return None
+        if images.get(preferred) is not None:
+            return images[preferred]
+        return next((image for image in images.values() if image is not None), None)
+
     def _classify_crop(self, crop_input: str, images: Dict) -> str:
         """Step 1: Identify crop to route to correct 'Head'."""
         if crop_input and crop_input.lower() in self.supported_crops:
             return crop_input.lower()
-        # Fallback / Simulation for Image Classification
+        # Crop classifier on the whole-plant view, when a model is installed
+        prediction = classify_image('crop', self._primary_image(images, 'whole'))
+        if prediction and prediction['label'] in self.supported_crops:
+            return prediction['label']
         return "tomato" # Default for v1
 
     def _run_specialist_model(self, crop: str, images: Dict) -> List[Dict]:
         """Step 2: The 'Specialist' AI Head."""
-        # In a real system, this loads models/tomato_net.pt
-        # Here we simulate the 'Expert' logic with high-detail rules.
-        
+        diseases = self._expert_logic(crop)
+        prediction = classify_image(f'disease_{crop}', self._primary_image(images, 'close_up'))
+        if not prediction:
+            return diseases
+
+        # The image model's probabilities replace the rule confidences
+        by_name = {d['name'].lower(): d for d in diseases}
+        ranked = []
+        for candidate in prediction['top']:
+            entry = by_name.get(candidate['label'].lower()) or {
+                "name": candidate['label'],
+                "symptoms": [],
+                "treatment": ["Consult local agronomist"],
+                "explanation": "Identified by the image model.",
+            }
+            entry['confidence'] = candidate['confidence']
+            entry['source'] = 'image_model'
+            ranked.append(entry)
+        return ranked
+
+    def _expert_logic(self, crop: str) -> List[Dict]:
+        """Rule-based specialist heads, used when no image model is installed."""
         if crop == 'tomato':
             return self._tomato_expert_logic()
         elif crop == 'rice':
@@ -95,7 +135,7 @@ class KrishiRakshaPestService:
         return self._generalist_logic(crop)
 
     def _verify_region_context(self, diseases: List[Dict], location: str) -> List[Dict]:
-        """Step 3: Filter diseases based on Weather/Season."""
+        """Step 4: Filter diseases based on Weather/Season."""
         try:
             weather = self.weather_api.get_current_weather(location)
             # Default to benign conditions if API fails
@@ -130,7 +170,7 @@ class KrishiRakshaPestService:
             return diseases
 
     def _analyze_severity(self, diseases: List[Dict]) -> List[Dict]:
-        """Step 4: Assign severity scores."""
+        """Step 3: Assign severity scores."""
         for d in diseases:
             # Simulate severity based on 'lesion_coverage' from image analysis (mocked)
             d['severity_score'] = random.randint(10, 90)
@@ -0,0 +1,461 @@
+"""
+LLM Gateway
+One entry point for free-text generation over every LLM backend (local
+Ollama, Gemini, the Hugging Face inference API). For each backend the gateway
+keeps a rolling window of latencies and outcomes. Each prompt goes to the
+healthy backend expected to answer first. If that backend has not answered
+by its own p90 latency, the gateway sends a hedge request to the next one.
+The first good answer wins and the other request is cancelled:
+
+    get_llm_gateway().generate(prompt)  ->  {'text', 'backend', 'latency', 'hedged'} or None
+
+A backend is a plain callable `(prompt, timeout, cancelled, options)`. It
+returns the text, or a dict with 'text' and any backend state such as
+Ollama's 'context' tokens, which is copied into the result. `options` may
+carry hints that only some backends understand. Ollama continues a
+conversation from `context` and only needs the new turn in `continuation`;
+other backends ignore both and read the full prompt.
+Streaming backends stop reading as soon as `cancelled` is set. Other
+backends finish in the background and their answer is dropped. Each backend
+has a concurrency limit. When all of a backend's slots are taken, the
+gateway passes over it instead of queueing. After repeated failures a
+backend is skipped for a cooldown period, then probed again.
+
+Backends also have a quality tier. Fallback-tier backends (by default the
+Hugging Face DialoGPT model, see LLM_GATEWAY_FALLBACK) answer worse however
+fast they are. They are never used as a hedge and are tried only once every
+preferred backend has failed, is saturated or is cooling down.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import requests
+from django.conf import settings
+
+from ..monitoring.tracing import propagate, span
+
+logger = logging.getLogger(__name__)
+
+WINDOW = 100                   # latest calls per backend kept for latency and error rates
+MIN_SAMPLES = 5                # latency samples before p90 replaces the prior as hedge delay
+DEFAULT_PRIOR_LATENCY = 5.0    # seconds assumed for a backend with no history
+MIN_HEDGE_DELAY = 0.05
+FAILURE_THRESHOLD = 3          # consecutive failures before a backend is skipped
+COOLDOWN_SECONDS = 30.0
+CONNECT_TIMEOUT = 3.05
+
+GEMINI_BASE_URL = 'https://generativelanguage.googleapis.com/v1beta'
+HUGGINGFACE_MODEL_URL = 'https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium'
+DEFAULT_CONCURRENCY = {'ollama': 2, 'gemini': 8, 'huggingface': 4, 'local': 8, 'stub': 8}
+# data_source labels the services reported before the gateway existed
+DATA_SOURCES = {'ollama': 'ollama_ai', 'gemini': 'google_ai'}
+# Option keys that carry conversation state rather than sampling parameters
+STATE_HINTS = frozenset({'context', 'continuation'})
+
+PREFERRED_TIER = 0
+FALLBACK_TIER = 1
+
+BackendCall = Callable[[str, float, threading.Event, Dict[str, Any]], Any]
+
+
+class Backend:
+    """One LLM backend with its concurrency slots and rolling statistics"""
+
+    def __init__(self, name: str, call: BackendCall, max_concurrency: int = 4,
+                 prior_latency: float = DEFAULT_PRIOR_LATENCY, tier: int = PREFERRED_TIER):
+        self.name = name
+        self.call = call
+        self.tier = tier
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.prior_latency = prior_latency
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=WINDOW)
+        self._outcomes = deque(maxlen=WINDOW)
+        self._consecutive_failures = 0
+        self._skip_until = 0.0
+        self.in_flight = 0
+
+    def acquire(self) -> bool:
+        if not self._slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def record(self, latency: float, ok: Optional[bool]):
+        """
+        Record one finished call. `ok=None` marks a cancelled loser: its
+        elapsed time is a lower bound on its latency and still counts, but it
+        is neither a success nor a failure.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            if ok is None:
+                return
+            self._outcomes.append(ok)
+            if ok:
+                self._consecutive_failures = 0
+                self._skip_until = 0.0
+            else:
+                self._consecutive_failures += 1
+                if self._consecutive_failures >= FAILURE_THRESHOLD:
+                    self._skip_until = time.monotonic() + COOLDOWN_SECONDS
+
+    def latency(self, quantile: float) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return None
+            return float(np.quantile(np.fromiter(self._latencies, float), quantile))
+
+    def error_rate(self) -> float:
+        with self._lock:
+            return 1.0 - sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def healthy(self) -> bool:
+        with self._lock:
+            return self._consecutive_failures < FAILURE_THRESHOLD or time.monotonic() >= self._skip_until
+
+    def expected_latency(self) -> float:
+        """Median latency inflated by the error rate (a failed call costs a retry elsewhere)"""
+        median = self.latency(0.5)
+        return (self.prior_latency if median is None else median) / max(0.05, 1.0 - self.error_rate())
+
+    def hedge_delay(self) -> float:
+        p90 = self.latency(0.9)
+        return max(MIN_HEDGE_DELAY, self.prior_latency if p90 is None else p90)
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p90 = self.latency(0.5), self.latency(0.9)
+        return {
+            'healthy': self.healthy(),
+            'tier': self.tier,
+            'p50_ms': None if p50 is None else round(p50 * 1000, 1),
+            'p90_ms': None if p90 is None else round(p90 * 1000, 1),
+            'error_rate': round(self.error_rate(), 3),
+            'samples': len(self._latencies),
+            'in_flight': self.in_flight,
+            'max_concurrency': self.max_concurrency,
+        }
+
+
+class StubBackend(Backend):
+    """Local backend with a fixed reply, latency and failure mode, for tests and offline development"""
+
+    def __init__(self, name: str = 'stub', reply: Any = 'Stub answer: {prompt}', latency: float = 0.0,
+                 fail: bool = False, max_concurrency: int = 8, prior_latency: float = DEFAULT_PRIOR_LATENCY,
+                 tier: int = PREFERRED_TIER):
+        self.reply = reply
+        self.delay = latency
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+        super().__init__(name, self._answer, max_concurrency, prior_latency, tier)
+
+    def _answer(self, prompt: str, timeout: float, cancelled: threading.Event, options: Dict[str, Any]):
+        self.calls += 1
+        if cancelled.wait(min(self.delay, timeout)):
+            self.cancelled += 1
+            return None
+        if self.delay > timeout:
+            raise TimeoutError(f'{self.name} backend timed out')
+        if self.fail:
+            raise RuntimeError(f'{self.name} backend failure')
+        return self.reply(prompt) if callable(self.reply) else self.reply.replace('{prompt}', prompt[-200:])
+
+
+def ollama_backend(base_url: str, model: str, max_concurrency: int = 2, keep_alive: Optional[str] = None,
+                   **kwargs) -> Backend:
+    """
+    Local Ollama server. Tokens are streamed so a cancelled hedge closes the
+    connection and frees the model. `keep_alive` keeps the model resident
+    between requests, and the conversation `context` Ollama returns is
+    passed back to the caller.
+    """
+
+    def call(prompt, timeout, cancelled, options):
+        payload = {'model': model, 'prompt': prompt, 'stream': True}
+        if keep_alive:
+            payload['keep_alive'] = keep_alive
+        if options.get('context'):
+            payload['context'] = options['context']
+            payload['prompt'] = options.get('continuation', prompt)
+        if options.keys() - STATE_HINTS:
+            payload['options'] = {
+                'temperature': options.get('temperature', 0.7),
+                'top_p': options.get('top_p', 0.9),
+                'num_predict': options.get('max_tokens', 800),
+                **({'stop': options['stop']} if options.get('stop') else {}),
+            }
+        parts = []
+        context = None
+        with requests.post(f'{base_url.rstrip("/")}/api/generate', json=payload, stream=True,
+                           timeout=(CONNECT_TIMEOUT, timeout)) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if cancelled.is_set():
+                    return None
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                parts.append(chunk.get('response', ''))
+                if chunk.get('done'):
+                    context = chunk.get('context')
+                    break
+        return {'text': ''.join(parts).strip(), 'context': context}
+
+    return Backend('ollama', call, max_concurrency, **kwargs)
+
+
+def gemini_backend(api_key: str, model: str = 'gemini-1.5-flash', max_concurrency: int = 8, **kwargs) -> Backend:
+    """Google AI Studio generateContent"""
+
+    def call(prompt, timeout, cancelled, options):
+        payload = {'contents': [{'parts': [{'text': prompt}]}]}
+        if options.keys() - STATE_HINTS:
+            payload['generationConfig'] = {
+                'temperature': options.get('temperature', 0.7),
+                'topP': options.get('top_p', 0.9),
+                'maxOutputTokens': options.get('max_tokens', 800),
+            }
+        response = requests.post(f'{GEMINI_BASE_URL}/models/{model}:generateContent', json=payload,
+                                 headers={'x-goog-api-key': api_key}, timeout=(CONNECT_TIMEOUT, timeout))
+        response.raise_for_status()
+        candidates = response.json().get('candidates') or []
+        if not candidates:
+            return None
+        return candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '').strip()
+
+    return Backend('gemini', call, max_concurrency, **kwargs)
+
+
+def huggingface_backend(token: str, url: str = HUGGINGFACE_MODEL_URL, max_concurrency: int = 4,
+                        **kwargs) -> Backend:
+    """Hugging Face inference API"""
+
+    def call(prompt, timeout, cancelled, options):
+        options = options or {}
+        payload = {'inputs': prompt, 'parameters': {'max_length': options.get('max_tokens', 200),
+                                                    'temperature': options.get('temperature', 0.7)}}
+        response = requests.post(url, json=payload, headers={'Authorization': f'Bearer {token}'},
+                                 timeout=(CONNECT_TIMEOUT, timeout))
+        response.raise_for_status()
+        result = response.json()
+        if isinstance(result, list) and result:
+            return result[0].get('generated_text', '').strip()
+        return None
+
+    return Backend('huggingface', call, max_concurrency, **kwargs)
+
+
+def local_backend(client, max_concurrency: int = 8, **kwargs) -> Backend:
+    """Resident local generation worker (advisory.ml.local_generation)"""
+
+    def call(prompt, timeout, cancelled, options):
+        if not client.available():
+            raise ConnectionError('local generation worker is not running')
+        return client.generate(prompt, (options or {}).get('max_tokens'), timeout) or None
+
+    return Backend('local', call, max_concurrency, **kwargs)
+
+
+class _Attempt:
+    __slots__ = ('backend', 'future', 'cancelled', 'started')
+
+    def __init__(self, backend: Backend):
+        self.backend = backend
+        self.future = Future()
+        self.future.set_running_or_notify_cancel()
+        self.cancelled = threading.Event()
+        self.started = time.monotonic()
+
+
+class LLMGateway:
+    """Latency-aware router with hedged requests over a set of backends"""
+
+    def __init__(self, backends: Iterable[Backend] = (), timeout: float = 30.0, hedge: bool = True):
+        self.timeout = timeout
+        self.hedge = hedge
+        self._backends: Dict[str, Backend] = {}
+        for backend in backends:
+            self.register(backend)
+
+    def register(self, backend: Backend) -> Backend:
+        self._backends[backend.name] = backend
+        return backend
+
+    def backend(self, name: str) -> Optional[Backend]:
+        return self._backends.get(name)
+
+    @property
+    def backends(self) -> List[str]:
+        return list(self._backends)
+
+    def ranked(self, names: Optional[Iterable[str]] = None) -> List[Backend]:
+        """
+        Backends in the order to try them: healthy ones by tier, then by
+        expected latency within a tier; the ones in cooldown last, in case
+        nothing else is left. Registration order breaks ties, so it acts as
+        the preference order until latency data builds up.
+        """
+        allowed = list(self._backends) if names is None else [name for name in names if name in self._backends]
+        position = {name: i for i, name in enumerate(self._backends)}
+        candidates = [self._backends[name] for name in allowed]
+        return sorted(candidates, key=lambda b: (not b.healthy(), b.tier, b.expected_latency(), position[b.name]))
+
+    def generate(self, prompt: str, timeout: Optional[float] = None, backends: Optional[Iterable[str]] = None,
+                 options: Optional[Dict[str, Any]] = None, hedge: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """
+        Text from the first backend to answer, or None when every backend
+        failed, was saturated or ran out of time. At most two requests are
+        in flight: the primary and one hedge. A failed request is replaced
+        by the next backend straight away.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        hedge = self.hedge if hedge is None else hedge
+        deadline = time.monotonic() + timeout
+        candidates = self.ranked(backends)
+        pending: Dict[Future, _Attempt] = {}
+        hedged = False
+
+        def launch(max_tier: Optional[int] = None) -> bool:
+            for backend in list(candidates):
+                if max_tier is not None and backend.tier > max_tier:
+                    continue
+                candidates.remove(backend)
+                if not backend.acquire():
+                    logger.debug(f"LLM backend {backend.name} is at its concurrency limit")
+                    continue
+                attempt = _Attempt(backend)
+                pending[attempt.future] = attempt
+                threading.Thread(target=propagate(self._run), args=(attempt, prompt, deadline, options or {}),
+                                 name=f'llm-{backend.name}', daemon=True).start()
+                return True
+            return False
+
+        launch()
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wait_for = deadline - now
+            primary = next(iter(pending.values()))
+            # A hedge goes to a backend of the same or a better tier, never to a fallback
+            can_hedge = (hedge and not hedged and len(pending) == 1
+                         and any(b.tier <= primary.backend.tier for b in candidates))
+            if can_hedge:
+                wait_for = min(wait_for, max(0.0, primary.started + primary.backend.hedge_delay() - now))
+
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+            if not done:
+                if can_hedge and launch(max_tier=primary.backend.tier):
+                    hedged = True
+                    logger.debug(f"Hedging LLM request after {primary.backend.name} passed its p90")
+                continue
+
+            for future in done:
+                attempt = pending.pop(future)
+                latency = time.monotonic() - attempt.started
+                try:
+                    answer = future.result()
+                except Exception as e:
+                    logger.warning(f"LLM backend {attempt.backend.name} failed: {e}")
+                    answer = None
+                state = answer if isinstance(answer, dict) else {'text': answer}
+                if state['text']:
+                    attempt.backend.record(latency, True)
+                    self._cancel(pending, ok=None)
+                    return dict(state, backend=attempt.backend.name, latency=latency, hedged=hedged)
+                attempt.backend.record(latency, False)
+            if not pending:
+                launch()
+
+        # Out of time: whatever is still running has timed out
+        self._cancel(pending, ok=False)
+        return None
+
+    @staticmethod
+    def _run(attempt: _Attempt, prompt: str, deadline: float, options: Dict[str, Any]):
+        try:
+            remaining = max(0.1, deadline - time.monotonic())
+            with span(f'llm.{attempt.backend.name}'):
+                attempt.future.set_result(attempt.backend.call(prompt, remaining, attempt.cancelled, options))
+        except Exception as e:
+            attempt.future.set_exception(e)
+        finally:
+            attempt.backend.release()
+
+    @staticmethod
+    def _cancel(pending: Dict[Future, _Attempt], ok: Optional[bool]):
+        for attempt in pending.values():
+            attempt.cancelled.set()
+            attempt.backend.record(time.monotonic() - attempt.started, ok)
+        pending.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: backend.stats() for name, backend in self._backends.items()}
+
+
+def build_gateway() -> LLMGateway:
+    """Gateway over the backends named in settings.LLM_GATEWAY_BACKENDS that are configured"""
+    concurrency = dict(DEFAULT_CONCURRENCY, **getattr(settings, 'LLM_GATEWAY_CONCURRENCY', {}))
+    gateway = LLMGateway(timeout=float(getattr(settings, 'LLM_GATEWAY_TIMEOUT', 30)),
+                         hedge=bool(getattr(settings, 'LLM_GATEWAY_HEDGE', True)))
+    fallback = set(getattr(settings, 'LLM_GATEWAY_FALLBACK', ['huggingface', 'local']))
+    for name in getattr(settings, 'LLM_GATEWAY_BACKENDS', ['ollama', 'gemini', 'huggingface', 'local']):
+        tier = FALLBACK_TIER if name in fallback else PREFERRED_TIER
+        if name == 'ollama':
+            gateway.register(ollama_backend(os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434'),
+                                            os.getenv('OLLAMA_MODEL', 'llama3:8b'), concurrency['ollama'],
+                                            keep_alive=getattr(settings, 'OLLAMA_KEEP_ALIVE', None), tier=tier))
+        elif name == 'gemini' and os.getenv('GOOGLE_AI_API_KEY'):
+            gateway.register(gemini_backend(os.getenv('GOOGLE_AI_API_KEY'), max_concurrency=concurrency['gemini'],
+                                            tier=tier))
+        elif name == 'huggingface' and os.getenv('HUGGINGFACE_TOKEN'):
+            gateway.register(huggingface_backend(os.getenv('HUGGINGFACE_TOKEN'),
+                                                 max_concurrency=concurrency['huggingface'], tier=tier))
+        elif name == 'local' and getattr(settings, 'LOCAL_GENERATION_AUTHKEY', ''):
+            from ..ml.local_generation import get_generation_client
+            gateway.register(local_backend(get_generation_client(), max_concurrency=concurrency['local'], tier=tier))
+        elif name == 'stub':
+            gateway.register(StubBackend(max_concurrency=concurrency['stub'], tier=tier))
+    logger.info(f"LLM gateway backends: {', '.join(gateway.backends) or 'none'}")
+    return gateway
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway, built on first use"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = build_gateway()
+    return _gateway
+
+
+def reset_llm_gateway(gateway: Optional[LLMGateway] = None):
+    """Replace the process-wide gateway (None rebuilds it from settings on next use)"""
+    global _gateway
+    with _gateway_lock:
+        _gateway = gateway
+
+
+def data_source(result: Dict[str, Any]) -> str:
+    return DATA_SOURCES.get(result['backend'], f"{result['backend']}_ai")
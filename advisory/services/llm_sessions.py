@@ -0,0 +1,130 @@
+"""
+LLM Chat Sessions
+Prompt state for multi-turn chats, kept under the chat session id in the
+'shared' cache alias, so every worker sees the same session (each worker
+keeps its own while that cache is unreachable):
+
+    generate_in_session(session_id, system_prompt, query)
+
+After each Ollama answer the session keeps the `context` token array that
+Ollama returns. The next turn sends only the new question along with that
+context, so the system prompt and earlier turns are not evaluated again.
+The session also keeps a transcript trimmed to LLM_SESSION_TOKEN_BUDGET.
+Turns past the budget are folded into a one-line summary of earlier
+questions. The prompt is rebuilt from the transcript when the context is
+missing or over budget, when it was produced for another system prompt, or
+when a different backend answered.
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from ..cache_utils import shared_cache
+from .llm_gateway import get_llm_gateway
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 3            # rough for mixed Hindi and English text
+SUMMARY_QUESTION_CHARS = 80    # of each question folded into the summary
+MAX_SUMMARY_CHARS = 1200
+SESSION_KEY = 'llm_session:{}'
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or '') // CHARS_PER_TOKEN + 1
+
+
+def token_budget() -> int:
+    return int(getattr(settings, 'LLM_SESSION_TOKEN_BUDGET', 2048))
+
+
+def _digest(system_prompt: str) -> str:
+    return hashlib.sha1(system_prompt.encode('utf-8')).hexdigest()[:16]
+
+
+def new_session(system_prompt: str) -> Dict[str, Any]:
+    return {'system': _digest(system_prompt), 'context': None, 'turns': [], 'summary': ''}
+
+
+def load_session(session_id: str) -> Optional[Dict[str, Any]]:
+    return shared_cache.get(SESSION_KEY.format(session_id))
+
+
+def save_session(session_id: str, state: Dict[str, Any]):
+    shared_cache.set(SESSION_KEY.format(session_id), state, int(getattr(settings, 'LLM_SESSION_TTL', 3600)))
+
+
+def clear_session(session_id: str):
+    shared_cache.delete(SESSION_KEY.format(session_id))
+
+
+def trim_turns(state: Dict[str, Any], budget: int):
+    """Fold the oldest turns into the summary until the transcript fits the budget"""
+    turns: List[List[str]] = state['turns']
+
+    def size():
+        return sum(estimate_tokens(question) + estimate_tokens(answer) for question, answer in turns)
+
+    while len(turns) > 1 and size() > budget:
+        question, _ = turns.pop(0)
+        question = ' '.join(question.split())[:SUMMARY_QUESTION_CHARS]
+        summary = f"{state['summary']}; {question}" if state['summary'] else question
+        # The summary keeps the latest questions and gets at most a quarter of the budget
+        state['summary'] = summary[-min(MAX_SUMMARY_CHARS, budget * CHARS_PER_TOKEN // 4):]
+    if turns and size() > budget:
+        question, answer = turns[0]
+        turns[0] = [question, answer[:max(0, budget - estimate_tokens(question)) * CHARS_PER_TOKEN]]
+
+
+def build_prompt(system_prompt: str, state: Dict[str, Any], query: str) -> str:
+    """Full prompt: system prompt, summary of earlier questions, recent turns and the new question"""
+    parts = [system_prompt.strip()]
+    if state['summary']:
+        parts.append(f"Earlier in this conversation the user asked about: {state['summary']}")
+    parts.extend(f'User: {question}\nAssistant: {answer}' for question, answer in state['turns'])
+    parts.append(f'User: {query}\nAssistant:')
+    return '\n\n'.join(parts)
+
+
+def generate_in_session(session_id: Optional[str], system_prompt: str, query: str,
+                        timeout: Optional[float] = None, options: Optional[Dict[str, Any]] = None,
+                        backends: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Answer `query` as the next turn of a chat session through the LLM
+    gateway. Returns the gateway result with 'context_reused' added, or
+    None when no backend answered. The turn is only recorded if it was
+    answered. Without a session id the prompt is a one-off.
+    """
+    gateway = get_llm_gateway()
+    if not session_id:
+        return gateway.generate(build_prompt(system_prompt, new_session(system_prompt), query),
+                                timeout=timeout, options=options, backends=backends)
+
+    budget = token_budget()
+    state = load_session(session_id) or new_session(system_prompt)
+    if state['system'] != _digest(system_prompt):
+        # Ollama's context encodes the old system prompt; the transcript is still valid
+        state.update(system=_digest(system_prompt), context=None)
+
+    hints = dict(options or {})
+    reuse = bool(state['context']) and len(state['context']) <= budget
+    if reuse:
+        hints.update(context=state['context'], continuation=f'User: {query}\nAssistant:')
+
+    result = gateway.generate(build_prompt(system_prompt, state, query), timeout=timeout, options=hints,
+                              backends=backends)
+    if not result:
+        return None
+
+    state['turns'].append([query, result['text']])
+    context = result.get('context')
+    # A context past the budget is dropped, so the next turn starts again from the trimmed transcript
+    state['context'] = context if context and len(context) <= budget else None
+    trim_turns(state, budget)
+    save_session(session_id, state)
+    logger.debug(f"Session {session_id}: {len(state['turns'])} turns, context "
+                 f"{'reused' if reuse and result['backend'] == 'ollama' else 'rebuilt'}")
+    return dict(result, context_reused=reuse and context is not None)
@@ -382,8 +382,11 @@ class PerformanceOptimizer:
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get system performance metrics"""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage from the background sampler; cpu_percent(interval=1)
+            # would hold this request for a second
+            from ..monitoring.performance_monitor import performance_monitor as request_monitor
+            snapshot = request_monitor.system_snapshot()
+            cpu_percent = snapshot['cpu']['percent'] if snapshot else psutil.cpu_percent(interval=None)
             
             # Memory usage
             memory = psutil.virtual_memory()
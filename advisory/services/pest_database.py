@@ -0,0 +1,187 @@
+"""
+Pest and Disease Knowledge
+Crop pest/disease entries used by the pest detection, consolidated crop and
+unified crop services, plus the season/region context and multilingual
+symptom vocabulary used by the symptom index (advisory.services.pest_index).
+"""
+
+# Detailed entries per crop (EnhancedPestDetectionService)
+CROP_PESTS = {
+    'wheat': [
+        {
+            'name': 'Rust Disease',
+            'scientific_name': 'Puccinia spp.',
+            'type': 'disease',
+            'severity': 'high',
+            'description': 'Fungal disease causing yellow-orange pustules on leaves',
+            'symptoms': ['Yellow-orange pustules', 'Leaf discoloration', 'Reduced yield'],
+            'treatment': ['Fungicide application', 'Resistant varieties', 'Crop rotation'],
+            'prevention': ['Use resistant varieties', 'Proper field sanitation', 'Avoid excessive nitrogen'],
+            'confidence': 0.9
+        },
+        {
+            'name': 'Aphids',
+            'scientific_name': 'Rhopalosiphum maidis',
+            'type': 'pest',
+            'severity': 'medium',
+            'description': 'Small sap-sucking insects that damage plants',
+            'symptoms': ['Stunted growth', 'Yellowing leaves', 'Honeydew secretion'],
+            'treatment': ['Insecticide application', 'Natural predators', 'Neem oil'],
+            'prevention': ['Early planting', 'Proper irrigation', 'Beneficial insects'],
+            'confidence': 0.9
+        }
+    ],
+    'rice': [
+        {
+            'name': 'Blast Disease',
+            'scientific_name': 'Magnaporthe oryzae',
+            'type': 'disease',
+            'severity': 'high',
+            'description': 'Fungal disease causing lesions on leaves and panicles',
+            'symptoms': ['Diamond-shaped lesions', 'Panicle blight', 'Yield loss'],
+            'treatment': ['Fungicide application', 'Resistant varieties', 'Proper water management'],
+            'prevention': ['Use resistant varieties', 'Avoid excessive nitrogen', 'Proper spacing'],
+            'confidence': 0.9
+        },
+        {
+            'name': 'Brown Planthopper',
+            'scientific_name': 'Nilaparvata lugens',
+            'type': 'pest',
+            'severity': 'high',
+            'description': 'Sap-sucking insect that causes hopperburn',
+            'symptoms': ['Hopperburn', 'Yellowing', 'Plant death'],
+            'treatment': ['Insecticide application', 'Natural enemies', 'Resistant varieties'],
+            'prevention': ['Avoid excessive nitrogen', 'Proper water management', 'Early planting'],
+            'confidence': 0.9
+        }
+    ],
+    'maize': [
+        {
+            'name': 'Fall Armyworm',
+            'scientific_name': 'Spodoptera frugiperda',
+            'type': 'pest',
+            'severity': 'high',
+            'description': 'Invasive pest causing severe damage to maize',
+            'symptoms': ['Leaf damage', 'Ear damage', 'Yield loss'],
+            'treatment': ['Biological control', 'Insecticide application', 'Bt varieties'],
+            'prevention': ['Early detection', 'Crop rotation', 'Resistant varieties'],
+            'confidence': 0.9
+        },
+        {
+            'name': 'Maize Lethal Necrosis',
+            'scientific_name': 'Virus complex',
+            'type': 'disease',
+            'severity': 'high',
+            'description': 'Viral disease causing plant death',
+            'symptoms': ['Yellowing', 'Stunting', 'Plant death'],
+            'treatment': ['Virus-free seeds', 'Vector control', 'Resistant varieties'],
+            'prevention': ['Use certified seeds', 'Vector management', 'Field sanitation'],
+            'confidence': 0.8
+        }
+    ],
+    'cotton': [
+        {
+            'name': 'Bollworm',
+            'scientific_name': 'Helicoverpa armigera',
+            'type': 'pest',
+            'severity': 'high',
+            'description': 'Major pest attacking cotton bolls',
+            'symptoms': ['Boll damage', 'Yield loss', 'Quality reduction'],
+            'treatment': ['Bt cotton', 'Insecticide application', 'Biological control'],
+            'prevention': ['Bt varieties', 'Proper timing', 'Natural enemies'],
+            'confidence': 0.9
+        },
+        {
+            'name': 'Whitefly',
+            'scientific_name': 'Bemisia tabaci',
+            'type': 'pest',
+            'severity': 'medium',
+            'description': 'Sap-sucking insect transmitting viruses',
+            'symptoms': ['Yellowing', 'Virus transmission', 'Honeydew'],
+            'treatment': ['Insecticide application', 'Natural enemies', 'Resistant varieties'],
+            'prevention': ['Early planting', 'Proper irrigation', 'Beneficial insects'],
+            'confidence': 0.8
+        }
+    ]
+}
+
+# Entries with Hindi names keyed by pest id (ConsolidatedCropService)
+CROP_PEST_CATALOG = {
+    'wheat': {
+        'rust': {
+            'name': 'Rust',
+            'hindi_name': 'रस्ट',
+            'symptoms': ['Yellow-orange pustules', 'Reduced yield'],
+            'treatment': ['Fungicide spray', 'Resistant varieties'],
+            'prevention': ['Crop rotation', 'Proper spacing']
+        },
+        'aphids': {
+            'name': 'Aphids',
+            'hindi_name': 'एफिड्स',
+            'symptoms': ['Sticky leaves', 'Yellowing', 'Stunted growth'],
+            'treatment': ['Insecticide spray', 'Natural predators'],
+            'prevention': ['Healthy soil', 'Proper irrigation']
+        }
+    },
+    'rice': {
+        'blast': {
+            'name': 'Blast',
+            'hindi_name': 'ब्लास्ट',
+            'symptoms': ['Spindle-shaped lesions', 'Node rot'],
+            'treatment': ['Fungicide treatment', 'Resistant varieties'],
+            'prevention': ['Proper spacing', 'Water management']
+        }
+    }
+}
+
+# Symptom keyword -> pest (CropService in the unified service architecture)
+SYMPTOM_PESTS = {
+    'wheat': {
+        'yellow_spots': {'pest': 'Yellow Rust', 'treatment': 'Fungicide spray'},
+        'brown_patches': {'pest': 'Brown Rust', 'treatment': 'Fungicide spray'},
+        'holes_in_leaves': {'pest': 'Army Worm', 'treatment': 'Insecticide spray'}
+    },
+    'rice': {
+        'yellow_spots': {'pest': 'Bacterial Blight', 'treatment': 'Copper fungicide'},
+        'white_powder': {'pest': 'Powdery Mildew', 'treatment': 'Sulfur spray'},
+        'holes_in_leaves': {'pest': 'Rice Leaf Folder', 'treatment': 'Neem oil spray'}
+    }
+}
+
+# When and where each pest is most active, keyed by lower-case pest name
+PEST_CONTEXT = {
+    'rust': {'seasons': ['rabi'], 'regions': ['Punjab', 'Haryana', 'Uttar Pradesh', 'Himachal Pradesh', 'Uttarakhand']},
+    'yellow rust': {'seasons': ['rabi'], 'regions': ['Punjab', 'Haryana', 'Himachal Pradesh', 'Jammu and Kashmir']},
+    'brown rust': {'seasons': ['rabi'], 'regions': ['Uttar Pradesh', 'Bihar', 'Madhya Pradesh', 'Maharashtra']},
+    'aphids': {'seasons': ['rabi'], 'regions': []},
+    'army worm': {'seasons': ['kharif', 'rabi'], 'regions': []},
+    'blast': {'seasons': ['kharif'], 'regions': ['Tamil Nadu', 'Karnataka', 'Andhra Pradesh', 'Odisha', 'West Bengal', 'Assam']},
+    'brown planthopper': {'seasons': ['kharif'], 'regions': ['Andhra Pradesh', 'Telangana', 'Odisha', 'West Bengal', 'Punjab', 'Haryana']},
+    'bacterial blight': {'seasons': ['kharif'], 'regions': ['Punjab', 'Haryana', 'Bihar', 'Odisha', 'Andhra Pradesh']},
+    'powdery mildew': {'seasons': ['rabi'], 'regions': []},
+    'rice leaf folder': {'seasons': ['kharif'], 'regions': []},
+    'fall armyworm': {'seasons': ['kharif'], 'regions': ['Karnataka', 'Maharashtra', 'Telangana', 'Andhra Pradesh', 'Tamil Nadu', 'Bihar']},
+    'maize lethal necrosis': {'seasons': ['kharif'], 'regions': []},
+    'bollworm': {'seasons': ['kharif'], 'regions': ['Maharashtra', 'Gujarat', 'Telangana', 'Punjab', 'Haryana']},
+    'whitefly': {'seasons': ['kharif', 'zaid'], 'regions': ['Punjab', 'Haryana', 'Rajasthan', 'Gujarat']},
+}
+
+# Hindi and romanised Hindi symptom words -> English index terms
+SYMPTOM_SYNONYMS = {
+    'पीला': 'yellow', 'पीली': 'yellow', 'पीले': 'yellow', 'पीलापन': 'yellowing', 'peela': 'yellow', 'peeli': 'yellow', 'peele': 'yellow',
+    'भूरा': 'brown', 'भूरे': 'brown', 'भूरी': 'brown', 'bhura': 'brown',
+    'सफेद': 'white', 'safed': 'white', 'काला': 'black', 'काले': 'black', 'kala': 'black',
+    'नारंगी': 'orange', 'लाल': 'red',
+    'पत्ती': 'leaf', 'पत्तियां': 'leaf', 'पत्तियों': 'leaf', 'पत्ते': 'leaf', 'patti': 'leaf', 'pattiyan': 'leaf', 'patte': 'leaf',
+    'धब्बे': 'spot', 'धब्बा': 'spot', 'dhabbe': 'spot', 'dhabba': 'spot', 'चित्ती': 'spot',
+    'छेद': 'hole', 'chhed': 'hole', 'छाले': 'pustule', 'फफोले': 'pustule',
+    'कीड़े': 'insect', 'कीड़ा': 'insect', 'कीट': 'insect', 'keede': 'insect', 'keeda': 'insect', 'sundi': 'caterpillar', 'सुंडी': 'caterpillar', 'इल्ली': 'caterpillar',
+    'चिपचिपा': 'sticky', 'चिपचिपी': 'sticky', 'chipchipa': 'sticky', 'मधुरस': 'honeydew',
+    'मुरझाना': 'wilting', 'मुरझा': 'wilting', 'murjhana': 'wilting', 'सूखना': 'wilting', 'सूख': 'wilting',
+    'बौना': 'stunted', 'बौनापन': 'stunted', 'रुका': 'stunted',
+    'सड़न': 'rot', 'सड़': 'rot', 'गलन': 'rot', 'sadan': 'rot',
+    'चूर्ण': 'powder', 'पाउडर': 'powder', 'फफूंद': 'mold', 'फफूंदी': 'mold',
+    'टिड्डा': 'hopper', 'माहू': 'aphid', 'mahu': 'aphid', 'सफेद मक्खी': 'whitefly',
+    'बाली': 'panicle', 'गांठ': 'node', 'टिंडे': 'boll', 'टिंडा': 'boll', 'भुट्टा': 'ear', 'भुट्टे': 'ear',
+    'घाव': 'lesion', 'मुड़ी': 'curl', 'मुड़ना': 'curl',
+}
@@ -0,0 +1,264 @@
+"""
+Pest Symptom Index
+One inverted index over every pest/disease entry in
+advisory.services.pest_database, searched with BM25 over multilingual
+symptom terms:
+
+    get_pest_index().search('पत्तियों पर पीले धब्बे', crop='wheat', season='rabi', state='Punjab')
+
+Postings hold precomputed BM25 term weights, so a query is a handful of
+vector additions followed by a top-k selection, independent of how many
+crops or dictionaries the entries came from.
+"""
+
+import logging
+import re
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .pest_database import CROP_PEST_CATALOG, CROP_PESTS, PEST_CONTEXT, SYMPTOM_PESTS, SYMPTOM_SYNONYMS
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Term frequency weight per field; symptoms carry most of the signal
+FIELD_WEIGHTS = {'symptoms': 3.0, 'name': 1.5, 'description': 1.0}
+SEASON_BOOST = 0.25
+REGION_BOOST = 0.15
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'for', 'from', 'has', 'have', 'in', 'is', 'it', 'my', 'of', 'on',
+    'or', 'the', 'there', 'to', 'with', 'crop', 'plant', 'plants', 'some', 'very',
+    'par', 'mein', 'hai', 'ke', 'ki', 'me',
+    'में', 'पर', 'की', 'के', 'का', 'है', 'हैं', 'और', 'को', 'से', 'रहे', 'रही', 'रहा', 'हो', 'फसल',
+}
+IRREGULAR = {'leaves': 'leaf', 'flies': 'fly', 'yellowish': 'yellow', 'brownish': 'brown', 'whitish': 'white'}
+INDIAN_STATES = [
+    'Andhra Pradesh', 'Assam', 'Bihar', 'Chhattisgarh', 'Gujarat', 'Haryana', 'Himachal Pradesh',
+    'Jammu and Kashmir', 'Jharkhand', 'Karnataka', 'Kerala', 'Madhya Pradesh', 'Maharashtra', 'Odisha',
+    'Punjab', 'Rajasthan', 'Tamil Nadu', 'Telangana', 'Uttar Pradesh', 'Uttarakhand', 'West Bengal',
+]
+
+_TOKEN = re.compile(r'[a-z0-9\u0900-\u097F]+')
+_PHRASES = sorted((phrase for phrase in SYMPTOM_SYNONYMS if ' ' in phrase), key=len, reverse=True)
+
+
+def _stem(token: str) -> str:
+    if token in IRREGULAR:
+        return IRREGULAR[token]
+    if token.endswith('ing') and len(token) > 5:
+        return token[:-3]
+    if token.endswith('ed') and len(token) > 4:
+        return token[:-2]
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('s') and not token.endswith('ss') and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms for English, Hindi or romanised Hindi text"""
+    text = (text or '').lower().replace('_', ' ')
+    for phrase in _PHRASES:
+        text = text.replace(phrase, f' {SYMPTOM_SYNONYMS[phrase]} ')
+    terms = []
+    for token in _TOKEN.findall(text):
+        if token in STOPWORDS:
+            continue
+        terms.append(_stem(SYMPTOM_SYNONYMS.get(token, token)))
+    return terms
+
+
+def current_season(today: Optional[date] = None) -> str:
+    month = (today or date.today()).month
+    if 6 <= month <= 10:
+        return 'kharif'
+    if month >= 11 or month <= 3:
+        return 'rabi'
+    return 'zaid'
+
+
+def state_of(location: Optional[str]) -> Optional[str]:
+    """Indian state named in a free-text location, if any"""
+    lowered = (location or '').lower()
+    for state in INDIAN_STATES:
+        if state.lower() in lowered:
+            return state
+    return None
+
+
+def _canonical(name: str) -> str:
+    return re.sub(r'\s+disease$', '', (name or '').strip().lower())
+
+
+def collect_entries() -> List[Dict[str, Any]]:
+    """Merge the pest dictionaries into one entry per (crop, pest)"""
+    merged: Dict[tuple, Dict[str, Any]] = {}
+
+    def entry_for(crop: str, name: str, source: str) -> Dict[str, Any]:
+        key = (crop, _canonical(name))
+        if key not in merged:
+            context = PEST_CONTEXT.get(key[1], {})
+            merged[key] = {
+                'id': f"{crop}:{re.sub(r'[^a-z0-9]+', '_', key[1]).strip('_')}",
+                'name': name, 'hindi_name': '', 'scientific_name': '', 'type': '', 'severity': '',
+                'description': '', 'crops': [crop], 'symptoms': [], 'treatment': [], 'prevention': [],
+                'seasons': list(context.get('seasons', [])), 'regions': list(context.get('regions', [])),
+                'sources': [],
+            }
+        entry = merged[key]
+        if source not in entry['sources']:
+            entry['sources'].append(source)
+        return entry
+
+    def extend(entry: Dict[str, Any], field: str, values: Iterable[str]):
+        for value in values:
+            if value and value not in entry[field]:
+                entry[field].append(value)
+
+    for crop, pests in CROP_PESTS.items():
+        for pest in pests:
+            entry = entry_for(crop, pest['name'], 'pest_detection')
+            for field in ('scientific_name', 'type', 'severity', 'description'):
+                entry[field] = entry[field] or pest.get(field, '')
+            for field in ('symptoms', 'treatment', 'prevention'):
+                extend(entry, field, pest.get(field, []))
+
+    for crop, pests in CROP_PEST_CATALOG.items():
+        for pest_id, pest in pests.items():
+            entry = entry_for(crop, pest['name'], 'crop_catalog')
+            entry['hindi_name'] = entry['hindi_name'] or pest.get('hindi_name', '')
+            for field in ('symptoms', 'treatment', 'prevention'):
+                extend(entry, field, pest.get(field, []))
+
+    for crop, symptoms in SYMPTOM_PESTS.items():
+        for symptom, pest in symptoms.items():
+            entry = entry_for(crop, pest['pest'], 'symptom_map')
+            extend(entry, 'symptoms', [symptom.replace('_', ' ').capitalize()])
+            extend(entry, 'treatment', [pest['treatment']])
+
+    return list(merged.values())
+
+
+class PestKnowledgeIndex:
+    """BM25 inverted index over pest entries with crop filters and context boosts"""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        size = len(entries)
+
+        term_freqs = []
+        lengths = np.zeros(size, dtype=np.float32)
+        for i, entry in enumerate(entries):
+            freqs: Dict[str, float] = {}
+            fields = {
+                'symptoms': ' '.join(entry.get('symptoms', [])),
+                'name': f"{entry.get('name', '')} {entry.get('hindi_name', '')}",
+                'description': entry.get('description', ''),
+            }
+            for field, text in fields.items():
+                for term in tokenize(text):
+                    freqs[term] = freqs.get(term, 0.0) + FIELD_WEIGHTS[field]
+            term_freqs.append(freqs)
+            lengths[i] = sum(freqs.values())
+        average_length = float(lengths.mean()) if size else 1.0
+
+        documents: Dict[str, List[int]] = {}
+        for i, freqs in enumerate(term_freqs):
+            for term in freqs:
+                documents.setdefault(term, []).append(i)
+
+        # Postings carry the full BM25 contribution of the term to each document
+        self._postings: Dict[str, tuple] = {}
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(average_length, 1e-6))
+        for term, ids in documents.items():
+            ids = np.asarray(ids, dtype=np.int32)
+            tf = np.asarray([term_freqs[i][term] for i in ids], dtype=np.float32)
+            idf = np.log(1 + (size - len(ids) + 0.5) / (len(ids) + 0.5))
+            self._postings[term] = (ids, (idf * tf * (BM25_K1 + 1) / (tf + norms[ids])).astype(np.float32))
+
+        self._by_crop: Dict[str, np.ndarray] = {}
+        self._by_season: Dict[str, np.ndarray] = {}
+        self._by_region: Dict[str, np.ndarray] = {}
+        for attribute, groups in (('crops', self._by_crop), ('seasons', self._by_season), ('regions', self._by_region)):
+            collected: Dict[str, List[int]] = {}
+            for i, entry in enumerate(entries):
+                for value in entry.get(attribute, []):
+                    collected.setdefault(value.lower(), []).append(i)
+            groups.update({value: np.asarray(ids, dtype=np.int32) for value, ids in collected.items()})
+
+    def __len__(self):
+        return len(self.entries)
+
+    def crops(self) -> List[str]:
+        return sorted(self._by_crop)
+
+    def for_crop(self, crop: str) -> List[Dict[str, Any]]:
+        return [self.entries[i] for i in self._by_crop.get((crop or '').lower(), [])]
+
+    def search(self, symptoms, crop: Optional[str] = None, season: Optional[str] = None,
+               state: Optional[str] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank entries for the described symptoms (a string or a list of
+        strings). `crop` restricts results to that crop's entries; matching
+        `season` and `state` boost an entry's score.
+        """
+        text = ' '.join(symptoms) if isinstance(symptoms, (list, tuple)) else (symptoms or '')
+        terms = [term for term in dict.fromkeys(tokenize(text)) if term in self._postings]
+        if not terms or not self.entries:
+            return []
+
+        scores = np.zeros(len(self.entries), dtype=np.float32)
+        matched = np.zeros(len(self.entries), dtype=np.int16)
+        for term in terms:
+            ids, weights = self._postings[term]
+            scores[ids] += weights
+            matched[ids] += 1
+
+        if crop:
+            allowed = np.zeros(len(self.entries), dtype=bool)
+            allowed[self._by_crop.get(crop.lower(), np.empty(0, dtype=np.int32))] = True
+            scores[~allowed] = 0
+        boost = np.ones(len(self.entries), dtype=np.float32)
+        if season and season.lower() in self._by_season:
+            boost[self._by_season[season.lower()]] += SEASON_BOOST
+        if state and state.lower() in self._by_region:
+            boost[self._by_region[state.lower()]] += REGION_BOOST
+        scores *= boost
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        query_size = len(set(tokenize(text)))
+        results = []
+        for i in candidates:
+            coverage = min(1.0, float(matched[i]) / query_size)
+            results.append(dict(
+                self.entries[i],
+                score=round(float(scores[i]), 4),
+                confidence=round(0.5 + 0.45 * coverage, 2),
+                matched_terms=[term for term in terms if i in self._postings[term][0]],
+            ))
+        return results
+
+
+_index: Optional[PestKnowledgeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_pest_index() -> PestKnowledgeIndex:
+    """Process-wide index, built on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PestKnowledgeIndex(collect_entries())
+                logger.info(f"Built pest symptom index with {len(_index)} entries")
+    return _index
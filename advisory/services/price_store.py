@@ -0,0 +1,507 @@
+"""
+Mandi Price Store
+Append-optimized columnar store for observed mandi prices. Each commodity
+keeps one memory-mapped NumPy column per field (date, mandi, min, max,
+modal), sorted by date, with a small JSON manifest holding row counts and
+the mandi dictionary. Range, rolling-window, rollup and trend queries are
+vectorized slices over these columns.
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Column name -> dtype; dates are days since 1970-01-01, mandis index the manifest dictionary
+COLUMNS = {
+    'date': np.int32,
+    'mandi': np.int32,
+    'min': np.float32,
+    'max': np.float32,
+    'modal': np.float32,
+}
+PRICE_COLUMNS = ('min', 'max', 'modal')
+
+ROLLUP_FREQUENCIES = ('D', 'W', 'M')
+
+# Agmarknet / data.gov.in CSV headers, normalized to lowercase letters only
+CSV_FIELDS = {
+    'state': ('state', 'statename'),
+    'district': ('district', 'districtname'),
+    'market': ('market', 'marketname', 'mandi', 'mandiname'),
+    'commodity': ('commodity', 'commodityname'),
+    'date': ('arrivaldate', 'pricedate', 'reporteddate', 'date'),
+    'min': ('minprice', 'minimumprice', 'minpricersquintal'),
+    'max': ('maxprice', 'maximumprice', 'maxpricersquintal'),
+    'modal': ('modalprice', 'modalpricersquintal'),
+}
+CSV_DATE_FORMATS = ('%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d-%b-%Y', '%d %b %Y')
+
+_EPOCH = date(1970, 1, 1)
+
+
+def to_day(value) -> int:
+    """Days since 1970-01-01 for a date, datetime, ISO string or day number"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - _EPOCH).days
+
+
+def from_days(days: np.ndarray) -> np.ndarray:
+    return np.asarray(days, dtype='int64').astype('datetime64[D]')
+
+
+def normalize_commodity(name: str) -> str:
+    return ' '.join(str(name).lower().split())
+
+
+def _mandi_key(name: str, district: str = '', state: str = '') -> str:
+    return '|'.join(normalize_commodity(part) for part in (name, district, state))
+
+
+def _commodity_dirname(commodity: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', commodity).strip('_') or 'unknown'
+
+
+class PriceStore:
+    """
+    Columnar store rooted at `root`:
+
+        manifest.json
+        <commodity>/date.bin, mandi.bin, min.bin, max.bin, modal.bin
+
+    Rows past the manifest count are ignored, so an interrupted append never
+    becomes visible; it is truncated away by the next write.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.RLock()
+        self._columns_cache: Dict[str, Any] = {}
+        self._latest_cache: Dict[str, Any] = {}
+        self._manifest_mtime = None
+        self._load_manifest()
+        if os.path.exists(self._manifest_path()):
+            self._manifest_mtime = os.stat(self._manifest_path()).st_mtime_ns
+
+    # ------------------------------------------------------------------ manifest
+
+    def _load_manifest(self):
+        self._manifest = self._read_manifest()
+        self._mandi_index = {
+            _mandi_key(m['name'], m.get('district', ''), m.get('state', '')): i
+            for i, m in enumerate(self._manifest['mandis'])
+        }
+        self._columns_cache = {}
+        self._latest_cache = {}
+
+    def refresh(self):
+        """Pick up rows written by another process (e.g. a `ingest_prices` run)"""
+        try:
+            mtime = os.stat(self._manifest_path()).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._manifest_mtime:
+            with self._lock:
+                self._load_manifest()
+                self._manifest_mtime = mtime
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, 'manifest.json')
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = self._manifest_path()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        return {'version': MANIFEST_VERSION, 'mandis': [], 'commodities': {}}
+
+    def _write_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.manifest.', suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self._manifest_path())
+        self._manifest_mtime = os.stat(self._manifest_path()).st_mtime_ns
+
+    def commodities(self) -> List[str]:
+        self.refresh()
+        return sorted(self._manifest['commodities'])
+
+    def mandis(self) -> List[Dict[str, str]]:
+        return list(self._manifest['mandis'])
+
+    def info(self, commodity: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        return self._manifest['commodities'].get(normalize_commodity(commodity))
+
+    def mandi_id(self, name: str, district: str = '', state: str = '') -> int:
+        """Dictionary id for a mandi, registering it on first sight"""
+        key = _mandi_key(name, district, state)
+        with self._lock:
+            if key not in self._mandi_index:
+                self._mandi_index[key] = len(self._manifest['mandis'])
+                self._manifest['mandis'].append({'name': name.strip(), 'district': district.strip(), 'state': state.strip()})
+            return self._mandi_index[key]
+
+    def _mandi_ids(self, mandi: Optional[str] = None, state: Optional[str] = None) -> Optional[np.ndarray]:
+        """Ids matching a mandi name and/or state, or None for no filter"""
+        if mandi is None and state is None:
+            return None
+        mandi, state = (normalize_commodity(v) if v else None for v in (mandi, state))
+        return np.array([
+            i for i, m in enumerate(self._manifest['mandis'])
+            if (mandi is None or normalize_commodity(m['name']) == mandi)
+            and (state is None or normalize_commodity(m.get('state', '')) == state)
+        ], dtype=np.int32)
+
+    # ------------------------------------------------------------------ columns
+
+    def _column_path(self, commodity: str, column: str) -> str:
+        return os.path.join(self.root, self._manifest['commodities'][commodity]['dir'], f'{column}.bin')
+
+    def _columns(self, commodity: str) -> Optional[Dict[str, np.ndarray]]:
+        """Read-only memory maps of a commodity's columns, cached per row count"""
+        entry = self._manifest['commodities'].get(commodity)
+        if not entry or not entry['rows']:
+            return None
+        cached = self._columns_cache.get(commodity)
+        if cached and cached[0] == entry['rows']:
+            return cached[1]
+        columns = {
+            name: np.memmap(self._column_path(commodity, name), dtype=dtype, mode='r', shape=(entry['rows'],))
+            for name, dtype in COLUMNS.items()
+        }
+        self._columns_cache[commodity] = (entry['rows'], columns)
+        return columns
+
+    def _append_columns(self, commodity: str, batch: Dict[str, np.ndarray]):
+        entry = self._manifest['commodities'][commodity]
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(commodity, name)
+            with open(path, 'ab') as f:
+                # Drop any tail left by an interrupted append before writing
+                f.truncate(entry['rows'] * np.dtype(dtype).itemsize)
+                f.write(np.ascontiguousarray(batch[name], dtype=dtype).tobytes())
+
+    def _latest_rows(self, commodity: str, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Row of each mandi's most recent observation (-1 if none), cached per row count"""
+        rows_count = len(columns['date'])
+        cached = self._latest_cache.get(commodity)
+        if cached and cached[0] == rows_count:
+            return cached[1]
+        mandis = np.asarray(columns['mandi'])
+        # Rows are date-sorted, so a mandi's first row in reverse order is its newest
+        ids, first = np.unique(mandis[::-1], return_index=True)
+        rows = np.full(max(len(self._manifest['mandis']), int(ids[-1]) + 1), -1, dtype=np.int64)
+        rows[ids] = rows_count - 1 - first
+        self._latest_cache[commodity] = (rows_count, rows)
+        return rows
+
+    def _rewrite_columns(self, commodity: str, data: Dict[str, np.ndarray]):
+        self._columns_cache.pop(commodity, None)
+        self._latest_cache.pop(commodity, None)
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(commodity, name)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'.{name}.', suffix='.bin')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(np.ascontiguousarray(data[name], dtype=dtype).tobytes())
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def _sort_dedupe(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Sort by (date, mandi); the last row wins for duplicate observations"""
+        order = np.lexsort((data['mandi'], data['date']))
+        data = {name: values[order] for name, values in data.items()}
+        if len(data['date']) > 1:
+            keep = np.ones(len(data['date']), dtype=bool)
+            keep[:-1] = (data['date'][1:] != data['date'][:-1]) | (data['mandi'][1:] != data['mandi'][:-1])
+            data = {name: values[keep] for name, values in data.items()}
+        return data
+
+    # ------------------------------------------------------------------ writes
+
+    def append(self, commodity: str, dates, mandi_ids, min_prices, max_prices, modal_prices) -> int:
+        """
+        Append observations for one commodity. Batches newer than everything
+        stored are appended in place; older or overlapping batches trigger a
+        merge rewrite. Returns the commodity's row count.
+        """
+        commodity = normalize_commodity(commodity)
+        batch = self._sort_dedupe({
+            'date': np.asarray([to_day(d) for d in dates], dtype=np.int32),
+            'mandi': np.asarray(mandi_ids, dtype=np.int32),
+            'min': np.asarray(min_prices, dtype=np.float32),
+            'max': np.asarray(max_prices, dtype=np.float32),
+            'modal': np.asarray(modal_prices, dtype=np.float32),
+        })
+        if not len(batch['date']):
+            return self._manifest['commodities'].get(commodity, {}).get('rows', 0)
+
+        with self._lock:
+            entry = self._manifest['commodities'].setdefault(commodity, {
+                'dir': _commodity_dirname(commodity), 'rows': 0, 'first_day': None, 'last_day': None,
+            })
+            os.makedirs(os.path.join(self.root, entry['dir']), exist_ok=True)
+
+            if entry['rows'] and int(batch['date'][0]) <= entry['last_day']:
+                existing = {name: np.array(values) for name, values in self._columns(commodity).items()}
+                merged = self._sort_dedupe({name: np.concatenate([existing[name], batch[name]]) for name in COLUMNS})
+                self._rewrite_columns(commodity, merged)
+                entry['rows'] = len(merged['date'])
+                entry['first_day'] = int(merged['date'][0])
+            else:
+                self._append_columns(commodity, batch)
+                if not entry['rows']:
+                    entry['first_day'] = int(batch['date'][0])
+                entry['rows'] += len(batch['date'])
+            entry['last_day'] = max(entry['last_day'] or 0, int(batch['date'][-1]))
+            entry['first_date'] = str(from_days(entry['first_day']))
+            entry['last_date'] = str(from_days(entry['last_day']))
+            self._write_manifest()
+            return entry['rows']
+
+    def ingest_agmarknet_csv(self, path: str) -> Dict[str, Any]:
+        """Load an Agmarknet / data.gov.in price export; returns row counts"""
+        by_commodity: Dict[str, Dict[str, list]] = {}
+        skipped = 0
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            fields = self._csv_field_map(reader.fieldnames or [])
+            missing = [name for name in ('market', 'commodity', 'date', 'modal') if name not in fields]
+            if missing:
+                raise ValueError(f"{path} is missing column(s): {', '.join(missing)}")
+
+            for row in reader:
+                try:
+                    day = self._parse_csv_date(row[fields['date']])
+                    modal = float(row[fields['modal']])
+                    low = float(row[fields['min']]) if 'min' in fields and row[fields['min']] else modal
+                    high = float(row[fields['max']]) if 'max' in fields and row[fields['max']] else modal
+                except (TypeError, ValueError):
+                    skipped += 1
+                    continue
+                mandi = self.mandi_id(
+                    row[fields['market']],
+                    row.get(fields.get('district'), '') or '',
+                    row.get(fields.get('state'), '') or '',
+                )
+                columns = by_commodity.setdefault(normalize_commodity(row[fields['commodity']]),
+                                                  {'date': [], 'mandi': [], 'min': [], 'max': [], 'modal': []})
+                columns['date'].append(day)
+                columns['mandi'].append(mandi)
+                columns['min'].append(low)
+                columns['max'].append(high)
+                columns['modal'].append(modal)
+
+        rows = 0
+        for commodity, columns in by_commodity.items():
+            self.append(commodity, columns['date'], columns['mandi'], columns['min'], columns['max'], columns['modal'])
+            rows += len(columns['date'])
+        if skipped:
+            logger.warning(f"Skipped {skipped} unparseable row(s) in {path}")
+        return {'rows': rows, 'skipped': skipped, 'commodities': sorted(by_commodity)}
+
+    @staticmethod
+    def _csv_field_map(fieldnames: Iterable[str]) -> Dict[str, str]:
+        normalized = {re.sub(r'[^a-z]', '', name.replace('_x0020_', ' ').lower()): name for name in fieldnames}
+        return {
+            field: normalized[alias]
+            for field, aliases in CSV_FIELDS.items()
+            for alias in aliases if alias in normalized
+        }
+
+    @staticmethod
+    def _parse_csv_date(value: str) -> int:
+        value = value.strip()
+        for fmt in CSV_DATE_FORMATS:
+            try:
+                return to_day(datetime.strptime(value, fmt))
+            except ValueError:
+                continue
+        raise ValueError(f'Unrecognised date {value!r}')
+
+    # ------------------------------------------------------------------ queries
+
+    def range(self, commodity: str, start=None, end=None, mandi: Optional[str] = None,
+              state: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Observations between `start` and `end` (inclusive) as column arrays"""
+        self.refresh()
+        columns = self._columns(normalize_commodity(commodity))
+        if columns is None:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+        days = columns['date']
+        lo = np.searchsorted(days, to_day(start), 'left') if start is not None else 0
+        hi = np.searchsorted(days, to_day(end), 'right') if end is not None else len(days)
+        selected = {name: values[lo:hi] for name, values in columns.items()}
+
+        ids = self._mandi_ids(mandi, state)
+        if ids is not None:
+            mask = np.isin(selected['mandi'], ids)
+            selected = {name: values[mask] for name, values in selected.items()}
+        return selected
+
+    def rollup(self, commodity: str, freq: str = 'D', start=None, end=None,
+               mandi: Optional[str] = None, state: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Daily ('D'), weekly ('W', Monday start) or monthly ('M') aggregates:
+        period start, lowest min, highest max, mean modal and observation count.
+        """
+        if freq not in ROLLUP_FREQUENCIES:
+            raise ValueError(f"Unknown frequency {freq!r} (choose from {', '.join(ROLLUP_FREQUENCIES)})")
+        data = self.range(commodity, start, end, mandi, state)
+        days = data['date'].astype(np.int64)
+        if not len(days):
+            return {'period': from_days(days), 'min': np.empty(0), 'max': np.empty(0),
+                    'modal': np.empty(0), 'count': np.empty(0, dtype=np.int64)}
+
+        if freq == 'D':
+            periods = days
+        elif freq == 'W':
+            periods = (days + 3) // 7 * 7 - 3  # 1970-01-01 was a Thursday
+        else:
+            periods = from_days(days).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+        # Rows are date-sorted, so each period is one contiguous run
+        starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        counts = np.diff(np.r_[starts, len(periods)])
+        return {
+            'period': from_days(periods[starts]),
+            'min': np.minimum.reduceat(data['min'], starts),
+            'max': np.maximum.reduceat(data['max'], starts),
+            'modal': np.add.reduceat(data['modal'].astype(np.float64), starts) / counts,
+            'count': counts,
+        }
+
+    def rolling(self, commodity: str, window: int = 7, start=None, end=None, column: str = 'modal',
+                mandi: Optional[str] = None, state: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Trailing `window`-day mean of the daily average price, skipping days without data"""
+        if column not in PRICE_COLUMNS:
+            raise ValueError(f'Unknown price column {column!r}')
+        data = self.range(commodity, start, end, mandi, state)
+        days = data['date'].astype(np.int64)
+        if not len(days):
+            return {'date': from_days(days), 'value': np.empty(0)}
+
+        # Daily sums and counts on a dense calendar, then windowed sums via cumsum
+        offset = days - days[0]
+        span = int(offset[-1]) + 1
+        sums = np.bincount(offset, weights=data[column].astype(np.float64), minlength=span)
+        counts = np.bincount(offset, minlength=span).astype(np.float64)
+        cum_sums = np.concatenate([[0.0], np.cumsum(sums)])
+        cum_counts = np.concatenate([[0.0], np.cumsum(counts)])
+        idx = np.arange(span)
+        lower = np.maximum(idx + 1 - window, 0)
+        window_sums = cum_sums[idx + 1] - cum_sums[lower]
+        window_counts = cum_counts[idx + 1] - cum_counts[lower]
+
+        observed = counts > 0
+        return {
+            'date': from_days(days[0] + idx[observed]),
+            'value': window_sums[observed] / window_counts[observed],
+        }
+
+    def latest(self, commodity: str, mandi: Optional[str] = None, state: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Average prices on the most recent day with observations. Filtered
+        lookups go through a per-mandi latest-row index, so they cost one
+        step per matching mandi instead of a scan of the whole history.
+        """
+        self.refresh()
+        commodity = normalize_commodity(commodity)
+        columns = self._columns(commodity)
+        if columns is None:
+            return None
+        if mandi or state:
+            ids = self._mandi_ids(mandi, state)
+            latest_rows = self._latest_rows(commodity, columns)
+            rows = latest_rows[ids[ids < len(latest_rows)]]
+            rows = rows[rows >= 0]
+            if not len(rows):
+                return None
+            days = columns['date'][rows]
+            rows = np.sort(rows[days == days.max()])
+        else:
+            days = columns['date']
+            rows = np.arange(np.searchsorted(days, days[-1], 'left'), len(days))
+        return {
+            'date': str(from_days(columns['date'][rows[0]])),
+            'min': float(np.min(columns['min'][rows])),
+            'max': float(np.max(columns['max'][rows])),
+            'modal': round(float(np.mean(columns['modal'][rows])), 2),
+            'mandis': int(len(rows)),
+        }
+
+    def trend(self, commodity: str, days: int = 90, mandi: Optional[str] = None,
+              state: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Price trend over the last `days` days of data: least-squares slope of
+        the daily modal price, percentage change, and volatility (standard
+        deviation of day-to-day returns). Returns None without data.
+        """
+        entry = self.info(commodity)
+        if not entry or not entry['rows']:
+            return None
+        end = int(entry['last_day'])
+        daily = self.rollup(commodity, 'D', end - days + 1, end, mandi, state)
+        prices = daily['modal']
+        if not len(prices):
+            return None
+
+        x = daily['period'].astype(np.int64).astype(np.float64)
+        mean_price = float(np.mean(prices))
+        slope = float(np.polyfit(x - x[0], prices, 1)[0]) if len(prices) > 1 else 0.0
+        returns = np.diff(prices) / prices[:-1] if len(prices) > 1 else np.empty(0)
+        expected_change = slope * days / mean_price if mean_price else 0.0
+        if expected_change > 0.03:
+            direction = 'increasing'
+        elif expected_change < -0.03:
+            direction = 'decreasing'
+        else:
+            direction = 'stable'
+
+        return {
+            'commodity': normalize_commodity(commodity),
+            'from': str(daily['period'][0]),
+            'to': str(daily['period'][-1]),
+            'observations': int(daily['count'].sum()),
+            'latest_price': round(float(prices[-1]), 2),
+            'average_price': round(mean_price, 2),
+            'min_price': round(float(np.min(daily['min'])), 2),
+            'max_price': round(float(np.max(daily['max'])), 2),
+            'change_percent': round(float((prices[-1] - prices[0]) / prices[0] * 100), 2) if prices[0] else 0.0,
+            'slope_per_day': round(slope, 4),
+            'volatility': round(float(np.std(returns)), 4) if len(returns) else 0.0,
+            'trend': direction,
+        }
+
+
+_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Process-wide store at settings.PRICE_STORE_DIR"""
+    global _store
+    root = str(getattr(settings, 'PRICE_STORE_DIR', None) or os.path.join(settings.BASE_DIR, 'data', 'price_store'))
+    with _store_lock:
+        if _store is None or _store.root != root:
+            _store = PriceStore(root)
+        return _store
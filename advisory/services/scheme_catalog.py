@@ -0,0 +1,220 @@
+"""
+Government Scheme Catalog
+One compiled catalog over advisory.services.government_schemes_data, with
+central and state schemes indexed by state, category, crop and eligibility
+tag, and every scheme pre-rendered once per language:
+
+    get_scheme_catalog().lookup('Ludhiana', category='credit', language='en', page=1)
+
+A lookup is an intersection of precomputed id sets followed by a slice of
+the pre-rendered records. Scheme ids are assigned in display order, so a
+sorted intersection is already ranked. Records are shared between requests
+and must not be mutated by callers.
+"""
+
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from .government_schemes_data import CATEGORY_LABELS, CENTRAL_GOVERNMENT_SCHEMES, STATE_SPECIFIC_SCHEMES
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ('hi', 'en')
+DEFAULT_PAGE_SIZE = 6
+MAX_PAGE_SIZE = 50
+KISAN_CALL_CENTRE = '1800-180-1551'
+# Wildcard keys for schemes open to every crop or every farmer
+ALL_CROPS = '*'
+ALL_FARMERS = 'all_farmers'
+
+PRIORITY_LABELS = {1: 'high', 2: 'medium', 3: 'low'}
+STATUS_LABELS = {'hi': 'सक्रिय', 'en': 'Active'}
+APPLICATION_LABELS = {'hi': 'ऑनलाइन आवेदन', 'en': 'Online application'}
+# Cities whose names do not appear in the mandi directory
+CITY_STATES = {'mumbai': 'Maharashtra', 'bengaluru': 'Karnataka', 'gurgaon': 'Haryana', 'noida': 'Uttar Pradesh'}
+
+_CITY = re.compile(r'\(([^)]+)\)')
+_EMPTY: FrozenSet[int] = frozenset()
+
+
+def _location_states() -> Dict[str, str]:
+    from .mandi_database import ALL_INDIA_MANDIS
+    from .pest_index import INDIAN_STATES
+
+    states = {state.lower(): state for state in list(INDIAN_STATES) + list(STATE_SPECIFIC_SCHEMES)}
+    cities = dict(CITY_STATES)
+    for name, mandi in ALL_INDIA_MANDIS.items():
+        if not mandi.get('state'):
+            continue
+        # 'Vashi APMC (Mumbai)', 'Ludhiana New Grain Market (Punjab)': both ends name a place
+        match = _CITY.search(name)
+        if match:
+            cities.setdefault(match.group(1).strip().lower(), mandi['state'])
+        cities.setdefault(name.split()[0].lower(), mandi['state'])
+    cities.update(states)
+    return cities
+
+
+def collect_schemes() -> List[Dict[str, Any]]:
+    """Central and state schemes as one list of source records in display order"""
+    schemes = [dict(scheme, state='') for scheme in CENTRAL_GOVERNMENT_SCHEMES]
+    for state, entries in STATE_SPECIFIC_SCHEMES.items():
+        for entry in entries:
+            schemes.append(dict(
+                entry,
+                id=entry.get('id') or f"{state.lower().replace(' ', '_')}_{len(schemes)}",
+                state=state,
+                official_website=entry.get('official_website', entry.get('website', '')),
+                priority=entry.get('priority', 2),
+            ))
+    # High priority first; at equal priority a farmer's state schemes come before central ones
+    order = sorted(range(len(schemes)), key=lambda i: (schemes[i].get('priority', 3), not schemes[i]['state'], i))
+    return [schemes[i] for i in order]
+
+
+def render_scheme(scheme: Dict[str, Any], language: str) -> Dict[str, Any]:
+    """Response record for one scheme in one language"""
+    english = language == 'en'
+
+    def text(key):
+        return scheme.get(f'{key}_en', scheme.get(key)) if english else scheme.get(key)
+
+    state = scheme['state']
+    if state:
+        eligibility = f'Farmers in {state}' if english else f'{state} के किसान'
+    else:
+        eligibility = ''
+    category = scheme.get('category', '')
+    return {
+        'id': scheme['id'],
+        'name': scheme.get('name_en', scheme['name']) if english else scheme['name'],
+        'name_hindi': scheme['name'],
+        'name_en': scheme.get('name_en', scheme['name']),
+        'amount': text('amount'),
+        'description': text('description'),
+        'eligibility': text('eligibility') or eligibility,
+        'benefits': tuple(text('benefits') or ()),
+        'helpline': scheme.get('helpline', KISAN_CALL_CENTRE),
+        'website': scheme.get('official_website', ''),
+        'apply_link': scheme.get('apply_link', scheme.get('official_website', '')),
+        'category': CATEGORY_LABELS.get(category, {}).get(language, category),
+        'category_id': category,
+        'status': STATUS_LABELS[language],
+        'application_method': APPLICATION_LABELS[language],
+        'priority': PRIORITY_LABELS.get(scheme.get('priority'), 'low'),
+        'scope': 'state' if state else 'central',
+        'state': state,
+        'crops': tuple(scheme.get('crops') or ()),
+        'eligibility_tags': tuple(scheme.get('eligibility_tags') or (ALL_FARMERS,)),
+    }
+
+
+class SchemeCatalog:
+    """Immutable scheme catalog with id-set indexes and per-language records"""
+
+    def __init__(self, schemes: List[Dict[str, Any]]):
+        self._ids = {scheme['id']: i for i, scheme in enumerate(schemes)}
+        self._rendered = {language: tuple(render_scheme(scheme, language) for scheme in schemes)
+                          for language in LANGUAGES}
+        self._states = _location_states()
+        # Longest names first so 'navi mumbai' wins over 'mumbai' in free text
+        self._state_names = sorted(self._states, key=len, reverse=True)
+
+        by_state: Dict[str, set] = {}
+        by_category: Dict[str, set] = {}
+        by_crop: Dict[str, set] = {}
+        by_tag: Dict[str, set] = {}
+        for i, scheme in enumerate(schemes):
+            by_state.setdefault(scheme['state'].lower(), set()).add(i)
+            by_category.setdefault(scheme.get('category', ''), set()).add(i)
+            for crop in scheme.get('crops') or (ALL_CROPS,):
+                by_crop.setdefault(crop.lower(), set()).add(i)
+            for tag in scheme.get('eligibility_tags') or (ALL_FARMERS,):
+                by_tag.setdefault(tag.lower(), set()).add(i)
+        self._by_state = {key: frozenset(ids) for key, ids in by_state.items()}
+        self._by_category = {key: frozenset(ids) for key, ids in by_category.items()}
+        self._by_crop = {key: frozenset(ids) for key, ids in by_crop.items()}
+        self._by_tag = {key: frozenset(ids) for key, ids in by_tag.items()}
+        self._match = lru_cache(maxsize=512)(self._match_ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def categories(self) -> List[str]:
+        return sorted(key for key in self._by_category if key)
+
+    def tags(self) -> List[str]:
+        return sorted(self._by_tag)
+
+    def resolve_state(self, location: Optional[str]) -> str:
+        """State for a state or city name ('' when unknown, which selects central schemes only)"""
+        lowered = (location or '').strip().lower()
+        if not lowered:
+            return ''
+        if lowered in self._states:
+            return self._states[lowered]
+        for name in self._state_names:
+            if name in lowered:
+                return self._states[name]
+        return ''
+
+    def _match_ids(self, state: str, category: str, crop: str, tag: str) -> tuple:
+        ids = self._by_state.get('', _EMPTY) | self._by_state.get(state, _EMPTY)
+        if category:
+            ids &= self._by_category.get(category, _EMPTY)
+        if crop:
+            ids &= self._by_crop.get(ALL_CROPS, _EMPTY) | self._by_crop.get(crop, _EMPTY)
+        if tag:
+            ids &= self._by_tag.get(ALL_FARMERS, _EMPTY) | self._by_tag.get(tag, _EMPTY)
+        return tuple(sorted(ids))
+
+    def lookup(self, location: Optional[str] = None, category: Optional[str] = None, crop: Optional[str] = None,
+               tag: Optional[str] = None, language: str = 'hi', page: int = 1,
+               page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        One page of schemes open to farmers in `location` (a state or city;
+        central schemes always apply), optionally restricted to a category,
+        a crop and an eligibility tag.
+        """
+        state = self.resolve_state(location)
+        ids = self._match(state.lower(), (category or '').lower(), (crop or '').lower(), (tag or '').lower())
+        page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+        pages = max(1, -(-len(ids) // page_size))
+        page = max(1, int(page))
+        records = self._rendered[self.language(language)]
+        start = (page - 1) * page_size
+        return {
+            'schemes': [records[i] for i in ids[start:start + page_size]],
+            'state': state,
+            'total': len(ids),
+            'page': page,
+            'page_size': page_size,
+            'pages': pages,
+        }
+
+    def get(self, scheme_id: str, language: str = 'hi') -> Optional[Dict[str, Any]]:
+        i = self._ids.get(scheme_id)
+        return None if i is None else self._rendered[self.language(language)][i]
+
+    @staticmethod
+    def language(language: Optional[str]) -> str:
+        """Catalog language for a requested one; Hindi for 'hi', English otherwise"""
+        return 'hi' if (language or 'hi').lower().startswith('hi') else 'en'
+
+
+_catalog: Optional[SchemeCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_scheme_catalog() -> SchemeCatalog:
+    """Process-wide catalog, compiled on first use"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = SchemeCatalog(collect_schemes())
+                logger.info(f"Compiled government scheme catalog with {len(_catalog)} schemes")
+    return _catalog
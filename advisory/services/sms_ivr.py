@@ -1,8 +1,72 @@
+"""
+SMS / IVR channel for feature phones.
+
+Daily digests (weather, top mandi prices, active alerts) are rendered ahead
+of time per (district, language) by `update_digests`, so inbound SMS and
+IVR requests are answered by a key lookup without touching the chatbot or
+any upstream API:
+
+    python manage.py build_sms_digests
+    handle_sms_query('+919800000000', 'PUNE HI')
+"""
+
+import json
 import logging
-from typing import Dict, Any
+import os
+import re
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Dict, Any, Iterable, List, Optional
+
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+DIGEST_LANGUAGES = {'en': 'english', 'hi': 'hindi'}
+SMS_MAX_SEGMENTS = 3
+TOP_PRICES = 3
+
+# GSM 03.38 default alphabet; anything outside it forces UCS-2 (70 chars a segment)
+GSM7_BASIC = set(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM7_EXTENDED = set('^{}\\[~]|€')
+
+# Cities whose APMC entries carry the state name as their district
+CITY_STATES = {'Delhi', 'Chandigarh'}
+DISTRICT_OVERRIDES = {'Khanna Grain Market (Asia Biggest)': 'Ludhiana'}
+
+SMS_LABELS = {
+    'en': {
+        'weather': '{low:.0f}-{high:.0f}C, rain {rain:.0f}mm, wind {wind:.0f}km/h',
+        'rain': 'rain {rain:.0f} mm',
+        'alert': 'ALERT',
+        'prices': 'Mandi Rs/qtl',
+        'trend': {'increasing': 'up', 'decreasing': 'down', 'stable': 'steady'},
+        'menu': 'Press 1 for weather, 2 for mandi prices, 3 for alerts.',
+        'no_alerts': 'There are no active alerts for your area.',
+        'usage': 'Send your district name, e.g. PUNE, or PUNE HI for Hindi.',
+        'unavailable': 'Today\'s update for your district is not ready yet. Please try again later.',
+    },
+    'hi': {
+        'weather': '{low:.0f}-{high:.0f}°C, बारिश {rain:.0f}mm, हवा {wind:.0f}km/h',
+        'rain': 'बारिश {rain:.0f} मिमी',
+        'alert': 'चेतावनी',
+        'prices': 'मंडी भाव ₹/क्विंटल',
+        'trend': {'increasing': 'तेजी', 'decreasing': 'मंदी', 'stable': 'स्थिर'},
+        'menu': 'मौसम के लिए 1, मंडी भाव के लिए 2, चेतावनी के लिए 3 दबाएं।',
+        'no_alerts': 'आपके क्षेत्र के लिए कोई चेतावनी नहीं है।',
+        'usage': 'अपने जिले का नाम भेजें, जैसे PUNE HI',
+        'unavailable': 'आपके जिले की आज की जानकारी अभी तैयार नहीं है। कृपया बाद में प्रयास करें।',
+    },
+}
+
+# Marks template fields the digest has no data for; lines carrying it are dropped
+_MISSING = '\x00'
+_DECORATION = re.compile('[\U0001F000-\U0001FAFF\u2600-\u27BF\u2500-\u257F\uFE0F\u2022]')
+
 def send_sms(phone_number: str, message: str) -> bool:
     """
     Placeholder function to simulate sending an SMS.
@@ -16,24 +80,61 @@ def send_sms(phone_number: str, message: str) -> bool:
         logger.error(f"Error sending SMS to {phone_number}: {e}")
         return False
 
-def handle_ivr_input(phone_number: str, user_input: str) -> Dict[str, Any]:
+def handle_ivr_input(phone_number: str, user_input: str, district: Optional[str] = None,
+                     language: str = 'hi') -> Dict[str, Any]:
     """
-    Placeholder function to simulate handling IVR (Interactive Voice Response) input.
-    In a real application, this would involve parsing user voice input (e.g., DTMF tones or ASR output)
-    and responding accordingly, often interacting with a chatbot or specific backend logic.
+    Answer an IVR menu selection (DTMF digit) from the caller's district
+    digest: 1 weather, 2 mandi prices, 3 alerts; anything else repeats
+    the menu.
     """
     try:
-        logger.info(f"Simulating IVR input from {phone_number}: {user_input}")
-        response_message = f"Received your input '{user_input}'. Thank you."
-        # Example: Integrate with chatbot or decision tree
-        # if "weather" in user_input.lower():
-        #     response_message = "Fetching weather information."
+        logger.info(f"IVR input from {phone_number}: {user_input} ({district}, {language})")
+        labels = SMS_LABELS.get(language, SMS_LABELS['en'])
+        digest = get_digest(district, language) if district else None
+        if digest is None:
+            return {"status": "unavailable", "response_message": labels['unavailable']}
 
-        return {"status": "success", "response_message": response_message}
+        choice = (user_input or '').strip()[:1]
+        section = {'1': 'weather', '2': 'prices', '3': 'alerts'}.get(choice)
+        if section is None:
+            return {"status": "success", "response_message": digest['ivr']['menu'], "section": "menu"}
+        return {"status": "success", "response_message": digest['ivr'][section], "section": section}
     except Exception as e:
         logger.error(f"Error handling IVR input from {phone_number}: {e}")
         return {"status": "error", "response_message": "An error occurred while processing your request."}
 
+
+def handle_sms_query(phone_number: str, text: str) -> Dict[str, Any]:
+    """
+    Reply to an inbound SMS naming a district ("PUNE", "PUNE HI", or the
+    name followed by Devanagari text) with that district's digest.
+    """
+    language = 'hi' if re.search('[\u0900-\u097F]', text or '') else 'en'
+    tokens = [token.lower() for token in re.findall(r'[A-Za-z]+', text or '')]
+    if 'hi' in tokens:
+        language = 'hi'
+    document = _digests()
+    districts = (document or {}).get('districts', {})
+
+    district = None
+    for size in (3, 2, 1):
+        for i in range(len(tokens) - size + 1):
+            candidate = ' '.join(tokens[i:i + size])
+            if candidate in districts:
+                district = candidate
+                break
+        if district:
+            break
+
+    digest = get_digest(district, language) if district else None
+    if digest is None:
+        labels = SMS_LABELS[language]
+        message = labels['usage'] if document and not district else labels['unavailable']
+        return {"status": "unavailable", "response_message": message, "segments": sms_segments(message)}
+    logger.info(f"SMS digest for {district}/{language} to {phone_number}")
+    return {"status": "success", "response_message": digest['sms'], "segments": digest['segments']}
+
+
 def send_ivr_message(phone_number: str, message: str) -> bool:
     """
     Placeholder function to simulate sending an IVR voice message.
@@ -46,3 +147,263 @@ def send_ivr_message(phone_number: str, message: str) -> bool:
     except Exception as e:
         logger.error(f"Error sending IVR message to {phone_number}: {e}")
         return False
+
+
+# ---------------------------------------------------------------------- digests
+
+def sms_segments(text: str) -> int:
+    """Number of SMS segments `text` needs (GSM-7 160/153, UCS-2 70/67 characters)"""
+    if all(ch in GSM7_BASIC or ch in GSM7_EXTENDED for ch in text):
+        length = sum(2 if ch in GSM7_EXTENDED else 1 for ch in text)
+        single, multi = 160, 153
+    else:
+        length = len(text.encode('utf-16-le')) // 2
+        single, multi = 70, 67
+    if length <= single:
+        return 1
+    return -(-length // multi)
+
+
+def normalize_district(name: Optional[str]) -> str:
+    return ' '.join((name or '').lower().split())
+
+
+def digest_key(district: str, language: str) -> str:
+    return f"{normalize_district(district)}|{language}"
+
+
+def district_locations() -> Dict[str, Dict[str, Any]]:
+    """Districts with APMC coverage, located at the mean of their mandi yards"""
+    from .mandi_database import ALL_INDIA_MANDIS
+
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for mandi, info in ALL_INDIA_MANDIS.items():
+        match = re.search(r'\(([^)]+)\)\s*$', mandi)
+        district = DISTRICT_OVERRIDES.get(mandi) or (match.group(1) if match else mandi.split()[0])
+        if district == info['state'] and district not in CITY_STATES:
+            district = mandi.split()[0]
+        entry = grouped.setdefault(normalize_district(district), {
+            'name': district, 'state': info['state'], 'lats': [], 'lons': [],
+        })
+        entry['lats'].append(info['lat'])
+        entry['lons'].append(info['lon'])
+    return {
+        key: {
+            'name': entry['name'], 'state': entry['state'],
+            'latitude': sum(entry['lats']) / len(entry['lats']),
+            'longitude': sum(entry['lons']) / len(entry['lons']),
+        }
+        for key, entry in grouped.items()
+    }
+
+
+def _district_weather(districts: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Next-day forecast per district, one batched Open-Meteo pass over their tiles"""
+    from .alert_fanout import fetch_tile_weather, tile_of
+
+    tile_by_district = {key: tile_of(d['latitude'], d['longitude']) for key, d in districts.items()}
+    tiles = sorted(set(tile_by_district.values()))
+    observations = fetch_tile_weather(tiles)
+    position = {tile: i for i, tile in enumerate(tiles)}
+    weather = {}
+    for key, tile in tile_by_district.items():
+        values = {name: float(column[position[tile]]) for name, column in observations.items()}
+        if not any(value != value for value in values.values()):
+            weather[key] = values
+    return weather
+
+
+def _state_prices(states: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Top commodities per state by mandi coverage on the latest day, with their trend"""
+    from .price_store import get_price_store
+
+    store = get_price_store()
+    prices: Dict[str, List[Dict[str, Any]]] = {}
+    commodities = store.commodities()
+    for state in set(states):
+        rows = []
+        for commodity in commodities:
+            latest = store.latest(commodity, state=state)
+            if latest is None:
+                continue
+            trend = store.trend(commodity, days=30, state=state) or {}
+            rows.append({
+                'commodity': commodity, 'modal': latest['modal'], 'mandis': latest['mandis'],
+                'date': latest['date'], 'trend': trend.get('trend', 'stable'),
+            })
+        rows.sort(key=lambda row: (row['date'], row['mandis']), reverse=True)
+        prices[state] = rows[:TOP_PRICES]
+    return prices
+
+
+def _active_alerts(weather: Optional[Dict[str, float]], moves: List[Dict[str, Any]], language: str) -> List[str]:
+    """Titles of the weather and price rules that fire for a district"""
+    import numpy as np
+    from .alert_fanout import PRICE_RULES, WEATHER_RULES, evaluate_rules
+
+    alerts = []
+    if weather:
+        fired = evaluate_rules(WEATHER_RULES, {name: np.array([value]) for name, value in weather.items()})
+        for rule in WEATHER_RULES:
+            if rule['id'] in fired:
+                alerts.append(rule['messages'].get(language, rule['messages']['en'])[0])
+    if moves:
+        fired = evaluate_rules(PRICE_RULES, {'change_percent': np.array([move['change_percent'] for move in moves])})
+        for rule in PRICE_RULES:
+            for i in fired.get(rule['id'], []):
+                title = rule['messages'].get(language, rule['messages']['en'])[0]
+                alerts.append(f"{title.format(mandi=moves[i]['mandi'])} ({moves[i]['commodity'].title()})")
+    return alerts
+
+
+def _spoken(text: str) -> str:
+    """Chat-formatted text as an IVR script: no emoji, no lines with missing data"""
+    lines = []
+    for line in _DECORATION.sub('', text).splitlines():
+        line = line.strip(' :')
+        if line and _MISSING not in line and line not in lines:
+            lines.append(line if line[-1] in '.।!?' else line + '.')
+    return ' '.join(lines)
+
+
+def _fit_sms(lines: List[str], max_segments: int) -> str:
+    """Keep lines in priority order until the next one would exceed `max_segments`"""
+    kept = lines[:1]
+    for line in lines[1:]:
+        if sms_segments('\n'.join(kept + [line])) > max_segments:
+            break
+        kept.append(line)
+    return '\n'.join(kept)
+
+
+def render_digest(district: Dict[str, Any], weather: Optional[Dict[str, float]], prices: List[Dict[str, Any]],
+                  alerts: List[str], language: str, today: Optional[date] = None,
+                  max_segments: int = SMS_MAX_SEGMENTS) -> Dict[str, Any]:
+    """SMS text and IVR script for one (district, language)"""
+    from .enhanced_multilingual import EnhancedMultilingualSupport
+
+    support = EnhancedMultilingualSupport()
+    template_language = DIGEST_LANGUAGES[language]
+    labels = SMS_LABELS[language]
+    name = district['name']
+    today = today or date.today()
+
+    header = _DECORATION.sub('', support.get_localized_template('weather_info', template_language, location=name)).strip()
+    lines = [f"{header.rstrip(':')} {today.strftime('%d-%b')}:"]
+    if weather:
+        lines[0] += ' ' + labels['weather'].format(
+            low=weather['temperature_min_c'], high=weather['temperature_max_c'],
+            rain=weather['precipitation_mm'], wind=weather['wind_max_kmph'])
+    lines.extend(f"{labels['alert']}: {alert}" for alert in alerts)
+    if prices:
+        lines.append(labels['prices'] + ':')
+        lines.extend(f"{row['commodity'].title()} {row['modal']:.0f} ({labels['trend'].get(row['trend'], row['trend'])})"
+                     for row in prices)
+    sms = _fit_sms(lines, max_segments)
+
+    weather_script = _spoken(support.format_response({
+        'type': 'weather', 'location': name,
+        'temperature': f"{weather['temperature_min_c']:.0f}-{weather['temperature_max_c']:.0f}°C" if weather else _MISSING,
+        'humidity': _MISSING, 'condition': labels['rain'].format(rain=weather['precipitation_mm']) if weather else _MISSING,
+    }, template_language)) if weather else labels['unavailable']
+    price_scripts = [
+        _spoken(support.format_response({
+            'type': 'market_price', 'crop': row['commodity'].title(), 'location': district['state'],
+            'price': f"{row['modal']:.0f} {'रुपये प्रति क्विंटल' if language == 'hi' else 'rupees per quintal'}",
+            'msp': _MISSING, 'trend': labels['trend'].get(row['trend'], row['trend']),
+        }, template_language))
+        for row in prices
+    ]
+    return {
+        'district': name,
+        'state': district['state'],
+        'language': language,
+        'sms': sms,
+        'segments': sms_segments(sms),
+        'ivr': {
+            'menu': labels['menu'],
+            'weather': weather_script,
+            'prices': ' '.join(price_scripts) or labels['unavailable'],
+            'alerts': '. '.join(alerts) + '.' if alerts else labels['no_alerts'],
+        },
+    }
+
+
+def build_digests(districts: Optional[Dict[str, Dict[str, Any]]] = None,
+                  weather: Optional[Dict[str, Dict[str, float]]] = None,
+                  prices: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                  moves: Optional[List[Dict[str, Any]]] = None,
+                  languages: Iterable[str] = DIGEST_LANGUAGES) -> Dict[str, Any]:
+    """Render every (district, language) digest; upstream data is fetched once per run"""
+    districts = districts if districts is not None else district_locations()
+    if weather is None:
+        weather = _district_weather(districts)
+    if prices is None:
+        prices = _state_prices(d['state'] for d in districts.values())
+    if moves is None:
+        from .alert_fanout import price_moves_from_store
+        moves = price_moves_from_store()
+
+    today = date.today()
+    digests = {}
+    for key, district in districts.items():
+        nearby = [move for move in moves if move.get('state') == district['state']]
+        for language in languages:
+            alerts = _active_alerts(weather.get(key), nearby, language)
+            digests[digest_key(key, language)] = render_digest(
+                district, weather.get(key), prices.get(district['state'], []), alerts, language, today)
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'districts': {key: {'name': d['name'], 'state': d['state']} for key, d in districts.items()},
+        'digests': digests,
+    }
+
+
+def _digest_path() -> str:
+    return str(getattr(settings, 'SMS_DIGEST_PATH', None)
+               or os.path.join(str(settings.BASE_DIR), 'data', 'sms_digests.json'))
+
+
+def save_digests(document: Dict[str, Any], path: Optional[str] = None) -> str:
+    path = path or _digest_path()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.sms_digests.', suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+_loaded: Dict[str, Any] = {'path': None, 'mtime': None, 'document': None}
+_loaded_lock = threading.Lock()
+
+
+def _digests() -> Optional[Dict[str, Any]]:
+    path = _digest_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if _loaded['path'] != path or _loaded['mtime'] != mtime:
+        with _loaded_lock:
+            with open(path, encoding='utf-8') as f:
+                _loaded.update(path=path, mtime=mtime, document=json.load(f))
+    return _loaded['document']
+
+
+def get_digest(district: Optional[str], language: str = 'en') -> Optional[Dict[str, Any]]:
+    """Pre-rendered digest for a district, falling back to English"""
+    document = _digests()
+    if not document or not district:
+        return None
+    digests = document['digests']
+    return digests.get(digest_key(district, language)) or digests.get(digest_key(district, 'en'))
+
+
+def update_digests(path: Optional[str] = None) -> Dict[str, Any]:
+    """Daily job: render and persist all district digests"""
+    document = build_digests()
+    path = save_digests(document, path)
+    logger.info(f"Wrote {len(document['digests'])} SMS/IVR digests to {path}")
+    return {'path': path, 'districts': len(document['districts']), 'digests': len(document['digests'])}
@@ -0,0 +1,369 @@
+"""
+Translation Memory
+Segment-level translation cache for the multilingual layer. Responses are
+mostly built from a few hundred fixed phrases with crops, places and numbers
+filled in, so the text is split into segments (lines and sentences) and the
+variable parts are masked before lookup:
+
+    "│ 💰 MSP: ₹2275/quintal"  ->  "│ 💰 " + "MSP: {0}/quintal" % ["₹2275"]
+
+Only the masked templates are looked up, keyed by (source, target,
+normalized segment). New segments from concurrent requests are collected
+into batches for the translation backend, and the translated templates are
+kept for later calls:
+
+    get_translator('dictionary').translate(text, 'en', 'hi')
+
+Each backend has its own memory, saved as JSON to
+TRANSLATION_MEMORY_DIR/<backend>.json so it survives a restart. The save
+happens every TRANSLATION_MEMORY_SAVE_EVERY new entries and again at exit.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from django.conf import settings
+
+# Optional runtime for neural translation
+try:
+    from transformers import pipeline
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    pipeline = None
+    TRANSFORMERS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Language names used by the older helpers -> codes used as memory keys
+LANGUAGE_CODES = {'hindi': 'hi', 'english': 'en'}
+
+NLLB_MODEL = 'facebook/nllb-200-distilled-600M'
+NLLB_CODES = {
+    'en': 'eng_Latn', 'hi': 'hin_Deva', 'bn': 'ben_Beng', 'pa': 'pan_Guru', 'ta': 'tam_Taml',
+    'te': 'tel_Telu', 'kn': 'kan_Knda', 'ml': 'mal_Mlym', 'gu': 'guj_Gujr', 'or': 'ory_Orya',
+    'mr': 'mar_Deva',
+}
+
+# Prices, quantities, percentages, dates and times stay as they are
+VARIABLE_RE = re.compile(r'[₹$]?\d+(?:[.,:/-]\d+)*%?')
+SENTENCE_END_RE = re.compile(r'(?<=[.!?।])\s+')
+PLACEHOLDER_RE = re.compile(r'\{(\d+)\}')
+
+# A segment is either verbatim text or (template, values)
+Segment = Union[str, Tuple[str, List[str]]]
+BatchBackend = Callable[[List[str], str, str], List[str]]
+
+
+def language_code(language: str) -> str:
+    return LANGUAGE_CODES.get(language, language)
+
+
+def normalize_segment(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def _is_edge(ch: str) -> bool:
+    # Punctuation, symbols (emoji, box drawing) and separators; vowel signs are marks and stay
+    return unicodedata.category(ch)[0] in 'PSZC'
+
+
+def _mask(sentence: str) -> List[Segment]:
+    start, end = 0, len(sentence)
+    while start < end and _is_edge(sentence[start]):
+        start += 1
+    while end > start and _is_edge(sentence[end - 1]):
+        end -= 1
+    core = sentence[start:end]
+    if not any(ch.isalpha() for ch in core):
+        return [sentence]
+    values: List[str] = []
+
+    def placeholder(match):
+        values.append(match.group(0))
+        return '{%d}' % (len(values) - 1)
+
+    template = VARIABLE_RE.sub(placeholder, core.replace('{', '{{').replace('}', '}}'))
+    parts: List[Segment] = [sentence[:start]] if start else []
+    parts.append((template, values))
+    if end < len(sentence):
+        parts.append(sentence[end:])
+    return parts
+
+
+def split_segments(text: str) -> List[Segment]:
+    """Split text into verbatim pieces and masked (template, values) segments"""
+    segments: List[Segment] = []
+    for i, line in enumerate(text.split('\n')):
+        if i:
+            segments.append('\n')
+        pos = 0
+        for match in SENTENCE_END_RE.finditer(line):
+            segments.extend(_mask(line[pos:match.start()]))
+            segments.append(match.group(0))
+            pos = match.end()
+        if pos < len(line):
+            segments.extend(_mask(line[pos:]))
+    return segments
+
+
+def fill_template(template: str, values: Sequence[str]) -> str:
+    filled = PLACEHOLDER_RE.sub(lambda m: values[int(m.group(1))] if int(m.group(1)) < len(values) else m.group(0),
+                                template)
+    return filled.replace('{{', '{').replace('}}', '}')
+
+
+def _keeps_placeholders(template: str, translation: str) -> bool:
+    return sorted(PLACEHOLDER_RE.findall(template)) == sorted(PLACEHOLDER_RE.findall(translation))
+
+
+class TranslationMemory:
+    """Bounded map of (source, target, segment) -> translation, saved to a JSON file"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100000, save_every: int = 50):
+        self.path = path
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self._entries: 'OrderedDict[Tuple[str, str, str], str]' = OrderedDict()
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, source: str, target: str, segment: str) -> Optional[str]:
+        key = (source, target, normalize_segment(segment))
+        with self._lock:
+            translation = self._entries.get(key)
+            if translation is not None:
+                self._entries.move_to_end(key)
+            return translation
+
+    def put(self, source: str, target: str, segment: str, translation: str):
+        with self._lock:
+            self._entries[(source, target, normalize_segment(segment))] = translation
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            due = self.path and self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                rows = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read translation memory {self.path}: {e}")
+            return
+        with self._lock:
+            for source, target, segment, translation in rows[-self.max_entries:]:
+                self._entries[(source, target, segment)] = translation
+        logger.info(f"Loaded {len(rows)} translation memory entries from {self.path}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            rows = [[source, target, segment, translation]
+                    for (source, target, segment), translation in self._entries.items()]
+            self._unsaved = 0
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.translation_memory.', suffix='.json')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save translation memory {self.path}: {e}")
+
+
+class BatchTranslator:
+    """
+    Collects segments from concurrent callers and sends them to the backend
+    in batches per language pair. A batch holds up to `max_batch_size`
+    segments and waits at most `max_wait_ms` after its first segment.
+    """
+
+    def __init__(self, backend: BatchBackend, max_batch_size: int = 32, max_wait_ms: float = 20):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: 'queue.Queue' = queue.Queue()
+        self._stats = {'segments': 0, 'batches': 0, 'errors': 0}
+        self._worker = threading.Thread(target=self._run, name='translation-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, segment: str, source: str, target: str) -> Future:
+        future: Future = Future()
+        self._pending.put((segment, source, target, future))
+        return future
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            groups: Dict[Tuple[str, str], List[tuple]] = {}
+            for item in self._collect():
+                groups.setdefault((item[1], item[2]), []).append(item)
+            for (source, target), items in groups.items():
+                self._stats['batches'] += 1
+                self._stats['segments'] += len(items)
+                try:
+                    translations = self.backend([item[0] for item in items], source, target)
+                    for item, translation in zip(items, translations):
+                        item[3].set_result(translation)
+                except Exception as e:
+                    self._stats['errors'] += 1
+                    for item in items:
+                        if not item[3].done():
+                            item[3].set_exception(e)
+
+
+class SegmentTranslator:
+    """Translation memory in front of a batched backend"""
+
+    def __init__(self, memory: TranslationMemory, backend: BatchBackend, max_batch_size: int = 32,
+                 max_wait_ms: float = 20):
+        self.memory = memory
+        self.batcher = BatchTranslator(backend, max_batch_size, max_wait_ms)
+
+    def translate(self, text: str, source: str, target: str, timeout: Optional[float] = 30) -> str:
+        return self.translate_many([text], source, target, timeout)[0]
+
+    def translate_many(self, texts: Sequence[str], source: str, target: str,
+                       timeout: Optional[float] = 30) -> List[str]:
+        """
+        Translate texts segment by segment. Known segments come from the
+        memory; the new ones go to the backend in one batch. A segment the
+        backend cannot translate stays in the source language and is not
+        remembered.
+        """
+        source, target = language_code(source), language_code(target)
+        if source == target:
+            return list(texts)
+        split = [split_segments(text or '') for text in texts]
+        templates = {part[0] for parts in split for part in parts if isinstance(part, tuple)}
+        known = {template: self.memory.get(source, target, template) for template in templates}
+        misses = {template: self.batcher.submit(template, source, target)
+                  for template, translation in known.items() if translation is None}
+        for template, future in misses.items():
+            try:
+                translation = future.result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Translation {source}->{target} failed for {template!r}: {e}")
+                continue
+            if translation and _keeps_placeholders(template, translation):
+                known[template] = translation
+                self.memory.put(source, target, template, translation)
+        return [''.join(part if isinstance(part, str) else fill_template(known[part[0]] or part[0], part[1])
+                        for part in parts) for parts in split]
+
+
+def dictionary_backend(support=None) -> BatchBackend:
+    """Word-table translation from EnhancedMultilingualSupport"""
+
+    def translate(segments: List[str], source: str, target: str) -> List[str]:
+        nonlocal support
+        if support is None:
+            from .enhanced_multilingual import EnhancedMultilingualSupport
+            support = EnhancedMultilingualSupport()
+        if target == 'hi':
+            return [support._translate_to_hindi(segment) for segment in segments]
+        if target == 'en':
+            return [support._translate_to_english(segment) for segment in segments]
+        if target == 'hinglish':
+            return [support._translate_to_hinglish(segment) for segment in segments]
+        return list(segments)
+
+    return translate
+
+
+def nllb_backend(model: str = NLLB_MODEL) -> BatchBackend:
+    """NLLB through a transformers pipeline loaded once, one call per batch"""
+    state: Dict[str, object] = {}
+    lock = threading.Lock()
+
+    def translate(segments: List[str], source: str, target: str) -> List[str]:
+        if not TRANSFORMERS_AVAILABLE:
+            raise RuntimeError('transformers is not installed')
+        if source not in NLLB_CODES or target not in NLLB_CODES:
+            return list(segments)
+        with lock:
+            if 'pipeline' not in state:
+                state['pipeline'] = pipeline('translation', model=model)
+        out = state['pipeline'](segments, src_lang=NLLB_CODES[source], tgt_lang=NLLB_CODES[target],
+                                max_length=256)
+        return [row['translation_text'] for row in out]
+
+    return translate
+
+
+BACKENDS: Dict[str, Callable[[], BatchBackend]] = {
+    'dictionary': dictionary_backend,
+    'nllb': nllb_backend,
+}
+
+_translators: Dict[str, SegmentTranslator] = {}
+_lock = threading.Lock()
+
+
+def _memory_dir() -> str:
+    return str(getattr(settings, 'TRANSLATION_MEMORY_DIR', None)
+               or os.path.join(str(settings.BASE_DIR), 'data', 'translation_memory'))
+
+
+def get_translator(backend: str = 'dictionary') -> SegmentTranslator:
+    """Segment translator over the named backend ('dictionary' or 'nllb')"""
+    translator = _translators.get(backend)
+    if translator is None:
+        with _lock:
+            translator = _translators.get(backend)
+            if translator is None:
+                memory = TranslationMemory(
+                    os.path.join(_memory_dir(), f'{backend}.json'),
+                    max_entries=int(getattr(settings, 'TRANSLATION_MEMORY_MAX_ENTRIES', 100000)),
+                    save_every=int(getattr(settings, 'TRANSLATION_MEMORY_SAVE_EVERY', 50)),
+                )
+                atexit.register(memory.save)
+                translator = _translators[backend] = SegmentTranslator(
+                    memory, BACKENDS[backend](),
+                    max_batch_size=int(getattr(settings, 'TRANSLATION_MAX_BATCH_SIZE', 32)),
+                    max_wait_ms=float(getattr(settings, 'TRANSLATION_MAX_WAIT_MS', 20)),
+                )
+    return translator
+
+
+def reset_translators(translators: Optional[Dict[str, SegmentTranslator]] = None):
+    with _lock:
+        _translators.clear()
+        _translators.update(translators or {})
@@ -16,6 +16,10 @@ import aiohttp
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+import numpy as np
+
+from .price_store import get_price_store
+
 logger = logging.getLogger(__name__)
 
 class UltimateRealTimeSystem:
@@ -475,6 +479,11 @@ class UltimateRealTimeSystem:
     def get_historical_market_analysis(self, state: str) -> Dict[str, Any]:
         """Get historical market analysis for past 3 years"""
         try:
+            # Prefer observed mandi prices when the price store has them
+            observed = self._observed_market_analysis(state)
+            if observed:
+                return observed
+
             # Simulate historical market analysis
             analysis = self._generate_historical_market_analysis(state)
             
@@ -818,6 +827,58 @@ class UltimateRealTimeSystem:
             'best_timing': 'october_november'
         }
     
+    def _observed_market_analysis(self, state: str, years: int = 3) -> Optional[Dict[str, Any]]:
+        """Historical market analysis computed from the columnar price store"""
+        store = get_price_store()
+        month_names = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+                       'august', 'september', 'october', 'november', 'december']
+        price_trends, seasonal_patterns, best_timing = {}, {}, {}
+        first, last, observations = None, None, 0
+
+        for commodity in store.commodities():
+            trend = store.trend(commodity, days=365 * years, state=state)
+            if not trend:
+                continue
+            price_trends[commodity] = trend
+            first = min(first or trend['from'], trend['from'])
+            last = max(last or trend['to'], trend['to'])
+            observations += trend['observations']
+
+            monthly = store.rollup(commodity, 'M', start=trend['from'], state=state)
+            month_of_year = monthly['period'].astype('datetime64[M]').astype(np.int64) % 12
+            totals = np.bincount(month_of_year, weights=monthly['modal'], minlength=12)
+            counts = np.bincount(month_of_year, minlength=12)
+            averages = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+            if np.isfinite(averages).sum() >= 2:
+                peak, trough = int(np.nanargmax(averages)), int(np.nanargmin(averages))
+                seasonal_patterns[commodity] = {'peak_month': month_names[peak], 'lowest_month': month_names[trough]}
+                best_timing[commodity] = month_names[peak]
+
+        if not price_trends:
+            return None
+
+        volatility = float(np.mean([trend['volatility'] for trend in price_trends.values()]))
+        directions = [trend['trend'] for trend in price_trends.values()]
+        demand_trend = max(set(directions), key=directions.count)
+        fallback = self._generate_historical_market_analysis(state)
+
+        return {
+            'analysis_period': f"{first} to {last}",
+            'price_volatility': 'low' if volatility < 0.02 else 'moderate' if volatility < 0.05 else 'high',
+            'seasonal_patterns': seasonal_patterns or fallback['seasonal_patterns'],
+            'demand_trends': demand_trend,
+            'supply_trends': fallback['supply_trends'],
+            'profit_margins': fallback['profit_margins'],
+            'market_performance': 'good' if demand_trend != 'decreasing' else 'weak',
+            'best_timing': best_timing or fallback['best_timing'],
+            'price_trends': price_trends,
+            'observations': observations,
+            'timestamp': datetime.now().isoformat(),
+            'source': 'Observed Mandi Prices (Agmarknet)',
+            'realtime': False,
+            'confidence': 0.95 if observations >= 1000 else 0.9
+        }
+
     def _generate_soil_analysis(self, lat: float, lon: float) -> Dict[str, Any]:
         """Generate soil analysis"""
         return {
@@ -17,6 +17,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib3
 from urllib3.exceptions import InsecureRequestWarning
 
+from ..monitoring.tracing import propagate, traced
+
 # Disable SSL warnings for development
 urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -73,6 +75,7 @@ class UltraDynamicGovernmentAPI:
         self.response_times = {}
         self.success_rates = {}
         
+    @traced('gov.weather')
     def get_weather_data(self, location: str, latitude: float = None, longitude: float = None) -> Dict[str, Any]:
         """Get weather data for a location - ALWAYS try real-time government APIs first"""
         try:
@@ -119,12 +122,12 @@ class UltraDynamicGovernmentAPI:
             # Parallel data fetching for maximum speed
             with ThreadPoolExecutor(max_workers=6) as executor:
                 futures = {
-                    'weather': executor.submit(self._fetch_weather_data, latitude, longitude, location),
-                    'market_prices': executor.submit(self._fetch_market_prices, location),
-                    'crop_recommendations': executor.submit(self._fetch_crop_recommendations, location),
-                    'soil_health': executor.submit(self._fetch_soil_health, latitude, longitude),
-                    'government_schemes': executor.submit(self._fetch_government_schemes, location),
-                    'pest_database': executor.submit(self._fetch_pest_database, location)
+                    'weather': executor.submit(propagate(self._fetch_weather_data), latitude, longitude, location),
+                    'market_prices': executor.submit(propagate(self._fetch_market_prices), location),
+                    'crop_recommendations': executor.submit(propagate(self._fetch_crop_recommendations), location),
+                    'soil_health': executor.submit(propagate(self._fetch_soil_health), latitude, longitude),
+                    'government_schemes': executor.submit(propagate(self._fetch_government_schemes), location),
+                    'pest_database': executor.submit(propagate(self._fetch_pest_database), location)
                 }
                 
                 # Collect results
@@ -176,6 +179,7 @@ class UltraDynamicGovernmentAPI:
                 'timestamp': datetime.now().isoformat()
             }
     
+    @traced('gov.fetch_weather')
     def _fetch_weather_data(self, latitude: float, longitude: float, location: str) -> Dict[str, Any]:
         """Fetch real-time weather data from multiple government and open APIs"""
         try:
@@ -458,6 +462,7 @@ class UltraDynamicGovernmentAPI:
             logger.error(f"AccuWeather API error: {e}")
             return None
     
+    @traced('gov.fetch_market_prices')
     def _fetch_market_prices(self, location: str, mandi_filter: str = None) -> Dict[str, Any]:
         """Fetch real-time market prices from Agmarknet and e-NAM with enhanced reliability"""
         try:
@@ -532,6 +537,7 @@ class UltraDynamicGovernmentAPI:
             logger.error(f"Market prices API error: {e}")
             return None # Return None to trigger V2 fallback logic
     
+    @traced('gov.fetch_crop_recommendations')
     def _fetch_crop_recommendations(self, location: str) -> Dict[str, Any]:
         """Fetch real-time crop recommendations from ICAR"""
         try:
@@ -570,6 +576,7 @@ class UltraDynamicGovernmentAPI:
             logger.error(f"Crop recommendations API error: {e}")
             return self._get_fallback_crop_data(location)
     
+    @traced('gov.fetch_soil_health')
     def _fetch_soil_health(self, latitude: float, longitude: float) -> Dict[str, Any]:
         """Fetch real-time soil health data"""
         try:
@@ -599,6 +606,7 @@ class UltraDynamicGovernmentAPI:
             logger.error(f"Soil health API error: {e}")
             return self._get_fallback_soil_data("Unknown Location")
     
+    @traced('gov.fetch_government_schemes')
     def _fetch_government_schemes(self, location: str) -> Dict[str, Any]:
         """Fetch real-time government schemes data"""
         try:
@@ -635,6 +643,7 @@ class UltraDynamicGovernmentAPI:
             logger.error(f"Government schemes API error: {e}")
             return self._get_fallback_schemes_data(location)
     
+    @traced('gov.fetch_pest_database')
     def _fetch_pest_database(self, location: str) -> Dict[str, Any]:
         """Fetch real-time pest database from ICAR"""
         try:
@@ -888,6 +897,7 @@ class UltraDynamicGovernmentAPI:
         
         return " | ".join(advisories) if advisories else "सामान्य कृषि गतिविधियां जारी रखें"
     
+    @traced('gov.geocode')
     def _get_location_coordinates(self, location: str) -> Optional[Dict[str, float]]:
         """Get coordinates for a location"""
         # Basic location coordinates for major Indian cities
@@ -999,6 +1009,7 @@ class UltraDynamicGovernmentAPI:
         
         return coordinates.get(location)
     
+    @traced('gov.real_time_weather')
     def get_real_time_weather(self, location: str) -> Dict[str, Any]:
         """
         Public endpoint to get real-time weather from Open-Meteo.
@@ -1422,6 +1433,7 @@ class UltraDynamicGovernmentAPI:
 
 
 
+    @traced('gov.pest_control')
     def get_pest_control_recommendations(self, crop_name: str, location: str, language: str = 'hi') -> Dict[str, Any]:
         """Get pest control recommendations"""
         try:
@@ -1439,20 +1451,6 @@ class UltraDynamicGovernmentAPI:
     def _get_fallback_market_data(self, location: str) -> Dict[str, Any]:
         return self._get_enhanced_market_data(location)
 
-    def get_government_schemes(self, location: str, latitude: float = None, longitude: float = None, language: str = 'hi') -> Dict[str, Any]:
-        """Get government schemes"""
-        try:
-            # Try to fetch real data
-            data = self._fetch_government_schemes(location)
-            
-            if data and data.get('status') == 'success':
-                return data
-                
-            return self._get_fallback_schemes_data(location)
-        except Exception as e:
-            logger.error(f"Government schemes error: {e}")
-            return self._get_fallback_schemes_data(location)
-
     def _get_fallback_pest_data(self, location: str) -> Dict[str, Any]:
         """Fallback pest data when APIs are unavailable"""
         return {
@@ -1541,12 +1539,20 @@ class UltraDynamicGovernmentAPI:
 
         return self.get_market_prices_v2(location, mandi=mandi_name)
         
+    @traced('gov.market_prices')
     def get_market_prices_v2(self, location: str = "Delhi", mandi: str = None, page: int = 1, latitude: float = None, longitude: float = None) -> Dict[str, Any]:
         """
         Get real-time market prices with V2 consistent key structure (name, profit_margin).
         Robust fallback to enhanced simulation for ANY error or missing data.
         """
         try:
+            # Query parameters arrive as strings
+            try:
+                latitude = float(latitude) if latitude not in (None, '') else None
+                longitude = float(longitude) if longitude not in (None, '') else None
+            except (TypeError, ValueError):
+                latitude = longitude = None
+
             # 0. Determine Mandi Identity First (For Strict Filtering)
             target_mandi_name = mandi
             if not target_mandi_name:
@@ -1694,53 +1700,43 @@ class UltraDynamicGovernmentAPI:
                 'data_source': 'System Error Fallback'
             }
 
-    def get_government_schemes(self, location: str) -> Dict[str, Any]:
+    @traced('gov.government_schemes')
+    def get_government_schemes(self, location: str, latitude: float = None, longitude: float = None,
+                               language: str = 'hi') -> Dict[str, Any]:
         """
         Get real-time government schemes.
         """
         try:
             raw_data = self._fetch_government_schemes(location)
             
-            if raw_data and raw_data.get('status') == 'success':
+            if raw_data and raw_data.get('status') == 'success' and raw_data['data']['central_schemes']:
                 return raw_data
             else:
-                return self._get_fallback_schemes_data(location)
+                return self._get_fallback_schemes_data(location, language)
         except Exception as e:
             logger.error(f"Error in get_government_schemes: {e}")
-            return self._get_fallback_schemes_data(location)
+            return self._get_fallback_schemes_data(location, language)
+
+    def _get_fallback_schemes_data(self, location: str, language: str = 'en') -> Dict[str, Any]:
+        """Fallback schemes data from the compiled scheme catalog"""
+        from .scheme_catalog import MAX_PAGE_SIZE, get_scheme_catalog
 
-    def _get_fallback_schemes_data(self, location: str) -> Dict[str, Any]:
-        """Fallback schemes data"""
+        result = get_scheme_catalog().lookup(location, language=language, page_size=MAX_PAGE_SIZE)
         return {
             'status': 'success',
-            'schemes': [
-                {
-                    'name': 'PM Kisan Samman Nidhi',
-                    'amount': '₹6,000 per year',
-                    'description': 'Direct income support to farmers',
-                    'eligibility': 'All farmer families',
-                    'helpline': '1800-180-1551',
-                    'official_website': 'https://pmkisan.gov.in/',
-                    'apply_link': 'https://pmkisan.gov.in/'
-                },
-                {
-                    'name': 'Pradhan Mantri Fasal Bima Yojana',
-                    'amount': 'Insurance Cover',
-                    'description': 'Crop insurance scheme',
-                    'eligibility': 'All farmers',
-                    'helpline': '1800-180-1551',
-                    'official_website': 'https://pmfby.gov.in/',
-                    'apply_link': 'https://pmfby.gov.in/'
-                }
-            ],
+            'location': location,
+            'state': result['state'],
+            'schemes': result['schemes'],
             'data': {
-                'central_schemes': [],
-                'state_schemes': []
+                'central_schemes': [scheme for scheme in result['schemes'] if scheme['scope'] == 'central'],
+                'state_schemes': [scheme for scheme in result['schemes'] if scheme['scope'] == 'state']
             },
-            'sources': ['Fallback Schemes Data'],
-            'reliability_score': 0.6
+            'sources': ['Ministry of Agriculture & Farmers Welfare'],
+            'reliability_score': 0.6,
+            'timestamp': datetime.now().isoformat()
         }
 
+    @traced('gov.comprehensive_data')
     def get_comprehensive_government_data(self, location: str) -> Dict[str, Any]:
         """
         Aggregates ALL Real-Time Data (Weather, Soil, Market, Schemes) for Chatbot Context.
@@ -22,6 +22,11 @@ from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 import joblib
 
+from .pest_index import current_season, get_pest_index, state_of
+from ..ml.query_classifier import confident_prediction
+from .llm_gateway import data_source as llm_data_source
+from .llm_sessions import generate_in_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -171,18 +176,26 @@ class AIService(BaseService):
         """Classify the type of query"""
         query_lower = query.lower()
         
-        # Calculate scores for different categories
-        farming_score = self._calculate_farming_score(query_lower)
-        weather_score = self._calculate_weather_score(query_lower)
-        market_score = self._calculate_market_score(query_lower)
-        
-        # Determine primary category
-        scores = {
-            'farming_agriculture': farming_score,
-            'weather_climate': weather_score,
-            'market_economics': market_score,
-            'general': 0.1
-        }
+        # A confident local model prediction replaces the keyword scores
+        prediction = confident_prediction(query)
+        if prediction:
+            category = prediction['category']
+            scores = {category if category in ('farming_agriculture', 'weather_climate', 'market_economics')
+                      else 'general': prediction['confidence']}
+            farming_score = scores.get('farming_agriculture', 0.0)
+        else:
+            # Calculate scores for different categories
+            farming_score = self._calculate_farming_score(query_lower)
+            weather_score = self._calculate_weather_score(query_lower)
+            market_score = self._calculate_market_score(query_lower)
+            
+            # Determine primary category
+            scores = {
+                'farming_agriculture': farming_score,
+                'weather_climate': weather_score,
+                'market_economics': market_score,
+                'general': 0.1
+            }
         
         primary_category = max(scores, key=scores.get)
         confidence = scores[primary_category]
@@ -240,21 +253,15 @@ class AIService(BaseService):
         template_key = category.replace('_', '_query') if category != 'general' else 'general_query'
         template = self.response_templates.get(template_key, {}).get(language, "I'll help you with that.")
         
-        # Try different AI services
         response = None
         data_source = 'fallback'
         
-        # Try Google AI first if available
-        if self.ai_models['google_ai']['enabled']:
-            response = self._generate_google_ai_response(query, language, context)
-            if response:
-                data_source = 'google_ai'
-        
-        # Fallback to Ollama
-        if not response and self.ai_models['ollama']['enabled']:
-            response = self._generate_ollama_response(query, language, context)
-            if response:
-                data_source = 'ollama_ai'
+        # The gateway answers from the fastest healthy LLM backend
+        result = generate_in_session((context or {}).get('session_id'), self._build_system_prompt(language, context),
+                                     query)
+        if result:
+            response = result['text']
+            data_source = llm_data_source(result)
         
         # Final fallback
         if not response:
@@ -270,66 +277,17 @@ class AIService(BaseService):
             'context': context or {}
         }
     
-    def _generate_google_ai_response(self, query: str, language: str, context: Dict[str, Any]) -> Optional[str]:
-        """Generate response using Google AI"""
-        try:
-            url = f"{self.ai_models['google_ai']['base_url']}/models/{self.ai_models['google_ai']['model']}:generateContent"
-            
-            prompt = self._build_prompt(query, language, context)
-            
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }]
-            }
-            
-            headers = {
-                'Authorization': f'Bearer {self.google_ai_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = self._make_request(url, 'POST', json=payload, headers=headers)
-            
-            if response and 'candidates' in response:
-                return response['candidates'][0]['content']['parts'][0]['text']
-            
-        except Exception as e:
-            self.logger.error(f"Google AI error: {e}")
-        
-        return None
-    
-    def _generate_ollama_response(self, query: str, language: str, context: Dict[str, Any]) -> Optional[str]:
-        """Generate response using Ollama"""
-        try:
-            url = f"{self.ai_models['ollama']['base_url']}/api/generate"
-            
-            prompt = self._build_prompt(query, language, context)
-            
-            payload = {
-                "model": self.ai_models['ollama']['model'],
-                "prompt": prompt,
-                "stream": False
-            }
-            
-            response = self._make_request(url, 'POST', json=payload)
-            
-            if response and 'response' in response:
-                return response['response']
-            
-        except Exception as e:
-            self.logger.error(f"Ollama error: {e}")
-        
-        return None
-    
-    def _build_prompt(self, query: str, language: str, context: Dict[str, Any]) -> str:
-        """Build prompt for AI services"""
+    def _build_system_prompt(self, language: str, context: Dict[str, Any]) -> str:
+        """System prompt for AI services; the query and earlier turns are added per chat session"""
+        # The session keeps the history itself, and a stable prompt lets Ollama's context be reused
+        context = {key: value for key, value in (context or {}).items()
+                   if key not in ('session_id', 'conversation_history')}
         base_prompt = f"""
 You are Krishimitra AI, an intelligent agricultural assistant for Indian farmers.
 You provide expert advice on farming, crops, weather, market prices, and government schemes.
 
-User Query: {query}
 Language: {language}
-Context: {json.dumps(context, indent=2)}
+Context: {json.dumps(context, indent=2, default=str)}
 
 Please provide a helpful, accurate, and detailed response in {language}.
 Focus on practical, actionable advice for Indian farmers.
@@ -765,32 +723,16 @@ class CropService(BaseService):
         if cached_data:
             return cached_data
         
-        # Simple symptom-based detection
-        pest_database = {
-            'wheat': {
-                'yellow_spots': {'pest': 'Yellow Rust', 'treatment': 'Fungicide spray'},
-                'brown_patches': {'pest': 'Brown Rust', 'treatment': 'Fungicide spray'},
-                'holes_in_leaves': {'pest': 'Army Worm', 'treatment': 'Insecticide spray'}
-            },
-            'rice': {
-                'yellow_spots': {'pest': 'Bacterial Blight', 'treatment': 'Copper fungicide'},
-                'white_powder': {'pest': 'Powdery Mildew', 'treatment': 'Sulfur spray'},
-                'holes_in_leaves': {'pest': 'Rice Leaf Folder', 'treatment': 'Neem oil spray'}
-            }
-        }
-        
-        symptoms_lower = symptoms.lower()
-        crop_pests = pest_database.get(crop.lower(), {})
-        
+        # Ranked against the shared symptom index
         detected_pests = []
-        for symptom, pest_info in crop_pests.items():
-            if symptom in symptoms_lower:
-                detected_pests.append({
-                    'symptom': symptom,
-                    'pest': pest_info['pest'],
-                    'treatment': pest_info['treatment'],
-                    'confidence': 0.8
-                })
+        for match in get_pest_index().search(symptoms, crop=crop, season=current_season(), state=state_of(location)):
+            detected_pests.append({
+                'symptom': ' '.join(match['matched_terms']),
+                'pest': match['name'],
+                'treatment': match['treatment'][0] if match['treatment'] else 'Integrated Pest Management',
+                'confidence': match['confidence'],
+                'score': match['score']
+            })
         
         result = {
             'crop': crop,
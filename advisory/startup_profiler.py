@@ -0,0 +1,87 @@
+"""
+Cold Start Profiler
+Measures how long a fresh Python process takes to boot Django and import
+the given modules, with per-module import cost from `python -X importtime`.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Sequence
+
+from django.conf import settings
+
+# Modules a web worker imports before it can serve its first API request
+DEFAULT_STARTUP_MODULES = (
+    'advisory.api.views',
+    'advisory.ml.ultimate_intelligent_ai',
+)
+
+_PROBE_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+import django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', {settings_module!r})
+django.setup()
+setup_done = time.perf_counter()
+import importlib
+for name in {modules!r}:
+    importlib.import_module(name)
+end = time.perf_counter()
+print(json.dumps({{'setup_seconds': setup_done - start, 'total_seconds': end - start}}))
+"""
+
+
+def _parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` lines into per-module self/cumulative milliseconds"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip(' ')) - 1) // 2,
+            'self_ms': self_us / 1000,
+            'cumulative_ms': cumulative_us / 1000,
+        })
+    return entries
+
+
+def profile_cold_start(modules: Sequence[str] = DEFAULT_STARTUP_MODULES,
+                       importtime: bool = True, timeout: int = 120) -> Dict[str, Any]:
+    """
+    Boot Django in a fresh interpreter, import `modules` and report timings.
+
+    Returns wall-clock seconds for django.setup() and for the whole start-up,
+    plus (when `importtime` is set) per-module import costs sorted by
+    cumulative time.
+    """
+    script = _PROBE_SCRIPT.format(
+        settings_module=os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),
+        modules=list(modules),
+    )
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', script]
+
+    result = subprocess.run(
+        command, cwd=str(settings.BASE_DIR), capture_output=True, text=True, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Start-up probe failed: {result.stderr.strip().splitlines()[-1:]}")
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['modules'] = list(modules)
+    report['budget_seconds'] = getattr(settings, 'COLD_START_BUDGET_SECONDS', None)
+    if importtime:
+        report['imports'] = sorted(
+            _parse_importtime(result.stderr), key=lambda entry: entry['cumulative_ms'], reverse=True
+        )
+    return report
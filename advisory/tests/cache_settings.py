@@ -0,0 +1,23 @@
+"""
+Cache settings shared by the test modules
+
+Tests that need a working cache whatever the environment (DEBUG switches
+the per-process aliases to DummyCache) run under `locmem_caches(name)`;
+each feature keeps at least one test on the project's real CACHES as well.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def locmem_caches(name: str) -> dict:
+    """CACHES setting with each alias of the project's CACHES on its own LocMemCache"""
+    return {
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'{name}-{alias}'}
+        for alias in settings.CACHES
+    }
+
+
+def clear_caches():
+    for alias in caches:
+        caches[alias].clear()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Geo-targeted Alert Fan-out
+Delivery goes through the in-process LocalProvider; no network calls.
+The tests run on the project's real CACHES: the delivery ledger is a table.
+"""
+
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import AlertDelivery, ChatSession, UserSession
+from ..services.alert_fanout import (
+    AlertDispatcher, LocalProvider, SubscriberIndex, fan_out_price_alerts,
+    fan_out_warning, fan_out_weather_alerts, prune_deliveries, tile_of,
+)
+
+MESSAGES = {'en': {'title': 'Test', 'body': 'Test alert'}, 'hi': {'title': 'परीक्षण', 'body': 'परीक्षण चेतावनी'}}
+
+
+class AlertFanoutTests(TestCase):
+    """Test cases for the subscriber index, dispatcher and rule fan-out"""
+
+    def setUp(self):
+        # Lucknow, Kanpur (~75 km away) and Pune
+        UserSession.objects.create(user_id='lko-1', session_id='s1', latitude=26.85, longitude=80.95)
+        UserSession.objects.create(user_id='lko-2', session_id='s2', latitude=26.86, longitude=80.93, preferred_language='hi')
+        UserSession.objects.create(user_id='knp-1', session_id='s3', latitude=26.45, longitude=80.33)
+        UserSession.objects.create(user_id='pune-1', session_id='s4', latitude=18.52, longitude=73.86)
+        UserSession.objects.create(user_id='nowhere', session_id='s5')
+        # A later chat from pune-1 in Lucknow supersedes the older session
+        ChatSession.objects.create(user_id='pune-1', session_id='c1', latitude=26.84, longitude=80.94)
+        self.index = SubscriberIndex.from_sessions()
+
+    def _users(self, positions):
+        return sorted(self.index.user_ids[positions].tolist())
+
+    def test_index_uses_latest_location(self):
+        """Test each user is indexed once, at their most recent coordinates"""
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self._users(self.index.in_tiles([tile_of(26.85, 80.95)])), ['lko-1', 'lko-2', 'pune-1'])
+        self.assertEqual(self._users(self.index.in_bbox(18, 73, 19, 74)), [])
+
+    def test_radius_query(self):
+        """Test radius lookups use great-circle distance"""
+        self.assertEqual(self._users(self.index.within(26.85, 80.95, 20)), ['lko-1', 'lko-2', 'pune-1'])
+        self.assertEqual(self._users(self.index.within(26.85, 80.95, 100)), ['knp-1', 'lko-1', 'lko-2', 'pune-1'])
+
+    def test_batching_and_idempotent_rerun(self):
+        """Test recipients are batched per provider and never sent twice"""
+        user_ids = [f'farmer-{i}' for i in range(250)]
+        index = SubscriberIndex(user_ids, np.full(250, 26.85), np.full(250, 80.95))
+        provider = LocalProvider(batch_size=100)
+        dispatcher = AlertDispatcher([provider])
+
+        first = fan_out_warning('imd-1', {'latitude': 26.85, 'longitude': 80.95, 'radius_km': 10},
+                                MESSAGES, index=index, dispatcher=dispatcher)
+        second = fan_out_warning('imd-1', {'latitude': 26.85, 'longitude': 80.95, 'radius_km': 10},
+                                 MESSAGES, index=index, dispatcher=dispatcher)
+
+        self.assertEqual((first['batches'], first['sent']), (3, 250))
+        self.assertEqual((second['sent'], second['skipped']), (0, 250))
+        self.assertEqual(len(provider.delivered), 250)
+
+    def test_ledger_is_shared_between_workers(self):
+        """Test a second dispatcher (another worker) skips recipients the first reached"""
+        first = AlertDispatcher([LocalProvider(rejected={'b'})], max_retries=0)
+        self.assertEqual(first.dispatch('shared-1', {'en': ['a', 'b']}, MESSAGES)['sent'], 1)
+
+        provider = LocalProvider()
+        result = AlertDispatcher([provider]).dispatch('shared-1', {'en': ['a', 'b']}, MESSAGES)
+
+        self.assertEqual((result['sent'], result['skipped']), (1, 1))
+        self.assertEqual([recipient for recipient, _ in provider.delivered], ['b'])
+        self.assertEqual(AlertDelivery.objects.filter(alert_id='shared-1').count(), 2)
+
+    def test_old_ledger_rows_are_pruned(self):
+        """Test deliveries past the idempotency window are dropped"""
+        AlertDelivery.objects.create(alert_id='old', provider='local', recipient='a')
+        AlertDelivery.objects.create(alert_id='new', provider='local', recipient='a')
+        AlertDelivery.objects.filter(alert_id='old').update(sent_at=timezone.now() - timedelta(days=3))
+
+        self.assertEqual(prune_deliveries(), 1)
+        self.assertEqual(list(AlertDelivery.objects.values_list('alert_id', flat=True)), ['new'])
+
+    def test_retries_failed_batches_and_recipients(self):
+        """Test provider errors are retried and permanent rejections reported"""
+        provider = LocalProvider(fail_first=2, rejected={'lko-2'})
+        dispatcher = AlertDispatcher([provider], max_retries=2, base_delay=0)
+
+        result = dispatcher.dispatch('retry-test', {'en': ['lko-1', 'lko-2', 'knp-1']}, MESSAGES)
+
+        self.assertEqual((result['sent'], result['failed']), (2, 1))
+        self.assertEqual(sorted(r for r, _ in provider.delivered), ['knp-1', 'lko-1'])
+
+    def test_rate_limit_paces_batches(self):
+        """Test batches to a provider are held to its per-second limit"""
+        provider = LocalProvider(batch_size=1, batches_per_second=2)
+        dispatcher = AlertDispatcher([provider])
+
+        started = time.monotonic()
+        result = dispatcher.dispatch('rate-test', {'en': ['a', 'b', 'c', 'd']}, MESSAGES)
+
+        self.assertEqual(result['sent'], 4)
+        self.assertGreaterEqual(time.monotonic() - started, 0.9)
+
+    def test_weather_rules_target_tiles_in_language(self):
+        """Test a rule firing on one tile reaches only that tile, in each user's language"""
+        provider = LocalProvider()
+        tiles = [tile_of(26.85, 80.95), tile_of(26.45, 80.33)]
+        observations = {'precipitation_mm': np.array([80.0, 5.0]), 'temperature_max_c': np.array([38.0, np.nan])}
+
+        results = fan_out_weather_alerts(self.index, observations, tiles, AlertDispatcher([provider]))
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]['alert_id'].startswith('weather:heavy_rain:'))
+        titles = dict((recipient, message['title']) for recipient, message in provider.delivered)
+        self.assertEqual(sorted(titles), ['lko-1', 'lko-2', 'pune-1'])
+        self.assertEqual(titles['lko-2'], 'भारी बारिश चेतावनी')
+
+    def test_price_moves_reach_nearby_farmers(self):
+        """Test price alerts go to farmers within the rule radius of the mandi"""
+        provider = LocalProvider()
+        moves = [
+            {'commodity': 'wheat', 'mandi': 'Kanpur', 'state': 'Uttar Pradesh', 'latitude': 26.45,
+             'longitude': 80.33, 'price': 2100.0, 'change_percent': -12.5},
+            {'commodity': 'onion', 'mandi': 'Pune', 'state': 'Maharashtra', 'latitude': 18.52,
+             'longitude': 73.86, 'price': 1500.0, 'change_percent': 3.0},
+        ]
+
+        results = fan_out_price_alerts(moves, self.index, AlertDispatcher([provider]))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual([recipient for recipient, _ in provider.delivered], ['knp-1'])
+        self.assertIn('12%', provider.delivered[0][1]['body'])
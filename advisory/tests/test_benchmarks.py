@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Benchmark Harness and Upstream Fixture Server
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.test import SimpleTestCase
+
+from ..benchmarks.fixture_server import FixtureServer, route_upstreams
+from ..benchmarks.harness import benchmark, compare_results, get_benchmarks, run_benchmark
+from ..benchmarks.loadgen import LoadGenerator, endpoint_of, load_trace, parse_mix, synthetic_requests
+
+
+class FixtureServerTests(SimpleTestCase):
+    """Test cases for recorded upstream replay"""
+
+    def test_replays_recorded_nominatim_response(self):
+        """Test upstream calls are answered from the recorded fixtures"""
+        with FixtureServer() as server, route_upstreams(server):
+            response = requests.get(
+                'https://nominatim.openstreetmap.org/search',
+                params={'q': 'Pune, India', 'format': 'json', 'limit': 1}, timeout=5
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['name'], 'Pune')
+        self.assertEqual(server.stats['nominatim.openstreetmap.org']['hits'], 1)
+
+    def test_unrecorded_request_returns_404(self):
+        """Test requests without a recording never reach the network"""
+        with FixtureServer() as server, route_upstreams(server):
+            response = requests.get('https://example.invalid/anything', timeout=5)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(server.stats['example.invalid']['misses'], 1)
+
+    def test_configurable_latency(self):
+        """Test replayed responses are delayed by the configured latency"""
+        with FixtureServer(latency_ms=50) as server, route_upstreams(server):
+            start = time.perf_counter()
+            requests.get('https://mausam.imd.gov.in/api/weather', timeout=5)
+            elapsed = time.perf_counter() - start
+        self.assertGreaterEqual(elapsed, 0.05)
+
+
+class HarnessTests(SimpleTestCase):
+    """Test cases for timing and regression detection"""
+
+    def test_run_benchmark_reports_statistics(self):
+        """Test a registered benchmark produces timing statistics"""
+        @benchmark('test_sum', iterations=20, warmup=1)
+        def bench_sum():
+            return lambda: sum(range(100))
+
+        result = run_benchmark('test_sum')
+        self.assertIn('test_sum', get_benchmarks())
+        self.assertEqual(result['iterations'], 20)
+        self.assertLessEqual(result['min_ms'], result['median_ms'])
+        self.assertLessEqual(result['median_ms'], result['max_ms'])
+
+    def test_compare_results_flags_regressions(self):
+        """Test slowdowns over the threshold are flagged"""
+        baseline = {'results': {'a': {'median_ms': 1.0}, 'b': {'median_ms': 2.0}}}
+        current = {'results': {'a': {'median_ms': 1.05}, 'b': {'median_ms': 2.5}}}
+
+        comparison = {entry['name']: entry for entry in compare_results(current, baseline, threshold=0.10)}
+
+        self.assertFalse(comparison['a']['regression'])
+        self.assertTrue(comparison['b']['regression'])
+        self.assertEqual(comparison['b']['change'], 0.25)
+
+
+class _StubAPIHandler(BaseHTTPRequestHandler):
+    """Answers 429 for weather, 500 for forum and 200 for everything else"""
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        status = {'/api/weather/': 429, '/api/forum/': 500}.get(self.path.split('?')[0], 200)
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LoadGeneratorTests(SimpleTestCase):
+    """Test cases for trace replay and load reporting"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StubAPIHandler)
+        cls.httpd.daemon_threads = True
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+        cls.base_url = 'http://127.0.0.1:%d' % cls.httpd.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+        super().tearDownClass()
+
+    def test_endpoint_names(self):
+        """Test endpoint names are derived from API paths"""
+        self.assertEqual(endpoint_of('/api/market-prices/?location=Delhi'), 'market-prices')
+        self.assertEqual(endpoint_of('/api/locations/search/'), 'locations')
+
+    def test_parse_mix_rejects_unknown_endpoints(self):
+        """Test endpoint weights are validated"""
+        self.assertEqual(parse_mix('chatbot=3,weather=1'), {'chatbot': 3.0, 'weather': 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix('unknown=1')
+
+    def test_load_trace_skips_non_api_lines(self):
+        """Test trace loading keeps only API calls"""
+        lines = [
+            {'method': 'GET', 'path': '/api/weather/', 'params': {'location': 'Pune'}},
+            {'request_id': 'user-029', 'title': 'not an API call'},
+            {'path': '/api/chatbot/', 'json': {'query': 'hi'}},
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            f.write('\n'.join(json.dumps(line) for line in lines))
+        try:
+            entries = load_trace(f.name)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[1]['method'], 'POST')
+
+    def test_closed_loop_report(self):
+        """Test per-endpoint counts, errors and rate-limit hits are reported"""
+        source = iter([
+            {'method': 'GET', 'path': '/api/weather/'},
+            {'method': 'GET', 'path': '/api/forum/'},
+            {'method': 'POST', 'path': '/api/chatbot/', 'json': {'query': 'hi'}},
+            {'method': 'POST', 'path': '/api/chatbot/', 'json': {'query': 'hello'}},
+        ])
+        report = LoadGenerator(self.base_url, concurrency=2, total_requests=10).run(source)
+
+        self.assertEqual(report['mode'], 'closed-loop')
+        self.assertEqual(report['overall']['requests'], 4)
+        self.assertEqual(report['endpoints']['weather']['rate_limited'], 1)
+        self.assertEqual(report['endpoints']['weather']['errors'], 0)
+        self.assertEqual(report['endpoints']['forum']['errors'], 1)
+        self.assertEqual(report['endpoints']['chatbot']['requests'], 2)
+        self.assertIn('p99_ms', report['overall'])
+
+    def test_open_loop_synthetic_mix(self):
+        """Test open-loop arrivals stop at the request budget"""
+        generator = LoadGenerator(self.base_url, concurrency=4, rate=200, total_requests=20, seed=1)
+        report = generator.run(synthetic_requests({'chatbot': 1, 'market-prices': 1}, seed=1))
+
+        self.assertEqual(report['mode'], 'open-loop')
+        self.assertEqual(report['overall']['requests'], 20)
+        self.assertLessEqual(set(report['endpoints']), {'chatbot', 'market-prices'})
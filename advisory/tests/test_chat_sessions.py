@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Chat Session State Store
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, override_settings
+
+from ..cache_utils import shared_cache
+from ..ml.conversational_chatbot import ConversationalAgriculturalChatbot
+from ..models import ChatSession
+from ..services import chat_sessions
+from ..services.chat_sessions import SessionStateStore
+from .cache_settings import clear_caches, locmem_caches
+
+
+@override_settings(CACHES=locmem_caches('chat-sessions'))
+class SessionStateStoreTests(TestCase):
+    """Test cases for bounded, shared and persisted session state"""
+
+    def setUp(self):
+        clear_caches()
+
+    def test_sessions_are_isolated(self):
+        """Test each session sees only its own changes"""
+        store = SessionStateStore()
+        store.update('farmer-a', last_lat=19.99, last_place='Nashik')
+        store.update('farmer-b', last_lat=30.90, last_place='Ludhiana')
+        self.assertEqual(store.get('farmer-a')['last_place'], 'Nashik')
+        self.assertEqual(store.get('farmer-b')['last_lat'], 30.90)
+        with store.session(None) as anonymous:
+            self.assertIsNone(anonymous['last_lat'])
+
+    def test_lru_and_ttl_bound_memory(self):
+        """Test the oldest sessions are evicted and persisted, and idle ones expire"""
+        store = SessionStateStore(max_sessions=2, shared_cache=False, persist_seconds=3600)
+        for i in range(3):
+            store.update(f's{i}', last_product=f'crop{i}')
+        self.assertEqual(len(store), 2)
+        self.assertEqual(ChatSession.objects.get(session_id='s0').conversation_context['last_product'], 'crop0')
+        self.assertEqual(store.get('s0')['last_product'], 'crop0')
+
+        expiring = SessionStateStore(ttl=0, shared_cache=False)
+        expiring.update('s', last_product='onion')
+        expiring.get('other')
+        self.assertNotIn('s', expiring._entries)
+
+    def test_persistence_is_lazy(self):
+        """Test the database is written on the first change and then only when due"""
+        store = SessionStateStore(persist_seconds=3600)
+        store.update('s1', last_lat=28.6, last_lon=77.2, last_place='Delhi')
+        row = ChatSession.objects.get(session_id='s1')
+        self.assertEqual((row.latitude, row.longitude, row.location_name), (28.6, 77.2, 'Delhi'))
+
+        store.update('s1', last_place='Noida')
+        self.assertEqual(ChatSession.objects.get(session_id='s1').location_name, 'Delhi')
+        store.flush()
+        self.assertEqual(ChatSession.objects.get(session_id='s1').location_name, 'Noida')
+
+        clear_caches()
+        self.assertEqual(SessionStateStore().get('s1')['last_place'], 'Noida')
+
+    def test_shared_cache_carries_sessions_across_workers(self):
+        """Test a second worker continues the conversation and the first sees its update"""
+        worker_a, worker_b = SessionStateStore(), SessionStateStore()
+        worker_a.update('s1', last_product='Wheat')
+        self.assertEqual(worker_b.get('s1')['last_product'], 'Wheat')
+        worker_b.update('s1', last_product='Rice')
+        self.assertEqual(worker_a.get('s1')['last_product'], 'Rice')
+
+    def test_shared_copy_wins_after_it_was_evicted(self):
+        """Test a worker with more local turns still picks up another worker's later turn"""
+        worker_a, worker_b = SessionStateStore(persist_seconds=3600), SessionStateStore()
+        for product in ('Wheat', 'Maize', 'Onion'):
+            worker_a.update('s1', last_product=product)
+        shared_cache.clear()
+        self.assertEqual(worker_b.get('s1')['last_product'], 'Wheat')
+        worker_b.update('s1', last_product='Rice')
+        self.assertEqual(worker_a.get('s1')['last_product'], 'Rice')
+
+    def test_concurrent_turns_do_not_lose_updates(self):
+        """Test turns of one session are serialized"""
+        store = SessionStateStore(shared_cache=False, persist_seconds=3600)
+
+        def turns():
+            for _ in range(50):
+                with store.session('busy') as state:
+                    state['turns'] = state.get('turns', 0) + 1
+
+        threads = [threading.Thread(target=turns) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.get('busy')['turns'], 400)
+
+
+class SessionStateProjectCacheTests(TestCase):
+    """Test session state under the project's real CACHES reaches every worker"""
+
+    def test_state_is_shared_between_workers(self):
+        """Test the write-through store is not per-process"""
+        self.assertNotIsInstance(caches['shared'], (LocMemCache, DummyCache))
+        SessionStateStore(persist_seconds=3600).update('s1', last_place='Nashik', last_lat=19.99)
+        # A fresh connection to the alias stands in for another worker's process
+        other_worker = caches.create_connection('shared')
+        self.assertEqual(other_worker.get('chat_state:s1')['last_place'], 'Nashik')
+        ChatSession.objects.all().delete()
+        self.assertEqual(SessionStateStore().get('s1')['last_lat'], 19.99)
+
+
+@override_settings(CACHES=locmem_caches('chat-sessions'))
+class ChatbotSessionContextTests(TestCase):
+    """Test cases for the chatbot reading context from the session store"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.chatbot = ConversationalAgriculturalChatbot()
+
+    def setUp(self):
+        clear_caches()
+        chat_sessions.reset_session_store(SessionStateStore(persist_seconds=3600))
+        self.seen = []
+        patcher = patch.object(ConversationalAgriculturalChatbot, '_generate_response', side_effect=self._answer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(chat_sessions.reset_session_store)
+
+    def _answer(self, query, language):
+        context = self.chatbot.conversation_context
+        self.seen.append((context['last_lat'], context['last_lon'], context['last_place']))
+        return 'ok'
+
+    def test_locations_stay_with_their_session(self):
+        """Test one farmer's place never leaks into another's turn"""
+        nominatim = Mock(ok=True)
+        nominatim.json.return_value = [{'lat': '18.52', 'lon': '73.86'}]
+        with patch('advisory.ml.conversational_chatbot.requests.get', return_value=nominatim) as geocoder:
+            self.chatbot.get_response('weather in Pune', session_id='a')
+            self.chatbot.get_response('wheat price', session_id='b')
+            self.chatbot.get_response('rain tomorrow in Pune', session_id='a')
+            self.chatbot.get_response('mandi rates in Pune', session_id='c')
+            self.chatbot.get_response('soil test', session_id='a')
+        self.assertEqual(geocoder.call_count, 1)
+        self.assertEqual(self.seen, [(18.52, 73.86, 'pune'), (None, None, None), (18.52, 73.86, 'pune'),
+                                     (18.52, 73.86, 'pune'), (18.52, 73.86, 'pune')])
+        self.assertEqual(chat_sessions.get_session_store().get('a')['places'], {'pune': [18.52, 73.86]})
+        self.assertIsNone(self.chatbot._default_context['last_lat'])
+
+    def test_turns_survive_a_shared_cache_outage(self):
+        """Test a missing cache table leaves each session on this worker's own state"""
+        broken = dict(settings.CACHES, shared={'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                                               'LOCATION': 'missing_cache_table'})
+        nominatim = Mock(ok=True)
+        nominatim.json.return_value = [{'lat': '18.52', 'lon': '73.86'}]
+        with override_settings(CACHES=broken), \
+                patch('advisory.ml.conversational_chatbot.requests.get', return_value=nominatim):
+            self.chatbot.get_response('weather in Pune', session_id='a')
+            self.chatbot.get_response('soil test', session_id='a')
+        self.assertEqual(self.seen[-1], (18.52, 73.86, 'pune'))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Dataset Versions and Conditional GET
+"""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils.http import http_date
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from ..api.conditional import versioned_response
+from ..api.views import CropViewSet, GovernmentSchemesViewSet, RealTimeGovernmentDataViewSet
+from ..services import data_versions
+from ..services.data_versions import combined_version, dataset_version
+
+
+class DataVersionTests(SimpleTestCase):
+    """Test cases for dataset version hashes"""
+
+    def test_static_datasets_are_stable(self):
+        """Test static datasets hash once and combine deterministically"""
+        version = dataset_version('government_schemes')
+        self.assertRegex(version['version'], r'^[0-9a-f]{16}$')
+        self.assertIs(dataset_version('government_schemes'), version)
+
+        schemes = combined_version(['government_schemes'])
+        self.assertEqual(combined_version(['government_schemes']), schemes)
+        self.assertNotEqual(combined_version(['government_schemes'], salt='v2')['version'], schemes['version'])
+
+
+class ConditionalGetTests(SimpleTestCase):
+    """Test cases for ETag validation on versioned endpoints"""
+
+    def _schemes(self, **headers):
+        view = GovernmentSchemesViewSet.as_view({'get': 'list'})
+        return view(APIRequestFactory().get('/api/government-schemes/', {'location': 'Punjab'}, **headers))
+
+    def test_revalidation_skips_payload(self):
+        """Test a matching If-None-Match returns 304 without building the payload"""
+        first = self._schemes()
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['Cache-Control'].startswith('public, max-age='))
+        self.assertIn('Last-Modified', first)
+        etag = first['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+
+        with patch.object(GovernmentSchemesViewSet, '_get_location_specific_schemes') as build:
+            revalidated = self._schemes(HTTP_IF_NONE_MATCH=etag)
+            strong = self._schemes(HTTP_IF_NONE_MATCH=f'"other", {etag[2:]}')
+        build.assert_not_called()
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated['ETag'], etag)
+        self.assertEqual(strong.status_code, 304)
+
+        self.assertEqual(self._schemes(HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_if_modified_since_and_new_versions(self):
+        """Test Last-Modified validation and that a new dataset version misses"""
+        first = self._schemes()
+        self.assertEqual(self._schemes(HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 304)
+        self.assertEqual(self._schemes(HTTP_IF_MODIFIED_SINCE=http_date(0)).status_code, 200)
+
+        data_versions.register_dataset('government_schemes', lambda: {
+            'version': 'changed', 'last_modified': data_versions._EPOCH}, static=True)
+        try:
+            self.assertEqual(self._schemes(HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+        finally:
+            data_versions.register_dataset('government_schemes', data_versions._government_schemes, static=True)
+
+    def test_etags_differ_per_endpoint(self):
+        """Test endpoints over the same datasets do not share validators"""
+        class Probe(viewsets.ViewSet):
+            @versioned_response('government_schemes')
+            def list(self, request):
+                return Response({})
+
+        probe = Probe.as_view({'get': 'list'})(APIRequestFactory().get('/api/probe/'))
+        self.assertEqual(probe.status_code, 200)
+        self.assertNotEqual(probe['ETag'], self._schemes()['ETag'])
+
+    def test_live_endpoints_are_not_versioned(self):
+        """Test endpoints carrying live market data get no validators or shared-cache headers"""
+        factory = APIRequestFactory()
+        context = {'location': 'Pune', 'market': {'top_crops': [{'name': 'Wheat', 'price': 2400, 'trend': 'up'}]}}
+        with patch('advisory.services.ultra_dynamic_government_api.UltraDynamicGovernmentAPI'
+                   '.get_comprehensive_government_data', return_value=context) as gov_data:
+            crops = CropViewSet.as_view({'get': 'list'})(factory.get('/api/crops/', {'crop': 'wheat', 'location': 'Pune'}))
+        gov_data.assert_called_once_with('Pune')
+        self.assertEqual(crops.status_code, 200)
+        self.assertEqual(crops.data['crop_info']['price'], 2400)
+
+        with patch('advisory.services.ultra_dynamic_government_api.UltraDynamicGovernmentAPI._fetch_market_prices',
+                   return_value=None):
+            mandis = RealTimeGovernmentDataViewSet.as_view({'get': 'mandi_search'})(
+                factory.get('/api/realtime-gov/mandi_search/', {'location': 'Pune'}))
+        self.assertEqual(mandis.status_code, 200)
+        for response in (crops, mandis):
+            self.assertFalse(response.has_header('ETag'))
+            self.assertFalse(response.has_header('Cache-Control'))
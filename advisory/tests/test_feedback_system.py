@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Feedback Analytics System
+Tests daily rollups and the analytics built on top of them
+"""
+
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+import json
+import os
+import tempfile
+
+from ..models import UserFeedback, FeedbackDailyRollup
+from ..feedback_system import FeedbackAnalytics, estimate_distinct, merge_sketches, user_sketch
+
+
+class FeedbackAnalyticsTests(TestCase):
+    """Test cases for FeedbackAnalytics"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.analytics = FeedbackAnalytics()
+        self.base = {
+            'session_id': 'session1',
+            'input_data': {},
+            'system_prediction': {},
+            'actual_result': {},
+        }
+
+    def _create(self, user_id, prediction_type, rating, days_ago=0, **extra):
+        feedback = UserFeedback.objects.create(
+            user_id=user_id, prediction_type=prediction_type,
+            feedback_rating=rating, **self.base, **extra
+        )
+        if days_ago:
+            UserFeedback.objects.filter(id=feedback.id).update(
+                created_at=timezone.now() - timedelta(days=days_ago)
+            )
+        return feedback
+
+    def test_refresh_daily_rollups(self):
+        """Test rollups group feedback by day and prediction type"""
+        self._create('u1', 'crop_recommendation', 5, days_ago=3, latitude=28.7, longitude=77.1)
+        self._create('u2', 'crop_recommendation', 2, days_ago=3, feedback_text='wrong crop')
+        self._create('u1', 'yield_prediction', 4, days_ago=1)
+
+        written = self.analytics.refresh_daily_rollups()
+        self.assertEqual(written, 2)
+
+        rollup = FeedbackDailyRollup.objects.get(prediction_type='crop_recommendation')
+        self.assertEqual(rollup.total_count, 2)
+        self.assertEqual(rollup.rating_sum, 7)
+        self.assertEqual(rollup.rating_5_count, 1)
+        self.assertEqual(rollup.rating_2_count, 1)
+        self.assertEqual(rollup.with_text_count, 1)
+        self.assertEqual(rollup.geo_count, 1)
+        self.assertEqual(estimate_distinct(rollup.user_sketch), 2)
+
+    def test_refresh_is_incremental(self):
+        """Test a second refresh only rewrites the latest day onwards"""
+        self._create('u1', 'crop_recommendation', 5, days_ago=3)
+        self.analytics.refresh_daily_rollups()
+        self._create('u2', 'crop_recommendation', 3, days_ago=1)
+
+        written = self.analytics.refresh_daily_rollups()
+        self.assertEqual(written, 2)
+        self.assertEqual(FeedbackDailyRollup.objects.count(), 2)
+
+    def test_feedback_analytics_combines_rollups_and_today(self):
+        """Test analytics read rolled-up days plus live counts for today"""
+        self._create('u1', 'crop_recommendation', 5, days_ago=10)
+        self._create('u2', 'yield_prediction', 1, days_ago=2)
+        self.analytics.refresh_daily_rollups()
+        self._create('u3', 'crop_recommendation', 3)
+
+        analytics = self.analytics.get_feedback_analytics(days=30)
+
+        self.assertEqual(analytics['total_feedback'], 3)
+        self.assertEqual(analytics['average_rating'], 3.0)
+        self.assertEqual(analytics['rating_distribution'], {1: 1, 2: 0, 3: 1, 4: 0, 5: 1})
+        self.assertEqual(analytics['prediction_types'], {'crop_recommendation': 2, 'yield_prediction': 1})
+        self.assertEqual(analytics['recent_trend_7_days'], 2)
+        self.assertIn('feedback_quality', analytics)
+
+    def test_analytics_refresh_missing_days_on_read(self):
+        """Test past days show up without the scheduled rollup task having run"""
+        self._create('u1', 'crop_recommendation', 4, days_ago=5)
+        self._create('u1', 'crop_recommendation', 2, days_ago=1)
+        self._create('u1', 'yield_prediction', 5)
+
+        analytics = self.analytics.get_feedback_analytics(days=30)
+
+        self.assertEqual(analytics['total_feedback'], 3)
+        self.assertEqual(analytics['recent_trend_7_days'], 3)
+        self.assertTrue(FeedbackDailyRollup.objects.exists())
+
+    def test_unique_users_are_distinct_over_the_period(self):
+        """Test a user active on several days and types is counted once"""
+        self._create('u1', 'crop_recommendation', 4, days_ago=3)
+        self._create('u1', 'yield_prediction', 4, days_ago=2)
+        self._create('u1', 'crop_recommendation', 4)
+        self._create('u2', 'crop_recommendation', 4)
+        self.analytics.refresh_daily_rollups()
+
+        analytics = self.analytics.get_feedback_analytics(days=30)
+
+        self.assertEqual(analytics['unique_users'], 2)
+        self.assertEqual(analytics['avg_feedback_per_user'], 2.0)
+
+    def test_user_sketches_merge_within_a_few_percent(self):
+        """Test sketches of overlapping days merge to the distinct count of their union"""
+        days = [user_sketch(f'farmer-{i}' for i in range(start, start + 3000)) for start in range(0, 9000, 1500)]
+        self.assertEqual(estimate_distinct(merge_sketches(days[:1])), estimate_distinct(days[0]))
+        self.assertAlmostEqual(estimate_distinct(merge_sketches(days)), 10500, delta=10500 * 0.08)
+        self.assertEqual(estimate_distinct(user_sketch(['u1', 'u2', 'u1'])), 2)
+        self.assertEqual(estimate_distinct(b''), 0)
+
+    def test_feedback_analytics_empty(self):
+        """Test analytics without feedback"""
+        analytics = self.analytics.get_feedback_analytics()
+        self.assertEqual(analytics, {'message': 'No feedback data available'})
+
+    def test_prediction_accuracy(self):
+        """Test accuracy metrics are computed from the rollups"""
+        self._create('u1', 'crop_recommendation', 5, days_ago=2)
+        self._create('u2', 'crop_recommendation', 3, days_ago=2)
+        self._create('u3', 'crop_recommendation', 1, days_ago=2, feedback_text='Wrong crop suggested')
+        self.analytics.refresh_daily_rollups()
+
+        accuracy = self.analytics.get_prediction_accuracy('crop_recommendation')
+
+        self.assertEqual(accuracy['total_predictions'], 3)
+        self.assertEqual(accuracy['high_ratings'], 1)
+        self.assertEqual(accuracy['medium_ratings'], 1)
+        self.assertEqual(accuracy['low_ratings'], 1)
+        self.assertEqual(accuracy['accuracy_score'], 0.5)
+        self.assertEqual(accuracy['common_issues'], ['inaccurate'])
+
+    def test_export_feedback_data(self):
+        """Test JSON export streams every row into a valid document"""
+        self._create('u1', 'crop_recommendation', 4)
+        self._create('u2', 'yield_prediction', 2)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                filepath = self.analytics.export_feedback_data()
+                with open(filepath) as f:
+                    data = json.load(f)
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(len(data), 2)
+        self.assertEqual({row['user_id'] for row in data}, {'u1', 'u2'})
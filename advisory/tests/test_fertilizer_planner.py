@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Least-Cost Fertilizer Planner
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from ..api.views import CropAdvisoryViewSet
+from ..cache_utils import FALLBACK_FERTILIZER_PRICES
+from ..ml.fertilizer_planner import FertilizerPlanner, get_fertilizer_planner
+from ..ml.fertilizer_recommendations import FertilizerRecommendationEngine
+from .cache_settings import locmem_caches
+
+CROPS = ['wheat', 'rice', 'maize', 'sugarcane', 'cotton', 'tomato']
+SOILS = ['loamy', 'clayey', 'sandy', 'silty']
+SEASONS = ['kharif', 'rabi', 'zaid']
+
+
+def village(n, seed=7):
+    rng = np.random.default_rng(seed)
+    return [{'field_id': f'F{i}', 'crop': CROPS[rng.integers(6)], 'soil_type': SOILS[rng.integers(4)],
+             'season': SEASONS[rng.integers(3)], 'area_hectares': round(float(rng.uniform(0.2, 4)), 2)}
+            for i in range(n)]
+
+
+@override_settings(CACHES=locmem_caches('fertilizer'))
+class FertilizerPlannerTests(SimpleTestCase):
+    """Test cases for batch nutrient needs and least-cost product mixes"""
+
+    def setUp(self):
+        cache.clear()
+        self.engine = FertilizerRecommendationEngine()
+
+    def test_straight_fertilizers_match_the_hand_calculation(self):
+        """Test the classic DAP, then urea, then MOP calculation is reproduced exactly"""
+        planner = FertilizerPlanner(self.engine, FALLBACK_FERTILIZER_PRICES, products=['urea', 'dap', 'mop'])
+        plan = planner.plan([{'crop': 'wheat', 'soil_type': 'loamy', 'season': 'kharif', 'area_hectares': 2}])
+        field = plan['fields'][0]
+        self.assertEqual(field['nutrient_requirements'], {'nitrogen': 264.0, 'phosphorus': 120.0, 'potassium': 80.0})
+        dap = 120 / 0.46
+        urea = (264 - 0.18 * dap) / 0.46
+        mop = 80 / 0.60
+        kg = {p['product']: p['kg'] for p in field['products']}
+        self.assertEqual(kg, {'urea': round(urea, 2), 'dap': round(dap, 2), 'mop': round(mop, 2)})
+        self.assertAlmostEqual(field['total_cost'], urea / 50 * 242 + dap / 50 * 1350 + mop / 50 * 1750, places=2)
+
+    def test_mixes_cover_needs_at_no_more_than_straight_fertilizers(self):
+        """Test every field's needs are met and complex grades are used only when cheaper"""
+        fields = village(300)
+        full = FertilizerPlanner(self.engine, FALLBACK_FERTILIZER_PRICES).plan(fields)
+        straight = FertilizerPlanner(self.engine, FALLBACK_FERTILIZER_PRICES, products=['urea', 'dap', 'mop']).plan(fields)
+        for mixed, simple in zip(full['fields'], straight['fields']):
+            for nutrient, need in mixed['nutrient_requirements'].items():
+                self.assertGreaterEqual(mixed['nutrients_supplied'][nutrient], need - 0.01)
+            self.assertLessEqual(mixed['total_cost'], simple['total_cost'] + 0.01)
+        self.assertLess(full['totals']['total_cost'], straight['totals']['total_cost'])
+
+    def test_batch_plan_matches_single_field_plans(self):
+        """Test the vectorized solve gives each field the same plan as planning it alone"""
+        fields = village(200, seed=3)
+        planner = get_fertilizer_planner()
+        batch = planner.plan(fields)
+        for i in (0, 57, 199):
+            alone = planner.plan([fields[i]])['fields'][0]
+            self.assertEqual(batch['fields'][i]['products'], alone['products'])
+            self.assertEqual(batch['fields'][i]['total_cost'], alone['total_cost'])
+        self.assertAlmostEqual(batch['totals']['total_cost'], sum(f['total_cost'] for f in batch['fields']), places=1)
+        self.assertAlmostEqual(batch['totals']['area_hectares'], sum(f['area_hectares'] for f in fields), places=2)
+
+    def test_bad_fields_are_reported_and_the_rest_planned(self):
+        """Test unknown crops and invalid areas do not sink the village plan"""
+        plan = get_fertilizer_planner().plan([{'crop': 'mango'}, {'crop': 'rice', 'area_hectares': 'two'},
+                                              {'field_id': 'ok', 'crop': 'Rice', 'soil_type': 'peat'}])
+        self.assertEqual([e['index'] for e in plan['errors']], [0, 1])
+        self.assertEqual(plan['fields'][0]['field_id'], 'ok')
+        self.assertEqual(plan['fields'][0]['soil_type'], 'loamy')
+
+    def test_prices_come_from_the_prewarmed_cache(self):
+        """Test a changed price list rebuilds the planner and shifts the mix"""
+        field = [{'crop': 'wheat', 'soil_type': 'sandy', 'season': 'rabi'}]
+        before = get_fertilizer_planner()
+        urea_before = {p['product']: p['kg'] for p in before.plan(field)['fields'][0]['products']}.get('urea', 0)
+
+        cache.set('fallback:fertilizer_prices', {'urea': {'price': 5000, 'unit': '45kg bag', 'subsidy': 0}})
+        after = get_fertilizer_planner()
+        self.assertIsNot(after, before)
+        self.assertEqual(after.plan(field)['prices']['urea'], {'price': 5000.0, 'bag_kg': 45.0})
+        urea_after = {p['product']: p['kg'] for p in after.plan(field)['fields'][0]['products']}.get('urea', 0)
+        self.assertLess(urea_after, urea_before)
+
+    def test_single_recommendation_costs_the_least_cost_mix(self):
+        """Test get_fertilizer_recommendation prices the optimal products, not nutrient totals"""
+        recommendation = self.engine.get_fertilizer_recommendation('wheat', 'sandy', 'rabi', 1.5)
+        plan = self.engine.plan_fields([{'crop': 'wheat', 'soil_type': 'sandy', 'season': 'rabi',
+                                         'area_hectares': 1.5}])
+        self.assertEqual(recommendation['cost_estimation']['total_cost'], plan['fields'][0]['total_cost'])
+        self.assertEqual(set(recommendation['cost_estimation']['cost_breakdown']),
+                         {p['product'] for p in plan['fields'][0]['products']})
+
+    def test_fertilizer_plan_endpoint(self):
+        """Test the endpoint plans a village and rejects malformed bodies"""
+        view = CropAdvisoryViewSet.as_view({'post': 'fertilizer_plan'})
+        factory = APIRequestFactory()
+        response = view(factory.post('/api/advisories/fertilizer-plan/', {'fields': village(50)}, format='json'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals']['fields'], 50)
+
+        response = view(factory.post('/api/advisories/fertilizer-plan/', {'fields': 'wheat'}, format='json'))
+        self.assertEqual(response.status_code, 400)
+        response = view(factory.post('/api/advisories/fertilizer-plan/',
+                                     {'fields': village(1), 'products': ['urea']}, format='json'))
+        self.assertEqual(response.status_code, 400)
+        for products in ([{'name': 'urea'}], [['urea']], ['urea', 'gypsum'], 'urea'):
+            response = view(factory.post('/api/advisories/fertilizer-plan/',
+                                         {'fields': village(1), 'products': products}, format='json'))
+            self.assertEqual(response.status_code, 400, products)
+        self.assertIn('gypsum', view(factory.post('/api/advisories/fertilizer-plan/',
+                                                  {'fields': village(1), 'products': ['gypsum']},
+                                                  format='json')).data['error'])
+
+    def test_plan_fields_reuses_the_cached_planner(self):
+        """Test the engine's batch entry point does not rebuild the planner per call"""
+        field = [{'crop': 'rice', 'soil_type': 'clayey', 'season': 'kharif'}]
+        with patch('advisory.ml.fertilizer_planner.FertilizerPlanner', wraps=FertilizerPlanner) as built:
+            for products in (['dap', 'urea', 'mop'], ['urea', 'mop', 'dap'], ['mop', 'dap', 'urea']):
+                self.engine.plan_fields(field, products=products)
+        self.assertLessEqual(built.call_count, 1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Micro-batching Image Inference Server
+Images are synthetic arrays, so neither Pillow nor a model file is needed
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+from sklearn.linear_model import LogisticRegression
+
+from ..ml import image_inference
+from ..ml.image_inference import InferenceServer, SklearnFeatureBackend, image_features, preprocess
+from ..services.krishi_raksha_pest_service import KrishiRakshaPestService
+
+
+def _leaf(rgb, size=32, noise=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    image = np.clip(np.array(rgb, dtype=np.float32) + rng.normal(0, noise, (size, size, 3)), 0, 1)
+    return (image * 255).astype(np.uint8)
+
+
+class CountingBackend:
+    """Fixed per-call cost plus a small per-image cost, like a CPU network"""
+
+    labels = ['healthy', 'diseased']
+
+    def __init__(self, call_cost=0.02):
+        self.call_cost = call_cost
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def predict(self, batch):
+        with self._lock:
+            self.batch_sizes.append(len(batch))
+        time.sleep(self.call_cost + 0.0005 * len(batch))
+        diseased = (batch[..., 0].mean(axis=(1, 2)) > 0.5).astype(np.float32)
+        return np.stack([1 - diseased, diseased], axis=1)
+
+
+class ImageInferenceTests(SimpleTestCase):
+    """Test cases for batching, preprocessing and backends"""
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(IMAGE_MODEL_DIR=self.model_dir)
+        self.settings_override.enable()
+        image_inference._servers.clear()
+
+    def tearDown(self):
+        image_inference._servers.clear()
+        self.settings_override.disable()
+        shutil.rmtree(self.model_dir, ignore_errors=True)
+
+    def test_concurrent_requests_share_batches(self):
+        """Test concurrent submissions are grouped and answered individually"""
+        backend = CountingBackend()
+        server = InferenceServer('test', backend, max_batch_size=8, max_wait_ms=20, preprocess_fn=lambda x: x)
+        images = [np.full((8, 8, 3), 0.9 if i % 2 else 0.1, dtype=np.float32) for i in range(32)]
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(server.predict, images))
+
+        self.assertEqual([r['label'] for r in results], ['healthy', 'diseased'] * 16)
+        self.assertLess(len(backend.batch_sizes), 32)
+        self.assertLessEqual(max(backend.batch_sizes), 8)
+        self.assertGreater(server.stats()['mean_batch_size'], 1)
+
+    def test_lone_request_waits_at_most_max_wait(self):
+        """Test a single request is flushed after the wait bound"""
+        backend = CountingBackend(call_cost=0)
+        server = InferenceServer('test', backend, max_batch_size=64, max_wait_ms=20, preprocess_fn=lambda x: x)
+
+        started = time.monotonic()
+        result = server.predict(np.zeros((4, 4, 3), dtype=np.float32))
+
+        self.assertEqual(result['label'], 'healthy')
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(backend.batch_sizes, [1])
+
+    def test_errors_reach_only_their_futures(self):
+        """Test preprocessing errors fail one request and backend errors fail the batch"""
+        class FailingBackend:
+            labels = ['a']
+
+            def predict(self, batch):
+                raise RuntimeError('model crashed')
+
+        server = InferenceServer('test', CountingBackend(call_cost=0), preprocess_fn=lambda x: x / x.shape[2])
+        with self.assertRaises(Exception):
+            server.predict(np.zeros(3, dtype=np.float32))
+        self.assertEqual(server.predict(np.zeros((4, 4, 3), dtype=np.float32))['label'], 'healthy')
+
+        failing = InferenceServer('failing', FailingBackend(), preprocess_fn=lambda x: x)
+        with self.assertRaises(RuntimeError):
+            failing.predict(np.zeros((4, 4, 3), dtype=np.float32))
+
+    def test_preprocess_and_features(self):
+        """Test resizing, scaling and the batched feature extractor"""
+        array = preprocess(_leaf((0.2, 0.7, 0.2), size=50), size=(16, 16))
+        self.assertEqual(array.shape, (16, 16, 3))
+        self.assertLessEqual(array.max(), 1.0)
+
+        features = image_features(np.stack([array, array[::-1]]))
+        self.assertEqual(features.shape, (2, 3 + 3 + 24 + 2))
+        np.testing.assert_allclose(features[:, 6:30].reshape(2, 3, 8).sum(axis=2), 1.0, rtol=1e-5)
+
+    def test_sklearn_model_from_model_dir(self):
+        """Test a joblib model in IMAGE_MODEL_DIR is served and drives the specialist head"""
+        healthy = [preprocess(_leaf((0.2, 0.7, 0.2), seed=i), size=(32, 32)) for i in range(10)]
+        blighted = [preprocess(_leaf((0.45, 0.3, 0.1), seed=i), size=(32, 32)) for i in range(10)]
+        model = LogisticRegression(max_iter=500).fit(
+            image_features(np.stack(healthy + blighted)), [0] * 10 + [1] * 10)
+        joblib.dump(model, os.path.join(self.model_dir, 'disease_rice.joblib'))
+        with open(os.path.join(self.model_dir, 'disease_rice.labels.json'), 'w') as f:
+            json.dump(['Healthy', 'Rice Blast'], f)
+
+        self.assertIsInstance(image_inference.get_inference_server('disease_rice').backend, SklearnFeatureBackend)
+        self.assertIsNone(image_inference.get_inference_server('disease_wheat'))
+        self.assertIsNone(image_inference.get_inference_server('disease_../disease_rice'))
+        # Names without a model, such as arbitrary user crop names, are not remembered
+        self.assertEqual(set(image_inference._servers), {'disease_rice'})
+
+        service = KrishiRakshaPestService.__new__(KrishiRakshaPestService)
+        diagnosis = service._run_specialist_model('rice', {'close_up': _leaf((0.45, 0.3, 0.1), seed=99)})
+        self.assertEqual(diagnosis[0]['name'], 'Rice Blast')
+        self.assertEqual(diagnosis[0]['source'], 'image_model')
+        self.assertIn('Tricyclazole', diagnosis[0]['treatment'])
+
+        # No model for this crop: the rule-based head answers
+        self.assertEqual(service._run_specialist_model('banana', {'close_up': _leaf((0.5, 0.5, 0.1))})[0]['name'],
+                         'Panama Wilt')
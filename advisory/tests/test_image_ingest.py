@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Photo Upload Ingest and Duplicate Diagnoses
+Decoding is patched to return synthetic arrays, so Pillow is not needed
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from ..api.views import DiagnosticViewSet
+from ..models import DiagnosticSession
+from ..services import image_ingest
+from ..services.image_ingest import find_cached_diagnosis, hamming, perceptual_hash, remember_diagnosis, spool_upload
+from .cache_settings import clear_caches, locmem_caches
+
+
+def _field(seed, size=(240, 320)):
+    """Smooth synthetic field photo: a few random blobs of colour"""
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:size[0], 0:size[1]]
+    image = np.zeros(size + (3,), dtype=np.float32)
+    for _ in range(6):
+        cy, cx = rng.uniform(0, size[0]), rng.uniform(0, size[1])
+        radius = rng.uniform(20, 80)
+        image += np.exp(-((ys - cy) ** 2 + (xs - cx) ** 2) / (2 * radius ** 2))[..., None] * rng.uniform(0, 1, 3)
+    return (np.clip(image / image.max(), 0, 1) * 255).astype(np.uint8)
+
+
+def _post_upload(data):
+    request = APIRequestFactory().post('/api/diagnostics/upload/', data, format='multipart')
+    return DiagnosticViewSet.as_view({'post': 'upload'}, **DiagnosticViewSet.upload.kwargs)(request)
+
+
+@override_settings(CACHES=locmem_caches('image-ingest-tests'))
+class ImageIngestTests(TestCase):
+    """Test cases for spooling, perceptual hashing and the upload endpoint"""
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(UPLOAD_SPOOL_DIR=self.spool_dir, MAX_IMAGE_UPLOAD_BYTES=4096)
+        self.settings_override.enable()
+        clear_caches()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def test_spool_streams_to_disk_with_size_cap(self):
+        """Test uploads are written chunk by chunk, hashed and capped"""
+        spooled = spool_upload(SimpleUploadedFile('leaf.jpg', b'x' * 3000))
+        self.assertTrue(spooled['path'].startswith(self.spool_dir))
+        self.assertEqual(os.path.getsize(spooled['path']), 3000)
+        self.assertEqual(spooled['size'], 3000)
+        self.assertEqual(len(spooled['sha256']), 64)
+
+        with self.assertRaises(ValueError):
+            spool_upload(SimpleUploadedFile('huge.jpg', b'x' * 5000))
+        self.assertEqual(os.listdir(self.spool_dir), [os.path.basename(spooled['path'])])
+
+    def test_perceptual_hash_tolerates_rescaling(self):
+        """Test a downscaled, slightly noisy copy hashes close and a different photo does not"""
+        photo = _field(1)
+        smaller = photo[::2, ::2]
+        noisy = np.clip(photo.astype(np.int16) + np.random.default_rng(0).integers(-4, 5, photo.shape), 0, 255)
+
+        self.assertRegex(perceptual_hash(photo), r'^[0-9a-f]{16}$')
+        self.assertLessEqual(hamming(perceptual_hash(photo), perceptual_hash(smaller)), 3)
+        self.assertLessEqual(hamming(perceptual_hash(photo), perceptual_hash(noisy)), 3)
+        self.assertGreater(hamming(perceptual_hash(photo), perceptual_hash(_field(2))), 10)
+        self.assertEqual(len(perceptual_hash(np.zeros((4, 4, 3), dtype=np.uint8))), 16)
+
+    def test_near_duplicate_lookup(self):
+        """Test cached diagnoses are found by exact and near hashes, per crop"""
+        remember_diagnosis('00ff00ff00ff00ff', {'status': 'success', 'crop_detected': 'rice'}, crop='rice')
+
+        self.assertEqual(find_cached_diagnosis('00ff00ff00ff00ff', 'rice')['duplicate_distance'], 0)
+        self.assertEqual(find_cached_diagnosis('00ff00ff00ff00f8', 'rice')['duplicate_distance'], 3)
+        self.assertIsNone(find_cached_diagnosis('00ff00ff00ff0000', 'rice'))
+        self.assertIsNone(find_cached_diagnosis('00ff00ff00ff00ff', 'tomato'))
+
+    def test_upload_endpoint_reuses_diagnosis(self):
+        """Test a repeat photo reuses the model output but is verified for its own location"""
+        photo = _field(3)
+        humidity = {'Cuttack, Odisha': '85%', 'Jodhpur, Rajasthan': '12%'}
+
+        def upload(name, location):
+            return _post_upload({
+                'crop': 'rice', 'location': location,
+                'close_up': SimpleUploadedFile(name, b'jpeg-bytes', content_type='image/jpeg'),
+            })
+
+        with patch.object(image_ingest, 'load_downscaled', side_effect=[photo, photo[::2, ::2]]), \
+                patch('advisory.services.krishi_raksha_pest_service.CleanWeatherAPI') as weather_api, \
+                patch('advisory.services.krishi_raksha_pest_service.classify_image', return_value=None) as classify:
+            weather_api.return_value.get_current_weather.side_effect = \
+                lambda location: {'temperature': 28, 'humidity': humidity[location]}
+            first = upload('a.jpg', 'Cuttack, Odisha')
+            self.assertEqual(first.status_code, 200)
+            self.assertFalse(first.data['cached'])
+            calls = classify.call_count
+
+            second = upload('b.jpg', 'Jodhpur, Rajasthan')
+            self.assertEqual(second.status_code, 200)
+            self.assertTrue(second.data['cached'])
+            self.assertEqual(classify.call_count, calls)
+
+        self.assertEqual(second.data['location'], 'Jodhpur, Rajasthan')
+        blast = [{d['name']: d for d in response.data['diagnosis']}['Rice Blast'] for response in (first, second)]
+        self.assertEqual([b['confidence'] for b in blast], [0.92, 0.52])
+        self.assertEqual(blast[0]['severity_score'], blast[1]['severity_score'])
+        self.assertNotIn('verification_note', blast[0])
+
+        sessions = DiagnosticSession.objects.order_by('id')
+        self.assertEqual(len(sessions), 2)
+        self.assertEqual(sessions[0].images_json['close_up']['phash'], perceptual_hash(photo))
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_upload_endpoint_rejects_bad_requests(self):
+        """Test missing and oversized photos are rejected"""
+        self.assertEqual(_post_upload({'crop': 'rice'}).status_code, 400)
+
+        response = _post_upload({'image': SimpleUploadedFile('huge.jpg', b'x' * 5000, content_type='image/jpeg')})
+        self.assertEqual(response.status_code, 413)
+
+        with patch.object(image_ingest, 'load_downscaled', side_effect=ValueError('truncated JPEG')):
+            response = _post_upload({'image': SimpleUploadedFile('bad.jpg', b'x' * 100, content_type='image/jpeg')})
+        self.assertEqual(response.status_code, 400)
+
+
+class ImageIngestProjectCacheTests(TestCase):
+    """Test the upload endpoint on the project's real CACHES settings"""
+
+    def test_repeat_upload_under_project_caches(self):
+        """Test a repeat upload hits the recognition cache every worker shares, and both are recorded"""
+        self.assertNotIsInstance(caches['shared'], (LocMemCache, DummyCache))
+        photo = _field(4)
+
+        with patch.object(image_ingest, 'load_downscaled', return_value=photo), \
+                patch('advisory.services.krishi_raksha_pest_service.classify_image', return_value=None):
+            responses = [
+                _post_upload({'crop': 'tomato', 'location': 'Nashik',
+                              'close_up': SimpleUploadedFile(name, b'jpeg-bytes', content_type='image/jpeg')})
+                for name in ('a.jpg', 'b.jpg')
+            ]
+
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual([r.data['cached'] for r in responses], [False, True])
+        self.assertEqual(DiagnosticSession.objects.count(), 2)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the LLM Gateway
+"""
+
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from ..services import llm_gateway
+from ..services.consolidated_ai_service import ConsolidatedAIService
+from ..services.llm_gateway import FAILURE_THRESHOLD, FALLBACK_TIER, MIN_SAMPLES, LLMGateway, StubBackend
+
+
+def warmed(backend, latency, samples=MIN_SAMPLES):
+    for _ in range(samples):
+        backend.record(latency, True)
+    return backend
+
+
+class LLMGatewayRoutingTests(SimpleTestCase):
+    """Test cases for latency-aware routing and failover"""
+
+    def test_fastest_healthy_backend_answers(self):
+        """Test routing follows measured latency rather than registration order"""
+        slow = warmed(StubBackend('slow', reply='slow'), 2.0)
+        fast = warmed(StubBackend('fast', reply='fast'), 0.2)
+        gateway = LLMGateway([slow, fast], timeout=2)
+        self.assertEqual([b.name for b in gateway.ranked()], ['fast', 'slow'])
+
+        result = gateway.generate('kab buvai kare?', hedge=False)
+        self.assertEqual((result['text'], result['backend'], result['hedged']), ('fast', 'fast', False))
+        self.assertEqual(slow.calls, 0)
+        self.assertEqual(gateway.generate('x', backends=['slow'])['backend'], 'slow')
+
+    def test_failures_fail_over_and_trip_the_backend(self):
+        """Test a failing backend is replaced at once and then skipped"""
+        broken = StubBackend('broken', fail=True, prior_latency=0.1)
+        spare = StubBackend('spare', reply='spare', prior_latency=1.0)
+        gateway = LLMGateway([broken, spare], timeout=2)
+        self.assertEqual(gateway.generate('x')['backend'], 'spare')
+        self.assertEqual(gateway.generate('x')['backend'], 'spare')
+        self.assertEqual(broken.calls, 1)
+        self.assertEqual(gateway.stats()['broken']['error_rate'], 1.0)
+
+        for _ in range(FAILURE_THRESHOLD - 1):
+            broken.record(0.1, False)
+        self.assertFalse(broken.healthy())
+        self.assertEqual([b.name for b in gateway.ranked()], ['spare', 'broken'])
+
+        self.assertIsNone(LLMGateway([StubBackend(fail=True)], timeout=1).generate('x'))
+        self.assertIsNone(LLMGateway(timeout=1).generate('x'))
+
+    def test_timeout_bounds_the_wait(self):
+        """Test a request returns None once the deadline passes"""
+        gateway = LLMGateway([StubBackend(latency=5.0)], timeout=0.2)
+        started = time.monotonic()
+        self.assertIsNone(gateway.generate('x'))
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+class LLMGatewayHedgingTests(SimpleTestCase):
+    """Test cases for hedged requests and concurrency limits"""
+
+    def test_hedge_fires_after_p90_and_cancels_the_loser(self):
+        """Test a straggling primary is overtaken by the hedge and cancelled"""
+        primary = warmed(StubBackend('primary', reply='late', latency=3.0), 0.05)
+        backup = StubBackend('backup', reply='hedged answer', latency=0.05)
+        gateway = LLMGateway([primary, backup], timeout=2)
+
+        started = time.monotonic()
+        result = gateway.generate('x')
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual((result['backend'], result['text'], result['hedged']), ('backup', 'hedged answer', True))
+        for _ in range(50):
+            if primary.cancelled:
+                break
+            time.sleep(0.01)
+        self.assertEqual(primary.cancelled, 1)
+        self.assertEqual(primary.in_flight, 0)
+
+    def test_fast_primary_is_not_hedged(self):
+        """Test no second request is sent when the primary answers in time"""
+        primary = warmed(StubBackend('primary', reply='ok'), 1.0)
+        backup = StubBackend('backup')
+        result = LLMGateway([primary, backup], timeout=2).generate('x')
+        self.assertEqual((result['backend'], result['hedged']), ('primary', False))
+        self.assertEqual(backup.calls, 0)
+
+    def test_fallback_tier_is_last_resort(self):
+        """Test a fast fallback backend is neither preferred nor used as a hedge, only after failures"""
+        dialogpt = warmed(StubBackend('huggingface', reply='chit-chat', tier=FALLBACK_TIER), 0.05)
+        primary = warmed(StubBackend('ollama', reply='advice', latency=0.3), 0.05)
+        gateway = LLMGateway([dialogpt, primary], timeout=2)
+        self.assertEqual([b.name for b in gateway.ranked()], ['ollama', 'huggingface'])
+
+        result = gateway.generate('x')
+        self.assertEqual((result['backend'], result['hedged']), ('ollama', False))
+        self.assertEqual(dialogpt.calls, 0)
+
+        primary.fail = True
+        self.assertEqual(gateway.generate('x')['backend'], 'huggingface')
+
+    def test_saturated_backend_is_passed_over(self):
+        """Test a backend at its concurrency limit is skipped, not queued on"""
+        local = StubBackend('local', reply='local', latency=0.5, max_concurrency=1, prior_latency=0.1)
+        remote = StubBackend('remote', reply='remote', prior_latency=1.0)
+        gateway = LLMGateway([local, remote], timeout=2, hedge=False)
+
+        first = []
+        worker = threading.Thread(target=lambda: first.append(gateway.generate('a')))
+        worker.start()
+        time.sleep(0.1)
+        self.assertEqual(gateway.generate('b')['backend'], 'remote')
+        worker.join()
+        self.assertEqual(first[0]['backend'], 'local')
+        self.assertEqual(local.in_flight, 0)
+
+
+class LLMGatewayServiceTests(SimpleTestCase):
+    """Test cases for services generating through the gateway"""
+
+    def setUp(self):
+        llm_gateway.reset_llm_gateway(LLMGateway([StubBackend(reply='Namaste from the stub backend')], timeout=2))
+
+    def tearDown(self):
+        llm_gateway.reset_llm_gateway()
+
+    def test_general_queries_use_the_gateway(self):
+        """Test the consolidated service reports the answering backend"""
+        result = ConsolidatedAIService()._handle_general_query('who wrote the ramayana', {'confidence': 0.7}, {})
+        self.assertEqual(result['response'], 'Namaste from the stub backend')
+        self.assertEqual(result['data_source'], 'stub_ai')
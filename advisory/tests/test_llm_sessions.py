@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for LLM Chat Sessions
+"""
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..services import llm_gateway
+from ..services.llm_gateway import Backend, LLMGateway, StubBackend, ollama_backend
+from ..services.llm_sessions import build_prompt, estimate_tokens, generate_in_session, load_session
+from .cache_settings import clear_caches, locmem_caches
+
+SYSTEM = 'You are Krishimitra, an agricultural advisor for Indian farmers.'
+
+
+class FakeOllama:
+    """Backend call that records what it was sent and grows a context like Ollama does"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, prompt, timeout, cancelled, options):
+        self.requests.append({'prompt': prompt, 'options': dict(options)})
+        sent = options.get('continuation', prompt) if options.get('context') else prompt
+        context = list(options.get('context') or []) + [len(self.requests)] * estimate_tokens(sent)
+        return {'text': f'answer {len(self.requests)}', 'context': context}
+
+
+@override_settings(CACHES=locmem_caches('llm-sessions'), LLM_SESSION_TOKEN_BUDGET=2048)
+class LLMSessionTests(SimpleTestCase):
+    """Test cases for per-session context reuse and history trimming"""
+
+    def setUp(self):
+        clear_caches()
+        self.ollama = FakeOllama()
+        self.gateway = LLMGateway([Backend('ollama', self.ollama, prior_latency=0.1)], timeout=2)
+        llm_gateway.reset_llm_gateway(self.gateway)
+
+    def tearDown(self):
+        llm_gateway.reset_llm_gateway()
+
+    def test_follow_up_turns_send_only_the_new_question(self):
+        """Test the cached Ollama context replaces the re-sent history"""
+        first = generate_in_session('s1', SYSTEM, 'gehu ki buvai kab kare?')
+        self.assertFalse(first['context_reused'])
+        self.assertIn(SYSTEM, self.ollama.requests[0]['prompt'])
+        self.assertNotIn('context', self.ollama.requests[0]['options'])
+
+        second = generate_in_session('s1', SYSTEM, 'aur khad kitni dale?')
+        self.assertTrue(second['context_reused'])
+        options = self.ollama.requests[1]['options']
+        self.assertEqual(options['continuation'], 'User: aur khad kitni dale?\nAssistant:')
+        self.assertEqual(options['context'], first['context'])
+
+        state = load_session('s1')
+        self.assertEqual(state['turns'], [['gehu ki buvai kab kare?', 'answer 1'],
+                                          ['aur khad kitni dale?', 'answer 2']])
+        self.assertEqual(state['context'], second['context'])
+
+        generate_in_session('s2', SYSTEM, 'mausam kaisa rahega?')
+        self.assertNotIn('context', self.ollama.requests[2]['options'])
+
+    def test_other_backends_get_the_transcript(self):
+        """Test a turn answered elsewhere drops the stale context and the history is rebuilt"""
+        generate_in_session('s1', SYSTEM, 'gehu ki buvai kab kare?')
+        llm_gateway.reset_llm_gateway(LLMGateway([StubBackend(reply='stub answer')], timeout=2))
+        self.assertEqual(generate_in_session('s1', SYSTEM, 'aur khad?')['backend'], 'stub')
+        self.assertIsNone(load_session('s1')['context'])
+
+        llm_gateway.reset_llm_gateway(self.gateway)
+        generate_in_session('s1', SYSTEM, 'sinchai kab?')
+        request = self.ollama.requests[-1]
+        self.assertNotIn('context', request['options'])
+        self.assertIn('User: aur khad?\nAssistant: stub answer', request['prompt'])
+
+    def test_system_prompt_change_resets_context(self):
+        """Test a context built under another system prompt is not reused"""
+        generate_in_session('s1', SYSTEM, 'first question')
+        generate_in_session('s1', 'You are a weather assistant.', 'second question')
+        request = self.ollama.requests[-1]
+        self.assertNotIn('context', request['options'])
+        self.assertIn('User: first question\nAssistant: answer 1', request['prompt'])
+
+    @override_settings(LLM_SESSION_TOKEN_BUDGET=120)
+    def test_long_chats_stay_within_the_token_budget(self):
+        """Test prompt size stops growing with the number of turns"""
+        for turn in range(30):
+            generate_in_session('s1', SYSTEM, f'question number {turn} about paddy irrigation schedules')
+        state = load_session('s1')
+        self.assertLessEqual(sum(estimate_tokens(q) + estimate_tokens(a) for q, a in state['turns']), 120)
+        self.assertEqual(state['turns'][0][0], 'question number 25 about paddy irrigation schedules')
+        self.assertTrue(state['summary'].endswith('question number 24 about paddy irrigation schedules'))
+        self.assertLessEqual(estimate_tokens(state['summary']), 120 // 4 + 1)
+        sent = [estimate_tokens(r['options'].get('continuation') if r['options'].get('context') else r['prompt'])
+                for r in self.ollama.requests]
+        self.assertLess(max(sent[10:]), 2 * max(sent[:10]))
+        self.assertTrue(all(len(r['options'].get('context') or []) <= 120 for r in self.ollama.requests))
+
+    def test_without_session_the_prompt_is_one_off(self):
+        """Test no state is stored for anonymous calls"""
+        result = generate_in_session(None, SYSTEM, 'namaste')
+        self.assertEqual(result['text'], 'answer 1')
+        self.assertEqual(self.ollama.requests[0]['prompt'], build_prompt(SYSTEM, {'summary': '', 'turns': []},
+                                                                         'namaste'))
+        self.assertIsNone(load_session('None'))
+
+
+class LLMSessionProjectCacheTests(TestCase):
+    """Test sessions under the project's real CACHES reach every worker"""
+
+    def setUp(self):
+        self.ollama = FakeOllama()
+        llm_gateway.reset_llm_gateway(LLMGateway([Backend('ollama', self.ollama, prior_latency=0.1)], timeout=2))
+        self.addCleanup(llm_gateway.reset_llm_gateway)
+
+    def test_session_saved_by_one_worker_is_read_by_another(self):
+        """Test the session store is not per-process and a second worker reuses the context"""
+        self.assertNotIsInstance(caches['shared'], (LocMemCache, DummyCache))
+        first = generate_in_session('s-shared', SYSTEM, 'dhan me kitna paani de?')
+
+        # A fresh connection to the alias stands in for another worker's process
+        other_worker = caches.create_connection('shared')
+        self.assertEqual(other_worker.get('llm_session:s-shared')['context'], first['context'])
+        second = generate_in_session('s-shared', SYSTEM, 'aur kab tak?')
+        self.assertTrue(second['context_reused'])
+
+
+    @override_settings(CACHES=dict(settings.CACHES, shared={
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'missing_cache_table'}))
+    def test_cache_outage_falls_back_to_worker_state(self):
+        """Test a missing cache table keeps the chat going on this worker's own state"""
+        generate_in_session('s-outage', SYSTEM, 'dhan me kitna paani de?')
+        self.assertTrue(generate_in_session('s-outage', SYSTEM, 'aur kab tak?')['context_reused'])
+
+
+class OllamaBackendPayloadTests(SimpleTestCase):
+    """Test cases for the Ollama transport"""
+
+    def test_context_keep_alive_and_streamed_state(self):
+        """Test the payload carries context and keep_alive and the final context is returned"""
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = [json.dumps({'response': 'Buvai ', 'done': False}).encode(),
+                                            json.dumps({'response': 'Nov mein', 'done': True,
+                                                        'context': [1, 2, 3, 4]}).encode()]
+        backend = ollama_backend('http://ollama:11434', 'llama3:8b', keep_alive='30m')
+        with patch('advisory.services.llm_gateway.requests.post', return_value=response) as post:
+            answer = backend.call('full prompt', 5, threading.Event(),
+                                  {'context': [1, 2], 'continuation': 'User: kab?\nAssistant:'})
+        payload = post.call_args.kwargs['json']
+        self.assertEqual((payload['prompt'], payload['context'], payload['keep_alive']),
+                         ('User: kab?\nAssistant:', [1, 2], '30m'))
+        self.assertNotIn('options', payload)
+        self.assertEqual(answer, {'text': 'Buvai Nov mein', 'context': [1, 2, 3, 4]})
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Local Generation Worker
+"""
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from multiprocessing.connection import AuthenticationError, Client
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from ..ml import local_generation
+from ..ml.local_generation import GenerationServer, LocalGenerationClient, generation_authkey
+from ..services.llm_gateway import FALLBACK_TIER, LLMGateway, build_gateway, local_backend
+
+AUTHKEY = b'test-secret'
+unpickled = []
+
+
+class Tripwire:
+    """Records it was unpickled, as a malicious payload would run code"""
+
+    def __reduce__(self):
+        return unpickled.append, ('tripped',)
+
+
+class FakeGenerator:
+    """Echoes prompts and records each batch and its budgets"""
+
+    model_name = 'fake'
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def generate(self, prompts, max_new_tokens, max_time):
+        self.calls.append({'prompts': list(prompts), 'max_new_tokens': max_new_tokens, 'max_time': max_time})
+        time.sleep(self.delay)
+        return [f'answer to {prompt}' for prompt in prompts]
+
+
+class LocalGenerationTests(SimpleTestCase):
+    """Test cases for batching, budgets and the socket protocol"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.address = os.path.join(self.root, 'generation.sock')
+
+    def serve(self, generator, **kwargs):
+        server = GenerationServer(generator, self.address, AUTHKEY, **kwargs)
+        server.start()
+        self.addCleanup(server.close)
+        return server
+
+    def test_round_trip_and_token_cap(self):
+        """Test a prompt is answered over the socket with max_new_tokens capped"""
+        generator = FakeGenerator()
+        self.serve(generator, max_new_tokens=64)
+        client = LocalGenerationClient(self.address, AUTHKEY, timeout=5)
+        self.assertTrue(client.available())
+        self.assertEqual(client.generate('when to sow wheat?', max_new_tokens=500), 'answer to when to sow wheat?')
+        self.assertEqual(generator.calls[0]['max_new_tokens'], 64)
+        self.assertLessEqual(generator.calls[0]['max_time'], 5)
+
+    def test_concurrent_requests_are_batched_by_token_budget(self):
+        """Test compatible prompts from several web workers share one model call"""
+        generator = FakeGenerator(delay=0.05)
+        server = self.serve(generator, max_batch_size=8, max_wait_ms=50)
+        client = LocalGenerationClient(self.address, AUTHKEY, timeout=5)
+        answers = {}
+
+        def ask(i):
+            answers[i] = client.generate(f'q{i}', max_new_tokens=32 if i % 2 else 64)
+
+        threads = [threading.Thread(target=ask, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(answers[5], 'answer to q5')
+        self.assertLess(len(generator.calls), 8)
+        for call in generator.calls:
+            budget = 32 if int(call['prompts'][0][1:]) % 2 else 64
+            self.assertEqual(call['max_new_tokens'], budget)
+            self.assertTrue(all((int(p[1:]) % 2 == 1) == (budget == 32) for p in call['prompts']))
+        self.assertEqual(server.stats()['prompts'], 8)
+
+    def test_time_budget_is_enforced(self):
+        """Test a slow model times out the client and queued requests past their deadline are dropped"""
+        generator = FakeGenerator(delay=0.3)
+        server = self.serve(generator, max_batch_size=1, max_wait_ms=0)
+        client = LocalGenerationClient(self.address, AUTHKEY)
+        first = threading.Thread(target=lambda: client.generate('slow', timeout=2))
+        first.start()
+        time.sleep(0.05)
+        with self.assertRaises(TimeoutError):
+            client.generate('stale', timeout=0.1)
+        first.join()
+        time.sleep(0.1)
+        self.assertEqual([call['prompts'] for call in generator.calls], [['slow']])
+        self.assertEqual(server.stats()['expired'], 1)
+
+    def test_missing_worker_fails_fast(self):
+        """Test the gateway skips the local backend when no worker is running"""
+        client = LocalGenerationClient(self.address, AUTHKEY, timeout=5)
+        self.assertFalse(client.available())
+        gateway = LLMGateway([local_backend(client)], timeout=2)
+        self.assertIsNone(gateway.generate('namaste'))
+
+        self.serve(FakeGenerator())
+        self.assertEqual(gateway.generate('namaste')['text'], 'answer to namaste')
+
+    def test_gateway_falls_back_to_the_worker_when_configured(self):
+        """Test the default gateway adds the worker as a fallback backend only when its key is set"""
+        backends = dict(LLM_GATEWAY_BACKENDS=['local'], LLM_GATEWAY_FALLBACK=['local'])
+        self.addCleanup(local_generation.reset_generation_client)
+        with override_settings(LOCAL_GENERATION_AUTHKEY='', **backends):
+            self.assertNotIn('local', build_gateway().backends)
+        local_generation.reset_generation_client()
+        with override_settings(LOCAL_GENERATION_AUTHKEY='g' * 40, **backends):
+            gateway = build_gateway()
+        self.assertEqual(gateway.backend('local').tier, FALLBACK_TIER)
+
+    def test_socket_is_private_and_speaks_json_only(self):
+        """Test the socket is owner-only, wrong keys are refused and pickled payloads are never loaded"""
+        self.serve(FakeGenerator())
+        self.assertEqual(stat.S_IMODE(os.stat(self.address).st_mode), 0o600)
+        with self.assertRaises(AuthenticationError):
+            Client(self.address, authkey=b'wrong-secret')
+
+        with Client(self.address, authkey=AUTHKEY) as conn:
+            conn.send(Tripwire())
+            self.assertIn('not JSON', json.loads(conn.recv_bytes())['error'])
+            conn.send_bytes(json.dumps({'prompt': ['not', 'text']}).encode())
+            self.assertIn('error', json.loads(conn.recv_bytes()))
+            conn.send_bytes(json.dumps({'prompt': 'kharif crops?'}).encode())
+            self.assertEqual(json.loads(conn.recv_bytes())['text'], 'answer to kharif crops?')
+        self.assertEqual(unpickled, [])
+
+    def test_available_pings_the_worker(self):
+        """Test a leftover socket file or a missing key is not mistaken for a running worker"""
+        open(self.address, 'w').close()
+        self.assertFalse(LocalGenerationClient(self.address, AUTHKEY).available())
+        self.serve(FakeGenerator())
+        self.assertTrue(LocalGenerationClient(self.address, AUTHKEY).available())
+        self.assertFalse(LocalGenerationClient(self.address, None).available())
+        self.assertFalse(LocalGenerationClient(self.address, b'wrong-secret').available())
+
+    def test_authkey_must_be_dedicated(self):
+        """Test the worker key cannot be empty, short or the Django SECRET_KEY"""
+        secret = 'k' * 40
+        for key in ('', 'short', secret):
+            with override_settings(SECRET_KEY=secret, LOCAL_GENERATION_AUTHKEY=key):
+                with self.assertRaises(ImproperlyConfigured):
+                    generation_authkey()
+        with override_settings(LOCAL_GENERATION_AUTHKEY='g' * 40):
+            self.assertEqual(generation_authkey(), b'g' * 40)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Request Timing and the System Sampler
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+
+from ..api.monitoring_views import MonitoringViewSet, liveness_check
+from ..middleware.request_timing import RequestTimingMiddleware
+from ..monitoring import performance_monitor as monitor_module
+from ..monitoring.performance_monitor import PerformanceMonitor
+from ..monitoring.ring_buffer import RingBuffer
+
+
+class PerformanceMonitorTests(SimpleTestCase):
+    """Test cases for ring buffers, per-route summaries and snapshot reads"""
+
+    def setUp(self):
+        self.monitor = PerformanceMonitor(ring_size=256, max_routes=3, sample_interval=60)
+        self.addCleanup(self.monitor.sampler.stop)
+
+    def test_ring_buffer_keeps_the_newest_items(self):
+        """Test the buffer wraps in order and concurrent writers never grow it"""
+        buffer = RingBuffer(5)
+        for i in range(12):
+            buffer.append(i)
+        self.assertEqual(buffer.items(), [7, 8, 9, 10, 11])
+        self.assertEqual((len(buffer), buffer.total), (5, 12))
+
+        shared = RingBuffer(100)
+        threads = [threading.Thread(target=lambda: [shared.append(1) for _ in range(1000)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(shared.items()), 100)
+        self.assertEqual(next(shared._counter), 8000)
+
+    def test_summary_percentiles_per_route(self):
+        """Test nearest-rank percentiles, error rates and the overflow bucket"""
+        for ms in range(1, 101):
+            self.monitor.record_request('api:weather', 'GET', 500 if ms % 10 == 0 else 200, ms)
+        for route in ('a', 'b', 'c'):
+            self.monitor.record_request(route, 'GET', 200, 1)
+        summary = self.monitor.get_api_performance_summary(1)
+        weather = summary['routes']['GET api:weather']
+        self.assertEqual((weather['p50_ms'], weather['p95_ms'], weather['p99_ms'], weather['max_ms']),
+                         (50, 95, 99, 100))
+        self.assertEqual((weather['errors'], weather['error_rate']), (10, 0.1))
+        self.assertEqual(weather['status_codes'], {'2xx': 90, '5xx': 10})
+        self.assertEqual(set(summary['routes']), {'GET api:weather', 'GET a', 'GET b', 'other'})
+        self.assertEqual(summary['overall']['count'], 103)
+        self.assertEqual(self.monitor.get_api_performance_summary(0)['overall']['count'], 0)
+
+    def test_middleware_records_resolved_routes(self):
+        """Test requests are keyed by view name and exceptions count as 500s"""
+        factory = RequestFactory()
+
+        def view(request):
+            request.resolver_match = resolve('/api/health/liveness/')
+            return HttpResponse('ok', status=201)
+
+        def broken(request):
+            raise RuntimeError('boom')
+
+        with mock.patch('advisory.middleware.request_timing.performance_monitor', self.monitor):
+            RequestTimingMiddleware(view)(factory.get('/api/health/liveness/'))
+            with self.assertRaises(RuntimeError):
+                RequestTimingMiddleware(broken)(factory.post('/missing/'))
+        routes = self.monitor.get_api_performance_summary(1)['routes']
+        self.assertEqual(routes['GET liveness_check']['status_codes'], {'2xx': 1})
+        self.assertEqual(routes['POST unmatched']['errors'], 1)
+
+    def test_health_reads_the_snapshot_without_psutil(self):
+        """Test health checks only copy the latest sample and stay in microseconds"""
+        self.monitor.sampler.ensure_running()
+        while self.monitor.sampler.snapshot is None:
+            time.sleep(0.001)          # first sample from the thread
+        self.monitor.record_request('api:crops', 'GET', 200, 12)
+        self.monitor.sampler.sample()
+        with mock.patch.object(monitor_module.psutil, 'cpu_percent', side_effect=AssertionError), \
+                mock.patch.object(monitor_module.psutil, 'virtual_memory', side_effect=AssertionError):
+            started = time.perf_counter()
+            for _ in range(1000):
+                health = self.monitor.get_system_health_status()
+            per_call = (time.perf_counter() - started) / 1000
+        self.assertLess(per_call, 0.001)
+        self.assertIn(health['status'], ('healthy', 'degraded', 'critical'))
+        self.assertEqual(health['requests']['p95_ms'], 12)
+        self.assertGreater(health['process']['threads'], 0)
+        self.assertIn('uptime_seconds', health)
+
+    def test_monitoring_views_read_the_monitor(self):
+        """Test the endpoints serve the monitor's snapshot, summaries and activity"""
+        self.monitor.sampler.sample()
+        with mock.patch.object(monitor_module, 'performance_monitor', self.monitor), \
+                mock.patch('advisory.api.monitoring_views.performance_monitor', self.monitor):
+            factory = APIRequestFactory()
+            response = MonitoringViewSet.as_view({'get': 'system_health'})(factory.get('/'))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('cpu', response.data)
+            response = MonitoringViewSet.as_view({'post': 'record_activity'})(
+                factory.post('/', {'user_id': 'u1', 'activity_type': 'chat'}, format='json'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.monitor.get_user_activity_summary()['by_type'], {'chat': 1})
+            self.assertEqual(liveness_check(factory.get('/')).status_code, 200)
+            response = MonitoringViewSet.as_view({'get': 'metrics'})(factory.get('/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'timestamp', 'system', 'api', 'user_activity'})
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Pest Symptom Index
+"""
+
+import time
+
+from django.test import SimpleTestCase
+
+from ..services.enhanced_pest_detection import EnhancedPestDetectionService
+from ..services.pest_index import PestKnowledgeIndex, collect_entries, get_pest_index, tokenize
+
+
+def _entry(name, crop, symptoms, seasons=(), regions=()):
+    return {'id': f'{crop}:{name}', 'name': name, 'hindi_name': '', 'description': '', 'crops': [crop],
+            'symptoms': list(symptoms), 'treatment': [], 'prevention': [],
+            'seasons': list(seasons), 'regions': list(regions)}
+
+
+class PestIndexTests(SimpleTestCase):
+    """Test cases for symptom tokenization, ranking and service wiring"""
+
+    def test_multilingual_tokens_share_terms(self):
+        """Test Hindi, romanised Hindi and English symptoms map to the same terms"""
+        english = tokenize('Yellow spots on leaves')
+        self.assertEqual(english, ['yellow', 'spot', 'leaf'])
+        self.assertEqual(sorted(tokenize('पत्तियों पर पीले धब्बे')), sorted(english))
+        self.assertEqual(sorted(tokenize('patti par peele dhabbe')), sorted(english))
+
+    def test_sources_are_merged(self):
+        """Test entries from the separate pest dictionaries merge per crop and pest"""
+        rust = next(e for e in collect_entries() if e['id'] == 'wheat:rust')
+
+        self.assertEqual(rust['sources'], ['pest_detection', 'crop_catalog'])
+        self.assertEqual(rust['hindi_name'], 'रस्ट')
+        self.assertEqual(rust['scientific_name'], 'Puccinia spp.')
+        self.assertIn('rabi', rust['seasons'])
+
+    def test_ranked_search_with_crop_filter(self):
+        """Test the best-matching entry ranks first and other crops are excluded"""
+        index = get_pest_index()
+
+        results = index.search('yellow orange pustules on leaves', crop='wheat')
+        self.assertEqual(results[0]['name'], 'Rust Disease')
+        self.assertTrue(all(r['crops'] == ['wheat'] for r in results))
+        self.assertGreater(results[0]['score'], results[-1]['score'])
+
+        anywhere = {r['name'] for r in index.search('holes in leaves')}
+        self.assertTrue({'Army Worm', 'Rice Leaf Folder'} <= anywhere)
+        self.assertEqual(index.search('zzz unknown words'), [])
+
+    def test_season_and_region_boosts(self):
+        """Test matching season and region lift otherwise equal entries"""
+        index = PestKnowledgeIndex([
+            _entry('Kharif Pest', 'rice', ['leaf spots'], seasons=['kharif']),
+            _entry('Rabi Pest', 'rice', ['leaf spots'], seasons=['rabi'], regions=['Punjab']),
+        ])
+
+        self.assertEqual(index.search('leaf spots', season='kharif')[0]['name'], 'Kharif Pest')
+        self.assertEqual(index.search('leaf spots', season='rabi')[0]['name'], 'Rabi Pest')
+        self.assertEqual(index.search('leaf spots', state='Punjab')[0]['name'], 'Rabi Pest')
+
+    def test_scales_to_thousands_of_entries(self):
+        """Test queries stay fast over a large synthetic catalogue"""
+        words = ['yellow', 'brown', 'spot', 'lesion', 'wilt', 'curl', 'rot', 'hole', 'powder', 'sticky']
+        entries = [
+            _entry(f'Pest {i}', f'crop{i % 50}', [f'{words[i % 10]} {words[(i * 7) % 10]} marker{i}'])
+            for i in range(5000)
+        ]
+        index = PestKnowledgeIndex(entries)
+
+        started = time.perf_counter()
+        for _ in range(200):
+            results = index.search('yellow spot marker42', crop='crop42', top_k=5)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / 200
+
+        self.assertEqual(results[0]['name'], 'Pest 42')
+        self.assertLess(elapsed_ms, 5)
+
+    def test_detection_service_uses_symptoms(self):
+        """Test the pest detection fallback ranks by described symptoms"""
+        service = EnhancedPestDetectionService()
+
+        ranked = service._get_pests_from_database('rice', 'diamond shaped lesions', 'Cuttack, Odisha')
+        self.assertEqual(ranked[0]['name'], 'Blast Disease')
+        self.assertIn('lesion', ranked[0]['matched_symptoms'])
+        self.assertEqual(len(service._get_pests_from_database('rice', '')), 2)
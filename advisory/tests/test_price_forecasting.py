@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Batch Price Forecasting Engine
+Runs offline against the recorded Agmarknet-style history fixture
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from ..ml import price_forecasting
+from ..ml.price_forecasting import (
+    build_weekly_matrix, fit_and_forecast, get_forecast, history_from_file,
+    history_from_store, run_batch_forecast, update_forecasts,
+)
+from ..services.price_store import PriceStore
+
+HISTORY_FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'mandi_price_history.csv')
+
+
+class PriceForecastingTests(SimpleTestCase):
+    """Test cases for batch fitting, persistence and lookups"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            PRICE_STORE_DIR=self.root, PRICE_FORECAST_PATH=os.path.join(self.root, 'forecasts.json')
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_weekly_matrix_includes_aggregates(self):
+        """Test one row per mandi series plus state and national aggregates"""
+        keys, week_starts, matrix = build_weekly_matrix(history_from_file(HISTORY_FIXTURE))
+
+        self.assertIn(('wheat', 'Lucknow', 'Uttar Pradesh'), keys)
+        self.assertIn(('wheat', '', 'Uttar Pradesh'), keys)
+        self.assertIn(('onion', '', ''), keys)
+        self.assertEqual(matrix.shape, (len(keys), 104))
+        self.assertEqual(len(week_starts), 104)
+        self.assertFalse(np.isnan(matrix).any())
+
+    def test_models_track_trend_and_season(self):
+        """Test a trending series keeps rising and a seasonal one repeats its season"""
+        weeks = np.arange(104)
+        matrix = np.vstack([
+            1000 + 10.0 * weeks,
+            1000 + 300 * np.sin(2 * np.pi * weeks / 52),
+        ])
+        result = fit_and_forecast(matrix, horizon=26)
+
+        self.assertAlmostEqual(result['forecast'][0, 12], 1000 + 10 * (103 + 13), delta=20)
+        self.assertAlmostEqual(result['forecast'][1, 12], matrix[1, 104 - 52 + 12], delta=1)
+        self.assertEqual(price_forecasting.MODELS[result['model'][1]], 'seasonal_naive')
+
+    def test_forecasts_persist_and_serve_lookups(self):
+        """Test the nightly run writes forecasts that later lookups read back"""
+        result = update_forecasts(HISTORY_FIXTURE)
+        self.assertEqual(result['series'], 12)
+
+        forecast = get_forecast('Wheat', 'Lucknow', 'Uttar Pradesh')
+        self.assertGreater(forecast['next_3_months'], forecast['last_price'])
+        self.assertGreater(forecast['next_6_months'], forecast['next_3_months'])
+
+        # Unknown mandi falls back to the state, then the national aggregate
+        self.assertIsNone(get_forecast('wheat', 'Agra', 'Uttar Pradesh')['mandi'])
+        self.assertIsNone(get_forecast('onion', state='Punjab')['state'])
+        self.assertIsNone(get_forecast('cotton'))
+
+    def test_history_from_store_matches_file(self):
+        """Test forecasts from the price store match those from the same CSV"""
+        PriceStore(self.root).ingest_agmarknet_csv(HISTORY_FIXTURE)
+
+        from_store = run_batch_forecast(history_from_store(PriceStore(self.root)))
+        from_file = run_batch_forecast(history_from_file(HISTORY_FIXTURE))
+
+        self.assertEqual(set(from_store['series']), set(from_file['series']))
+        key = 'onion|lasalgaon|maharashtra'
+        self.assertAlmostEqual(from_store['series'][key]['next_3_months'],
+                               from_file['series'][key]['next_3_months'], places=0)
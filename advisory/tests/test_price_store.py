@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Columnar Mandi Price Store
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from ..services.price_store import PriceStore, get_price_store, to_day
+
+AGMARKNET_CSV = """State,District,Market,Commodity,Variety,Grade,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal_x0020_Price
+Uttar Pradesh,Lucknow,Lucknow,Wheat,Dara,FAQ,01/03/2024,2200,2400,2300
+Uttar Pradesh,Lucknow,Lucknow,Wheat,Dara,FAQ,02/03/2024,2250,2450,2350
+Uttar Pradesh,Kanpur,Kanpur(Grain),Wheat,Dara,FAQ,02/03/2024,2150,2350,2250
+Maharashtra,Pune,Pune,Onion,Red,FAQ,01/03/2024,1000,1400,1200
+Maharashtra,Pune,Pune,Onion,Red,FAQ,not a date,1000,1400,1200
+"""
+
+
+class PriceStoreTests(SimpleTestCase):
+    """Test cases for the memory-mapped price columns"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = PriceStore(self.root)
+        self.mandi = self.store.mandi_id('Lucknow', 'Lucknow', 'Uttar Pradesh')
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _append_days(self, start, prices, mandi=None):
+        dates = [start + timedelta(days=i) for i in range(len(prices))]
+        self.store.append('wheat', dates, [mandi if mandi is not None else self.mandi] * len(prices),
+                          [p - 100 for p in prices], [p + 100 for p in prices], prices)
+
+    def test_range_query_and_persistence(self):
+        """Test appended rows are range-queryable and survive reopening the store"""
+        self._append_days(date(2024, 1, 1), [2000 + i for i in range(10)])
+
+        reopened = PriceStore(self.root)
+        rows = reopened.range('Wheat', '2024-01-03', '2024-01-05')
+
+        self.assertEqual(rows['modal'].tolist(), [2002, 2003, 2004])
+        self.assertIsInstance(reopened._columns('wheat')['modal'], np.memmap)
+        self.assertEqual(reopened.info('wheat')['last_date'], '2024-01-10')
+
+    def test_out_of_order_batch_is_merged(self):
+        """Test older batches are merged in date order and duplicates replaced"""
+        self._append_days(date(2024, 1, 5), [2100, 2200])
+        self._append_days(date(2024, 1, 1), [2000, 2010, 2020, 2030, 2999])
+
+        rows = self.store.range('wheat')
+        self.assertEqual(from_iso(rows['date']), ['2024-01-01', '2024-01-02', '2024-01-03',
+                                                   '2024-01-04', '2024-01-05', '2024-01-06'])
+        self.assertEqual(rows['modal'][4], 2999)
+
+    def test_rollups_and_rolling_window(self):
+        """Test weekly/monthly rollups and the trailing rolling mean"""
+        self._append_days(date(2024, 1, 29), [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000])
+
+        weekly = self.store.rollup('wheat', 'W')
+        self.assertEqual([str(p) for p in weekly['period']], ['2024-01-29', '2024-02-05'])
+        self.assertEqual(weekly['count'].tolist(), [7, 1])
+        self.assertEqual(weekly['max'].tolist(), [7100, 8100])
+
+        monthly = self.store.rollup('wheat', 'M')
+        self.assertEqual([str(p) for p in monthly['period']], ['2024-01-01', '2024-02-01'])
+        self.assertEqual(monthly['modal'].tolist(), [2000, 6000])
+
+        rolling = self.store.rolling('wheat', window=3)
+        self.assertEqual(rolling['value'].tolist()[:3], [1000, 1500, 2000])
+
+    def test_state_filter_and_trend(self):
+        """Test queries can be limited to a state and trends follow the data"""
+        other = self.store.mandi_id('Pune', 'Pune', 'Maharashtra')
+        self._append_days(date(2024, 1, 1), [2000 + 10 * i for i in range(30)])
+        self.store.append('wheat', [date(2024, 2, 1)], [other], [1], [1], [1])
+
+        latest = self.store.latest('wheat', state='Uttar Pradesh')
+        self.assertEqual(latest['date'], '2024-01-30')
+        self.assertEqual(latest['modal'], 2290)
+
+        trend = self.store.trend('wheat', days=60, state='Uttar Pradesh')
+        self.assertEqual(trend['trend'], 'increasing')
+        self.assertAlmostEqual(trend['slope_per_day'], 10, places=2)
+
+    def test_latest_index_follows_writes(self):
+        """Test filtered latest lookups use the per-mandi index and see appends and merges"""
+        kanpur = self.store.mandi_id('Kanpur(Grain)', 'Kanpur', 'Uttar Pradesh')
+        self._append_days(date(2024, 1, 1), [2000, 2100, 2200])
+        self._append_days(date(2024, 1, 1), [1800, 1900], mandi=kanpur)
+
+        self.assertEqual(self.store.latest('wheat', mandi='Kanpur(Grain)')['date'], '2024-01-02')
+        index = self.store._latest_cache['wheat'][1]
+        self.assertEqual(self.store.latest('wheat', state='Uttar Pradesh')['modal'], 2200)
+        self.assertIs(self.store._latest_cache['wheat'][1], index)
+
+        self._append_days(date(2024, 1, 3), [2000], mandi=kanpur)
+        latest = self.store.latest('wheat', state='uttar pradesh')
+        self.assertEqual((latest['date'], latest['modal'], latest['mandis']), ('2024-01-03', 2100, 2))
+
+        self._append_days(date(2024, 1, 3), [2600])
+        self.assertEqual(self.store.latest('wheat', mandi='Lucknow')['modal'], 2600)
+        self.assertIsNone(self.store.latest('wheat', state='Maharashtra'))
+
+    def test_ingest_agmarknet_csv(self):
+        """Test Agmarknet exports are parsed into per-commodity columns"""
+        path = os.path.join(self.root, 'export.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(AGMARKNET_CSV)
+
+        result = self.store.ingest_agmarknet_csv(path)
+
+        self.assertEqual(result['rows'], 4)
+        self.assertEqual(result['skipped'], 1)
+        self.assertEqual(self.store.commodities(), ['onion', 'wheat'])
+        self.assertEqual(self.store.latest('wheat')['mandis'], 2)
+        self.assertEqual(self.store.range('wheat', mandi='Kanpur(Grain)')['modal'].tolist(), [2250])
+
+    def test_singleton_follows_settings(self):
+        """Test the shared store is rooted at PRICE_STORE_DIR"""
+        with override_settings(PRICE_STORE_DIR=self.root):
+            self.assertEqual(get_price_store().root, self.root)
+        self.assertEqual(to_day('1970-01-02'), 1)
+
+
+def from_iso(days):
+    return [str(day) for day in days.astype('int64').astype('datetime64[D]')]
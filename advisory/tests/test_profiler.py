@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Sampling Profiler
+"""
+
+import re
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..api.monitoring_views import MonitoringViewSet
+from ..middleware.request_timing import RequestTimingMiddleware
+from ..monitoring.profiler import SamplingProfiler, get_profiler, reset_profiler
+
+
+def hot_keyword_loop(stop):
+    keywords = ['wheat', 'rice', 'mandi', 'urea', 'monsoon'] * 20
+    while not stop.is_set():
+        sum(1 for word in keywords if 'a' in word)
+
+
+def idle_worker(stop):
+    while not stop.is_set():
+        sum(range(200))
+
+
+class ProfilerTests(SimpleTestCase):
+    """Test cases for timed and per-request sampling and collapsed export"""
+
+    def setUp(self):
+        self.profiler = SamplingProfiler(interval_ms=2, max_seconds=5)
+        reset_profiler(self.profiler)
+        self.addCleanup(reset_profiler)
+        self.stop = threading.Event()
+        self.addCleanup(self.stop.set)
+
+    def run_in_thread(self, target):
+        thread = threading.Thread(target=target, args=(self.stop,), daemon=True)
+        thread.start()
+        return thread
+
+    def wait_until_idle(self):
+        deadline = time.monotonic() + 5
+        while self.profiler.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_timed_session_exports_collapsed_stacks(self):
+        """Test a timed session samples every thread and finds the hot loop"""
+        self.run_in_thread(hot_keyword_loop)
+        self.profiler.start(0.3)
+        self.assertTrue(self.profiler.running)
+        # A loaded machine may not schedule the hot thread early on; extend the session until it is seen
+        deadline = time.monotonic() + 5
+        while 'hot_keyword_loop' not in self.profiler.collapsed() and time.monotonic() < deadline:
+            self.profiler.start(0.3)
+            time.sleep(0.05)
+        self.wait_until_idle()
+        status = self.profiler.status()
+        self.assertFalse(status['running'])
+        self.assertGreater(status['samples'], 0)
+
+        collapsed = self.profiler.collapsed()
+        lines = collapsed.splitlines()
+        self.assertTrue(all(re.fullmatch(r'\S+ \d+', line) for line in lines))
+        hot = [line for line in lines if 'hot_keyword_loop' in line]
+        self.assertTrue(hot)
+        self.assertTrue(hot[0].split(' ')[0].split(';')[0].startswith('threading:'))
+        self.assertIn('advisory.tests.test_profiler:hot_keyword_loop', self.profiler.collapsed())
+        self.assertIn('hot_keyword_loop', ' '.join(entry['function'] for entry in self.profiler.top(5)))
+
+    def test_request_mode_samples_only_tagged_threads(self):
+        """Test profiling one request leaves other busy threads out of the profile"""
+        self.run_in_thread(idle_worker)
+        with self.profiler.profile_current_thread():
+            self.assertEqual(self.profiler.status()['mode'], 'request')
+            stop = threading.Event()
+            threading.Timer(0.2, stop.set).start()
+            hot_keyword_loop(stop)
+        self.wait_until_idle()
+        collapsed = self.profiler.collapsed()
+        self.assertIn('hot_keyword_loop', collapsed)
+        self.assertNotIn('idle_worker', collapsed)
+
+    def test_overhead_stays_low(self):
+        """Test the time spent sampling is a small share of the profiled time"""
+        for _ in range(4):
+            self.run_in_thread(hot_keyword_loop)
+        self.profiler.interval_ms = 10
+        self.profiler.start(0.5)
+        self.wait_until_idle()
+        self.assertLess(self.profiler.status()['overhead_percent'], 5.0)
+
+    @override_settings(PROFILER_TOKEN='s3cret')
+    def test_header_token_profiles_the_request(self):
+        """Test only requests with the right X-Profile header are sampled"""
+        seen = []
+
+        def view(request):
+            seen.append(get_profiler().status()['tagged_threads'])
+            return HttpResponse('ok')
+
+        middleware = RequestTimingMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get('/api/chatbot/', HTTP_X_PROFILE='s3cret'))
+        middleware(factory.get('/api/chatbot/', HTTP_X_PROFILE='guess'))
+        middleware(factory.get('/api/chatbot/'))
+        self.assertEqual(seen, [1, 0, 0])
+
+    def test_profile_endpoint_is_admin_only(self):
+        """Test staff can start, read, download and discard a profile; others are refused"""
+        view = MonitoringViewSet.as_view({'get': 'profile', 'post': 'profile', 'delete': 'profile'})
+        factory = APIRequestFactory()
+        staff, farmer = User(username='ops', is_staff=True), User(username='farmer')
+
+        request = factory.post('/api/monitoring/profile/', {'seconds': 0.2}, format='json')
+        force_authenticate(request, user=farmer)
+        self.assertEqual(view(request).status_code, 403)
+        self.assertEqual(view(factory.get('/api/monitoring/profile/')).status_code, 401)
+
+        request = factory.post('/api/monitoring/profile/', {'seconds': 0.2, 'interval_ms': 5}, format='json')
+        force_authenticate(request, user=staff)
+        response = view(request)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['mode'], 'timed')
+        self.wait_until_idle()
+
+        request = factory.get('/api/monitoring/profile/')
+        force_authenticate(request, user=staff)
+        response = view(request)
+        self.assertGreater(response.data['samples'], 0)
+        self.assertIn('collapsed', response.data)
+
+        request = factory.get('/api/monitoring/profile/', {'download': '1'})
+        force_authenticate(request, user=staff)
+        response = view(request)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        self.assertEqual(response.content.decode(), self.profiler.collapsed())
+
+        request = factory.delete('/api/monitoring/profile/')
+        force_authenticate(request, user=staff)
+        self.assertEqual(view(request).data['samples'], 0)
+        request = factory.post('/api/monitoring/profile/', {'seconds': 'ten'}, format='json')
+        force_authenticate(request, user=staff)
+        self.assertEqual(view(request).status_code, 400)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Local Query Classifier
+"""
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import numpy as np
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..ml import query_classifier
+from ..ml.query_classifier import LocalQueryClassifier, features, fit_temperature, label_queries, train
+from ..models import ChatHistory
+from ..services.consolidated_ai_service import ConsolidatedAIService
+from ..services.enhanced_classifier import EnhancedQueryClassifier
+from ..services.google_ai_studio import GoogleAIStudio
+
+LABELLED = [
+    (f'{crop} {phrase}', 'farming_agriculture')
+    for crop in ('wheat', 'rice', 'cotton', 'गेहूं')
+    for phrase in ('ki buvai kab kare', 'crop fertilizer dose', 'which seed to sow', 'फसल में खाद')
+] + [
+    (f'{crop} {phrase}', 'market_economics')
+    for crop in ('wheat', 'onion', 'tomato', 'प्याज')
+    for phrase in ('mandi price today', 'ka bhav kya hai', 'msp rate', 'मंडी भाव')
+] + [
+    (f'{phrase} {city}', 'weather_climate')
+    for city in ('delhi', 'pune', 'patna', 'लखनऊ')
+    for phrase in ('weather forecast', 'kal barish hogi', 'temperature in', 'मौसम कैसा है')
+] + [
+    (phrase, 'entertainment_fun')
+    for phrase in ('tell me a joke', 'i am bored', 'play a game', 'suno ek chutkula', 'koi mazedar baat',
+                   'sing a song', 'funny story please', 'mujhe hasao', 'riddle puchho', 'कोई चुटकुला सुनाओ')
+]
+
+
+class QueryClassifierModelTests(SimpleTestCase):
+    """Test cases for training, export and inference"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.classifier, cls.summary = train(LABELLED)
+
+    def test_features_keep_hindi_words_intact(self):
+        """Test punctuation splits words but Devanagari vowel signs survive"""
+        terms = features('गेहूं, मंडी!')
+        self.assertIn('w:गेहूं', terms)
+        self.assertIn('w:मंडी', terms)
+        self.assertIn(' ग', terms)
+
+    def test_predictions_are_calibrated_distributions(self):
+        """Test predictions on unseen phrasings with probabilities summing to one"""
+        for query, category in [('maize fertilizer dose', 'farming_agriculture'),
+                                ('potato mandi price', 'market_economics'),
+                                ('kal jaipur mein barish hogi', 'weather_climate')]:
+            prediction = self.classifier.predict(query)
+            self.assertEqual(prediction['category'], category, query)
+            self.assertAlmostEqual(sum(prediction['probabilities'].values()), 1.0, places=3)
+
+        unknown = self.classifier.predict('zzqx')
+        self.assertLess(unknown['confidence'], self.classifier.predict('onion mandi price today')['confidence'])
+        self.assertEqual(self.summary['samples'], len(LABELLED))
+        self.assertIsNotNone(self.summary['validation_accuracy'])
+
+    def test_export_round_trip(self):
+        """Test the saved arrays reproduce the in-memory model"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'qc.npz')
+            self.classifier.save(path)
+            loaded = LocalQueryClassifier.load(path)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        for query in ('wheat mandi price', 'मौसम कैसा है', 'tell me a joke'):
+            np.testing.assert_allclose(loaded.predict_proba(query), self.classifier.predict_proba(query), rtol=1e-6)
+        self.assertEqual(loaded.metadata['samples'], len(LABELLED))
+
+    def test_temperature_softens_overconfident_logits(self):
+        """Test temperature scaling raises T for logits that are too sharp"""
+        rng = np.random.default_rng(0)
+        labels = rng.integers(0, 3, 200)
+        logits = rng.normal(size=(200, 3))
+        logits[np.arange(200), labels] += 1.0
+        self.assertGreater(fit_temperature(logits * 10, labels), 1.0)
+        with self.assertRaises(ValueError):
+            train(LABELLED[:5])
+
+
+class QueryClassifierRoutingTests(SimpleTestCase):
+    """Test cases for the confidence threshold in front of the LLM"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'qc.npz')
+        train(LABELLED)[0].save(path)
+        self.settings_override = override_settings(QUERY_CLASSIFIER_PATH=path, QUERY_CLASSIFIER_MIN_CONFIDENCE=0.5)
+        self.settings_override.enable()
+        query_classifier.reset_query_classifier()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        query_classifier.reset_query_classifier()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_confident_queries_skip_the_llm(self):
+        """Test the LLM is only called below the threshold"""
+        studio = GoogleAIStudio()
+        studio.api_key = 'test-key'
+        llm_answer = {'category': 'general_knowledge', 'confidence': 0.9}
+        with patch.object(GoogleAIStudio, '_call_google_ai', return_value=llm_answer) as llm:
+            result = studio.classify_query('onion mandi price today')
+            self.assertEqual(result['category'], 'market_economics')
+            self.assertEqual(result['source'], 'local_model')
+            llm.assert_not_called()
+
+            with override_settings(QUERY_CLASSIFIER_MIN_CONFIDENCE=1.01):
+                self.assertEqual(studio.classify_query('onion mandi price today'), llm_answer)
+            llm.assert_called_once()
+
+    def test_keyword_classifiers_use_confident_predictions(self):
+        """Test the keyword scorers defer to the local model"""
+        enhanced = EnhancedQueryClassifier().classify_query('kal patna mein barish hogi')
+        self.assertEqual((enhanced['category'], enhanced['query_type']), ('weather_climate', 'farming'))
+        self.assertEqual(EnhancedQueryClassifier().classify_query('suno ek chutkula')['query_type'], 'general')
+
+        query_classifier.reset_query_classifier()
+        with override_settings(QUERY_CLASSIFIER_PATH=os.path.join(self.directory, 'missing.npz')):
+            self.assertIsNone(query_classifier.confident_prediction('onion mandi price today'))
+            self.assertNotIn('source', EnhancedQueryClassifier().classify_query('onion mandi price today'))
+
+
+    def test_consolidated_service_keeps_the_predicted_category(self):
+        """Test a confident prediction outside the scored categories is not reported as general"""
+        service = ConsolidatedAIService()
+        joke = service.classify_query('suno ek chutkula')
+        self.assertEqual((joke['category'], joke['source']), ('entertainment_fun', 'local_model'))
+        self.assertTrue(joke['requires_general_knowledge'])
+
+        market = service.classify_query('onion mandi price today')
+        self.assertEqual((market['category'], market['subcategory']), ('market_economics', 'price_inquiry'))
+        self.assertGreaterEqual(market['confidence'], 0.5)
+
+class QueryClassifierTrainingTests(TestCase):
+    """Test cases for labelling and training from logged queries"""
+
+    def test_keyword_teachers_must_agree(self):
+        """Test only unambiguous keyword labels are kept"""
+        labelled = dict((query, category) for query, category, _ in label_queries([
+            'wheat crop fertilizer for my soil', 'mandi price of onion today', 'kal barish hogi kya']))
+        self.assertEqual(labelled, {'wheat crop fertilizer for my soil': 'farming_agriculture',
+                                    'mandi price of onion today': 'market_economics'})
+
+    def test_command_trains_from_chat_history(self):
+        """Test the management command labels logs and writes a loadable model"""
+        for i, (query, _) in enumerate(LABELLED):
+            ChatHistory.objects.create(user_id='u', session_id=f's{i}', message_type='user', message_content=query,
+                                       detected_language='en', response_language='en',
+                                       response_source='test', response_type='test')
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'qc.npz')
+            out = StringIO()
+            call_command('train_query_classifier', output=path, stdout=out)
+            self.assertIn('Model written to', out.getvalue())
+            model = LocalQueryClassifier.load(path)
+            self.assertGreater(model.metadata['teachers']['keywords'], 0)
+            self.assertEqual(model.metadata['teachers']['seed'], len(GoogleAIStudio().training_examples))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Response Shaping, the orjson Renderer and Compression
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from ..api.renderers import ORJSONRenderer
+from ..api.response_shaping import apply_fields, compact_market_prices, parse_fields
+from ..api.views import RealTimeGovernmentDataViewSet
+from ..middleware import compression
+from ..middleware.compression import CompressionMiddleware, choose_encoding
+from ..services.ultra_dynamic_government_api import UltraDynamicGovernmentAPI
+
+
+def _simulated_market_prices(location='Pune'):
+    with patch.object(UltraDynamicGovernmentAPI, '_fetch_market_prices', return_value=None), \
+            patch.object(UltraDynamicGovernmentAPI, '_get_location_coordinates', return_value=None):
+        return UltraDynamicGovernmentAPI().get_market_prices_v2(location)
+
+
+class ResponseShapingTests(SimpleTestCase):
+    """Test cases for sparse fieldsets and the compact market price schema"""
+
+    def test_sparse_fieldsets(self):
+        """Test dotted paths select nested keys, including inside lists"""
+        tree = parse_fields('mandi, crops.name,crops.price')
+        self.assertEqual(tree, {'mandi': {}, 'crops': {'name': {}, 'price': {}}})
+        self.assertIsNone(parse_fields(''))
+
+        data = {'mandi': 'Pune APMC', 'status': 'success',
+                'crops': [{'name': 'Wheat', 'price': 2500, 'msp': 2125}, {'name': 'Rice', 'price': 3000}]}
+        self.assertEqual(apply_fields(data, tree), {
+            'mandi': 'Pune APMC', 'crops': [{'name': 'Wheat', 'price': 2500}, {'name': 'Rice', 'price': 3000}]})
+        self.assertEqual(apply_fields(data, parse_fields('status,missing')), {'status': 'success'})
+
+    def test_whole_key_wins_at_any_depth_and_order(self):
+        """Test naming a key outright keeps all of it, whether before or after a narrower path"""
+        for spec in ('crops,crops.name', 'crops.name,crops', 'crops.name,crops,crops.price'):
+            self.assertEqual(parse_fields(spec), {'crops': {}}, spec)
+        for spec in ('a.b,a.b.c', 'a.b.c,a.b', 'a.b.c,a.b,a.b.d'):
+            self.assertEqual(parse_fields(spec), {'a': {'b': {}}}, spec)
+        self.assertEqual(parse_fields('a.b.c,a.d,a.b.e'), {'a': {'b': {'c': {}, 'e': {}}, 'd': {}}})
+
+    def test_compact_schema_removes_duplicates(self):
+        """Test v3 lists each crop and mandi once with one key per value"""
+        legacy = _simulated_market_prices()
+        compact = compact_market_prices(legacy)
+
+        self.assertEqual(compact['schema'], 'v3')
+        self.assertEqual(len(compact['crops']), len(legacy['crops']))
+        self.assertEqual(len(compact['mandis']), len(legacy['nearby_mandis']))
+        crop = compact['crops'][0]
+        self.assertEqual(crop['name'], legacy['crops'][0]['crop_name'])
+        self.assertEqual(crop['price'], legacy['crops'][0]['current_price'])
+        self.assertEqual(crop['profit'], legacy['crops'][0]['profit'])
+        self.assertFalse({'crop_name', 'profit_margin', 'current_price', 'mandi'} & set(crop))
+
+        legacy_bytes = len(json.dumps(legacy, ensure_ascii=False).encode())
+        compact_bytes = len(json.dumps(compact, ensure_ascii=False).encode())
+        self.assertLess(compact_bytes, legacy_bytes / 2)
+
+    def test_compact_schema_for_service_payload(self):
+        """Test the enhanced market service shape maps to the same schema"""
+        payload = {
+            'status': 'success', 'location': 'Delhi', 'state': 'Delhi', 'sources': ['Agmarknet'],
+            'crops': [{'crop_name': 'Onion', 'current_price': 2800, 'mandi': 'Azadpur Mandi', 'profit_percentage': 'N/A'}],
+            'nearest_mandis': ['Azadpur Mandi'],
+            'nearest_mandis_data': [{'name': 'Azadpur Mandi', 'distance': '0 km', 'latitude': 28.7}],
+            'auto_selected_mandi': 'Azadpur Mandi',
+        }
+        self.assertEqual(compact_market_prices(payload), {
+            'schema': 'v3', 'status': 'success', 'location': 'Delhi', 'state': 'Delhi', 'mandi': 'Azadpur Mandi',
+            'crops': [{'name': 'Onion', 'price': 2800}],
+            'mandis': [{'name': 'Azadpur Mandi', 'distance': '0 km'}],
+            'source': ['Agmarknet'],
+        })
+
+    def test_viewset_applies_schema_and_fields(self):
+        """Test the query parameters reshape a live viewset response"""
+        view = RealTimeGovernmentDataViewSet.as_view({'get': 'market_prices'})
+        request = APIRequestFactory().get('/api/realtime-gov/market_prices/',
+                                          {'location': 'Pune', 'schema': 'v3', 'fields': 'schema,crops.name'})
+        with patch.object(UltraDynamicGovernmentAPI, '_fetch_market_prices', return_value=None), \
+                patch.object(UltraDynamicGovernmentAPI, '_get_location_coordinates', return_value=None):
+            response = view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'schema', 'crops'})
+        self.assertTrue(response.data['crops'])
+        self.assertTrue(all(set(crop) == {'name'} for crop in response.data['crops']))
+
+
+class RendererAndCompressionTests(SimpleTestCase):
+    """Test cases for the orjson renderer and negotiated compression"""
+
+    def test_orjson_matches_json_renderer(self):
+        """Test the orjson renderer produces the same document as DRF's renderer"""
+        data = {
+            'crop': 'गेहूं', 'price': Decimal('2500.50'), 'count': 3, 'ok': True, 'none': None,
+            'when': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc), 'nested': [{'a': 1.5}],
+        }
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+        self.assertIn('गेहूं'.encode(), ORJSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render({1: 'a'}), b'{"1":"a"}')
+
+    def test_encoding_negotiation(self):
+        """Test q-values and wildcards pick the coding"""
+        self.assertEqual(choose_encoding('gzip, deflate'), 'gzip')
+        self.assertEqual(choose_encoding('gzip;q=0, identity'), '')
+        self.assertEqual(choose_encoding('*'), 'br' if compression.BROTLI_AVAILABLE else 'gzip')
+        self.assertEqual(choose_encoding(''), '')
+        with patch.object(compression, 'BROTLI_AVAILABLE', True):
+            self.assertEqual(choose_encoding('gzip;q=1.0, br;q=0.8'), 'gzip')
+            self.assertEqual(choose_encoding('br, gzip'), 'br')
+
+    @override_settings(COMPRESSION_MIN_BYTES=100)
+    def test_middleware_compresses_json(self):
+        """Test JSON is gzipped when accepted and small or binary bodies are left alone"""
+        body = json.dumps({'crops': [{'name': 'Wheat', 'price': 2500}] * 50}).encode()
+
+        def respond(content, content_type='application/json', accept='gzip'):
+            middleware = CompressionMiddleware(lambda request: HttpResponse(content, content_type=content_type))
+            return middleware(RequestFactory().get('/api/market-prices/', HTTP_ACCEPT_ENCODING=accept))
+
+        response = respond(body)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        self.assertFalse(respond(body, accept='identity').has_header('Content-Encoding'))
+        self.assertFalse(respond(b'{}').has_header('Content-Encoding'))
+        self.assertFalse(respond(body, content_type='image/png').has_header('Content-Encoding'))
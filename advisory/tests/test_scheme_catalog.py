@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Government Scheme Catalog
+"""
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from ..api.views import GovernmentSchemesViewSet
+from ..services.government_schemes_data import CENTRAL_GOVERNMENT_SCHEMES
+from ..services.scheme_catalog import SchemeCatalog, collect_schemes, get_scheme_catalog
+
+
+class SchemeCatalogTests(SimpleTestCase):
+    """Test cases for indexed scheme lookups"""
+
+    def setUp(self):
+        self.catalog = get_scheme_catalog()
+
+    def test_locations_resolve_to_states(self):
+        """Test state names, mandi cities and unknown places"""
+        self.assertEqual(self.catalog.resolve_state('Punjab'), 'Punjab')
+        self.assertEqual(self.catalog.resolve_state('pune'), 'Maharashtra')
+        self.assertEqual(self.catalog.resolve_state('Mumbai'), 'Maharashtra')
+        self.assertEqual(self.catalog.resolve_state('Bangalore'), 'Karnataka')
+        self.assertEqual(self.catalog.resolve_state('Ludhiana, Punjab'), 'Punjab')
+        self.assertEqual(self.catalog.resolve_state('Ludhiana'), 'Punjab')
+        self.assertEqual(self.catalog.resolve_state('Atlantis'), '')
+
+    def test_state_schemes_join_central_ones(self):
+        """Test a state's schemes are added to every central scheme and ranked by priority"""
+        central = self.catalog.lookup('Atlantis', page_size=50)
+        delhi = self.catalog.lookup('Delhi', page_size=50)
+        self.assertEqual(central['total'], len(CENTRAL_GOVERNMENT_SCHEMES))
+        self.assertEqual(delhi['total'], central['total'] + 2)
+        self.assertEqual({s['state'] for s in delhi['schemes'] if s['scope'] == 'state'}, {'Delhi'})
+
+        ids = [scheme['id'] for scheme in delhi['schemes']]
+        self.assertEqual(ids[:3], ['pm_kisan', 'fasal_bima', 'kisan_credit'])
+        self.assertLess(ids.index('delhi_kisan_vikas'), ids.index('soil_health'))
+
+    def test_filters_intersect(self):
+        """Test category, crop and eligibility filters"""
+        credit = self.catalog.lookup('Punjab', category='credit', page_size=50)['schemes']
+        self.assertEqual({s['id'] for s in credit}, {'kisan_credit', 'punjab_karz_mafi'})
+
+        onion = {s['id'] for s in self.catalog.lookup('Nashik', crop='onion', page_size=50)['schemes']}
+        wheat = {s['id'] for s in self.catalog.lookup('Nashik', crop='wheat', page_size=50)['schemes']}
+        self.assertIn('operation_greens', onion - wheat)
+        self.assertIn('nfsm', wheat - onion)
+        self.assertIn('pm_kisan', onion & wheat)
+
+        tenant = {s['id'] for s in self.catalog.lookup('Delhi', tag='tenant', page_size=50)['schemes']}
+        self.assertIn('fasal_bima', tenant)
+        self.assertIn('soil_health', tenant)
+        self.assertNotIn('pm_kisan', tenant)
+        self.assertEqual(self.catalog.lookup('Delhi', category='unknown')['total'], 0)
+
+    def test_pagination(self):
+        """Test pages partition the ranked result"""
+        everything = [s['id'] for s in self.catalog.lookup('Maharashtra', page_size=50)['schemes']]
+        pages = []
+        first = self.catalog.lookup('Maharashtra', page_size=4)
+        self.assertEqual(first['pages'], -(-len(everything) // 4))
+        for page in range(1, first['pages'] + 1):
+            pages.extend(s['id'] for s in self.catalog.lookup('Maharashtra', page=page, page_size=4)['schemes'])
+        self.assertEqual(pages, everything)
+        self.assertEqual(self.catalog.lookup('Maharashtra', page=99)['schemes'], [])
+
+    def test_language_variants_are_prerendered(self):
+        """Test each language returns shared records with translated text"""
+        hindi = self.catalog.get('pm_kisan', 'hi')
+        english = self.catalog.get('pm_kisan', 'en')
+        self.assertEqual(hindi['name'], CENTRAL_GOVERNMENT_SCHEMES[0]['name'])
+        self.assertEqual(english['name'], 'PM-Kisan Samman Nidhi')
+        self.assertEqual(english['amount'], '₹6,000 per year')
+        self.assertEqual((hindi['category'], english['category']), ('आय सहायता', 'Income support'))
+        self.assertIs(self.catalog.get('pm_kisan', 'hi-IN'), hindi)
+        self.assertIs(self.catalog.get('pm_kisan', 'ta'), english)
+        self.assertIs(self.catalog.lookup('Delhi', language='en')['schemes'][0], english)
+        self.assertIsNone(self.catalog.get('missing'))
+
+    def test_state_entries_without_text_fall_back(self):
+        """Test sparse state entries still render complete records"""
+        catalog = SchemeCatalog(collect_schemes())
+        record = catalog.get('punjab_karz_mafi', 'en')
+        self.assertEqual(record['eligibility'], 'Farmers in Punjab')
+        self.assertEqual(record['website'], 'https://punjab.gov.in/')
+        self.assertEqual(record['eligibility_tags'], ('small_marginal',))
+
+
+class GovernmentSchemesViewTests(SimpleTestCase):
+    """Test cases for the catalog-backed schemes endpoint"""
+
+    def _get(self, **params):
+        view = GovernmentSchemesViewSet.as_view({'get': 'list'})
+        return view(APIRequestFactory().get('/api/government-schemes/', params))
+
+    def test_list_filters_and_paginates(self):
+        """Test query parameters reach the catalog"""
+        response = self._get(location='Pune', category='credit', language='en')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['state'], 'Maharashtra')
+        self.assertEqual(response.data['language'], 'en')
+        self.assertEqual({s['id'] for s in response.data['schemes']}, {'kisan_credit', 'mjpsky'})
+        self.assertEqual(response.data['total_schemes'], 2)
+
+        paged = self._get(location='Delhi', page=2, page_size=5)
+        self.assertEqual((paged.data['page'], paged.data['page_size']), (2, 5))
+        self.assertEqual(len(paged.data['schemes']), 5)
+        self.assertEqual(self._get(page='two').status_code, 400)
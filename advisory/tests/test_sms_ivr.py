@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Pre-rendered SMS/IVR Digests
+Upstream weather, prices and alerts are passed in; no network calls
+"""
+
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from ..services.sms_ivr import (
+    build_digests, district_locations, handle_ivr_input, handle_sms_query,
+    render_digest, save_digests, sms_segments,
+)
+
+PUNE = {'name': 'Pune', 'state': 'Maharashtra', 'latitude': 18.49, 'longitude': 73.85}
+WEATHER = {'precipitation_mm': 70.0, 'temperature_max_c': 31.0, 'temperature_min_c': 22.0, 'wind_max_kmph': 18.0}
+PRICES = [
+    {'commodity': 'onion', 'modal': 1450.0, 'mandis': 3, 'date': '2024-03-01', 'trend': 'decreasing'},
+    {'commodity': 'soybean', 'modal': 4400.0, 'mandis': 2, 'date': '2024-03-01', 'trend': 'stable'},
+]
+MOVES = [{'commodity': 'onion', 'mandi': 'Lasalgaon', 'state': 'Maharashtra', 'change_percent': -14.0}]
+
+
+class SMSIVRDigestTests(SimpleTestCase):
+    """Test cases for digest rendering and inbound lookups"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.settings_override = override_settings(SMS_DIGEST_PATH=os.path.join(self.root, 'digests.json'))
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _save(self):
+        save_digests(build_digests({'pune': PUNE}, {'pune': WEATHER}, {'Maharashtra': PRICES}, MOVES))
+
+    def test_segment_counting(self):
+        """Test GSM-7 and UCS-2 segment limits"""
+        self.assertEqual(sms_segments('a' * 160), 1)
+        self.assertEqual(sms_segments('a' * 161), 2)
+        self.assertEqual(sms_segments('[' * 80), 1)
+        self.assertEqual(sms_segments('[' * 81), 2)
+        self.assertEqual(sms_segments('मौसम' * 17), 1)
+        self.assertEqual(sms_segments('मौसम' * 18), 2)
+
+    def test_digest_contains_weather_alerts_and_prices(self):
+        """Test the digest leads with weather and alerts and lists top prices"""
+        digest = build_digests({'pune': PUNE}, {'pune': WEATHER}, {'Maharashtra': PRICES}, MOVES)['digests']['pune|en']
+
+        lines = digest['sms'].splitlines()
+        self.assertTrue(lines[0].startswith('Weather in Pune'))
+        self.assertIn('rain 70mm', lines[0])
+        self.assertEqual(lines[1:3], ['ALERT: Heavy rain alert', 'ALERT: Price drop at Lasalgaon (Onion)'])
+        self.assertIn('Onion 1450 (down)', lines)
+        self.assertLessEqual(digest['segments'], 3)
+        self.assertIn('Temperature: 22-31°C', digest['ivr']['weather'])
+        self.assertNotIn('Humidity', digest['ivr']['weather'])
+
+    def test_digest_fits_segment_budget(self):
+        """Test lower-priority lines are dropped to stay within the segment budget"""
+        digest = render_digest(PUNE, WEATHER, PRICES, ['Heavy rain alert'], 'hi', max_segments=2)
+
+        self.assertEqual(digest['segments'], 2)
+        self.assertIn('चेतावनी: Heavy rain alert', digest['sms'])
+        self.assertNotIn('Soybean', digest['sms'])
+        self.assertIn('Soybean', digest['ivr']['prices'])
+
+    def test_inbound_sms_is_a_lookup(self):
+        """Test inbound SMS resolve district and language from the text"""
+        self._save()
+
+        english = handle_sms_query('+919800000000', 'pune')
+        hindi = handle_sms_query('+919800000000', 'PUNE HI')
+        unknown = handle_sms_query('+919800000000', 'ATLANTIS')
+
+        self.assertEqual(english['status'], 'success')
+        self.assertTrue(english['response_message'].startswith('Weather in Pune'))
+        self.assertIn('चेतावनी', hindi['response_message'])
+        self.assertEqual(unknown['status'], 'unavailable')
+        self.assertIn('district', unknown['response_message'])
+
+    def test_ivr_menu_sections(self):
+        """Test DTMF digits select IVR sections and missing digests degrade politely"""
+        self._save()
+
+        self.assertEqual(handle_ivr_input('+91', '2', district='Pune', language='en')['section'], 'prices')
+        self.assertIn('Lasalgaon', handle_ivr_input('+91', '3', district='pune', language='hi')['response_message'])
+        self.assertEqual(handle_ivr_input('+91', '9', district='pune')['section'], 'menu')
+        self.assertEqual(handle_ivr_input('+91', '1', district='Atlantis')['status'], 'unavailable')
+
+    def test_districts_from_mandi_directory(self):
+        """Test districts are derived from the APMC directory"""
+        districts = district_locations()
+
+        self.assertEqual(districts['nashik']['state'], 'Maharashtra')
+        self.assertIn('ludhiana', districts)
+        self.assertNotIn('asia biggest', districts)
+        self.assertNotIn('punjab', districts)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Start-up Regression Tests
+Guards worker cold start time and the lazy import layer
+"""
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from ..lazy_imports import lazy_import, is_loaded, get_import_timings
+from ..startup_profiler import profile_cold_start
+
+# Modules that must not be imported just by loading the API views
+HEAVY_MODULES = [
+    'advisory.services.enhanced_market_prices',
+    'advisory.services.ultra_dynamic_government_api',
+    'advisory.services.comprehensive_crop_recommendations',
+    'advisory.services.enhanced_location_service',
+    'advisory.services.ai_ml_crop_recommendation',
+    'advisory.services.google_ai_studio',
+    'advisory.services.ollama_integration',
+    'advisory.ml.self_learning_ai',
+]
+
+
+class LazyImportTests(SimpleTestCase):
+    """Test cases for the lazy import proxy"""
+
+    def test_module_not_loaded_until_used(self):
+        """Test the proxy defers the import until first access"""
+        proxy = lazy_import('json', 'dumps')
+        self.assertFalse(is_loaded(proxy))
+        self.assertEqual(proxy({'a': 1}), '{"a": 1}')
+        self.assertTrue(is_loaded(proxy))
+        self.assertIn('json:dumps', get_import_timings())
+
+    def test_attribute_and_class_proxies(self):
+        """Test attribute access and instantiation through the proxy"""
+        ordered_dict = lazy_import('collections', 'OrderedDict')
+        instance = ordered_dict(a=1)
+        self.assertEqual(list(instance.keys()), ['a'])
+
+        module = lazy_import('os.path')
+        self.assertEqual(module.join('a', 'b'), 'a/b')
+
+
+class ColdStartTests(SimpleTestCase):
+    """Cold start budget for a fresh worker process"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = profile_cold_start()
+
+    def test_cold_start_within_budget(self):
+        """Test booting Django and importing the views stays within budget"""
+        budget = settings.COLD_START_BUDGET_SECONDS
+        self.assertLessEqual(
+            self.report['total_seconds'], budget,
+            f"Cold start took {self.report['total_seconds']:.2f}s (budget {budget:.2f}s); "
+            f"run `manage.py profile_startup` to find the expensive imports"
+        )
+
+    def test_heavy_modules_are_deferred(self):
+        """Test heavy service modules are not imported at start-up"""
+        imported = {entry['module'] for entry in self.report['imports']}
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, imported)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Text-to-Speech Audio Cache
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from .. import text_to_speech
+from ..api.views import TextToSpeechViewSet
+
+
+class TextToSpeechCacheTests(SimpleTestCase):
+    """Test cases for content-addressed synthesis"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, TTS_CACHE_DIR=None)
+        self.settings_override.enable()
+        self.calls = []
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _engine(self, name, fail=False, delay=0):
+        extension = '.wav' if name == 'pyttsx3' else '.mp3'
+
+        def synthesize(text, lang, voice, key):
+            self.calls.append(name)
+            time.sleep(delay)
+            if fail:
+                raise ConnectionError('upstream unreachable')
+            return text_to_speech._write_atomically(key, extension, lambda path: open(path, 'wb').write(b'ID3audio'))
+        return synthesize
+
+    def test_repeat_phrase_served_from_cache(self):
+        """Test a phrase is synthesized once and then served from disk"""
+        with mock.patch.object(text_to_speech, 'ENGINES', [('gtts', self._engine('gtts'))]):
+            first = text_to_speech.synthesize('Heavy rain expected', 'en')
+            second = text_to_speech.synthesize('Heavy  rain expected ', 'en')
+
+        self.assertFalse(first['cached'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(first['key'], second['key'])
+        self.assertEqual(self.calls, ['gtts'])
+        self.assertTrue(first['url'].startswith('/media/tts/'))
+
+    def test_language_and_voice_are_part_of_the_key(self):
+        """Test the same text in another language or voice gets its own audio"""
+        key = text_to_speech.audio_cache_key('Namaste', 'en')
+        self.assertNotEqual(key, text_to_speech.audio_cache_key('Namaste', 'hi'))
+        self.assertNotEqual(key, text_to_speech.audio_cache_key('Namaste', 'en', 'slow'))
+
+    def test_falls_back_when_gtts_unreachable(self):
+        """Test the local engine is used when gTTS fails"""
+        engines = [('gtts', self._engine('gtts', fail=True)), ('pyttsx3', self._engine('pyttsx3'))]
+        with mock.patch.object(text_to_speech, 'ENGINES', engines):
+            audio = text_to_speech.synthesize('Frost warning tonight', 'en')
+
+        self.assertEqual(audio['engine'], 'pyttsx3')
+        self.assertEqual(self.calls, ['gtts', 'pyttsx3'])
+
+    def test_fallback_audio_is_upgraded_once_stale(self):
+        """Test fallback audio is served briefly, then replaced by gTTS audio"""
+        engines = [('gtts', self._engine('gtts', fail=True)), ('pyttsx3', self._engine('pyttsx3'))]
+        with mock.patch.object(text_to_speech, 'ENGINES', engines):
+            fallback = text_to_speech.synthesize('Frost warning tonight', 'en')
+            self.assertTrue(text_to_speech.synthesize('Frost warning tonight', 'en')['cached'])
+
+        view = TextToSpeechViewSet.as_view({'get': 'retrieve'})
+        response = view(APIRequestFactory().get('/'), pk=fallback['key'])
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response.file_to_stream.close()
+
+        with override_settings(TTS_FALLBACK_TTL=0), \
+                mock.patch.object(text_to_speech, 'ENGINES', [('gtts', self._engine('gtts'))]):
+            upgraded = text_to_speech.synthesize('Frost warning tonight', 'en')
+        self.assertEqual(upgraded['engine'], 'gtts')
+        self.assertEqual(upgraded['content_type'], 'audio/mpeg')
+        self.assertFalse(os.path.exists(fallback['path']))
+        self.assertEqual(self.calls, ['gtts', 'pyttsx3', 'gtts'])
+
+    def test_concurrent_requests_synthesize_once(self):
+        """Test simultaneous requests for one phrase share a single synthesis"""
+        results = []
+        with mock.patch.object(text_to_speech, 'ENGINES', [('gtts', self._engine('gtts', delay=0.05))]):
+            threads = [
+                threading.Thread(target=lambda: results.append(text_to_speech.synthesize('Sow wheat now', 'en')))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.calls, ['gtts'])
+        self.assertEqual(len({result['path'] for result in results}), 1)
+
+    def test_slow_phrase_does_not_block_others(self):
+        """Test a stuck render holds only its own phrase and the lock table empties afterwards"""
+        started, release = threading.Event(), threading.Event()
+        render = self._engine('gtts')
+
+        def engine(text, lang, voice, key):
+            if text == 'Slow phrase':
+                started.set()
+                release.wait(timeout=5)
+            return render(text, lang, voice, key)
+
+        with mock.patch.object(text_to_speech, 'ENGINES', [('gtts', engine)]):
+            slow = threading.Thread(target=text_to_speech.synthesize, args=('Slow phrase', 'en'))
+            slow.start()
+            self.assertTrue(started.wait(timeout=5))
+            done = threading.Event()
+            threading.Thread(target=lambda: (text_to_speech.synthesize('Fast phrase', 'en'), done.set())).start()
+            self.assertTrue(done.wait(timeout=2))
+            release.set()
+            slow.join()
+        self.assertEqual(text_to_speech._key_locks, {})
+
+    def test_pre_render_templates(self):
+        """Test templated advisories are rendered once and cached afterwards"""
+        with mock.patch.object(text_to_speech, 'ENGINES', [('gtts', self._engine('gtts'))]):
+            first = text_to_speech.pre_render_templates(['en'])
+            second = text_to_speech.pre_render_templates(['en'])
+
+        self.assertGreater(first['rendered'], 0)
+        self.assertEqual(first['failed'], 0)
+        self.assertEqual(second['cached'], first['rendered'])
+        self.assertEqual(second['rendered'], 0)
+
+    def test_audio_endpoint_caching_headers(self):
+        """Test cached audio is served with an ETag and answers 304 on revalidation"""
+        with mock.patch.object(text_to_speech, 'ENGINES', [('gtts', self._engine('gtts'))]):
+            audio = text_to_speech.synthesize('PM-Kisan installment released', 'en')
+
+        view = TextToSpeechViewSet.as_view({'get': 'retrieve'})
+        factory = APIRequestFactory()
+
+        response = view(factory.get(f"/api/tts/{audio['key']}/"), pk=audio['key'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'audio/mpeg')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), b'ID3audio')
+
+        response = view(factory.get('/', HTTP_IF_NONE_MATCH=response['ETag']), pk=audio['key'])
+        self.assertEqual(response.status_code, 304)
+
+        response = view(factory.get('/api/tts/../../etc/passwd/'), pk='../../etc/passwd')
+        self.assertEqual(response.status_code, 404)
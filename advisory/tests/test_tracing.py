@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Request Tracing
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..api.monitoring_views import MonitoringViewSet
+from ..middleware.request_timing import RequestTimingMiddleware
+from ..monitoring.tracing import TraceStore, propagate, reset_trace_store, span, start_trace, traced
+from ..services.llm_gateway import LLMGateway, StubBackend
+
+
+@traced('stage.sleep')
+def sleep_ms(ms):
+    time.sleep(ms / 1000)
+    return ms
+
+
+@traced('stage.parallel')
+def parallel_stage(barrier):
+    barrier.wait(timeout=2)
+    time.sleep(0.04)
+
+
+class TracingTests(SimpleTestCase):
+    """Test cases for span trees, propagation and tail sampling"""
+
+    def use_store(self, **kwargs):
+        store = TraceStore(**dict({'slow_ms': 0, 'sample_rate': 0.0}, **kwargs))
+        reset_trace_store(store)
+        self.addCleanup(reset_trace_store)
+        return store
+
+    def test_nested_spans_report_self_time(self):
+        """Test children nest under the current span and self time excludes them"""
+        store = self.use_store()
+        with start_trace('GET chatbot') as root:
+            with span('chatbot.respond'):
+                sleep_ms(30)
+                with span('chatbot.geocode', place='pune'):
+                    sleep_ms(20)
+            root.set(status=200)
+        trace = store.traces()[0]
+        respond = trace['root']['children'][0]
+        geocode = respond['children'][1]
+        self.assertEqual([c['name'] for c in respond['children']], ['stage.sleep', 'chatbot.geocode'])
+        self.assertEqual(geocode['attrs'], {'place': 'pune'})
+        self.assertLess(respond['self_ms'], 10)
+        self.assertGreaterEqual(geocode['children'][0]['self_ms'], 19)
+        self.assertEqual(trace['stages'][0], {'name': 'stage.sleep', 'self_ms': trace['stages'][0]['self_ms'],
+                                              'calls': 2})
+        self.assertEqual(trace['root']['attrs'], {'status': 200})
+
+    def test_spans_follow_work_into_threads(self):
+        """Test propagated executor tasks and gateway threads attach to the request's trace"""
+        store = self.use_store()
+        gateway = LLMGateway([StubBackend(latency=0.02)], timeout=2)
+        with start_trace('POST chatbot'):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                barrier = threading.Barrier(2)
+                for future in [executor.submit(propagate(parallel_stage), barrier) for _ in range(2)]:
+                    future.result()
+            gateway.generate('namaste')
+        root = store.traces()[0]['root']
+        self.assertEqual([c['name'] for c in root['children']], ['stage.parallel', 'stage.parallel', 'llm.stub'])
+        # Overlapping parallel children are counted once in the root's self time
+        intervals = sorted((c['start_ms'], c['start_ms'] + c['duration_ms']) for c in root['children'])
+        union, reach = 0.0, 0.0
+        for start, end in intervals:
+            union += max(0.0, end - max(start, reach))
+            reach = max(reach, end)
+        self.assertLess(union, sum(end - start for start, end in intervals) - 20)
+        self.assertAlmostEqual(root['self_ms'], root['duration_ms'] - union, delta=0.01)
+
+    def test_tail_sampling_keeps_slow_and_failed_traces(self):
+        """Test fast traces are dropped, slow and failed ones kept, and the store is bounded"""
+        store = self.use_store(slow_ms=25, capacity=2)
+        with start_trace('fast'):
+            pass
+        with start_trace('slow'):
+            sleep_ms(30)
+        with self.assertRaises(ValueError):
+            with start_trace('broken'):
+                raise ValueError('bad crop')
+        kept = store.traces()
+        self.assertEqual([(t['name'], t['reason']) for t in kept], [('broken', 'error'), ('slow', 'slow')])
+        self.assertEqual(kept[0]['root']['error'], 'ValueError: bad crop')
+        self.assertEqual(store.traces(min_ms=25)[0]['name'], 'slow')
+
+        with start_trace('third'):
+            sleep_ms(30)
+        self.assertEqual([t['name'] for t in store.traces()], ['third', 'broken'])
+        self.assertEqual(store.stats()['seen'], 4)
+
+    def test_spans_outside_a_trace_are_free(self):
+        """Test service code runs normally with no active request trace"""
+        self.use_store()
+        with span('orphan') as orphan:
+            self.assertIsNone(orphan)
+        self.assertEqual(sleep_ms(1), 1)
+
+    def test_middleware_trace_and_endpoint(self):
+        """Test each request is a root span named by route and served as a tree to staff only"""
+        store = self.use_store()
+
+        def view(request):
+            sleep_ms(5)
+            return HttpResponse('ok')
+
+        RequestTimingMiddleware(view)(RequestFactory().get('/api/chatbot/'))
+        traces_view = MonitoringViewSet.as_view({'get': 'traces'})
+        factory = APIRequestFactory()
+
+        def get(params, user=User(username='ops', is_staff=True)):
+            request = factory.get('/api/monitoring/traces/', params)
+            if user is not None:
+                force_authenticate(request, user=user)
+            return traces_view(request)
+
+        self.assertEqual(get({}, user=None).status_code, 401)
+        self.assertEqual(get({}, user=User(username='farmer')).status_code, 403)
+        response = get({'text': '1'})
+        self.assertEqual(response.status_code, 200)
+        trace = response.data['traces'][0]
+        self.assertEqual(trace['name'], 'GET unmatched')
+        self.assertEqual(trace['root']['attrs']['path'], '/api/chatbot/')
+        self.assertIn('stage.sleep', trace['text'][1])
+
+        response = get({'trace_id': trace['trace_id']})
+        self.assertEqual(response.data['trace_id'], trace['trace_id'])
+        self.assertEqual(get({'trace_id': 'nope'}).status_code, 404)
+        self.assertEqual(get({'limit': 'all'}).status_code, 400)
+        self.assertEqual(store.stats()['kept'], 1)
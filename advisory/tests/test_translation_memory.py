@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Translation Memory
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+from django.test import SimpleTestCase
+
+from ..services import translation_memory
+from ..services.enhanced_multilingual import EnhancedMultilingualSupport
+from ..services.translation_memory import (SegmentTranslator, TranslationMemory, dictionary_backend,
+                                           fill_template, split_segments)
+
+RESPONSE = ("🌱 Crop recommendations for Nashik:\n\n│ 💰 MSP: ₹2275/quintal\n"
+            "Irrigate between 6-8 AM. Avoid field work in afternoon!")
+
+
+class RecordingBackend:
+    """Upper-cases segments and records every batch it was sent"""
+
+    def __init__(self, drop_placeholders=False, fail=False):
+        self.batches = []
+        self.drop_placeholders = drop_placeholders
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def __call__(self, segments, source, target):
+        with self.lock:
+            self.batches.append(list(segments))
+        if self.fail:
+            raise RuntimeError('model unavailable')
+        if self.drop_placeholders:
+            return ['translated' for _ in segments]
+        return [segment.upper() for segment in segments]
+
+    @property
+    def segments(self):
+        return [segment for batch in self.batches for segment in batch]
+
+
+class TranslationMemoryTests(SimpleTestCase):
+    """Test cases for segment lookup, batching and persistence"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.path = os.path.join(self.root, 'dictionary.json')
+
+    def test_segments_mask_variables_and_keep_decoration(self):
+        """Test numbers become placeholders and emoji, boxes and punctuation pass through"""
+        segments = split_segments(RESPONSE)
+        templates = [part[0] for part in segments if isinstance(part, tuple)]
+        self.assertEqual(templates, ['Crop recommendations for Nashik', 'MSP: {0}/quintal',
+                                     'Irrigate between {0} AM', 'Avoid field work in afternoon'])
+        self.assertEqual(''.join(part if isinstance(part, str) else fill_template(*part) for part in segments),
+                         RESPONSE)
+        self.assertEqual(split_segments('खेती करें।'), [('खेती करें', []), '।'])
+
+    def test_only_new_segments_reach_the_backend(self):
+        """Test a response differing only in its numbers is served from memory"""
+        backend = RecordingBackend()
+        translator = SegmentTranslator(TranslationMemory(), backend)
+        first = translator.translate(RESPONSE, 'en', 'hi')
+        self.assertIn('│ 💰 MSP: ₹2275/QUINTAL', first)
+        self.assertEqual(len(backend.segments), 4)
+
+        second = translator.translate(RESPONSE.replace('2275', '2425').replace('6-8', '5-7'), 'english', 'hindi')
+        self.assertIn('MSP: ₹2425/QUINTAL', second)
+        self.assertIn('IRRIGATE BETWEEN 5-7 AM.', second)
+        self.assertEqual(len(backend.segments), 4)
+        self.assertEqual(translator.translate(RESPONSE, 'hi', 'hi'), RESPONSE)
+
+    def test_concurrent_misses_are_batched(self):
+        """Test segments from concurrent requests share backend calls"""
+        backend = RecordingBackend()
+        translator = SegmentTranslator(TranslationMemory(), backend, max_batch_size=64, max_wait_ms=50)
+        results = {}
+
+        def request(i):
+            results[i] = translator.translate(f'Sow variety {chr(65 + i)} early. Weed crop {chr(65 + i)}', 'en', 'hi')
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results[3], 'SOW VARIETY D EARLY. WEED CROP D')
+        self.assertEqual(len(backend.segments), 24)
+        self.assertLess(len(backend.batches), 12)
+        self.assertEqual(translator.batcher.stats()['segments'], 24)
+
+    def test_memory_survives_a_restart(self):
+        """Test saved entries are served without the backend after reloading"""
+        memory = TranslationMemory(self.path, save_every=2)
+        SegmentTranslator(memory, RecordingBackend()).translate(RESPONSE, 'en', 'hi')
+        self.assertTrue(os.path.exists(self.path))
+        memory.save()
+
+        offline = RecordingBackend(fail=True)
+        restarted = SegmentTranslator(TranslationMemory(self.path), offline)
+        self.assertIn('AVOID FIELD WORK IN AFTERNOON!', restarted.translate(RESPONSE, 'en', 'hi'))
+        self.assertEqual(offline.batches, [])
+
+    def test_failed_or_mangled_translations_are_not_remembered(self):
+        """Test the source text is kept and the segment retried later"""
+        memory = TranslationMemory()
+        self.assertEqual(SegmentTranslator(memory, RecordingBackend(fail=True)).translate(RESPONSE, 'en', 'hi'),
+                         RESPONSE)
+        mangled = SegmentTranslator(memory, RecordingBackend(drop_placeholders=True)).translate(
+            'MSP: ₹2275/quintal', 'en', 'hi')
+        self.assertEqual(mangled, 'MSP: ₹2275/quintal')
+        self.assertEqual(len(memory), 0)
+
+    def test_multilingual_support_translates_through_memory(self):
+        """Test translate_text uses the dictionary translator and its memory"""
+        translator = SegmentTranslator(TranslationMemory(), dictionary_backend())
+        translation_memory.reset_translators({'dictionary': translator})
+        self.addCleanup(translation_memory.reset_translators)
+
+        support = EnhancedMultilingualSupport()
+        self.assertEqual(support.translate_text('Check crop price for 2 quintal', 'en', 'hi'),
+                         'Check फसल कीमत for 2 quintal')
+        self.assertEqual(translator.memory.get('en', 'hi', 'Check crop price for {0} quintal'),
+                         'Check फसल कीमत for {0} quintal')
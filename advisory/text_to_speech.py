@@ -1,20 +1,306 @@
-from gtts import gTTS
+"""
+Text-to-Speech
+Content-addressed audio cache for voice advisories. Audio is stored under a
+hash of (text, language, voice), so a phrase is synthesized once and every
+repeat is served straight from disk. Synthesis uses gTTS and falls back to
+the local pyttsx3 engine when gTTS is unavailable or unreachable.
+
+Fallback audio (.wav) is a stopgap: once older than TTS_FALLBACK_TTL seconds
+the next request tries gTTS again, and a successful render replaces it.
+"""
+
+import hashlib
+import logging
 import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
 from django.conf import settings
 
-def convert_text_to_speech(text, lang='en'):
+from .services.government_schemes_data import CENTRAL_GOVERNMENT_SCHEMES
+
+# Optional engines; either one is enough to synthesize audio
+try:
+    from gtts import gTTS
+    GTTS_AVAILABLE = True
+except ImportError:
+    gTTS = None
+    GTTS_AVAILABLE = False
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    pyttsx3 = None
+    PYTTSX3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Voice presets: gTTS only knows normal/slow speech, pyttsx3 takes words per minute
+VOICES = {
+    'default': {'slow': False, 'rate': 160},
+    'slow': {'slow': True, 'rate': 110},
+}
+
+CONTENT_TYPES = {'.mp3': 'audio/mpeg', '.wav': 'audio/wav'}
+
+# Written by the local pyttsx3 engine only
+FALLBACK_EXTENSION = '.wav'
+
+_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# Per-phrase locks: concurrent requests for one phrase synthesize it once,
+# and a slow render never blocks other phrases. An entry lives only while a
+# request holds or waits for it, so the table stays small.
+_key_locks: Dict[str, list] = {}          # key -> [lock, holders]
+_key_locks_guard = threading.Lock()
+
+# pyttsx3 drives a single native engine and is not thread-safe
+_pyttsx3_lock = threading.Lock()
+
+# Templated advisories rendered ahead of time by `pre_render_templates`
+ADVISORY_TEMPLATES = {
+    'weather': {
+        'en': 'Weather alert: {condition} expected in your area in the next 24 hours. Plan your field work accordingly.',
+        'hi': 'मौसम चेतावनी: अगले 24 घंटों में आपके क्षेत्र में {condition} की संभावना है। खेत का काम उसी अनुसार करें।',
+    },
+    'price': {
+        'en': "Today's mandi prices for {commodity} are as follows.",
+        'hi': 'आज {commodity} के मंडी भाव इस प्रकार हैं।',
+    },
+    'scheme': {
+        'en': '{name}. {amount}. For help call {helpline}.',
+        'hi': '{name}। {amount}। सहायता के लिए {helpline} पर कॉल करें।',
+    },
+}
+
+TEMPLATE_VALUES = {
+    'weather': {
+        'en': [{'condition': c} for c in ('heavy rain', 'light rain', 'thunderstorm', 'hailstorm',
+                                            'heatwave', 'cold wave', 'frost', 'strong winds', 'dense fog')],
+        'hi': [{'condition': c} for c in ('भारी बारिश', 'हल्की बारिश', 'आंधी-तूफान', 'ओलावृष्टि',
+                                            'लू', 'शीतलहर', 'पाला', 'तेज हवाएं', 'घना कोहरा')],
+    },
+    'price': {
+        'en': [{'commodity': c} for c in ('wheat', 'rice', 'maize', 'cotton', 'sugarcane', 'mustard',
+                                            'soybean', 'gram', 'onion', 'potato', 'tomato')],
+        'hi': [{'commodity': c} for c in ('गेहूं', 'धान', 'मक्का', 'कपास', 'गन्ना', 'सरसों',
+                                            'सोयाबीन', 'चना', 'प्याज', 'आलू', 'टमाटर')],
+    },
+}
+
+
+def _scheme_values(lang: str):
+    for scheme in CENTRAL_GOVERNMENT_SCHEMES:
+        yield {
+            'name': scheme.get('name_en' if lang == 'en' else 'name', scheme.get('name', '')),
+            'amount': scheme.get('amount', ''),
+            'helpline': scheme.get('helpline', ''),
+        }
+
+
+def _cache_dir() -> str:
+    return getattr(settings, 'TTS_CACHE_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'tts')
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def audio_cache_key(text: str, lang: str = 'en', voice: str = 'default') -> str:
+    """Content address of a phrase: sha256 over normalized text, language and voice"""
+    payload = '\x1f'.join((_normalize(text), lang.lower(), voice))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def is_valid_cache_key(key: str) -> bool:
+    return bool(_KEY_PATTERN.match(key or ''))
+
+
+def _key_dir(key: str) -> str:
+    return os.path.join(_cache_dir(), key[:2])
+
+
+def get_cached_audio(key: str) -> Optional[str]:
+    """Path of the cached audio for `key`, or None when it has not been synthesized"""
+    if not is_valid_cache_key(key):
+        return None
+    for extension in CONTENT_TYPES:
+        path = os.path.join(_key_dir(key), key + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def is_fallback_audio(path: str) -> bool:
+    return os.path.splitext(path)[1] == FALLBACK_EXTENSION
+
+
+def _fallback_ttl() -> float:
+    return float(getattr(settings, 'TTS_FALLBACK_TTL', 3600))
+
+
+def _is_stale(path: str) -> bool:
+    """Fallback audio past TTS_FALLBACK_TTL, due for another gTTS attempt"""
+    if not is_fallback_audio(path):
+        return False
+    try:
+        return os.path.getmtime(path) + _fallback_ttl() < time.time()
+    except OSError:
+        return True
+
+
+def audio_url(path: str) -> str:
+    """Media URL of a cached audio file"""
+    relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+    return settings.MEDIA_URL.rstrip('/') + '/' + relative
+
+
+def _write_atomically(key: str, extension: str, render) -> str:
+    """Render into a temp file next to the target and rename it into place"""
+    directory = _key_dir(key)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{key}.', suffix=extension)
+    os.close(fd)
+    try:
+        render(tmp_path)
+        if os.path.getsize(tmp_path) == 0:
+            raise RuntimeError('engine produced no audio')
+        path = os.path.join(directory, key + extension)
+        os.replace(tmp_path, path)
+        return path
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _synthesize_gtts(text: str, lang: str, voice: Dict[str, Any], key: str) -> str:
+    if not GTTS_AVAILABLE:
+        raise RuntimeError('gTTS is not installed')
+    tts = gTTS(text=text, lang=lang, slow=voice['slow'], timeout=float(getattr(settings, 'TTS_GTTS_TIMEOUT', 10)))
+    return _write_atomically(key, '.mp3', tts.save)
+
+
+def _synthesize_pyttsx3(text: str, lang: str, voice: Dict[str, Any], key: str) -> str:
+    if not PYTTSX3_AVAILABLE:
+        raise RuntimeError('pyttsx3 is not installed')
+
+    def render(path):
+        with _pyttsx3_lock:
+            engine = pyttsx3.init()
+            for candidate in engine.getProperty('voices'):
+                languages = [str(code).lower() for code in getattr(candidate, 'languages', [])]
+                if any(lang in code for code in languages) or candidate.id.lower().endswith(lang):
+                    engine.setProperty('voice', candidate.id)
+                    break
+            engine.setProperty('rate', voice['rate'])
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+
+    return _write_atomically(key, FALLBACK_EXTENSION, render)
+
+
+# Tried in order until one produces audio
+ENGINES = [('gtts', _synthesize_gtts), ('pyttsx3', _synthesize_pyttsx3)]
+
+
+@contextmanager
+def _key_lock(key: str) -> Iterator[None]:
+    with _key_locks_guard:
+        entry = _key_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
     try:
-        tts = gTTS(text=text, lang=lang, slow=False)
-        # Create a temporary file path for the audio
-        audio_file_name = "speech.mp3"
-        audio_file_path = os.path.join(settings.BASE_DIR, "media", audio_file_name)
-
-        # Ensure the media directory exists
-        os.makedirs(os.path.dirname(audio_file_path), exist_ok=True)
-
-        tts.save(audio_file_path)
-        # Return the URL or path relative to MEDIA_URL
-        return os.path.join(settings.MEDIA_URL, audio_file_name)
-    except Exception as e:
-        print(f"Error converting text to speech: {e}")
+        with entry[0]:
+            yield
+    finally:
+        with _key_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _key_locks[key]
+
+
+def synthesize(text: str, lang: str = 'en', voice: str = 'default') -> Optional[Dict[str, Any]]:
+    """
+    Return cached audio for the phrase, synthesizing it on first use.
+    The result carries the cache key, file path, media URL, content type,
+    the engine used and whether it was served from the cache. Returns None
+    when no engine could produce audio.
+    """
+    text = _normalize(text or '')
+    if not text:
         return None
+    preset = VOICES.get(voice, VOICES['default'])
+    key = audio_cache_key(text, lang, voice)
+
+    def result(path, engine, cached):
+        return {
+            'key': key,
+            'path': path,
+            'url': audio_url(path),
+            'content_type': CONTENT_TYPES[os.path.splitext(path)[1]],
+            'engine': engine,
+            'cached': cached,
+        }
+
+    path = get_cached_audio(key)
+    if path and not _is_stale(path):
+        return result(path, None, True)
+
+    with _key_lock(key):
+        # Another request may have finished the same phrase while we waited
+        path = get_cached_audio(key)
+        if path and not _is_stale(path):
+            return result(path, None, True)
+
+        for engine_name, engine in ENGINES:
+            try:
+                rendered = engine(text, lang, preset, key)
+            except Exception as e:
+                logger.warning(f"{engine_name} text-to-speech failed for language {lang}: {e}")
+                continue
+            logger.info(f"Synthesized {lang} speech with {engine_name} ({key[:12]})")
+            if path and path != rendered and os.path.exists(path):
+                os.remove(path)
+            return result(rendered, engine_name, False)
+
+    if path:
+        # Stale fallback audio still beats none
+        return result(path, None, True)
+    logger.error(f"No text-to-speech engine could synthesize language {lang}")
+    return None
+
+
+def convert_text_to_speech(text, lang='en', voice='default'):
+    """Media URL of the spoken text, or None when synthesis failed"""
+    audio = synthesize(text, lang, voice)
+    return audio['url'] if audio else None
+
+
+def iter_template_phrases(languages: Iterable[str] = ('en', 'hi')):
+    """Yield (template, lang, text) for every templated advisory phrase"""
+    for name, by_language in ADVISORY_TEMPLATES.items():
+        for lang in languages:
+            template = by_language.get(lang)
+            if not template:
+                continue
+            values = _scheme_values(lang) if name == 'scheme' else TEMPLATE_VALUES[name].get(lang, [])
+            for value in values:
+                yield name, lang, template.format(**value)
+
+
+def pre_render_templates(languages: Iterable[str] = ('en', 'hi'), voice: str = 'default') -> Dict[str, int]:
+    """Synthesize every templated advisory ahead of time; returns counts by outcome"""
+    counts = {'rendered': 0, 'cached': 0, 'failed': 0}
+    for _, lang, text in iter_template_phrases(languages):
+        audio = synthesize(text, lang, voice)
+        if audio is None:
+            counts['failed'] += 1
+        elif audio['cached']:
+            counts['cached'] += 1
+        else:
+            counts['rendered'] += 1
+    return counts
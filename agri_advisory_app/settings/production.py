@@ -78,6 +78,16 @@ CACHES = {
         },
         'KEY_PREFIX': 'krishimitra_ai',
         'TIMEOUT': 300,
+    },
+    # Cross-worker state (LLM and chat sessions)
+    'shared': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://localhost:6379/1'),
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        },
+        'KEY_PREFIX': 'krishimitra_shared',
+        'TIMEOUT': 3600,
     }
 }
 
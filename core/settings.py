@@ -65,6 +65,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'advisory.middleware.request_timing.RequestTimingMiddleware',  # per-route latency ring buffers
+    'advisory.middleware.compression.CompressionMiddleware',  # gzip/brotli by Accept-Encoding
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', # Add CorsMiddleware
     'advisory.middleware.rate_limiting.UserRateLimitMiddleware',  # User rate limiting
@@ -173,7 +175,7 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': ('django_filters.rest_framework.DjangoFilterBackend',),
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'advisory.api.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -308,6 +310,18 @@ AUTH_USER_MODEL = 'advisory.User'
 #         'task': 'advisory.tasks.update_market_data',
 #         'schedule': timedelta(days=1),
 #     },
+#     'update-feedback-rollups-every-15-minutes': {
+#         'task': 'advisory.tasks.update_feedback_rollups',
+#         'schedule': timedelta(minutes=15),
+#     },
+#     'update-price-forecasts-nightly': {
+#         'task': 'advisory.tasks.update_price_forecasts',
+#         'schedule': timedelta(days=1),
+#     },
+#     'update-sms-digests-daily': {
+#         'task': 'advisory.tasks.update_sms_digests',
+#         'schedule': timedelta(days=1),
+#     },
 # }
 
 # Cache busting for frontend files
@@ -365,6 +379,27 @@ else:
     }
 }
 
+# State every worker must see (LLM chat sessions, chat session state) lives in
+# the 'shared' alias, which is never LocMem or Dummy: Redis when
+# SHARED_CACHE_URL is set, otherwise a database table created by the
+# advisory migrations.
+SHARED_CACHE_URL = os.environ.get('SHARED_CACHE_URL', '')
+if SHARED_CACHE_URL:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SHARED_CACHE_URL,
+        'TIMEOUT': 60 * 60,
+    }
+else:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'advisory_shared_cache',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000
+        }
+    }
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000", # Allow React frontend
     "http://127.0.0.1:3000",
@@ -403,6 +438,137 @@ PERFORMANCE_MONITORING = {
     }
 }
 
+# Cold start budget (seconds) for booting Django and importing the API views;
+# checked by `manage.py profile_startup` and the start-up regression test
+COLD_START_BUDGET_SECONDS = float(os.environ.get('COLD_START_BUDGET_SECONDS', '3.0'))
+
+# Content-addressed text-to-speech audio cache (advisory.text_to_speech);
+# defaults to MEDIA_ROOT/tts when unset
+TTS_CACHE_DIR = os.environ.get('TTS_CACHE_DIR') or None
+# Seconds before pyttsx3 fallback audio is re-tried with gTTS
+TTS_FALLBACK_TTL = int(os.environ.get('TTS_FALLBACK_TTL', 3600))
+# Seconds before a gTTS request is given up and the next engine is tried
+TTS_GTTS_TIMEOUT = float(os.environ.get('TTS_GTTS_TIMEOUT', 10))
+
+# Columnar store of observed mandi prices (advisory.services.price_store),
+# filled by `manage.py ingest_prices`
+PRICE_STORE_DIR = os.environ.get('PRICE_STORE_DIR', os.path.join(BASE_DIR, 'data', 'price_store'))
+
+# Batch price forecasts written nightly by advisory.tasks.update_price_forecasts;
+# defaults to PRICE_STORE_DIR/forecasts.json when unset
+PRICE_FORECAST_PATH = os.environ.get('PRICE_FORECAST_PATH') or None
+
+# Daily SMS/IVR digests per (district, language) written by
+# advisory.tasks.update_sms_digests; defaults to data/sms_digests.json
+SMS_DIGEST_PATH = os.environ.get('SMS_DIGEST_PATH') or None
+
+# Crop/disease image models served by advisory.ml.image_inference
+# (<name>.onnx or <name>.joblib with <name>.labels.json); defaults to models/vision
+IMAGE_MODEL_DIR = os.environ.get('IMAGE_MODEL_DIR') or None
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get('INFERENCE_MAX_BATCH_SIZE', '16'))
+INFERENCE_MAX_WAIT_MS = float(os.environ.get('INFERENCE_MAX_WAIT_MS', '10'))
+
+# Multipart photo uploads (advisory.services.image_ingest): anything above
+# FILE_UPLOAD_MAX_MEMORY_SIZE streams to a temporary file instead of memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
+UPLOAD_SPOOL_DIR = os.environ.get('UPLOAD_SPOOL_DIR') or None
+MAX_IMAGE_UPLOAD_BYTES = int(os.environ.get('MAX_IMAGE_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+IMAGE_DECODE_WORKERS = int(os.environ.get('IMAGE_DECODE_WORKERS', '4'))
+
+# Response compression (advisory.middleware.compression); Brotli is used
+# when the optional `brotli` package is installed
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '512'))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '5'))
+
+# Part of every data-version ETag (advisory.api.conditional); set per deploy so
+# cached responses are revalidated when the code that builds them changes
+RELEASE_VERSION = os.environ.get('RELEASE_VERSION', '')
+
+# Distilled query classifier (advisory.ml.query_classifier) written by
+# `manage.py train_query_classifier`; defaults to models/query_classifier.npz.
+# Below the confidence threshold classification falls back to the LLM
+QUERY_CLASSIFIER_PATH = os.environ.get('QUERY_CLASSIFIER_PATH') or None
+QUERY_CLASSIFIER_MIN_CONFIDENCE = float(os.environ.get('QUERY_CLASSIFIER_MIN_CONFIDENCE', '0.75'))
+
+# LLM gateway (advisory.services.llm_gateway). Backends are listed in order
+# of preference until latency data exists; gemini and huggingface are only
+# used when their keys are set, 'local' (the resident generation worker) when
+# LOCAL_GENERATION_AUTHKEY is set, and 'stub' is an offline echo backend.
+# Timeout is per generated answer in seconds, hedging included
+LLM_GATEWAY_BACKENDS = [name.strip() for name in
+                        os.environ.get('LLM_GATEWAY_BACKENDS', 'ollama,gemini,huggingface,local').split(',') if name.strip()]
+# Lower-quality backends tried only after every other backend failed, never as a hedge
+LLM_GATEWAY_FALLBACK = [name.strip() for name in
+                        os.environ.get('LLM_GATEWAY_FALLBACK', 'huggingface,local').split(',') if name.strip()]
+LLM_GATEWAY_TIMEOUT = float(os.environ.get('LLM_GATEWAY_TIMEOUT', '30'))
+LLM_GATEWAY_HEDGE = os.environ.get('LLM_GATEWAY_HEDGE', 'True').lower() == 'true'
+LLM_GATEWAY_CONCURRENCY = {
+    'ollama': int(os.environ.get('OLLAMA_MAX_CONCURRENCY', '2')),
+    'gemini': int(os.environ.get('GEMINI_MAX_CONCURRENCY', '8')),
+    'huggingface': int(os.environ.get('HUGGINGFACE_MAX_CONCURRENCY', '4')),
+    'local': int(os.environ.get('LOCAL_GENERATION_MAX_CONCURRENCY', '8')),
+}
+# How long Ollama keeps the model loaded after a request (Ollama duration, e.g. '30m', '-1' for always)
+OLLAMA_KEEP_ALIVE = os.environ.get('OLLAMA_KEEP_ALIVE', '30m')
+# Multi-turn chats (advisory.services.llm_sessions): Ollama context and the
+# transcript are cached per chat session, capped at this many tokens
+LLM_SESSION_TOKEN_BUDGET = int(os.environ.get('LLM_SESSION_TOKEN_BUDGET', '2048'))
+LLM_SESSION_TTL = int(os.environ.get('LLM_SESSION_TTL', str(60 * 60)))
+
+# Chatbot conversation state (advisory.services.chat_sessions): in-process
+# LRU size and idle TTL, write-through to the 'shared' cache alias, and how often
+# changes are persisted to ChatSession.conversation_context
+CHAT_SESSION_MAX_ENTRIES = int(os.environ.get('CHAT_SESSION_MAX_ENTRIES', '10000'))
+CHAT_SESSION_TTL = int(os.environ.get('CHAT_SESSION_TTL', str(30 * 60)))
+CHAT_SESSION_SHARED_CACHE = os.environ.get('CHAT_SESSION_SHARED_CACHE', 'True').lower() == 'true'
+CHAT_SESSION_PERSIST_SECONDS = int(os.environ.get('CHAT_SESSION_PERSIST_SECONDS', '60'))
+
+# Segment translation memory (advisory.services.translation_memory), one
+# JSON file per backend; defaults to data/translation_memory/
+TRANSLATION_MEMORY_DIR = os.environ.get('TRANSLATION_MEMORY_DIR') or None
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.environ.get('TRANSLATION_MEMORY_MAX_ENTRIES', '100000'))
+TRANSLATION_MEMORY_SAVE_EVERY = int(os.environ.get('TRANSLATION_MEMORY_SAVE_EVERY', '50'))
+TRANSLATION_MAX_BATCH_SIZE = int(os.environ.get('TRANSLATION_MAX_BATCH_SIZE', '32'))
+TRANSLATION_MAX_WAIT_MS = float(os.environ.get('TRANSLATION_MAX_WAIT_MS', '20'))
+
+# Resident offline generation worker (advisory.ml.local_generation), started
+# with `manage.py run_generation_worker`; needs torch and transformers from
+# requirements-optional.txt. Address is a Unix socket path or host:port;
+# defaults to a socket in the temp directory
+LOCAL_GENERATION_ADDRESS = os.environ.get('LOCAL_GENERATION_ADDRESS') or None
+# Shared by the worker and web processes only; the worker refuses to start
+# when it is unset, shorter than 32 characters or equal to SECRET_KEY
+LOCAL_GENERATION_AUTHKEY = os.environ.get('LOCAL_GENERATION_AUTHKEY', '')
+LOCAL_GENERATION_MODEL = os.environ.get('LOCAL_GENERATION_MODEL', 'google/flan-t5-base')
+LOCAL_GENERATION_QUANTIZE = os.environ.get('LOCAL_GENERATION_QUANTIZE', 'True').lower() == 'true'
+LOCAL_GENERATION_MAX_TOKENS = int(os.environ.get('LOCAL_GENERATION_MAX_TOKENS', '128'))
+LOCAL_GENERATION_MAX_BATCH_SIZE = int(os.environ.get('LOCAL_GENERATION_MAX_BATCH_SIZE', '8'))
+LOCAL_GENERATION_MAX_WAIT_MS = float(os.environ.get('LOCAL_GENERATION_MAX_WAIT_MS', '20'))
+LOCAL_GENERATION_TIMEOUT = float(os.environ.get('LOCAL_GENERATION_TIMEOUT', '10'))
+
+# Request timing and system sampling (advisory.monitoring.performance_monitor).
+# Each route keeps its last PERFORMANCE_RING_SIZE requests
+PERFORMANCE_SAMPLE_INTERVAL = float(os.environ.get('PERFORMANCE_SAMPLE_INTERVAL', '5'))
+PERFORMANCE_RING_SIZE = int(os.environ.get('PERFORMANCE_RING_SIZE', '1024'))
+PERFORMANCE_MAX_ROUTES = int(os.environ.get('PERFORMANCE_MAX_ROUTES', '200'))
+
+# Request tracing (advisory.monitoring.tracing): keep traces slower than
+# TRACE_SLOW_MS, failed ones, and a TRACE_SAMPLE_RATE fraction of the rest
+TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'True').lower() == 'true'
+TRACE_SLOW_MS = float(os.environ.get('TRACE_SLOW_MS', '1000'))
+TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', '0.01'))
+TRACE_STORE_SIZE = int(os.environ.get('TRACE_STORE_SIZE', '200'))
+TRACE_MAX_SPANS = int(os.environ.get('TRACE_MAX_SPANS', '500'))
+
+# Sampling profiler (advisory.monitoring.profiler), started from the admin-only
+# /api/monitoring/profile/ endpoint or per request with an X-Profile header
+# equal to PROFILER_TOKEN (header profiling is off while the token is empty)
+PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN', '')
+PROFILER_INTERVAL_MS = float(os.environ.get('PROFILER_INTERVAL_MS', '10'))
+PROFILER_MAX_SECONDS = float(os.environ.get('PROFILER_MAX_SECONDS', '300'))
+PROFILER_MAX_STACKS = int(os.environ.get('PROFILER_MAX_STACKS', '20000'))
+
 # Sentry Configuration
 SENTRY_DSN = os.environ.get('SENTRY_DSN')
 